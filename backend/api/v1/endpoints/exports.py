@@ -7,6 +7,7 @@ using StreamingResponse for efficient large file handling.
 
 import io
 import json
+import tempfile
 import zipfile
 from pathlib import Path
 from typing import Dict, Any, AsyncIterator
@@ -18,6 +19,7 @@ from starlette.concurrency import run_in_threadpool
 from backend.api.types import CurrentUser, DBSession, DatasetServiceDep
 from backend.api.v1.response_models import get_common_responses
 from backend.core.exceptions import NotFoundError
+from builder._dataset_manifest import write_dataset_manifest
 from utility.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -78,6 +80,47 @@ async def generate_csv_stream(data: list[Dict[str, Any]]) -> AsyncIterator[bytes
         yield output.getvalue().encode('utf-8')
 
 
+def manifest_record(image: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map an image row to the columns of the dataset manifest.
+
+    Args:
+        image: Image metadata as stored in the images table
+
+    Returns:
+        Manifest record keyed by DATASET_MANIFEST_FIELDS
+    """
+    metadata = image.get("metadata_") or image.get("metadata") or {}
+    return {
+        "path": image.get("filename"),
+        "category": metadata.get("category"),
+        "keyword": metadata.get("keyword"),
+        "width": image.get("width"),
+        "height": image.get("height"),
+        "format": image.get("format_", image.get("format")),
+        "size": image.get("file_size"),
+        "content_hash": image.get("hash_", image.get("hash")),
+        "perceptual_hash": metadata.get("perceptual_hash"),
+        "valid": image.get("is_valid"),
+    }
+
+
+def build_manifest_file(images: list[Dict[str, Any]]) -> tuple[str, bytes]:
+    """
+    Build the columnar dataset manifest for a list of image records.
+
+    Args:
+        images: List of image metadata
+
+    Returns:
+        Tuple of (file name, file bytes); Parquet, or JSONL if pyarrow is unavailable
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = write_dataset_manifest((manifest_record(image) for image in images),
+                                      Path(tmp_dir) / "manifest.parquet")
+        return path.name, path.read_bytes()
+
+
 async def generate_zip_archive(
     dataset_id: int,
     images: list[Dict[str, Any]],
@@ -111,12 +154,17 @@ async def generate_zip_archive(
                 json.dumps(images, indent=2)
             )
 
+            # Add columnar manifest, loadable without parsing JSON
+            manifest_name, manifest_bytes = build_manifest_file(images)
+            zf.writestr(manifest_name, manifest_bytes)
+
             # Add README
             readme = f"""# Dataset {dataset_id}
 
 ## Contents
 - metadata.json: Dataset metadata
 - images.json: List of all images with metadata
+- {manifest_name}: Columnar manifest of all images
 - images/: Directory containing all images (if available)
 
 ## Statistics
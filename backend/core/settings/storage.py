@@ -1,6 +1,6 @@
 """File storage configuration settings."""
 
-from typing import List
+from typing import List, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -15,6 +15,7 @@ class StorageSettings(BaseSettings):
     Environment variables:
         STORAGE_UPLOAD_MAX_SIZE: Max upload size in bytes
         STORAGE_UPLOAD_ALLOWED_EXTENSIONS: Comma-separated extensions
+        STORAGE_DATA_DIR: Directory for state kept across jobs
     """
 
     model_config = SettingsConfigDict(
@@ -38,6 +39,13 @@ class StorageSettings(BaseSettings):
         description="Allowed file extensions for uploads",
         examples=[[".jpg", ".png"], [".jpg", ".jpeg", ".png", ".gif", ".webp"]]
     )
+    data_dir: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        description="Directory for state kept across jobs, such as the keyword cache "
+                    "(uses platformdirs if not set)",
+        examples=["./data", "/var/lib/pixcrawler"]
+    )
 
     @field_validator('upload_allowed_extensions')
     @classmethod
@@ -17,7 +17,7 @@ Functions:
 
 Features:
     - Integration with PixCrawler builder package
-    - Fast keyword generation using predefined variations (AI-disabled)
+    - AI keyword expansion at job start, batched, cached and bounded by a timeout
     - Real-time job status updates
     - Progress tracking and error handling
     - Image metadata storage
@@ -31,10 +31,12 @@ import json
 import time
 import uuid
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, Any, List, Optional, AsyncGenerator, Union
 from uuid import UUID
 
 from celery_core.app import celery_app
+from platformdirs import user_data_dir
 
 # Optional SSE support
 try:
@@ -44,6 +46,7 @@ except ImportError:
     SSE_AVAILABLE = False
     EventSourceResponse = None  # type: ignore
 
+from backend.core.config import get_settings
 from backend.core.exceptions import NotFoundError, ValidationError
 from backend.models import CrawlJob, Image
 from backend.repositories import (
@@ -271,6 +274,11 @@ class CrawlJobService(BaseService):
         activity_log_repo: ActivityLog repository
     """
 
+    # AI keyword expansion at job start: seconds to wait for the model, and expansions
+    # kept per keyword (the keyword itself comes first)
+    KEYWORD_EXPANSION_TIMEOUT = 20.0
+    MAX_EXPANSIONS_PER_KEYWORD = 5
+
     def __init__(
         self,
         crawl_job_repo: CrawlJobRepository,
@@ -296,6 +304,17 @@ class CrawlJobService(BaseService):
         self.activity_log_repo = activity_log_repo
         self.dataset_repo = dataset_repo
 
+    @staticmethod
+    def _data_dir() -> Path:
+        """
+        Get the directory for state shared across jobs, such as the keyword cache.
+
+        Returns:
+            The configured data directory, or the platform's user data directory
+        """
+        data_dir = get_settings().storage.data_dir
+        return Path(data_dir) if data_dir else Path(user_data_dir("pixcrawler", "pixcrawler"))
+
     async def create_job(
         self,
         dataset_id: int,
@@ -412,6 +431,9 @@ class CrawlJobService(BaseService):
             task_download_baidu,
             task_download_duckduckgo
         )
+        from builder._keyword_cache import KeywordCache
+        from builder._keywords import KeywordManagement
+        from builder._workspace import CrawlWorkspace
 
         # Step 1: Retrieve job
         job = await self.get_job(job_id)
@@ -468,14 +490,29 @@ class CrawlJobService(BaseService):
             'duckduckgo': task_download_duckduckgo
         }
 
-        # Step 4.5: Use original keywords directly (skip AI generation for now)
-        # TODO: Implement async keyword expansion in a separate background task
-        expanded_keywords = keywords
-        
+        # Step 4.5: Expand keywords with AI. All keywords go to the model in one batched
+        # prompt, expansions are cached across jobs and a slow model is cut off by the
+        # timeout, falling back to the original keywords
+        keyword_cache = KeywordCache.for_directory(self._data_dir())
+        try:
+            keyword_manager = KeywordManagement(keyword_cache=keyword_cache)
+            expansions = await keyword_manager.generate_keywords_async(
+                keywords, timeout=self.KEYWORD_EXPANSION_TIMEOUT
+            )
+        finally:
+            keyword_cache.close()
+        expanded_keywords = list(dict.fromkeys(
+            term
+            for keyword in keywords
+            for term in expansions.get(keyword, [keyword])[:self.MAX_EXPANSIONS_PER_KEYWORD]
+        ))
+
         logger.info(
-            f"Using original keywords for job {job_id} (AI-disabled, direct approach)",
+            f"Expanded {len(keywords)} keywords to {len(expanded_keywords)} for job {job_id}",
             job_id=job_id,
-            keyword_count=len(keywords)
+            keyword_count=len(keywords),
+            expanded_count=len(expanded_keywords),
+            keyword_cache_hits=keyword_cache.hits
         )
 
         # Calculate total chunks (one chunk per keyword-engine combination)
@@ -483,7 +520,8 @@ class CrawlJobService(BaseService):
 
         # Step 5: Dispatch tasks
         task_ids = []
-        output_dir = f"/tmp/crawl_{job_id}"
+        # Every keyword x engine chunk writes into its own directory of the job workspace
+        workspace = CrawlWorkspace.for_job(job_id)
 
         logger.info(
             f"Starting job {job_id}: {len(expanded_keywords)} keywords × {len(engines)} engines = {total_chunks} chunks",
@@ -504,8 +542,9 @@ class CrawlJobService(BaseService):
                 # Dispatch task with serializable arguments only
                 task = task_func.delay(
                     keyword=keyword,
-                    output_dir=output_dir,
-                    max_images=job.max_images // len(expanded_keywords),  # Distribute images across expanded keywords
+                    output_dir=str(workspace.chunk_dir(keyword, engine)),
+                    # Distribute images across expanded keywords, at least one per chunk
+                    max_images=max(1, job.max_images // len(expanded_keywords)),
                     job_id=str(job_id),
                     user_id=user_id
                 )
@@ -732,6 +771,18 @@ class CrawlJobService(BaseService):
         all_chunks_done = (new_completed + new_failed) >= total_chunks
 
         if all_chunks_done:
+            # Present the published chunks as one dataset view
+            try:
+                from builder._workspace import CrawlWorkspace
+                manifest_path = await asyncio.to_thread(
+                    CrawlWorkspace.for_job(job_id).write_manifest
+                )
+                logger.info(f"Wrote dataset manifest for job {job_id}: {manifest_path}",
+                            job_id=job_id)
+            except OSError as e:
+                logger.error(f"Failed to write dataset manifest for job {job_id}: {str(e)}",
+                             job_id=job_id, error=str(e))
+
             # Mark job as completed
             await self.crawl_job_repo.mark_completed(job_id)
 
@@ -1944,37 +1995,27 @@ async def execute_crawl_job(
 
         # Process results as they come using async generator
         try:
-            # Get the async generator from builder
-            async_gen = await run_in_threadpool(
-                builder.generate_async_batches,
-                batch_size=BATCH_SIZE
-            )
-
-            # Process batches as they come
-            while True:
-                try:
-                    batch = await run_in_threadpool(next, async_gen)
-                    await process_batch(batch)
-
-                    # Send progress update after each batch with fresh session
-                    progress = min(
-                        int((processed_count / job.max_images) * 100), 100) if job.max_images > 0 else 0
-
-                    async with session_maker() as progress_session:
-                        async with progress_session.begin():
-                            progress_job_service, _ = create_services_with_session(progress_session)
-                            # Direct repository update to avoid session issues
-                            job_to_update = await progress_job_service.crawl_job_repo.get_by_id(job_id)
-                            if job_to_update:
-                                await progress_job_service.crawl_job_repo.update(job_to_update,
-                                    progress=progress,
-                                    downloaded_images=processed_count,
-                                    valid_images=valid_count,
-                                    last_activity=datetime.utcnow()
-                                )
-
-                except StopAsyncIteration:
-                    break
+            # Batches arrive while later keywords are still downloading; the builder pauses
+            # downloading while too many batches are waiting here
+            async for batch in builder.generate_async_batches(batch_size=BATCH_SIZE):
+                await process_batch(batch)
+
+                # Send progress update after each batch with fresh session
+                progress = min(
+                    int((processed_count / job.max_images) * 100), 100) if job.max_images > 0 else 0
+
+                async with session_maker() as progress_session:
+                    async with progress_session.begin():
+                        progress_job_service, _ = create_services_with_session(progress_session)
+                        # Direct repository update to avoid session issues
+                        job_to_update = await progress_job_service.crawl_job_repo.get_by_id(job_id)
+                        if job_to_update:
+                            await progress_job_service.crawl_job_repo.update(job_to_update,
+                                progress=progress,
+                                downloaded_images=processed_count,
+                                valid_images=valid_count,
+                                last_activity=datetime.utcnow()
+                            )
 
             # Final progress update with fresh session
             progress = 100 if processed_count >= job.max_images else min(
@@ -7,6 +7,8 @@ deduplication, labeling, storage tiering, and quality reporting.
 """
 
 import asyncio
+import dataclasses
+import json
 import tempfile
 from datetime import datetime
 from pathlib import Path
@@ -25,15 +27,21 @@ from backend.services.storage import StorageService
 from backend.services.metrics import MetricsService
 from backend.storage.factory import create_storage_provider
 from backend.storage.config import StorageSettings
+from validator.analysis import ImageAnalysis
 from validator.validation import CheckManager
 from validator.config import ValidatorConfig, DuplicateAction
+from builder._dataset_manifest import DATASET_MANIFEST_NAME, image_record, write_dataset_manifest
 from builder._generator import LabelGenerator
+from builder._scheduler import YieldStats, record_validation_outcome
 from utility.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 __all__ = ['DatasetProcessingPipeline', 'PipelineConfig', 'PipelineMetrics']
 
+# Storage tier of the dataset view -> access tier passed to content-addressed providers
+STORAGE_ACCESS_TIERS: Dict[str, str] = {"hot": "Hot", "cold": "Cool"}
+
 
 class PipelineConfig:
     """Configuration for dataset processing pipeline."""
@@ -49,6 +57,7 @@ class PipelineConfig:
         temp_workspace_cleanup: bool = True,
         validation_mode: str = "strict",
         max_concurrent_validations: int = 5,
+        dataset_manifest_format: Optional[str] = "parquet",
     ):
         """Initialize pipeline configuration."""
         self.enable_validation = enable_validation
@@ -60,6 +69,7 @@ class PipelineConfig:
         self.temp_workspace_cleanup = temp_workspace_cleanup
         self.validation_mode = validation_mode
         self.max_concurrent_validations = max_concurrent_validations
+        self.dataset_manifest_format = dataset_manifest_format
 
 
 class PipelineMetrics:
@@ -138,7 +148,10 @@ class DatasetProcessingPipeline(BaseService):
             duplicate_action=DuplicateAction.REMOVE if self.config.enable_deduplication else DuplicateAction.REPORT_ONLY,
         )
         self.check_manager = CheckManager(validator_config)
-        self.label_generator = LabelGenerator() if self.config.enable_labeling else None
+        self.label_generator = (LabelGenerator(metadata_provider=self._label_metadata)
+                                if self.config.enable_labeling else None)
+        # Single-decode analyses of the validated images, keyed by file name
+        self.image_analyses: Dict[str, ImageAnalysis] = {}
         self.temp_workspace: Optional[Path] = None
         self.storage_settings = StorageSettings()
         self.storage_provider = create_storage_provider(self.storage_settings)
@@ -389,14 +402,31 @@ class DatasetProcessingPipeline(BaseService):
             validated_dir = self.temp_workspace / "validated"
             valid_count = 0
             invalid_count = 0
-            for image_file in crawled_dir.glob("*"):
-                if image_file.is_file():
-                    is_valid = self.check_manager.image_validator.validate(str(image_file))
-                    if is_valid:
-                        image_file.rename(validated_dir / image_file.name)
-                        valid_count += 1
-                    else:
-                        invalid_count += 1
+            rejected_hashes = []
+            self.image_analyses.clear()
+            image_files = [str(f) for f in crawled_dir.glob("*") if f.is_file()]
+            # Each image is read and decoded once; deduplication, labels and the
+            # manifest reuse the analysis instead of opening the file again
+            analyses = await asyncio.to_thread(self.check_manager.analyze_images, image_files)
+            image_validator = self.check_manager.image_validator
+            for analysis in analyses:
+                if image_validator.accepts(analysis):
+                    target = validated_dir / Path(analysis.path).name
+                    Path(analysis.path).rename(target)
+                    self.image_analyses[target.name] = dataclasses.replace(
+                        analysis, path=str(target))
+                    valid_count += 1
+                else:
+                    invalid_count += 1
+                    if analysis.content_hash:
+                        rejected_hashes.append(analysis.content_hash)
+            await asyncio.to_thread(
+                self.check_manager.record_analyses,
+                str(validated_dir),
+                list(self.image_analyses.values()),
+            )
+            if rejected_hashes:
+                await asyncio.to_thread(self._record_rejections, crawled_dir, rejected_hashes)
             self.metrics.images_validated = valid_count + invalid_count
             self.metrics.valid_images = valid_count
             self.metrics.invalid_images = invalid_count
@@ -500,20 +530,58 @@ class DatasetProcessingPipeline(BaseService):
             images = list(source_dir.glob("*"))
             total_images = len(images)
             hot_count = min(self.config.hot_storage_threshold, total_images)
-            for i, image_file in enumerate(images[:hot_count]):
+            # Content-addressed providers store each distinct image once; the dataset view is
+            # a manifest of references to those blobs instead of a second copy. The tier
+            # goes to the provider as the blob's access tier and is kept in the view
+            view_entries: List[Dict[str, Any]] = []
+            manifest_records: List[Dict[str, Any]] = []
+            for i, image_file in enumerate(images):
+                tier = "hot" if i < hot_count else "cold"
+                view_path = f"{tier}/{image_file.name}"
+                if hasattr(self.storage_provider, 'upload_content'):
+                    key = await asyncio.to_thread(
+                        self.storage_provider.upload_content,
+                        str(image_file),
+                        tier=STORAGE_ACCESS_TIERS[tier],
+                    )
+                    view_entries.append({"path": view_path, "blob": key, "tier": tier})
+                else:
+                    await asyncio.to_thread(
+                        self.storage_provider.upload,
+                        str(image_file),
+                        view_path,
+                    )
+                if self.config.dataset_manifest_format:
+                    manifest_records.append(await asyncio.to_thread(
+                        self._manifest_record, image_file, view_path))
+                if i < hot_count:
+                    self.metrics.hot_storage_count += 1
+                else:
+                    self.metrics.cold_storage_count += 1
+            if view_entries:
+                view_manifest = self.temp_workspace / "storage_manifest.jsonl"
+                view_manifest.write_text(
+                    "".join(json.dumps(entry) + "\n" for entry in view_entries),
+                    encoding="utf-8",
+                )
                 await asyncio.to_thread(
                     self.storage_provider.upload,
-                    str(image_file),
-                    f"hot/{image_file.name}",
+                    str(view_manifest),
+                    f"manifests/{self.temp_workspace.name}.jsonl",
+                )
+            if manifest_records:
+                # Columnar manifest of the dataset, for exports and training loaders
+                dataset_manifest = await asyncio.to_thread(
+                    write_dataset_manifest,
+                    manifest_records,
+                    self.temp_workspace / DATASET_MANIFEST_NAME,
+                    self.config.dataset_manifest_format,
                 )
-                self.metrics.hot_storage_count += 1
-            for image_file in images[hot_count:]:
                 await asyncio.to_thread(
                     self.storage_provider.upload,
-                    str(image_file),
-                    f"cold/{image_file.name}",
+                    str(dataset_manifest),
+                    f"manifests/{self.temp_workspace.name}{dataset_manifest.suffix}",
                 )
-                self.metrics.cold_storage_count += 1
             self.metrics.storage_duration = (
                 datetime.utcnow() - start_time
             ).total_seconds()
@@ -533,6 +601,49 @@ class DatasetProcessingPipeline(BaseService):
             logger.error(f"Storage tiering failed: {str(e)}")
             raise
 
+    @staticmethod
+    def _record_rejections(crawled_dir: Path, rejected_hashes: List[str]) -> None:
+        """
+        Feeds validation rejections back into the crawl's yield history.
+
+        The history is keyed by the crawl's parent directory, as the builder's engine tasks
+        key it, so later searches favour engines and templates whose images pass.
+        """
+        yield_stats = YieldStats.for_directory(crawled_dir.parent)
+        try:
+            record_validation_outcome(crawled_dir, rejected_hashes, yield_stats)
+        finally:
+            yield_stats.close()
+
+    def _image_analysis(self, image_file: Path) -> ImageAnalysis:
+        """Return the analysis of an image, analyzing it now if validation did not."""
+        analysis = self.image_analyses.get(image_file.name)
+        if analysis is None:
+            analysis = self.check_manager.image_validator.analyzer.analyze(str(image_file))
+        return analysis
+
+    def _label_metadata(self, image_file: Path) -> Optional[Dict[str, Any]]:
+        """Provide label metadata of a validated image from its analysis."""
+        analysis = self.image_analyses.get(image_file.name)
+        if analysis is None or not analysis.valid:
+            return None
+        return {"width": analysis.width, "height": analysis.height,
+                "format_": analysis.format, "mode": analysis.mode}
+
+    def _manifest_record(self, image_file: Path, view_path: str) -> Dict[str, Any]:
+        """Build the dataset manifest record of an image that passed validation."""
+        analysis = self._image_analysis(image_file)
+        hasher = self.check_manager.duplication_manager.hasher
+        return image_record(
+            image_file,
+            path=view_path,
+            content_hash=analysis.content_hash,
+            perceptual_hash=analysis.perceptual_hex(hasher.algorithm),
+            valid=True if self.config.enable_validation else None,
+            image_info=((analysis.width, analysis.height, analysis.format)
+                        if analysis.valid else None),
+        )
+
     async def _generate_quality_report(self) -> Dict[str, Any]:
         """Generate quality report for dataset."""
         try:
@@ -11,6 +11,8 @@ Classes:
 
 Functions:
     get_storage_provider: Factory function to create storage provider instances
+    content_key: Build the content-addressed storage key of a file
+    content_digest: Compute the MD5 digest of a file
 
 Features:
     - Protocol-based design for flexible storage backends
@@ -18,10 +20,12 @@ Features:
     - Azure Blob Storage with optional dependency
     - Environment-based configuration
     - Comprehensive error handling and logging
+    - Content-addressed uploads so identical images are stored once
 """
 
 from backend.storage.base import StorageProvider
 from backend.storage.config import StorageSettings
+from backend.storage.content import content_key, content_digest
 from backend.storage.factory import get_storage_provider
 from backend.storage.local import LocalStorageProvider
 from backend.storage.azure_blob import AzureBlobStorageProvider, AZURE_AVAILABLE
@@ -32,5 +36,7 @@ __all__ = [
     'get_storage_provider',
     'LocalStorageProvider',
     'AzureBlobStorageProvider',
-    'AZURE_AVAILABLE'
+    'AZURE_AVAILABLE',
+    'content_key',
+    'content_digest'
 ]
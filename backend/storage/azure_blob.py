@@ -16,6 +16,7 @@ Features:
     - Retry logic with exponential backoff
     - Progress tracking for large uploads/downloads
     - Metadata and tags support
+    - Content-addressed uploads that skip blobs already stored
 """
 
 from datetime import datetime, timedelta, timezone
@@ -23,6 +24,7 @@ from pathlib import Path
 from typing import List, Optional, Union, Dict, Any
 import time
 
+from backend.storage.content import content_key
 from utility.logging_config import get_logger
 
 __all__ = ['AzureBlobStorageProvider', 'AZURE_AVAILABLE', 'AccessTier', 'RehydratePriority']
@@ -258,6 +260,65 @@ class AzureBlobStorageProvider:
             logger.error(f"Failed to upload file {file_path} to Azure: {e}")
             raise IOError(f"Azure upload failed: {e}") from e
 
+    def exists(self, file_path: str) -> bool:
+        """Check whether a blob exists in Azure Blob Storage.
+
+        Args:
+            file_path: Blob name in storage
+
+        Returns:
+            True if the blob exists
+
+        Raises:
+            IOError: If the check fails
+        """
+        try:
+            blob_client = self.container_client.get_blob_client(file_path)
+            return bool(self._retry_operation(blob_client.exists))
+        except Exception as e:
+            logger.error(f"Failed to check blob {file_path}: {e}")
+            raise IOError(f"Azure existence check failed: {e}") from e
+
+    def upload_content(
+        self,
+        file_path: Union[str, Path],
+        digest: Optional[str] = None,
+        tier: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Upload a file under its content-addressed key, skipping blobs already stored.
+
+        Identical images from different jobs or datasets map to the same key, so they
+        are uploaded once and referenced by key afterwards. A stored blob requested
+        for the Hot tier is moved to Hot, so a blob shared by hot and cold datasets
+        is served from the hottest tier.
+
+        Args:
+            file_path: Path to the local file to upload
+            digest: Known MD5 digest of the file; computed if None
+            tier: Access tier (Hot/Cool/Archive), uses default if None
+            metadata: Optional metadata dictionary
+
+        Returns:
+            Content-addressed blob name
+
+        Raises:
+            FileNotFoundError: If source file doesn't exist
+            IOError: If upload fails
+        """
+        if not Path(file_path).is_file():
+            raise FileNotFoundError(f"Source file not found: {file_path}")
+
+        key = content_key(file_path, digest)
+        if self.exists(key):
+            logger.debug(f"Blob already stored, skipping upload: {key}")
+            if tier == AccessTier.HOT:
+                self.set_blob_tier(key, tier)
+            return key
+
+        self.upload(file_path, key, tier=tier, metadata=metadata)
+        return key
+
     @staticmethod
     def _get_content_type(file_path: Path) -> str:
         """Auto-detect content type from file extension."""
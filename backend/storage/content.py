@@ -0,0 +1,55 @@
+"""Content-addressed keys for storage providers.
+
+This module derives storage keys from file contents, so identical images are
+stored and uploaded once no matter how many jobs or datasets contain them.
+
+Functions:
+    content_digest: Compute the MD5 digest of a file
+    content_key: Build the content-addressed storage key of a file
+
+Features:
+    - Keys use the same MD5 digest the builder records while downloading
+    - Same ``ab/cd/<digest><ext>`` layout as the builder's local content store
+    - Streaming hash, so large files are never read into memory at once
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Optional, Union
+
+__all__ = ['CONTENT_PREFIX', 'content_digest', 'content_key']
+
+CONTENT_PREFIX = "blobs"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def content_digest(file_path: Union[str, Path]) -> str:
+    """Compute the MD5 digest of a file.
+
+    Args:
+        file_path: Path to the local file
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_key(file_path: Union[str, Path], digest: Optional[str] = None) -> str:
+    """Build the content-addressed storage key of a file.
+
+    Args:
+        file_path: Path to the local file
+        digest: Known MD5 digest of the file; computed if None
+
+    Returns:
+        Storage key such as ``blobs/ab/cd/abcd...ef.jpg``
+    """
+    digest = (digest or content_digest(file_path)).lower()
+    suffix = Path(file_path).suffix.lower()
+    return f"{CONTENT_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{suffix}"
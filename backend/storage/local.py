@@ -11,8 +11,10 @@ Features:
     - Uses platformdirs for proper base directory location
     - Comprehensive error handling and logging
     - Safe file operations with proper validation
+    - Content-addressed uploads that store identical files once
 """
 
+import os
 import shutil
 import time
 from pathlib import Path
@@ -20,6 +22,7 @@ from typing import List, Optional, Union
 from urllib.parse import quote
 
 from platformdirs import user_data_dir
+from backend.storage.content import content_key
 from utility.logging_config import get_logger
 
 __all__ = ['LocalStorageProvider']
@@ -106,6 +109,51 @@ class LocalStorageProvider:
             logger.error(f"Failed to upload file {file_path}: {e}")
             raise IOError(f"Upload failed: {e}") from e
 
+    def exists(self, file_path: str) -> bool:
+        """Check whether a file exists in local storage.
+
+        Args:
+            file_path: Path to the file in storage
+
+        Returns:
+            True if the file exists
+        """
+        return self._full_path(file_path).is_file()
+
+    def upload_content(
+        self,
+        file_path: Union[str, Path],
+        digest: Optional[str] = None,
+        tier: Optional[str] = None,
+    ) -> str:
+        """Upload a file under its content-addressed key, skipping files already stored.
+
+        The stored file is a copy, so later changes to the source cannot alter it.
+
+        Args:
+            file_path: Path to the local file to upload
+            digest: Known MD5 digest of the file; computed if None
+            tier: Access tier requested by the caller; local storage has no tiers
+
+        Returns:
+            Content-addressed storage key
+
+        Raises:
+            FileNotFoundError: If source file doesn't exist
+            IOError: If upload fails
+        """
+        source = Path(file_path)
+        if not source.is_file():
+            raise FileNotFoundError(f"Source file not found: {file_path}")
+
+        key = content_key(source, digest)
+        if self.exists(key):
+            logger.debug(f"Content already stored, skipping upload: {key}")
+            return key
+
+        self.upload(source, key)
+        return key
+
     def download(self, file_path: str, destination_path: Union[str, Path]) -> None:
         """Download a file from local storage.
 
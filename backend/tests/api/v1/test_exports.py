@@ -0,0 +1,82 @@
+"""
+Unit tests for the dataset export helpers.
+
+Tests cover:
+- Mapping image rows to dataset manifest columns
+- Columnar manifest included in ZIP exports
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from backend.api.v1.endpoints.exports import build_manifest_file, manifest_record
+from utility.dataset_manifest import DATASET_MANIFEST_FIELDS
+
+
+def _image_row(**overrides):
+    """Create an image row as returned for the images table."""
+    row = {
+        "id": 1,
+        "crawl_job_id": 7,
+        "filename": "cats/cute_cat/cute_cat_001.jpg",
+        "storage_url": "https://storage.example.com/cute_cat_001.jpg",
+        "width": 640,
+        "height": 480,
+        "file_size": 52311,
+        "format_": "jpg",
+        "hash_": "0cc175b9c0f1b6a831c399e269772661",
+        "is_valid": True,
+        "metadata_": {"category": "cats", "keyword": "cute cat"},
+    }
+    row.update(overrides)
+    return row
+
+
+class TestManifestRecord:
+    """Test mapping image rows to manifest columns."""
+
+    def test_maps_database_fields(self):
+        """Image table fields fill the matching manifest columns."""
+        record = manifest_record(_image_row())
+
+        assert tuple(record) == DATASET_MANIFEST_FIELDS
+        assert record["path"] == "cats/cute_cat/cute_cat_001.jpg"
+        assert record["size"] == 52311
+        assert record["format"] == "jpg"
+        assert record["content_hash"] == "0cc175b9c0f1b6a831c399e269772661"
+        assert record["valid"] is True
+        assert record["category"] == "cats" and record["keyword"] == "cute cat"
+
+    def test_missing_metadata(self):
+        """Rows without metadata leave category and keyword null."""
+        record = manifest_record(_image_row(metadata_=None))
+
+        assert record["category"] is None and record["keyword"] is None
+        assert record["width"] == 640
+
+
+class TestBuildManifestFile:
+    """Test the manifest written into ZIP exports."""
+
+    def test_columns_are_populated(self):
+        """Path, size, format and hash columns of the exported manifest are not null."""
+        images = [_image_row(), _image_row(id=2, filename="cats/cute_cat/cute_cat_002.png",
+                                           format_="png", is_valid=False)]
+
+        name, data = build_manifest_file(images)
+
+        if name.endswith(".jsonl"):
+            rows = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+        else:
+            from utility.dataset_manifest import read_dataset_manifest
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                path = Path(tmp_dir) / name
+                path.write_bytes(data)
+                rows = read_dataset_manifest(path).to_pylist()
+
+        assert [row["path"] for row in rows] == [
+            "cats/cute_cat/cute_cat_001.jpg", "cats/cute_cat/cute_cat_002.png"]
+        assert [row["format"] for row in rows] == ["jpg", "png"]
+        assert all(row["size"] == 52311 and row["content_hash"] for row in rows)
+        assert [row["valid"] for row in rows] == [True, False]
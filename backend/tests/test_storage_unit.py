@@ -135,6 +135,36 @@ class TestLocalStorageProviderUpload:
         assert uploaded_file.read_bytes() == sample_image_file.read_bytes()
 
 
+class TestLocalStorageProviderContentUpload:
+    """Test LocalStorageProvider content-addressed uploads."""
+
+    def test_upload_content_stores_identical_files_once(self, local_storage_provider: LocalStorageProvider, sample_image_file: Path):
+        """Test that identical files map to one content-addressed key."""
+        copy = sample_image_file.with_name("copy_of_image.png")
+        copy.write_bytes(sample_image_file.read_bytes())
+
+        key = local_storage_provider.upload_content(sample_image_file)
+        assert key.startswith("blobs/") and key.endswith(".png")
+        assert local_storage_provider.upload_content(copy) == key
+        assert local_storage_provider.exists(key)
+        assert local_storage_provider.list_files(prefix="blobs/") == [key]
+        assert (local_storage_provider.base_directory / key).read_bytes() == sample_image_file.read_bytes()
+
+    def test_upload_content_copies_source(self, local_storage_provider: LocalStorageProvider, sample_image_file: Path):
+        """Test that rewriting the source after upload leaves the stored content intact."""
+        original = sample_image_file.read_bytes()
+        key = local_storage_provider.upload_content(sample_image_file, tier="Cool")
+
+        with open(sample_image_file, "r+b") as f:
+            f.write(b"\x00" * 8)
+        assert (local_storage_provider.base_directory / key).read_bytes() == original
+
+    def test_upload_content_nonexistent_file_raises_error(self, local_storage_provider: LocalStorageProvider):
+        """Test content upload of nonexistent file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            local_storage_provider.upload_content("/nonexistent/file.png")
+
+
 class TestLocalStorageProviderDownload:
     """Test LocalStorageProvider download operations."""
 
@@ -28,18 +28,28 @@ Example:
     builder.set_ai_model("gpt4")
     builder.enable_keyword_generation()
     builder.generate()
+
+    # Streaming: consume image metadata while later keywords are still downloading
+    async for batch in builder.generate_async_batches(batch_size=50):
+        store(batch)
+    builder.cleanup()
     ```
 """
 
+import asyncio
+import concurrent.futures
 import os
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Set
+from typing import Optional, Dict, Any, List, Set, AsyncIterator
 
 from ._predefined_variations import get_search_variations
 from builder._config import DatasetGenerationConfig, get_engines
-from builder._constants import logger, KEYWORD_MODE, AI_MODELS
+from builder._constants import logger, KEYWORD_MODE, AI_MODELS, IMAGE_EXTENSIONS
+from builder._content_digest import ContentDigestIndex
 from ._search_engines import DDGSImageDownloader
 from builder._engine import EngineProcessor
+from builder._streaming import read_image_header
 from builder._exceptions import (
     DownloadError,
     GenerationError
@@ -51,6 +61,55 @@ from builder._helpers import ProgressManager
 
 __all__ = ['Builder']
 
+# Queued by the batch producer after its last batch
+_BATCH_STREAM_END = object()
+
+
+class _BatchStreamClosed(Exception):
+    """Raised in the batch producer thread once the consumer has stopped reading."""
+
+
+def _image_records(keyword_dir: Path, category: str, keyword: str) -> List[Dict[str, Any]]:
+    """
+    Builds the metadata records of the images in a keyword directory.
+
+    Dimensions and format are read from the leading bytes of each file, without opening the
+    whole image; the content hash comes from the digest manifest written during download.
+
+    Args:
+        keyword_dir (Path): The keyword directory.
+        category (str): The category the keyword belongs to.
+        keyword (str): The keyword.
+
+    Returns:
+        List[Dict[str, Any]]: One record per image, ordered by file name.
+    """
+    digests = ContentDigestIndex(keyword_dir)
+    records = []
+    entries = sorted((entry for entry in os.scandir(keyword_dir) if entry.is_file() and
+                      os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS),
+                     key=lambda entry: entry.name)
+    for entry in entries:
+        try:
+            header_format, dimensions = read_image_header(entry.path)
+        except OSError:
+            header_format = dimensions = None
+        width, height = dimensions or (None, None)
+        image_format = header_format or os.path.splitext(entry.name)[1][1:].lower()
+        is_valid = header_format is not None
+
+        records.append({
+            "filename": entry.name,
+            "file_size": entry.stat().st_size,
+            "width": width,
+            "height": height,
+            "format_": image_format,
+            "hash_": digests.current_digest(entry.name),
+            "is_valid": is_valid,
+            "metadata_": {"category": category, "keyword": keyword, "path": entry.path},
+        })
+    return records
+
 
 class Builder:
     """
@@ -66,6 +125,7 @@ class Builder:
         - Progress tracking and resumption
         - Comprehensive reporting
         - Customizable configuration
+        - Streaming of image metadata batches to asyncio consumers during generation
 
     Attributes:
         config (DatasetGenerationConfig): Configuration object for dataset generation
@@ -125,6 +185,8 @@ class Builder:
         self.dataset_generator: Optional[DatasetGenerator] = None
         self.engine_processor: Optional[EngineProcessor] = None
         self.progress_manager: Optional[ProgressManager] = None
+        self._batch_producer: Optional[threading.Thread] = None
+        self._batch_stop = threading.Event()
 
         # Load and validate configuration
         self._load_config()
@@ -176,6 +238,113 @@ class Builder:
             logger.error(f"Dataset generation failed: {e}")
             raise GenerationError(f"Failed to generate dataset: {e}") from e
 
+    async def generate_async_batches(self, batch_size: int = 50,
+                                     max_pending_batches: int = 4) -> AsyncIterator[
+        List[Dict[str, Any]]]:
+        """
+        Generates the dataset and yields image metadata in batches while downloading continues.
+
+        Generation runs in a background thread. The images of each keyword are queued in
+        batches as soon as that keyword is done. At most `max_pending_batches` batches wait
+        in the queue; while it is full, downloading pauses until the consumer catches up.
+        Leaving the loop early stops generation after the current keyword.
+
+        Args:
+            batch_size (int): Number of image records per batch.
+            max_pending_batches (int): Number of batches buffered before downloading pauses.
+
+        Yields:
+            List[Dict[str, Any]]: Image records with filename, file_size, width, height,
+                                  format_, hash_, is_valid and metadata_ (category, keyword, path).
+
+        Raises:
+            ValueError: If batch_size or max_pending_batches is not positive.
+            GenerationError: If a stream is already running or dataset generation fails.
+        """
+        if batch_size <= 0 or max_pending_batches <= 0:
+            raise ValueError("batch_size and max_pending_batches must be greater than 0")
+        if self._batch_producer is not None and self._batch_producer.is_alive():
+            raise GenerationError("A batch stream is already running for this builder")
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending_batches)
+        stop = threading.Event()
+        self._batch_stop = stop
+
+        def put(item: Any) -> None:
+            # Blocks the producer while the queue is full; gives up once the consumer is gone
+            if stop.is_set():
+                raise _BatchStreamClosed()
+            try:
+                future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            except RuntimeError as e:
+                raise _BatchStreamClosed() from e
+            while True:
+                try:
+                    future.result(timeout=0.5)
+                    return
+                except concurrent.futures.TimeoutError:
+                    if stop.is_set():
+                        future.cancel()
+                        raise _BatchStreamClosed()
+
+        def produce() -> None:
+            pending: List[Dict[str, Any]] = []
+
+            def on_keyword_completed(category: str, keyword: str, keyword_dir: Path) -> None:
+                if stop.is_set():
+                    raise _BatchStreamClosed()
+                pending.extend(_image_records(keyword_dir, category, keyword))
+                while len(pending) >= batch_size:
+                    put(pending[:batch_size])
+                    del pending[:batch_size]
+
+            try:
+                self.dataset_generator = DatasetGenerator(self.config)
+                self.dataset_generator.generate(on_keyword_completed)
+                if pending:
+                    put(pending)
+                put(_BATCH_STREAM_END)
+            except _BatchStreamClosed:
+                logger.info("Batch consumer stopped, dataset generation cancelled")
+            except Exception as e:
+                logger.error(f"Dataset generation failed: {e}")
+                try:
+                    put(e)
+                except _BatchStreamClosed:
+                    pass
+
+        producer = threading.Thread(target=produce, name="builder-batches", daemon=True)
+        self._batch_producer = producer
+        producer.start()
+        try:
+            while True:
+                item = await queue.get()
+                if item is _BATCH_STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise GenerationError(f"Failed to generate dataset: {item}") from item
+                yield item
+        finally:
+            stop.set()
+
+    def cleanup(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops a running batch stream and waits for its producer thread to finish.
+        Generation stops after the keyword being downloaded.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the producer; None waits until it ends.
+        """
+        self._batch_stop.set()
+        producer = self._batch_producer
+        if producer is not None and producer is not threading.current_thread():
+            producer.join(timeout)
+            if producer.is_alive():
+                logger.warning("Batch producer still running after cleanup timeout")
+                return
+        self._batch_producer = None
+
     def download(
         self,
         keyword: str,
@@ -220,9 +389,9 @@ class Builder:
                 try:
                     # Use DuckDuckGo downloader for now (can be extended for other engines)
                     if engine.lower() == 'duckduckgo':
-                        downloader = DDGSImageDownloader()
-                        success, downloaded = downloader.download(keyword, output_dir,
-                                                                  max_count)
+                        with DDGSImageDownloader() as downloader:
+                            success, downloaded = downloader.download(keyword, output_dir,
+                                                                      max_count)
                         if success:
                             total_downloaded += downloaded
                             logger.info(f"Downloaded {downloaded} images from {engine}")
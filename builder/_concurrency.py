@@ -0,0 +1,181 @@
+"""
+Concurrency primitives shared by the builder download paths.
+
+Classes:
+    DownloadQuota: Thread-safe counter that hands out a fixed number of download slots.
+    DownloadCounter: Thread-safe per-directory count of saved images, fed by save events.
+
+Features:
+    - Lets concurrent workers reserve a slot before writing an image, so a target
+      count is never overshot even when several fetches finish at once.
+    - Slots can be released again when a write fails after reservation.
+    - Writers report every image they save, so progress, stop conditions and retries
+      read a counter instead of rescanning the directories they just wrote to.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Union
+
+from ._constants import IMAGE_EXTENSIONS
+
+__all__ = [
+    'DownloadQuota',
+    'DownloadCounter'
+]
+
+
+class DownloadQuota:
+    """
+    Thread-safe counter that hands out at most `target` download slots.
+
+    Workers call `try_acquire` once an image has passed validation and only write
+    it to disk if a slot was granted.
+    """
+
+    def __init__(self, target: int):
+        """
+        Initializes the DownloadQuota.
+
+        Args:
+            target (int): The total number of slots available.
+        """
+        self.target = max(0, target)
+        self._acquired = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """
+        Reserves one slot if any are left.
+
+        Returns:
+            bool: True if a slot was reserved, False if the quota is exhausted.
+        """
+        with self._lock:
+            if self._acquired >= self.target:
+                return False
+            self._acquired += 1
+            return True
+
+    def release(self) -> None:
+        """
+        Returns a previously reserved slot, e.g. after a failed write.
+        """
+        with self._lock:
+            if self._acquired > 0:
+                self._acquired -= 1
+
+    @property
+    def count(self) -> int:
+        """
+        Returns the number of slots currently reserved.
+
+        Returns:
+            int: The reserved slot count.
+        """
+        with self._lock:
+            return self._acquired
+
+    @property
+    def remaining(self) -> int:
+        """
+        Returns the number of slots still available.
+
+        Returns:
+            int: The available slot count.
+        """
+        with self._lock:
+            return self.target - self._acquired
+
+    @property
+    def is_full(self) -> bool:
+        """
+        Checks whether every slot has been reserved.
+
+        Returns:
+            bool: True if no slots are left, False otherwise.
+        """
+        return self.remaining <= 0
+
+
+class DownloadCounter:
+    """
+    Thread-safe count of the images saved to each directory.
+
+    Writers call `record_saved` right after an image is in place; readers take the
+    difference of two `count` calls to learn how many images a step produced. A
+    directory's existing images are only counted by `seed`, once.
+    """
+
+    def __init__(self):
+        """
+        Initializes the DownloadCounter.
+        """
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(directory: Union[str, Path]) -> str:
+        """
+        Returns the counter key of a directory.
+
+        Args:
+            directory (Union[str, Path]): The directory.
+
+        Returns:
+            str: The absolute path of the directory.
+        """
+        return os.path.abspath(directory)
+
+    def seed(self, directory: Union[str, Path]) -> int:
+        """
+        Counts the images already in a directory the first time it is seen.
+
+        Args:
+            directory (Union[str, Path]): The directory.
+
+        Returns:
+            int: The current count of the directory.
+        """
+        key = self._key(directory)
+        with self._lock:
+            if key in self._counts:
+                return self._counts[key]
+        try:
+            existing = sum(1 for entry in os.scandir(key)
+                           if entry.is_file() and
+                           os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS)
+        except OSError:
+            existing = 0
+        with self._lock:
+            return self._counts.setdefault(key, existing)
+
+    def record_saved(self, directory: Union[str, Path], count: int = 1) -> int:
+        """
+        Records images saved to a directory.
+
+        Args:
+            directory (Union[str, Path]): The directory the images were saved to.
+            count (int): The number of images saved.
+
+        Returns:
+            int: The new count of the directory.
+        """
+        key = self._key(directory)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + count
+            return self._counts[key]
+
+    def count(self, directory: Union[str, Path]) -> int:
+        """
+        Returns the number of images recorded for a directory.
+
+        Args:
+            directory (Union[str, Path]): The directory.
+
+        Returns:
+            int: The seeded count plus the images saved since.
+        """
+        with self._lock:
+            return self._counts.get(self._key(directory), 0)
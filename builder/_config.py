@@ -15,7 +15,7 @@ Features:
     - Manages predefined search variations and engine configurations.
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -138,6 +138,9 @@ class DatasetGenerationConfig(BaseSettings):
         keyword_generation: Mode for keyword generation
         ai_model: AI model to use for keyword generation
         generate_labels: Whether to generate label files for images
+        label_manifest_format: Format of a consolidated label manifest (None for per-image labels only)
+        per_image_labels: Whether a label manifest build also writes a label file per image
+        dataset_manifest_format: Format of the columnar dataset manifest (None to skip it)
         dataset_name: Name of the dataset (loaded from config file)
         search_variations: List of search variation templates for image searches
     """
@@ -211,6 +214,24 @@ class DatasetGenerationConfig(BaseSettings):
         description="Whether to generate label files for images",
         examples=[True, False]
     )
+    label_manifest_format: Optional[Literal["jsonl", "parquet"]] = Field(
+        default=None,
+        description="Write labels as one consolidated manifest ('jsonl' or 'parquet') built "
+                    "in a single pass, instead of one label file per image",
+        examples=[None, "jsonl", "parquet"]
+    )
+    per_image_labels: bool = Field(
+        default=False,
+        description="With a label manifest, also write one label file per image; without "
+                    "a manifest, labels are always written per image",
+        examples=[False, True]
+    )
+    dataset_manifest_format: Optional[Literal["parquet", "arrow", "jsonl"]] = Field(
+        default="parquet",
+        description="Format of the dataset manifest written with every build; Parquet and "
+                    "Arrow need pyarrow and fall back to JSONL without it",
+        examples=["parquet", "arrow", "jsonl", None]
+    )
     dataset_name: str = Field(
         default="",
         max_length=100,
@@ -0,0 +1,341 @@
+"""
+Content digests recorded while images are written, for duplicate suppression at write time.
+
+Classes:
+    ContentDigestIndex: Per-directory set of content digests with a manifest kept next to the images.
+    DigestStorage: iCrawler file system storage that hashes and de-duplicates every write.
+
+Features:
+    - Download writers hash bytes while they are written, so an exact duplicate is discarded
+      before it ever reaches the dataset directory.
+    - Digests are appended to a JSON-lines manifest in the dataset directory. The validator
+      reads it instead of hashing every image a second time.
+    - The manifest follows renames, so digests stay attached to their files.
+    - Entries carry the size and modification time of their file; a digest is trusted only
+      while both still match.
+    - iCrawler writes are reported to the job's download counter as they happen.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union, Any
+
+from icrawler.storage import FileSystem
+
+from utility.content_digests import (CONTENT_DIGEST_MANIFEST, RecordedDigest, digest_entry,
+                                     load_content_digests, matches_file)
+from ._concurrency import DownloadCounter
+from ._constants import logger
+
+__all__ = [
+    'ContentDigestIndex',
+    'DigestStorage',
+    'CONTENT_DIGEST_MANIFEST',
+    'new_content_hash'
+]
+
+
+def new_content_hash() -> Any:
+    """
+    Creates the hash object used for content digests.
+
+    MD5 is used because the validator's exact-duplicate detection compares MD5 digests.
+
+    Returns:
+        Any: A hashlib hash object.
+    """
+    return hashlib.md5()
+
+
+class ContentDigestIndex:
+    """
+    Tracks the content digests of the images in one directory.
+
+    Writers `claim` a digest before moving a file into place and `record` it afterwards;
+    a failed claim means the bytes duplicate an image that is already kept.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Initializes the ContentDigestIndex and loads any existing manifest.
+
+        Args:
+            directory (Union[str, Path]): The dataset directory the digests belong to.
+        """
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / CONTENT_DIGEST_MANIFEST
+        self.duplicates_skipped = 0
+        self._by_file: Dict[str, RecordedDigest] = {}
+        self._claimed: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def for_directory(cls, directory: Union[str, Path],
+                      existing: Optional["ContentDigestIndex"] = None) -> "ContentDigestIndex":
+        """
+        Returns an index for a dataset directory, reusing `existing` if it covers that directory.
+
+        Args:
+            directory (Union[str, Path]): The dataset directory.
+            existing (Optional[ContentDigestIndex]): An index that may already cover it.
+
+        Returns:
+            ContentDigestIndex: The index.
+        """
+        if existing is not None and existing.directory == Path(directory):
+            return existing
+        return cls(directory)
+
+    def _load(self) -> None:
+        """
+        Loads the manifest, keeping the latest entry of every file that still exists.
+        """
+        self._by_file = load_content_digests(self.directory)
+        for file_name in list(self._by_file):
+            if not (self.directory / file_name).is_file():
+                del self._by_file[file_name]
+        for file_name, (digest, _, _) in self._by_file.items():
+            self._claimed.setdefault(digest, file_name)
+
+    def claim(self, digest: str) -> bool:
+        """
+        Reserves a digest for a file about to be kept.
+
+        Args:
+            digest (str): The hex content digest.
+
+        Returns:
+            bool: True if the digest is new, False if the content duplicates a kept image.
+        """
+        with self._lock:
+            if digest in self._claimed:
+                self.duplicates_skipped += 1
+                return False
+            self._claimed[digest] = None
+            return True
+
+    def release(self, digest: str) -> None:
+        """
+        Gives up a claimed digest whose file was not kept after all.
+
+        Args:
+            digest (str): The hex content digest.
+        """
+        with self._lock:
+            if self._claimed.get(digest, "") is None:
+                del self._claimed[digest]
+
+    def record(self, file_name: str, digest: str, size: int) -> None:
+        """
+        Records the digest of a file that has been moved into place.
+
+        Args:
+            file_name (str): The file path relative to the directory.
+            digest (str): The hex content digest.
+            size (int): The file size in bytes.
+        """
+        try:
+            mtime_ns: Optional[int] = os.stat(self.directory / file_name).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        with self._lock:
+            self._claimed[digest] = file_name
+            self._by_file[file_name] = (digest, size, mtime_ns)
+            self._append(digest_entry(file_name, self._by_file[file_name]))
+
+    def move(self, old_name: str, new_name: str) -> None:
+        """
+        Carries the digest of a file over to its new name.
+
+        Args:
+            old_name (str): The previous file path relative to the directory.
+            new_name (str): The new file path relative to the directory.
+        """
+        with self._lock:
+            entry = self._by_file.pop(old_name, None)
+            if entry is None:
+                return
+            self._by_file[new_name] = entry
+            self._claimed[entry[0]] = new_name
+            self._append(digest_entry(new_name, entry))
+
+    def digest_of(self, file_name: str) -> Optional[str]:
+        """
+        Looks up the recorded digest of a file.
+
+        Args:
+            file_name (str): The file path relative to the directory.
+
+        Returns:
+            Optional[str]: The digest, or None if the file has no entry.
+        """
+        with self._lock:
+            entry = self._by_file.get(file_name)
+        return entry[0] if entry else None
+
+    def current_digest(self, file_name: str) -> Optional[str]:
+        """
+        Looks up the recorded digest of a file if the file has not changed since.
+
+        Args:
+            file_name (str): The file path relative to the directory.
+
+        Returns:
+            Optional[str]: The digest, or None if the file has no entry or its size or
+                           modification time no longer match.
+        """
+        with self._lock:
+            entry = self._by_file.get(file_name)
+        return entry[0] if entry and matches_file(self.directory / file_name, entry) else None
+
+    def file_of(self, digest: str) -> Optional[str]:
+        """
+        Looks up the file currently holding a digest.
+
+        Args:
+            digest (str): The hex content digest.
+
+        Returns:
+            Optional[str]: The file path relative to the directory, or None if no kept file has it.
+        """
+        with self._lock:
+            return self._claimed.get(digest)
+
+    def rewrite(self, renames: Optional[Dict[str, str]] = None) -> None:
+        """
+        Rewrites the manifest compactly, applying renames and dropping missing files.
+
+        Args:
+            renames (Optional[Dict[str, str]]): Mapping of old to new file names.
+        """
+        renames = renames or {}
+        with self._lock:
+            entries = {renames.get(name, name): entry for name, entry in self._by_file.items()}
+            self._by_file = {name: entry for name, entry in entries.items()
+                             if (self.directory / name).is_file()}
+            self._claimed = {entry[0]: name for name, entry in self._by_file.items()}
+
+            if not self._by_file and not self.manifest_path.exists():
+                return
+            temp_path = self.manifest_path.with_suffix(".tmp")
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    for name, entry in sorted(self._by_file.items()):
+                        f.write(json.dumps(digest_entry(name, entry)) + "\n")
+                os.replace(temp_path, self.manifest_path)
+            except OSError as e:
+                logger.warning(f"Could not rewrite content digest manifest {self.manifest_path}: {e}")
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """
+        Appends one entry to the manifest. Must be called with the lock held.
+
+        Args:
+            entry (Dict[str, Any]): The manifest entry.
+        """
+        try:
+            with open(self.manifest_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not append to content digest manifest {self.manifest_path}: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_file)
+
+
+class DigestStorage(FileSystem):
+    """
+    iCrawler file system storage that hashes each image and drops exact duplicates.
+
+    Files are recorded in the index relative to the index directory, so storages rooted in
+    a staging sub-directory keep consistent names. Every file written is reported to the
+    download counter, if one is given.
+    """
+
+    def __init__(self, root_dir: str, digests: Optional[ContentDigestIndex] = None,
+                 counter: Optional[DownloadCounter] = None):
+        """
+        Initializes the DigestStorage.
+
+        Args:
+            root_dir (str): The directory images are written to.
+            digests (Optional[ContentDigestIndex]): The job's digest index; None disables hashing.
+            counter (Optional[DownloadCounter]): The job's download counter.
+        """
+        super().__init__(root_dir)
+        self.digests = digests
+        self.counter = counter
+
+    def _relative_name(self, id: str) -> str:
+        """
+        Returns the index-relative name of a file written by this storage.
+
+        Args:
+            id (str): The file name relative to the storage root.
+
+        Returns:
+            str: The file name relative to the index directory.
+        """
+        path = Path(self.root_dir) / id
+        try:
+            return path.relative_to(self.digests.directory).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def claim_content(self, data: Any) -> Optional[str]:
+        """
+        Hashes the data and claims its digest.
+
+        Args:
+            data (Any): The image content.
+
+        Returns:
+            Optional[str]: The digest if the content is new (or hashing is disabled, an empty
+                           string); None if it duplicates a kept image.
+        """
+        if self.digests is None:
+            return ""
+        content = data.encode("utf-8") if isinstance(data, str) else data
+        content_hash = new_content_hash()
+        content_hash.update(content)
+        digest = content_hash.hexdigest()
+        return digest if self.digests.claim(digest) else None
+
+    def write(self, id: str, data: Any) -> None:
+        """
+        Writes an image unless its content duplicates one already kept.
+
+        Args:
+            id (str): The file name relative to the storage root.
+            data (Any): The image content.
+        """
+        digest = self.claim_content(data)
+        if digest is None:
+            logger.debug(f"Skipping duplicate image content for {id}")
+            return
+        self._write_claimed(id, data, digest)
+
+    def _write_claimed(self, id: str, data: Any, digest: str) -> None:
+        """
+        Writes data whose digest has been claimed and records it.
+
+        Args:
+            id (str): The file name relative to the storage root.
+            data (Any): The image content.
+            digest (str): The claimed digest, or an empty string if hashing is disabled.
+        """
+        try:
+            super().write(id, data)
+        except Exception:
+            if digest:
+                self.digests.release(digest)
+            raise
+        if digest:
+            self.digests.record(self._relative_name(id), digest, len(data))
+        if self.counter is not None:
+            self.counter.record_saved(self.root_dir)
@@ -0,0 +1,186 @@
+"""
+Content-addressed blob store for builder output, shared across jobs and datasets.
+
+Classes:
+    ContentStore: Stores every distinct image once under a path derived from its content hash.
+
+Functions:
+    blob_key: Builds the store-relative key of a blob from its digest.
+
+Features:
+    - Blob paths are derived from the MD5 content digest, the digest the builder already
+      records while downloading and the validator compares for exact duplicates.
+    - Images are hard-linked into the store and back out into dataset views, so identical
+      images from overlapping crawls share one copy on disk.
+    - Writes go through a temporary name and an atomic link, so concurrent jobs can add the
+      same blob safely.
+"""
+
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple, Union, Final
+
+from ._constants import logger
+from ._content_digest import new_content_hash
+
+__all__ = [
+    'ContentStore',
+    'blob_key',
+    'CONTENT_STORE_DIRNAME'
+]
+
+# Default store directory, placed next to the crawl workspaces so hard links stay on one file system
+CONTENT_STORE_DIRNAME: Final[str] = "pixcrawler_content"
+
+HASH_CHUNK_SIZE: Final[int] = 1024 * 1024
+
+
+def blob_key(digest: str, suffix: str = '') -> str:
+    """
+    Builds the store-relative key of a blob.
+
+    Two levels of two hex digits keep every directory small. The same layout is used for
+    content-addressed keys in remote storage.
+
+    Args:
+        digest (str): Hex content digest of the blob.
+        suffix (str): File extension, including the dot.
+
+    Returns:
+        str: The key, e.g. ``ab/cd/abcd...ef.jpg``.
+    """
+    digest = digest.lower()
+    return f"{digest[:2]}/{digest[2:4]}/{digest}{suffix.lower()}"
+
+
+class ContentStore:
+    """
+    Content-addressed blob store on the local file system.
+
+    Every distinct image is stored once; datasets reference blobs by key or hard-link them
+    into their own directories.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initializes the ContentStore.
+
+        Args:
+            root (Union[str, Path]): Root directory of the store.
+        """
+        self.root = Path(root)
+        self.blobs_added = 0
+        self.blobs_reused = 0
+
+    @classmethod
+    def beside(cls, directory: Union[str, Path]) -> 'ContentStore':
+        """
+        Returns the shared store that sits next to a directory of jobs.
+
+        Args:
+            directory (Union[str, Path]): Directory holding crawl workspaces.
+
+        Returns:
+            ContentStore: The shared store.
+        """
+        return cls(Path(directory) / CONTENT_STORE_DIRNAME)
+
+    def path_of(self, key: str) -> Path:
+        """
+        Returns the file path of a blob.
+
+        Args:
+            key (str): Blob key as returned by `put`.
+
+        Returns:
+            Path: Path of the blob in the store.
+        """
+        return self.root / key
+
+    def put(self, file_path: Union[str, Path], digest: Optional[str] = None) -> Tuple[str, Path]:
+        """
+        Adds a file to the store, unless a blob with the same content is already there.
+
+        Args:
+            file_path (Union[str, Path]): The file to store.
+            digest (Optional[str]): Known MD5 digest of the file; computed if None.
+
+        Returns:
+            Tuple[str, Path]: The blob key and the blob path.
+        """
+        source = Path(file_path)
+        if digest is None:
+            digest = self.digest_file(source)
+        key = blob_key(digest, source.suffix)
+        blob = self.path_of(key)
+
+        if blob.exists():
+            self.blobs_reused += 1
+            return key, blob
+
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = blob.parent / f".{uuid.uuid4().hex}.tmp"
+        try:
+            try:
+                os.link(source, tmp_path)
+            except OSError:
+                shutil.copy2(source, tmp_path)
+            try:
+                # os.link fails if another job stored the blob first; both copies are identical
+                os.link(tmp_path, blob)
+                self.blobs_added += 1
+            except FileExistsError:
+                self.blobs_reused += 1
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+        logger.debug(f"Stored {source.name} as blob {key}")
+        return key, blob
+
+    def link(self, key: str, destination: Union[str, Path]) -> Path:
+        """
+        Places a blob at a path in a dataset view, replacing whatever was there.
+
+        Args:
+            key (str): Blob key.
+            destination (Union[str, Path]): Path in the dataset view.
+
+        Returns:
+            Path: The destination path.
+        """
+        blob = self.path_of(key)
+        destination = Path(destination)
+        if destination.exists():
+            if os.path.samefile(blob, destination):
+                return destination
+            destination.unlink()
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(blob, destination)
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copy2(blob, destination)
+        return destination
+
+    @staticmethod
+    def digest_file(file_path: Union[str, Path]) -> str:
+        """
+        Computes the content digest of a file.
+
+        Args:
+            file_path (Union[str, Path]): The file.
+
+        Returns:
+            str: Hex MD5 digest.
+        """
+        digest = new_content_hash()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
@@ -0,0 +1,301 @@
+"""
+Columnar dataset manifest: one Parquet or Arrow file describing every image of a dataset.
+
+The columns, formats and reader are shared through utility.dataset_manifest and
+re-exported here.
+
+Functions:
+    image_record: Builds the manifest record of one image.
+    iter_dataset_records: Yields the records of a category/keyword dataset directory.
+    write_manifest: Writes records of any schema to a Parquet, Arrow or JSONL file.
+    write_dataset_manifest: Writes records to a Parquet, Arrow or JSONL dataset manifest.
+    build_dataset_manifest: Walks a dataset directory and writes its manifest.
+
+Features:
+    - One row per image with path, category, keyword, width, height, format, size, content
+      hash, perceptual hash and validity; columns the writer cannot fill are null.
+    - Parquet for storage and transfer, Arrow IPC for memory-mapped zero-copy loading.
+    - Content hashes come from the digests recorded while downloading where available.
+    - pyarrow is optional; without it manifests are written as JSONL with the same columns.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, Final
+
+from PIL import Image
+
+from utility.content_digests import load_content_digests, matches_file
+from utility.dataset_manifest import (DATASET_MANIFEST_FIELDS, DATASET_MANIFEST_NAME,
+                                      MANIFEST_FORMATS, manifest_schema, read_dataset_manifest)
+from ._constants import logger, IMAGE_EXTENSIONS
+from ._content_store import ContentStore
+
+__all__ = [
+    'DATASET_MANIFEST_FIELDS',
+    'DATASET_MANIFEST_NAME',
+    'MANIFEST_FORMATS',
+    'manifest_schema',
+    'image_record',
+    'iter_dataset_records',
+    'write_manifest',
+    'write_dataset_manifest',
+    'read_dataset_manifest',
+    'build_dataset_manifest'
+]
+
+RECORD_BATCH_SIZE: Final[int] = 4096
+
+# Directories of a dataset that hold no images of a category
+SKIPPED_DIRS: Final[frozenset] = frozenset({"labels"})
+
+
+def _import_pyarrow() -> Optional[Any]:
+    """
+    Imports pyarrow if it is installed.
+
+    Returns:
+        Optional[Any]: The pyarrow module, or None if it is not available.
+    """
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def image_record(image_path: Union[str, Path], path: Optional[str] = None,
+                 category: Optional[str] = None, keyword: Optional[str] = None,
+                 content_hash: Optional[str] = None, perceptual_hash: Optional[str] = None,
+                 valid: Optional[bool] = None,
+                 image_info: Optional[Tuple[int, int, Optional[str]]] = None) -> Dict[str, Any]:
+    """
+    Builds the manifest record of one image. Dimensions and format are read from the
+    image header only, unless already known; the content hash is computed if not given.
+
+    Args:
+        image_path (Union[str, Path]): The image file.
+        path (Optional[str]): Path stored in the manifest; defaults to the file name.
+        category (Optional[str]): Category of the image.
+        keyword (Optional[str]): Keyword the image was found with.
+        content_hash (Optional[str]): Known MD5 digest of the file.
+        perceptual_hash (Optional[str]): Perceptual hash of the image.
+        valid (Optional[bool]): Validation verdict, if the image was validated.
+        image_info (Optional[Tuple[int, int, Optional[str]]]): Known (width, height, format)
+                                                              of the image, e.g. from the
+                                                              validator's analysis.
+
+    Returns:
+        Dict[str, Any]: The record, with every manifest field present.
+    """
+    image_path = Path(image_path)
+    record: Dict[str, Any] = dict.fromkeys(DATASET_MANIFEST_FIELDS)
+    record.update(path=path or image_path.name, category=category, keyword=keyword,
+                  perceptual_hash=perceptual_hash, valid=valid)
+    try:
+        record["size"] = image_path.stat().st_size
+        record["content_hash"] = content_hash or ContentStore.digest_file(image_path)
+    except OSError as e:
+        logger.warning(f"Could not read {image_path} for the dataset manifest: {e}")
+        return record
+    if image_info is not None:
+        record["width"], record["height"], record["format"] = image_info
+        return record
+    try:
+        with Image.open(image_path) as img:
+            record["width"], record["height"] = img.size
+            record["format"] = img.format
+    except Exception:
+        # Unreadable images keep null dimensions; validity is decided by the validator
+        pass
+    return record
+
+
+def iter_dataset_records(dataset_dir: Union[str, Path],
+                         perceptual_hash: Optional[Callable[[str], Optional[str]]] = None,
+                         validate: Optional[Callable[[str], bool]] = None
+                         ) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the manifest records of a ``<category>/<keyword>/<image>`` dataset directory,
+    in sorted order.
+
+    Args:
+        dataset_dir (Union[str, Path]): The dataset root.
+        perceptual_hash (Optional[Callable[[str], Optional[str]]]): Computes the perceptual
+            hash of an image path; the column stays null without it.
+        validate (Optional[Callable[[str], bool]]): Validates an image path; the column stays
+            null without it.
+
+    Yields:
+        Dict[str, Any]: One record per image.
+    """
+    root = Path(dataset_dir)
+
+    def subdirs(path: Path) -> List[Path]:
+        with os.scandir(path) as entries:
+            return sorted(Path(e.path) for e in entries
+                          if e.is_dir() and e.name not in SKIPPED_DIRS
+                          and not e.name.startswith("."))
+
+    for category_dir in subdirs(root):
+        for keyword_dir in subdirs(category_dir):
+            # Digests recorded while downloading spare hashing every image again
+            digests = load_content_digests(keyword_dir)
+            with os.scandir(keyword_dir) as entries:
+                names = sorted(e.name for e in entries
+                               if e.is_file() and Path(e.name).suffix.lower() in IMAGE_EXTENSIONS)
+            for name in names:
+                image_path = keyword_dir / name
+                recorded = digests.get(name)
+                yield image_record(
+                    image_path,
+                    path=image_path.relative_to(root).as_posix(),
+                    category=category_dir.name,
+                    keyword=keyword_dir.name,
+                    content_hash=(recorded[0] if recorded and matches_file(image_path, recorded)
+                                  else None),
+                    perceptual_hash=perceptual_hash(str(image_path)) if perceptual_hash else None,
+                    valid=validate(str(image_path)) if validate else None)
+
+
+def _batches(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Groups records into lists of at most `size`.
+
+    Args:
+        records (Iterable[Dict[str, Any]]): The records.
+        size (int): The batch size.
+
+    Yields:
+        List[Dict[str, Any]]: The next batch.
+    """
+    batch: List[Dict[str, Any]] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_manifest(records: Iterable[Dict[str, Any]], path: Union[str, Path],
+                   fields: Sequence[str], schema: Callable[[], Any],
+                   manifest_format: Optional[str] = None, description: str = "manifest") -> Path:
+    """
+    Writes records to a manifest file, replacing any existing file atomically.
+
+    Records are converted in batches, so the whole manifest is never held as Python objects.
+    If pyarrow is not installed, the manifest is written as JSONL next to the requested path.
+
+    Args:
+        records (Iterable[Dict[str, Any]]): Manifest records; missing fields are written as null.
+        path (Union[str, Path]): Destination file.
+        fields (Sequence[str]): The columns, in order.
+        schema (Callable[[], Any]): Returns the pyarrow.Schema of the columns; only called
+                                    for Parquet and Arrow.
+        manifest_format (Optional[str]): 'parquet', 'arrow' or 'jsonl'; inferred from the
+                                         suffix if None, defaulting to Parquet.
+        description (str): What the manifest is, for log messages.
+
+    Returns:
+        Path: Path of the written manifest.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    path = Path(path)
+    if manifest_format is None:
+        manifest_format = next((fmt for fmt, suffix in MANIFEST_FORMATS.items()
+                                if path.suffix == suffix), "parquet")
+    if manifest_format not in MANIFEST_FORMATS:
+        raise ValueError(f"Unsupported manifest format: {manifest_format}")
+
+    pa = _import_pyarrow() if manifest_format != "jsonl" else None
+    if manifest_format != "jsonl" and pa is None:
+        logger.warning(f"pyarrow not installed, writing the {description} as JSONL")
+        manifest_format = "jsonl"
+    path = path.with_suffix(MANIFEST_FORMATS[manifest_format])
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    rows = ({name: record.get(name) for name in fields} for record in records)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    count = 0
+    try:
+        if manifest_format == "jsonl":
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row) + "\n")
+                    count += 1
+        else:
+            os.close(fd)
+            arrow_schema = schema()
+            if manifest_format == "parquet":
+                import pyarrow.parquet as pq
+                writer = pq.ParquetWriter(tmp_path, arrow_schema)
+            else:
+                writer = pa.ipc.new_file(tmp_path, arrow_schema)
+            with writer:
+                for batch in _batches(rows, RECORD_BATCH_SIZE):
+                    writer.write_table(pa.Table.from_pylist(batch, schema=arrow_schema))
+                    count += len(batch)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    logger.info(f"{description.capitalize()} with {count} images written to {path}")
+    return path
+
+
+def write_dataset_manifest(records: Iterable[Dict[str, Any]], path: Union[str, Path],
+                           manifest_format: Optional[str] = None) -> Path:
+    """
+    Writes records to a dataset manifest, replacing any existing file atomically.
+
+    Args:
+        records (Iterable[Dict[str, Any]]): Manifest records with DATASET_MANIFEST_FIELDS keys;
+                                            missing fields are written as null.
+        path (Union[str, Path]): Destination file.
+        manifest_format (Optional[str]): 'parquet', 'arrow' or 'jsonl'; inferred from the
+                                         suffix if None, defaulting to Parquet.
+
+    Returns:
+        Path: Path of the written manifest.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    return write_manifest(records, path, DATASET_MANIFEST_FIELDS, manifest_schema,
+                          manifest_format, description="dataset manifest")
+
+
+def build_dataset_manifest(dataset_dir: Union[str, Path], manifest_format: str = "parquet",
+                           output_path: Optional[Union[str, Path]] = None,
+                           perceptual_hash: Optional[Callable[[str], Optional[str]]] = None,
+                           validate: Optional[Callable[[str], bool]] = None) -> Path:
+    """
+    Walks a dataset directory and writes its manifest.
+
+    Args:
+        dataset_dir (Union[str, Path]): The dataset root.
+        manifest_format (str): 'parquet', 'arrow' or 'jsonl'.
+        output_path (Optional[Union[str, Path]]): Destination; defaults to
+                                                  ``<dataset_dir>/dataset_manifest.<format>``.
+        perceptual_hash (Optional[Callable[[str], Optional[str]]]): Perceptual hash function.
+        validate (Optional[Callable[[str], bool]]): Validation function.
+
+    Returns:
+        Path: Path of the written manifest.
+    """
+    if manifest_format not in MANIFEST_FORMATS:
+        raise ValueError(f"Unsupported manifest format: {manifest_format}")
+    output_path = Path(output_path) if output_path is not None else (
+        Path(dataset_dir) / f"{DATASET_MANIFEST_NAME}{MANIFEST_FORMATS[manifest_format]}")
+    records = iter_dataset_records(dataset_dir, perceptual_hash, validate)
+    return write_dataset_manifest(records, output_path, manifest_format)
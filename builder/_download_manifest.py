@@ -0,0 +1,361 @@
+"""
+Per-keyword download manifest for image-granular resume of interrupted downloads.
+
+Classes:
+    DownloadManifest: Records the outcome of every image URL and search variation of one
+                      output directory, so a re-run continues where the last run stopped.
+
+Features:
+    - Append-only JSON-lines manifest next to the images, written as each URL finishes.
+    - Every URL is recorded as pending before it is fetched; URLs still pending when a
+      run dies are handed back to the URL index so the next run fetches them again.
+    - Failed requests (timeouts, HTTP errors) are retried by the next run as well.
+    - Saved images are counted through their content digests, so the count survives the
+      sequential renaming of the output directory.
+    - Completed search variations are recorded per engine and skipped on resume.
+    - Saved images carry the engine and template of the search that found them, so later
+      validation rejections can be charged to that search.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union, Final
+
+from ._constants import logger
+from ._content_digest import ContentDigestIndex
+
+__all__ = [
+    'DownloadManifest',
+    'DOWNLOAD_MANIFEST',
+    'STATUS_PENDING',
+    'STATUS_SAVED',
+    'STATUS_REJECTED',
+    'STATUS_FAILED'
+]
+
+DOWNLOAD_MANIFEST: Final[str] = ".download_manifest.jsonl"
+
+# URL is being fetched; still pending on load means the run was interrupted
+STATUS_PENDING: Final[str] = "pending"
+# Image was written to the output directory
+STATUS_SAVED: Final[str] = "saved"
+# Response was fetched but not kept (duplicate content, failed validation, full quota)
+STATUS_REJECTED: Final[str] = "rejected"
+# Request failed; retried by the next run, as the error may be transient
+STATUS_FAILED: Final[str] = "failed"
+
+
+class DownloadManifest:
+    """
+    Tracks the download state of one output directory, typically one keyword or chunk.
+
+    Writers call `start` before fetching a URL and `finish` with its outcome afterwards.
+    On the next run `resume` reports how many images are already in place and lets the
+    URLs that were in flight be fetched again.
+    """
+
+    def __init__(self, directory: Union[str, Path],
+                 digests: Optional[ContentDigestIndex] = None):
+        """
+        Initializes the DownloadManifest and loads any existing manifest.
+
+        Args:
+            directory (Union[str, Path]): The output directory the downloads go to.
+            digests (Optional[ContentDigestIndex]): Digest index of the directory, used to
+                                                    find saved images after renames. Loaded
+                                                    from the directory if not given.
+        """
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / DOWNLOAD_MANIFEST
+        self.digests = digests if digests is not None else ContentDigestIndex(self.directory)
+        self._urls: Dict[str, Dict[str, Any]] = {}
+        self._variations: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def for_directory(cls, directory: Union[str, Path],
+                      existing: Optional["DownloadManifest"] = None,
+                      digests: Optional[ContentDigestIndex] = None) -> "DownloadManifest":
+        """
+        Returns a manifest for an output directory, reusing `existing` if it covers that directory.
+
+        Args:
+            directory (Union[str, Path]): The output directory.
+            existing (Optional[DownloadManifest]): A manifest that may already cover it.
+            digests (Optional[ContentDigestIndex]): Digest index of the directory.
+
+        Returns:
+            DownloadManifest: The manifest.
+        """
+        if existing is not None and existing.directory == Path(directory):
+            if digests is not None:
+                existing.digests = digests
+            return existing
+        return cls(directory, digests)
+
+    def _load(self) -> None:
+        """
+        Loads the manifest, keeping the latest entry of every URL. Torn lines are skipped.
+        """
+        if not self.manifest_path.exists():
+            return
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        if "url" in entry:
+                            self._urls[entry["url"]] = entry
+                        elif "variation" in entry:
+                            self._variations.add((entry["engine"], entry["variation"]))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError as e:
+            logger.warning(f"Could not read download manifest {self.manifest_path}: {e}")
+
+    def status_of(self, url: str) -> Optional[str]:
+        """
+        Looks up the recorded status of a URL.
+
+        Args:
+            url (str): The image URL.
+
+        Returns:
+            Optional[str]: The status, or None if the URL was never attempted.
+        """
+        with self._lock:
+            entry = self._urls.get(url)
+        return entry["status"] if entry else None
+
+    def is_done(self, url: str) -> bool:
+        """
+        Reports whether a URL was fetched to completion, saved or rejected.
+
+        Args:
+            url (str): The image URL.
+
+        Returns:
+            bool: True if the URL has a final status and should not be fetched again.
+        """
+        status = self.status_of(url)
+        return status is not None and status not in (STATUS_PENDING, STATUS_FAILED)
+
+    def interrupted(self) -> List[str]:
+        """
+        Returns the URLs whose fetch was started but never finished.
+
+        Returns:
+            List[str]: The URLs still pending.
+        """
+        with self._lock:
+            return [url for url, entry in self._urls.items()
+                    if entry["status"] == STATUS_PENDING]
+
+    def retryable(self) -> List[str]:
+        """
+        Returns the URLs to fetch again: those interrupted and those whose request failed.
+
+        Returns:
+            List[str]: The pending and failed URLs.
+        """
+        with self._lock:
+            return [url for url, entry in self._urls.items()
+                    if entry["status"] in (STATUS_PENDING, STATUS_FAILED)]
+
+    def start(self, url: str) -> None:
+        """
+        Records that a URL is about to be fetched.
+
+        Args:
+            url (str): The image URL.
+        """
+        self._write({"url": url, "status": STATUS_PENDING})
+
+    def finish(self, url: str, status: str, file_path: Optional[Union[str, Path]] = None,
+               source: Optional[Tuple[str, str]] = None) -> None:
+        """
+        Records the outcome of a fetch.
+
+        Args:
+            url (str): The image URL.
+            status (str): One of the final statuses.
+            file_path (Optional[Union[str, Path]]): The saved file, for saved images.
+            source (Optional[Tuple[str, str]]): Engine and variation template of the search
+                                                that found the image.
+        """
+        entry: Dict[str, Any] = {"url": url, "status": status}
+        if source is not None:
+            entry["engine"], entry["template"] = source
+        if file_path is not None:
+            path = Path(file_path)
+            try:
+                name = path.relative_to(self.directory).as_posix()
+            except ValueError:
+                name = path.as_posix()
+            entry["file"] = name
+            entry["hash"] = self.digests.digest_of(name)
+        self._write(entry)
+
+    def sources_of(self, content_hashes: Iterable[str]) -> Dict[Tuple[str, str], int]:
+        """
+        Counts saved images by the engine and template that found them.
+
+        Args:
+            content_hashes (Iterable[str]): Content digests of the images, e.g. those the
+                                            validator rejected.
+
+        Returns:
+            Dict[Tuple[str, str], int]: Image counts keyed by (engine, template); images
+                                        without a recorded source are left out.
+        """
+        wanted = set(content_hashes)
+        counts: Dict[Tuple[str, str], int] = {}
+        with self._lock:
+            for entry in self._urls.values():
+                if (entry["status"] == STATUS_SAVED and entry.get("hash") in wanted
+                        and entry.get("engine") and entry.get("template")):
+                    source = (entry["engine"], entry["template"])
+                    counts[source] = counts.get(source, 0) + 1
+        return counts
+
+    def is_variation_done(self, engine: str, variation: str) -> bool:
+        """
+        Reports whether a search variation of an engine was crawled to the end.
+
+        Args:
+            engine (str): The engine name.
+            variation (str): The search query.
+
+        Returns:
+            bool: True if the variation was completed by an earlier run.
+        """
+        with self._lock:
+            return (engine, variation) in self._variations
+
+    def complete_variation(self, engine: str, variation: str) -> None:
+        """
+        Records that a search variation of an engine was crawled to the end.
+
+        Args:
+            engine (str): The engine name.
+            variation (str): The search query.
+        """
+        with self._lock:
+            self._variations.add((engine, variation))
+            self._append({"engine": engine, "variation": variation})
+
+    def saved_count(self) -> int:
+        """
+        Counts the saved images that are still in the output directory.
+
+        Images are found by content digest first, so renamed files are still counted.
+
+        Returns:
+            int: The number of distinct saved images present.
+        """
+        with self._lock:
+            saved = [entry for entry in self._urls.values() if entry["status"] == STATUS_SAVED]
+
+        present: Set[str] = set()
+        for entry in saved:
+            digest = entry.get("hash")
+            name = self.digests.file_of(digest) if digest else None
+            if name is None and entry.get("file") and (self.directory / entry["file"]).is_file():
+                name = entry["file"]
+            if name is not None:
+                present.add(name)
+        return len(present)
+
+    def resume(self, url_index: Optional[Any] = None) -> int:
+        """
+        Prepares a re-run: URLs that were in flight or failed may be fetched again.
+
+        Args:
+            url_index (Optional[Any]): The URL index that marked these URLs as seen.
+
+        Returns:
+            int: The number of images already saved by earlier runs.
+        """
+        retryable = self.retryable()
+        if url_index is not None:
+            for url in retryable:
+                url_index.readmit(url)
+        already = self.saved_count()
+        if already or retryable:
+            logger.info(f"Resuming downloads in {self.directory}: {already} images kept, "
+                        f"{len(retryable)} interrupted or failed fetches to retry")
+        return already
+
+    def attach(self, crawler: Any) -> None:
+        """
+        Makes an iCrawler crawler record every download in the manifest and skip URLs
+        finished by an earlier run.
+
+        Attach it before the URL index, so only URLs the index lets through are recorded.
+
+        Args:
+            crawler (Any): The iCrawler crawler instance.
+        """
+        downloader = getattr(crawler, "downloader", None)
+        if downloader is None or getattr(downloader, "_download_manifest", None) is self:
+            return
+
+        original_download = downloader.download
+
+        def download_recorded(task, *args, **kwargs):
+            url = task["file_url"]
+            if self.is_done(url):
+                task["success"] = False
+                task["filename"] = None
+                return
+            self.start(url)
+            try:
+                result = original_download(task, *args, **kwargs)
+            except Exception:
+                self.finish(url, STATUS_FAILED)
+                raise
+            filename = task.get("filename")
+            if task.get("success") and filename:
+                path = Path(downloader.storage.root_dir) / filename
+                if path.is_file():
+                    self.finish(url, STATUS_SAVED, path, getattr(downloader, "yield_source", None))
+                else:
+                    self.finish(url, STATUS_REJECTED)
+            elif not downloader.signal.get("reach_max_num"):
+                self.finish(url, STATUS_FAILED)
+            # URLs cut off by a reached target stay pending and are retried on resume
+            return result
+
+        downloader.download = download_recorded
+        downloader._download_manifest = self
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """
+        Records a URL entry in memory and in the manifest.
+
+        Args:
+            entry (Dict[str, Any]): The manifest entry.
+        """
+        with self._lock:
+            self._urls[entry["url"]] = entry
+            self._append(entry)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """
+        Appends one entry to the manifest. Must be called with the lock held.
+
+        Args:
+            entry (Dict[str, Any]): The manifest entry.
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.manifest_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not append to download manifest {self.manifest_path}: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._urls)
@@ -6,7 +6,8 @@ Classes:
     ABC: Abstract base class.
     SearchEngine: Base class for search engines.
     DuckDuckGo: A class to download images using DuckDuckGo search.
-    ImageDownloader: A class for downloading images using multiple image crawlers sequentially.
+    ImageDownloader: A class for downloading images using multiple image crawlers sequentially or in parallel.
+    AioHttpDownloader: An asyncio downloader that fetches image URLs over a shared connection pool.
 
 Functions:
     download_images_ddgs: Downloads images directly using the DuckDuckGo search engine.
@@ -15,21 +16,38 @@ Features:
     - DuckDuckGo image search integration.
     - Multi-threaded image downloading.
     - Support for various search engines.
-    - Sequential download processing for optimal performance.
+    - Sequential download processing, with an optional quota-coordinated parallel engine mode.
     - Fallback mechanisms for robust image retrieval.
+    - Concurrent asyncio fetching with pooled keep-alive connections.
+    - Download counts come from the save events of every writer, not directory scans.
+    - Interrupted downloads resume from the download manifest of their output directory.
 """
 
+import asyncio
+import itertools
 import logging
+import os
 import random
+import re
 import threading
+import uuid
 from abc import ABC
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Iterable, Iterator, List, Any
 
 from ._base import IDownloader
 from ._predefined_variations import get_search_variations
-from ._search_engines import download_images_ddgs
+from ._search_engines import download_images_ddgs, DDGSImageDownloader, USER_AGENT
 from ._constants import logger
+from ._exceptions import DownloadError, classify_http_error
+from ._streaming import StreamLimits, ImageStreamValidator, PARTIAL_SUFFIX
+from ._concurrency import DownloadCounter
+from ._url_index import URLIndex
+from ._scheduler import YieldStats
+from ._rate_control import AdaptiveRateController
+from ._search_cache import SearchResultCache
+from ._content_digest import ContentDigestIndex
+from ._download_manifest import DownloadManifest
 from ._engine import EngineProcessor
 from ._helpers import progress, rename_images_sequentially
 
@@ -45,11 +63,12 @@ __all__ = [
 
 class ImageDownloader(IDownloader):
     """
-    A class for downloading images using multiple image crawlers sequentially.
+    A class for downloading images using multiple image crawlers.
 
-    Uses sequential processing across search engines for optimal performance
-    and reliability. Parallel execution has been deprecated as it degraded
-    performance in production.
+    Uses sequential processing across search engines by default. The earlier
+    parallel mode degraded performance because engines raced on one directory
+    and one counter; the parallel mode enabled by `parallel_engines` instead
+    gives every engine its own staging directory and a shared atomic quota.
     """
 
     def __init__(self,
@@ -58,7 +77,15 @@ class ImageDownloader(IDownloader):
                  downloader_threads: int = 4,
                  min_image_size: Tuple[int, int] = (100, 100),
                  delay_between_searches: float = 0.5,
-                 log_level: int = logging.WARNING):
+                 log_level: int = logging.WARNING,
+                 parallel_engines: bool = False,
+                 url_index: Optional[URLIndex] = None,
+                 content_digests: Optional[ContentDigestIndex] = None,
+                 rate_controller: Optional[AdaptiveRateController] = None,
+                 search_cache: Optional[SearchResultCache] = None,
+                 yield_stats: Optional[YieldStats] = None,
+                 download_counter: Optional[DownloadCounter] = None,
+                 download_manifest: Optional[DownloadManifest] = None):
         """
         Initializes the ImageDownloader with configurable parameters.
 
@@ -67,8 +94,31 @@ class ImageDownloader(IDownloader):
             parser_threads (int): Number of parser threads for crawlers.
             downloader_threads (int): Number of downloader threads for crawlers.
             min_image_size (Tuple[int, int]): Minimum image size as (width, height) tuple.
-            delay_between_searches (float): Delay in seconds between different search terms.
+            delay_between_searches (float): Initial delay in seconds between searches on one engine;
+                                            each engine's rate then adapts to its responses.
             log_level (int): Logging level for crawlers (e.g., logging.INFO, logging.WARNING).
+            parallel_engines (bool): Whether to run all search engines at once instead of in sequence.
+            url_index (Optional[URLIndex]): Index of image URLs already fetched. Defaults to a new
+                                            in-memory index; pass a persistent one to share it
+                                            between tasks or jobs.
+            content_digests (Optional[ContentDigestIndex]): Digests of the images already kept in
+                                                            the output directory. Created for the
+                                                            output directory on download if not given.
+            rate_controller (Optional[AdaptiveRateController]): Per-engine rate controller. Defaults to
+                                                                one starting at `delay_between_searches`.
+            search_cache (Optional[SearchResultCache]): Cache of search result pages. Defaults to a new
+                                                        in-memory cache; pass a persistent one to reuse
+                                                        result pages across tasks or jobs.
+            yield_stats (Optional[YieldStats]): Yield history used to order engines and query
+                                                variations. Defaults to a new in-memory history;
+                                                pass a persistent one to learn across jobs.
+            download_counter (Optional[DownloadCounter]): Counter every saved image is reported to.
+                                                          Defaults to a new counter; pass a shared
+                                                          one to read progress from outside.
+            download_manifest (Optional[DownloadManifest]): Manifest of the output directory. Created
+                                                            for the output directory on download if
+                                                            not given; an interrupted download of the
+                                                            same directory resumes from it.
         """
         self.feeder_threads = feeder_threads
         self.parser_threads = parser_threads
@@ -76,6 +126,15 @@ class ImageDownloader(IDownloader):
         self.min_image_size = min_image_size
         self.delay_between_searches = delay_between_searches
         self.log_level = log_level
+        self.parallel_engines = parallel_engines
+        self.url_index = url_index if url_index is not None else URLIndex()
+        self.content_digests = content_digests
+        self.rate_controller = rate_controller or AdaptiveRateController.from_interval(
+            delay_between_searches)
+        self.search_cache = search_cache if search_cache is not None else SearchResultCache()
+        self.yield_stats = yield_stats if yield_stats is not None else YieldStats()
+        self.download_counter = download_counter or DownloadCounter()
+        self.download_manifest = download_manifest
 
         # Initialize engine manager
         self.engine_processor = EngineProcessor(self)
@@ -105,8 +164,10 @@ class ImageDownloader(IDownloader):
             chunk_id (Optional[str]): Optional chunk ID for structured logging.
 
         Returns:
-            Tuple[bool, int]: A tuple where the first element is True if any images were downloaded,
-                             and the second element is the total count of downloaded images.
+            Tuple[bool, int]: A tuple where the first element is True if the directory holds any
+                             downloaded images, and the second element is the number of images
+                             saved by this call. Images resumed from an earlier run count toward
+                             ``max_num`` but are not included in the returned count.
         """
         # Add structured logging context
         log_context = logger.bind(
@@ -120,13 +181,23 @@ class ImageDownloader(IDownloader):
         try:
             # Ensure output directory exists
             Path(out_dir).mkdir(parents=True, exist_ok=True)
+            self.content_digests = ContentDigestIndex.for_directory(out_dir, self.content_digests)
+            self.download_manifest = DownloadManifest.for_directory(out_dir,
+                                                                    self.download_manifest,
+                                                                    self.content_digests)
+            # Images kept by an interrupted run count toward the target
+            resumed = self.download_manifest.resume(self.url_index)
 
             # Reset counters and flags
             with self.lock:
-                self.total_downloaded = 0
+                self.total_downloaded = resumed
                 self.stop_workers = False
                 self.engine_processor.reset_stats()
 
+            if resumed >= max_num:
+                log_context.info("Download already complete", downloaded=resumed, target=max_num)
+                return True, 0
+
             # Update progress display
             progress.set_subtask_description(f"Starting download for: {keyword}")
             progress.set_subtask_postfix(target=max_num)
@@ -139,10 +210,17 @@ class ImageDownloader(IDownloader):
             # Shuffle variations to get more diverse results
             random.shuffle(variations)
 
-            # Use engines in sequence with fallbacks
-            progress.set_subtask_description(f"Downloading sequentially: {keyword}")
-            log_context.info("Starting sequential engine download", variations_count=len(variations))
-            self.engine_processor.download_with_sequential_engines(keyword,
+            if self.parallel_engines:
+                progress.set_subtask_description(f"Downloading in parallel: {keyword}")
+                log_context.info("Starting parallel engine download", variations_count=len(variations))
+                self.engine_processor.download_with_parallel_engines(keyword,
+                                                                     variations,
+                                                                     out_dir, max_num)
+            else:
+                # Use engines in sequence with fallbacks
+                progress.set_subtask_description(f"Downloading sequentially: {keyword}")
+                log_context.info("Starting sequential engine download", variations_count=len(variations))
+                self.engine_processor.download_with_sequential_engines(keyword,
                                                                        variations,
                                                                        out_dir, max_num)
 
@@ -155,19 +233,27 @@ class ImageDownloader(IDownloader):
                     downloaded_so_far=self.total_downloaded,
                     remaining=max_num - self.total_downloaded
                 )
-                self._try_duckduckgo_fallback(
+                ddgs_total = self._try_duckduckgo_fallback(
                     keyword=keyword,
                     out_dir=out_dir,
                     max_num=max_num,
                     total_downloaded=self.total_downloaded,
                     job_id=job_id,
-                    chunk_id=chunk_id
+                    chunk_id=chunk_id,
+                    url_index=self.url_index,
+                    content_digests=self.content_digests,
+                    rate_controller=self.rate_controller,
+                    search_cache=self.search_cache,
+                    download_counter=self.download_counter,
+                    download_manifest=self.download_manifest
                 )
+                with self.lock:
+                    self.total_downloaded = ddgs_total
 
             # Rename all files sequentially
             if self.total_downloaded > 0:
                 progress.set_subtask_description(f"Renaming images: {keyword}")
-                rename_images_sequentially(out_dir)
+                rename_images_sequentially(out_dir, incremental=True)
 
             # Log engine statistics
             self.engine_processor.log_engine_stats()
@@ -179,10 +265,14 @@ class ImageDownloader(IDownloader):
                 f"Image download completed",
                 downloaded=self.total_downloaded,
                 target=max_num,
-                success_rate=f"{(self.total_downloaded/max_num)*100:.1f}%"
+                success_rate=f"{(self.total_downloaded/max_num)*100:.1f}%",
+                duplicate_urls_skipped=self.url_index.skipped,
+                duplicate_contents_skipped=self.content_digests.duplicates_skipped,
+                engine_rates=self.rate_controller.rates(),
+                search_cache_hit_rate=f"{self.search_cache.hit_rate:.1%}"
             )
 
-            return self.total_downloaded > 0, self.total_downloaded
+            return self.total_downloaded > 0, self.total_downloaded - resumed
 
         except Exception as e:
             log_context.warning(
@@ -192,11 +282,20 @@ class ImageDownloader(IDownloader):
             )
             progress.set_subtask_description(
                 f"Error occurred, using final fallback: {keyword}")
-            return self._final_duckduckgo_fallback(keyword, out_dir, max_num, job_id, chunk_id)
+            return self._final_duckduckgo_fallback(keyword, out_dir, max_num, job_id, chunk_id,
+                                                   self.url_index, self.content_digests,
+                                                   self.rate_controller, self.search_cache,
+                                                   self.download_counter, self.download_manifest)
 
     @staticmethod
     def _try_duckduckgo_fallback(keyword: str, out_dir: str, max_num: int,
-                                 total_downloaded: int, job_id: Optional[str] = None, chunk_id: Optional[str] = None) -> int:
+                                 total_downloaded: int, job_id: Optional[str] = None, chunk_id: Optional[str] = None,
+                                 url_index: Optional[URLIndex] = None,
+                                 content_digests: Optional[ContentDigestIndex] = None,
+                                 rate_controller: Optional[AdaptiveRateController] = None,
+                                 search_cache: Optional[SearchResultCache] = None,
+                                 download_counter: Optional[DownloadCounter] = None,
+                                 download_manifest: Optional[DownloadManifest] = None) -> int:
         """
         Attempts to use DuckDuckGo as a fallback option if other engines haven't downloaded enough images.
 
@@ -207,6 +306,12 @@ class ImageDownloader(IDownloader):
             total_downloaded (int): The current count of downloaded images.
             job_id (Optional[str]): Optional job ID for structured logging.
             chunk_id (Optional[str]): Optional chunk ID for structured logging.
+            url_index (Optional[URLIndex]): Index of image URLs already fetched.
+            content_digests (Optional[ContentDigestIndex]): Digests of the images already kept.
+            rate_controller (Optional[AdaptiveRateController]): The job's engine rate controller.
+            search_cache (Optional[SearchResultCache]): Cache of search result pages.
+            download_counter (Optional[DownloadCounter]): The job's download counter.
+            download_manifest (Optional[DownloadManifest]): Manifest of the output directory.
 
         Returns:
             int: The updated total downloaded count after the fallback attempt.
@@ -229,7 +334,13 @@ class ImageDownloader(IDownloader):
         ddgs_success, ddgs_count = download_images_ddgs(
             keyword=keyword,
             out_dir=out_dir,
-            max_num=max_num - total_downloaded
+            max_num=max_num - total_downloaded,
+            url_index=url_index,
+            content_digests=content_digests,
+            rate_controller=rate_controller,
+            search_cache=search_cache,
+            download_counter=download_counter,
+            download_manifest=download_manifest
         )
         if ddgs_success:
             log_context.info("DuckDuckGo fallback successful", ddgs_count=ddgs_count)
@@ -238,7 +349,13 @@ class ImageDownloader(IDownloader):
         return total_downloaded
 
     @staticmethod
-    def _final_duckduckgo_fallback(keyword: str, out_dir: str, max_num: int, job_id: Optional[str] = None, chunk_id: Optional[str] = None) -> Tuple[
+    def _final_duckduckgo_fallback(keyword: str, out_dir: str, max_num: int, job_id: Optional[str] = None, chunk_id: Optional[str] = None,
+                                   url_index: Optional[URLIndex] = None,
+                                   content_digests: Optional[ContentDigestIndex] = None,
+                                   rate_controller: Optional[AdaptiveRateController] = None,
+                                   search_cache: Optional[SearchResultCache] = None,
+                                   download_counter: Optional[DownloadCounter] = None,
+                                   download_manifest: Optional[DownloadManifest] = None) -> Tuple[
         bool, int]:
         """
         Performs a final fallback to DuckDuckGo when all other download methods have failed.
@@ -249,6 +366,12 @@ class ImageDownloader(IDownloader):
             max_num (int): The maximum number of images to download.
             job_id (Optional[str]): Optional job ID for structured logging.
             chunk_id (Optional[str]): Optional chunk ID for structured logging.
+            url_index (Optional[URLIndex]): Index of image URLs already fetched.
+            content_digests (Optional[ContentDigestIndex]): Digests of the images already kept.
+            rate_controller (Optional[AdaptiveRateController]): The job's engine rate controller.
+            search_cache (Optional[SearchResultCache]): Cache of search result pages.
+            download_counter (Optional[DownloadCounter]): The job's download counter.
+            download_manifest (Optional[DownloadManifest]): Manifest of the output directory.
 
         Returns:
             Tuple[bool, int]: A tuple indicating success (True/False) and the number of images downloaded.
@@ -261,9 +384,11 @@ class ImageDownloader(IDownloader):
             chunk_id=chunk_id
         )
         log_context.info("Attempting final DuckDuckGo fallback")
-        success, count = download_images_ddgs(keyword, out_dir, max_num)
+        success, count = download_images_ddgs(keyword, out_dir, max_num, url_index,
+                                              content_digests, rate_controller, search_cache,
+                                              download_counter, download_manifest)
         if success and count > 0:
-            rename_images_sequentially(out_dir)
+            rename_images_sequentially(out_dir, incremental=True)
             log_context.info("Final fallback successful", count=count)
             return True, count
         else:
@@ -320,10 +445,288 @@ class APIDownloader(IDownloader):
 
 
 class AioHttpDownloader(IDownloader):
-    """Placeholder for async HTTP downloader. Disabled by default."""
+    """
+    Asynchronous image downloader built on a shared aiohttp connection pool.
 
-    def __init__(self, max_concurrent: int = 10, **kwargs):
-        raise NotImplementedError("AioHttpDownloader not implemented")
+    URLs produced by the search engines are fetched concurrently with bounded
+    global and per-host concurrency. Connections are kept alive and DNS lookups
+    cached, and image bodies are streamed to disk chunk by chunk off the event loop,
+    so a single worker process can keep hundreds of fetches in flight without holding
+    their bodies in memory.
+    """
+
+    def __init__(self,
+                 max_concurrent: int = 200,
+                 per_host_limit: int = 8,
+                 timeout: float = 20.0,
+                 min_file_size: int = 1000,
+                 dns_cache_ttl: int = 300,
+                 keepalive_timeout: float = 30.0,
+                 file_prefix: str = "aio",
+                 stream_limits: Optional[StreamLimits] = None,
+                 url_index: Optional[URLIndex] = None,
+                 content_digests: Optional[ContentDigestIndex] = None,
+                 download_counter: Optional[DownloadCounter] = None,
+                 **kwargs):
+        """
+        Initializes the AioHttpDownloader.
+
+        Args:
+            max_concurrent (int): Maximum number of in-flight requests across all hosts.
+            per_host_limit (int): Maximum number of concurrent connections to a single host.
+            timeout (float): Total timeout in seconds for a single image request.
+            min_file_size (int): Minimum accepted body size in bytes.
+            dns_cache_ttl (int): Seconds to cache resolved host addresses.
+            keepalive_timeout (float): Seconds to keep idle pooled connections open.
+            file_prefix (str): Prefix used for the names of downloaded files.
+            stream_limits (Optional[StreamLimits]): Size and dimension limits checked while
+                                                    bodies are received.
+            url_index (Optional[URLIndex]): Index of URLs already fetched; repeats are skipped.
+            content_digests (Optional[ContentDigestIndex]): Digests of the images already kept;
+                                                            created for the output directory if
+                                                            not given.
+            download_counter (Optional[DownloadCounter]): Counter every saved image is reported to.
+        """
+        if max_concurrent <= 0 or per_host_limit <= 0:
+            raise ValueError("max_concurrent and per_host_limit must be greater than 0")
+
+        self.max_concurrent = max_concurrent
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.min_file_size = min_file_size
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.file_prefix = file_prefix
+        self.stream_limits = stream_limits or StreamLimits(min_bytes=min_file_size)
+        self.url_index = url_index
+        self.content_digests = content_digests
+        self.download_counter = download_counter or DownloadCounter()
+        self.user_agent = kwargs.get('user_agent', USER_AGENT)
+
+    @staticmethod
+    def _import_aiohttp() -> Any:
+        """
+        Imports aiohttp lazily so the rest of the builder works without it.
+
+        Returns:
+            Any: The aiohttp module.
+
+        Raises:
+            DownloadError: If aiohttp is not installed.
+        """
+        try:
+            import aiohttp
+            return aiohttp
+        except ImportError as e:
+            raise DownloadError("aiohttp is required for AioHttpDownloader") from e
 
     def download(self, keyword: str, out_dir: str, max_num: int) -> Tuple[bool, int]:
-        raise NotImplementedError("AioHttpDownloader not implemented")
+        """
+        Searches DuckDuckGo for the keyword and fetches the resulting image URLs concurrently.
+
+        Args:
+            keyword (str): The search term for images.
+            out_dir (str): The output directory path where images will be saved.
+            max_num (int): The maximum number of images to download.
+
+        Returns:
+            Tuple[bool, int]: (success, downloaded_count)
+
+        Raises:
+            DownloadError: If the search or the download session fails unexpectedly.
+        """
+        try:
+            results = DDGSImageDownloader._fetch_search_results(keyword, max_num)
+        except Exception as e:
+            raise DownloadError(f"Search failed for '{keyword}': {e}") from e
+
+        urls = [result.get("image") for result in results if result.get("image")]
+        downloaded = self.download_urls(urls, out_dir, max_num)
+        return downloaded > 0, downloaded
+
+    def download_urls(self, urls: Iterable[str], out_dir: str, max_num: int) -> int:
+        """
+        Synchronous entry point that fetches a list of image URLs on a private event loop.
+
+        Callers already running inside an event loop should await `fetch_urls` instead.
+
+        Args:
+            urls (Iterable[str]): Candidate image URLs, in order of preference.
+            out_dir (str): The output directory path where images will be saved.
+            max_num (int): The maximum number of images to keep.
+
+        Returns:
+            int: The number of images saved.
+        """
+        return asyncio.run(self.fetch_urls(urls, out_dir, max_num))
+
+    async def fetch_urls(self, urls: Iterable[str], out_dir: str, max_num: int) -> int:
+        """
+        Fetches image URLs concurrently over a shared connection pool.
+
+        Remaining in-flight requests are cancelled as soon as `max_num` images are saved.
+
+        Args:
+            urls (Iterable[str]): Candidate image URLs, in order of preference.
+            out_dir (str): The output directory path where images will be saved.
+            max_num (int): The maximum number of images to keep.
+
+        Returns:
+            int: The number of images saved.
+        """
+        aiohttp = self._import_aiohttp()
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+        self.content_digests = ContentDigestIndex.for_directory(out_dir, self.content_digests)
+
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if max_num <= 0 or not unique_urls:
+            return 0
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrent,
+            limit_per_host=self.per_host_limit,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        file_index = itertools.count(self._next_file_index(out_dir))
+        saved: List[str] = []
+        written: List[str] = []
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={'User-Agent': self.user_agent}) as session:
+            tasks = [
+                asyncio.create_task(
+                    self._fetch_one(session, semaphore, url, out_dir, max_num,
+                                    file_index, saved, written))
+                for url in unique_urls
+            ]
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    await finished
+                    # Stop on written files, not reserved names, so a write that filled the
+                    # last slot is never cancelled
+                    if len(written) >= max_num:
+                        break
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        logger.info(f"AioHttpDownloader saved {len(saved)}/{max_num} images to {out_dir}")
+        return len(saved)
+
+    async def _fetch_one(self, session: Any, semaphore: asyncio.Semaphore, url: str,
+                         out_dir: str, max_num: int, file_index: Iterator[int],
+                         saved: List[str], written: List[str]) -> bool:
+        """
+        Fetches a single image URL and writes it to disk if it passes validation.
+
+        Args:
+            session (Any): The shared aiohttp client session.
+            semaphore (asyncio.Semaphore): Global in-flight request limiter.
+            url (str): The image URL.
+            out_dir (str): The output directory.
+            max_num (int): The maximum number of images to keep.
+            file_index (Iterator[int]): Shared counter used to name saved files.
+            saved (List[str]): Shared list of file paths reserved for accepted images.
+            written (List[str]): Shared list of file paths written to disk.
+
+        Returns:
+            bool: True if the image was saved, False otherwise.
+        """
+        if len(saved) >= max_num:
+            return False
+
+        claimed = False
+        # Bodies stream to a partial file under a temporary name until they are accepted
+        partial_path = os.path.join(out_dir, f".{self.file_prefix}_{uuid.uuid4().hex}"
+                                             f"{PARTIAL_SUFFIX}")
+        try:
+            async with semaphore:
+                # Checked once a slot is free, so cancelled fetches are not recorded as seen
+                if self.url_index is not None:
+                    if not self.url_index.check_and_add(url):
+                        return False
+                    claimed = True
+                async with session.get(url) as response:
+                    if response.status >= 400:
+                        error_class = classify_http_error(response.status)
+                        raise error_class(f"HTTP {response.status}: {url}")
+
+                    # Reject from headers and the first chunks before reading the rest
+                    validator = ImageStreamValidator(self.stream_limits)
+                    validator.check_headers(response.headers.get('Content-Type'),
+                                            response.headers.get('Content-Length'))
+                    partial = await asyncio.to_thread(open, partial_path, "wb")
+                    try:
+                        async for chunk in response.content.iter_chunked(
+                                self.stream_limits.chunk_size):
+                            validator.feed(chunk)
+                            await asyncio.to_thread(partial.write, chunk)
+                    finally:
+                        await asyncio.to_thread(partial.close)
+                    validator.finish()
+
+            # Reserve a name only once the body is accepted and the target is not met
+            if len(saved) >= max_num:
+                return False
+            digests = self.content_digests
+            digest = validator.content_hash
+            if digests is not None and not digests.claim(digest):
+                raise DownloadError("Skipping duplicate image content")
+            extension = validator.extension
+            file_name = f"{self.file_prefix}_{next(file_index):04d}{extension}"
+            file_path = os.path.join(out_dir, file_name)
+            saved.append(file_path)
+
+            try:
+                await asyncio.to_thread(os.replace, partial_path, file_path)
+            except BaseException:
+                saved.remove(file_path)
+                if digests is not None:
+                    digests.release(digest)
+                raise
+            if digests is not None:
+                await asyncio.to_thread(digests.record, file_name, digest, validator.size)
+            written.append(file_path)
+            self.download_counter.record_saved(out_dir)
+            claimed = False
+            return True
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"AioHttpDownloader skipped {url}: {e}")
+            return False
+        finally:
+            # Failed, rejected or cancelled fetches may be retried
+            if claimed:
+                self.url_index.forget(url)
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+
+    def _next_file_index(self, out_dir: str) -> int:
+        """
+        Returns the first file number after those already used in the output directory,
+        so a retry or a later batch into the same directory never overwrites earlier images.
+
+        Args:
+            out_dir (str): The output directory.
+
+        Returns:
+            int: The next free file number.
+        """
+        pattern = re.compile(rf"{re.escape(self.file_prefix)}_(\d+)\.\w+$")
+        highest = 0
+        for entry in os.scandir(out_dir):
+            match = pattern.match(entry.name)
+            if match:
+                highest = max(highest, int(match.group(1)))
+        return highest + 1
+
@@ -1,12 +1,13 @@
-"""This module provides the core logic for processing search engines and downloading images. It includes classes for managing engine configurations, tracking statistics, and orchestrating sequential image downloads.
+"""This module provides the core logic for processing search engines and downloading images. It includes classes for managing engine configurations, tracking statistics, and orchestrating sequential or parallel image downloads.
 
 Classes:
     EngineConfig: Configuration for a search engine, including offset range and variation step.
     VariationResult: Represents the outcome of processing a single search variation.
     EngineResult: Represents the aggregated result of processing a single search engine.
     EngineStats: Tracks performance statistics for individual search engines.
-    EngineProcessor: Manages and orchestrates image downloads across multiple search engines in sequential mode.
+    EngineProcessor: Manages and orchestrates image downloads across multiple search engines in sequential or parallel mode.
     SingleEngineProcessor: Handles the detailed processing of a single search engine, including its variations.
+    QuotaStorage: iCrawler file storage that drops duplicates and reserves a slot from a shared quota before every write.
 
 Functions:
     load_engine_configs: Loads and converts raw engine configurations into EngineConfig objects.
@@ -16,21 +17,35 @@ Features:
     - Centralized management of search engine configurations.
     - Detailed tracking and logging of engine performance and download statistics.
     - Sequential image downloading across various search engines.
-    - Intelligent selection and processing of search variations to optimize image retrieval.
+    - Parallel engine fan-out where each engine writes into its own staging directory and
+      reserves quota from a shared atomic target, so engines never race on one directory.
+    - Intelligent selection and processing of search variations to optimize image retrieval:
+      engines and variations are ordered by the yield they had in earlier searches.
+    - Searches are paced per engine by an adaptive rate controller fed with the engines'
+      result pages instead of fixed sleeps.
+    - Per-variation counts come from the storages' save events, not directory rescans.
     - Robust error handling and monitoring during the download process.
     - Note: Distributed processing is handled via Celery tasks.
 """
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import List, Dict, Any, Union, Type
+from typing import List, Dict, Any, Union, Type, Callable, Optional
 
 from icrawler.builtin import GoogleImageCrawler, BingImageCrawler, BaiduImageCrawler
 
+from ._concurrency import DownloadQuota, DownloadCounter
+from ._content_digest import ContentDigestIndex, DigestStorage
+from ._rate_control import AdaptiveRateController, parse_retry_after
+from ._scheduler import YieldScheduler, template_of, track_download_attempts, \
+    download_attempts_of, set_yield_source
 from ._search_engines import SearchEngineConfig, VariationResult, EngineResult, \
     download_google_images, download_bing_images, download_baidu_images
 from builder._config import get_engines
 from builder._constants import logger
 from builder._exceptions import CrawlerInitializationError, CrawlerExecutionError
 import random
+import shutil
+import threading
 import time
 import os
 
@@ -39,9 +54,12 @@ import os
 __all__ = [
     'EngineStats',
     'EngineProcessor',
-    'SingleEngineProcessor'
+    'SingleEngineProcessor',
+    'QuotaStorage'
 ]
 
+STAGING_DIR_PREFIX = ".staging_"
+
 
 def load_engine_configs() -> List["SearchEngineConfig"]:
     """
@@ -61,7 +79,9 @@ def load_engine_configs() -> List["SearchEngineConfig"]:
     ]
 
 
-def select_variations(variations: List[str], max_num: int) -> List[str]:
+def select_variations(variations: List[str], max_num: int,
+                      scheduler: Optional[YieldScheduler] = None,
+                      keyword: str = "") -> List[str]:
     """
     Selects an optimal number of variations based on the target maximum number of images.
     Prioritizes using more variations for higher targets, up to a certain limit.
@@ -69,12 +89,17 @@ def select_variations(variations: List[str], max_num: int) -> List[str]:
     Args:
         variations (List[str]): A list of available search variations.
         max_num (int): The maximum number of images to download.
+        scheduler (Optional[YieldScheduler]): If given, the variations with the highest
+                                              expected yield are selected, best first.
+        keyword (str): The keyword the variations were built for, used by the scheduler.
 
     Returns:
-        List[str]: A shuffled list of selected variations.
+        List[str]: The selected variations, by expected yield or shuffled.
     """
     # Use more variations for higher targets
     max_variations = min(len(variations), max(3, max_num // 5))
+    if scheduler is not None:
+        return scheduler.order_variations(variations, keyword)[:max_variations]
     selected = variations[:max_variations]
     random.shuffle(selected)
     return selected
@@ -109,10 +134,67 @@ class EngineStats:
             self.success_count / total_attempts * 100) if total_attempts > 0 else 0.0
 
 
+class QuotaStorage(DigestStorage):
+    """
+    iCrawler file system storage that reserves a slot from a shared quota before each write.
+
+    Exact duplicates of images already kept are dropped without using a slot. When the
+    quota is exhausted the image is dropped and `on_exhausted` is called, which lets the
+    engine processor stop every crawler sharing the same target.
+    """
+
+    def __init__(self, root_dir: str, quota: DownloadQuota,
+                 on_exhausted: Optional[Callable[[], None]] = None,
+                 digests: Optional[ContentDigestIndex] = None):
+        """
+        Initializes the QuotaStorage.
+
+        Args:
+            root_dir (str): The staging directory images are written to.
+            quota (DownloadQuota): The quota shared by all engines.
+            on_exhausted (Optional[Callable[[], None]]): Called when a write is refused.
+            digests (Optional[ContentDigestIndex]): The job's content digest index.
+        """
+        super().__init__(root_dir, digests)
+        self.quota = quota
+        self.on_exhausted = on_exhausted
+        self.written = 0
+        self._lock = threading.Lock()
+
+    def write(self, id: str, data: Any) -> None:
+        """
+        Writes an image if it is not a duplicate and a quota slot can be reserved.
+
+        Args:
+            id (str): The file name relative to the staging directory.
+            data (Any): The image content.
+        """
+        digest = self.claim_content(data)
+        if digest is None:
+            return
+
+        if not self.quota.try_acquire():
+            if digest:
+                self.digests.release(digest)
+            if self.on_exhausted is not None:
+                self.on_exhausted()
+            return
+
+        try:
+            self._write_claimed(id, data, digest)
+        except Exception:
+            self.quota.release()
+            raise
+
+        with self._lock:
+            self.written += 1
+
+
 class EngineProcessor:
     """
     Enhanced engine processor for managing search engines and image downloading.
-    Provides sequential processing with improved error handling and reliability.
+    Provides sequential processing with improved error handling and reliability, and a
+    parallel mode that runs every engine at once against a shared download quota.
     """
 
     def __init__(self, image_downloader: Any):
@@ -125,6 +207,16 @@ class EngineProcessor:
         self.image_downloader = image_downloader
         self.engine_configs = load_engine_configs()
         self.engine_stats: Dict[str, EngineStats] = {}
+        self._active_crawlers: List[Any] = []
+        self._crawlers_lock = threading.Lock()
+        self.scheduler = YieldScheduler(getattr(image_downloader, "yield_stats", None))
+        self.current_keyword = ""
+        self.rate_controller: AdaptiveRateController = (
+            getattr(image_downloader, "rate_controller", None)
+            or AdaptiveRateController.from_interval(
+                getattr(image_downloader, "delay_between_searches", 0.5)))
+        self.download_counter: DownloadCounter = (
+            getattr(image_downloader, "download_counter", None) or DownloadCounter())
 
     def reset_stats(self) -> None:
         """
@@ -163,6 +255,20 @@ class EngineProcessor:
         else:
             stats.failure_count += 1
 
+    def record_yield(self, engine_name: str, variation: str, images: int,
+                     attempts: int = 0) -> None:
+        """
+        Records the yield of one search in the scheduler's statistics.
+
+        Args:
+            engine_name (str): The engine that ran the search.
+            variation (str): The search string of the current keyword.
+            images (int): New images the search produced.
+            attempts (int): Image downloads attempted for the search.
+        """
+        self.scheduler.stats.record(engine_name, template_of(variation, self.current_keyword),
+                                    images, attempts)
+
     def log_engine_stats(self) -> None:
         """
         Logs comprehensive statistics about image downloads from each engine.
@@ -177,6 +283,7 @@ class EngineProcessor:
         logger.info("=" * 60)
 
         total_downloaded = self.image_downloader.total_downloaded
+        yields = self.scheduler.summary(list(self.engine_stats))
 
         for engine_name, stats in self.engine_stats.items():
             percentage = (
@@ -191,8 +298,27 @@ class EngineProcessor:
             logger.info(f"  Success Rate: {stats.success_rate:.1f}%")
             logger.info(f"  Avg Processing Time: {avg_time:.2f}s")
             logger.info(f"  Total Processing Time: {stats.total_processing_time:.2f}s")
+            engine_yield = yields[engine_name]
+            logger.info(f"  Images per Search (all runs): {engine_yield['images_per_search']:.2f} "
+                        f"over {engine_yield['searches']} searches")
+            if engine_yield['pass_rate'] is not None:
+                logger.info(f"  Pass Rate after Validation (all runs): {engine_yield['pass_rate']:.1%}")
             logger.info("-" * 40)
 
+        url_index = getattr(self.image_downloader, "url_index", None)
+        if url_index is not None:
+            logger.info(f"Duplicate URL fetches skipped: {url_index.skipped}")
+
+        search_cache = getattr(self.image_downloader, "search_cache", None)
+        if search_cache is not None:
+            logger.info(f"Search result cache: {search_cache.hits} hits, "
+                        f"{search_cache.misses} misses ({search_cache.hit_rate:.0%} hit rate)")
+
+        for engine_name, state in self.rate_controller.snapshot().items():
+            logger.info(
+                f"Rate {engine_name}: {state['rate']:.2f} req/s, waited {state['waited']:.1f}s, "
+                f"throttled {state['throttles']}x, empty pages {state['empties']}")
+
 
     def download_with_sequential_engines(self, keyword: str, variations: List[str],
                                          out_dir: str, max_num: int) -> List[
@@ -213,8 +339,10 @@ class EngineProcessor:
             f"Starting sequential engine processing for '{keyword}' (target: {max_num} images)")
 
         results = []
+        self.current_keyword = keyword
 
-        for config in self.engine_configs:
+        # Engines and variations that yielded most in earlier searches go first
+        for config in self.scheduler.order_engines(self.engine_configs):
             if self._should_stop_processing(max_num):
                 break
 
@@ -225,6 +353,7 @@ class EngineProcessor:
             logger.info(
                 f"Processing engine: {config.name} (remaining target: {remaining_target})")
 
+            variations = self.scheduler.order_variations(variations, keyword)
             if config.name == "google":
                 result = download_google_images(keyword, variations, out_dir,
                                                 remaining_target, config,
@@ -254,6 +383,252 @@ class EngineProcessor:
         return results
 
 
+    def download_with_parallel_engines(self, keyword: str, variations: List[str],
+                                       out_dir: str, max_num: int) -> List[EngineResult]:
+        """
+        Downloads images using all configured search engines at the same time.
+
+        Each engine crawls into its own staging directory under `out_dir` and reserves a
+        slot from a shared quota before every write. Once the global target is reached,
+        every running crawler is signalled to stop. Staged images are then promoted
+        into `out_dir` with engine-prefixed names.
+
+        Args:
+            keyword (str): The main search keyword.
+            variations (List[str]): A list of search variations for the keyword.
+            out_dir (str): The output directory for downloaded images.
+            max_num (int): The maximum number of images to download in total.
+
+        Returns:
+            List[EngineResult]: A list of results from each processed engine.
+        """
+        remaining_target = max_num - self.image_downloader.total_downloaded
+        if self._should_stop_processing(max_num) or remaining_target <= 0:
+            return []
+
+        self.current_keyword = keyword
+        configs = [config for config in self.engine_configs
+                   if self.get_crawler_class(config.name)]
+        if not configs:
+            return []
+
+        logger.info(
+            f"Starting parallel engine processing for '{keyword}' "
+            f"(engines: {len(configs)}, target: {remaining_target} images)")
+
+        quota = DownloadQuota(remaining_target)
+        stop_event = threading.Event()
+        results = []
+
+        def on_exhausted() -> None:
+            stop_event.set()
+            self._cancel_active_crawlers()
+
+        with ThreadPoolExecutor(max_workers=len(configs),
+                                thread_name_prefix="engine") as executor:
+            futures = {
+                executor.submit(self._run_engine_staged, config, variations, out_dir,
+                                remaining_target, quota, stop_event, on_exhausted): config
+                for config in configs
+            }
+            for future in as_completed(futures):
+                config = futures[future]
+                result = future.result()
+                results.append(result)
+
+                for variation_result in result.variations:
+                    self.update_stats(config.name, variation_result)
+
+                logger.info(
+                    f"Engine {config.name} completed: {result.total_downloaded}/{remaining_target} images")
+
+                if quota.is_full:
+                    on_exhausted()
+
+        return results
+
+    def _run_engine_staged(self, config: SearchEngineConfig, variations: List[str],
+                           out_dir: str, target: int, quota: DownloadQuota,
+                           stop_event: threading.Event,
+                           on_exhausted: Callable[[], None]) -> EngineResult:
+        """
+        Runs one engine in parallel mode, crawling into a private staging directory.
+
+        Args:
+            config (SearchEngineConfig): The configuration for the engine.
+            variations (List[str]): A list of search variations for the keyword.
+            out_dir (str): The output directory images are promoted into.
+            target (int): The number of images all engines are trying to reach together.
+            quota (DownloadQuota): The quota shared by all engines.
+            stop_event (threading.Event): Set once the shared target has been reached.
+            on_exhausted (Callable[[], None]): Called by the storage when the quota is full.
+
+        Returns:
+            EngineResult: The result of processing the engine.
+        """
+        start_time = time.time()
+        staging_dir = os.path.join(out_dir, f"{STAGING_DIR_PREFIX}{config.name}")
+        os.makedirs(staging_dir, exist_ok=True)
+        digests = getattr(self.image_downloader, "content_digests", None)
+        storage = QuotaStorage(staging_dir, quota, on_exhausted, digests)
+        variation_results = []
+        crawler = None
+
+        try:
+            # The storage must be passed at construction; the crawler hands it to its
+            # downloader there and set_storage() afterwards would not reach it
+            crawler = self.create_crawler(self.get_crawler_class(config.name), staging_dir,
+                                          storage, config.name)
+            SingleEngineProcessor._apply_safe_parser_wrapper(crawler, config.name,
+                                                             self.rate_controller)
+            self._register_crawler(crawler)
+
+            selected = select_variations(variations, target, self.scheduler,
+                                         self.current_keyword)
+            per_variation = max(1, target // len(selected)) if selected else 0
+
+            for i, variation in enumerate(selected):
+                if stop_event.is_set() or self.image_downloader.stop_workers:
+                    break
+
+                # Interruptible wait so a reached target is not held up by the engine's pacing
+                self.rate_controller.acquire(config.name, stop_event)
+                if stop_event.is_set():
+                    break
+
+                variation_start = time.time()
+                limit = min(per_variation, quota.remaining)
+                if limit <= 0:
+                    break
+
+                written_before = storage.written
+                attempts_before = download_attempts_of(crawler)
+                set_yield_source(crawler, config.name,
+                                 template_of(variation, self.current_keyword))
+                try:
+                    crawler.crawl(
+                        keyword=variation,
+                        max_num=limit,
+                        min_size=self.image_downloader.min_image_size,
+                        offset=config.random_offset + (i * config.variation_step),
+                        file_idx_offset=written_before
+                    )
+                    success, error = True, None
+                except Exception as crawl_error:
+                    logger.warning(f"{config.name}: Crawl error for '{variation}': {crawl_error}")
+                    success, error = False, str(crawl_error)
+
+                promoted = self._promote_staged_images(staging_dir, out_dir, config.name,
+                                                       digests)
+                self.record_yield(config.name, variation, promoted,
+                                  download_attempts_of(crawler) - attempts_before)
+                with self.image_downloader.lock:
+                    self.image_downloader.total_downloaded += promoted
+                self.download_counter.record_saved(out_dir, promoted)
+
+                variation_results.append(VariationResult(
+                    variation=variation,
+                    downloaded_count=promoted,
+                    success=success,
+                    error=error,
+                    processing_time=time.time() - variation_start
+                ))
+
+        except (CrawlerInitializationError, CrawlerExecutionError) as ce:
+            logger.error(f"Engine {config.name} failed with crawler error: {ce}")
+            variation_results.append(VariationResult(
+                variation="engine_failure", downloaded_count=0, success=False, error=str(ce)))
+        except Exception as e:
+            logger.error(f"Engine {config.name} failed with unexpected error: {e}")
+            variation_results.append(VariationResult(
+                variation="engine_failure", downloaded_count=0, success=False, error=str(e)))
+        finally:
+            if crawler is not None:
+                self._unregister_crawler(crawler)
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        return EngineResult(
+            engine_name=config.name,
+            total_downloaded=sum(r.downloaded_count for r in variation_results),
+            variations_processed=len(variation_results),
+            success_rate=SingleEngineProcessor._calculate_success_rate(variation_results),
+            processing_time=time.time() - start_time,
+            variations=variation_results
+        )
+
+    @staticmethod
+    def _promote_staged_images(staging_dir: str, out_dir: str, engine_name: str,
+                               digests: Optional[ContentDigestIndex] = None) -> int:
+        """
+        Moves staged images into the output directory under engine-prefixed names.
+
+        Args:
+            staging_dir (str): The engine's staging directory.
+            out_dir (str): The shared output directory.
+            engine_name (str): The engine name used as file name prefix.
+            digests (Optional[ContentDigestIndex]): Digest index whose entries follow the move.
+
+        Returns:
+            int: The number of images moved.
+        """
+        promoted = 0
+        try:
+            entries = list(os.scandir(staging_dir))
+        except OSError:
+            return 0
+
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            target = os.path.join(out_dir, f"{engine_name}_{entry.name}")
+            suffix = 1
+            while os.path.exists(target):
+                stem, ext = os.path.splitext(entry.name)
+                target = os.path.join(out_dir, f"{engine_name}_{stem}_{suffix}{ext}")
+                suffix += 1
+            try:
+                os.replace(entry.path, target)
+                promoted += 1
+                if digests is not None:
+                    digests.move(f"{os.path.basename(staging_dir)}/{entry.name}",
+                                 os.path.basename(target))
+            except OSError as e:
+                logger.warning(f"Failed to promote staged image {entry.path}: {e}")
+        return promoted
+
+    def _register_crawler(self, crawler: Any) -> None:
+        """
+        Tracks a running crawler so it can be cancelled once the target is reached.
+
+        Args:
+            crawler (Any): The crawler instance.
+        """
+        with self._crawlers_lock:
+            self._active_crawlers.append(crawler)
+
+    def _unregister_crawler(self, crawler: Any) -> None:
+        """
+        Stops tracking a crawler.
+
+        Args:
+            crawler (Any): The crawler instance.
+        """
+        with self._crawlers_lock:
+            if crawler in self._active_crawlers:
+                self._active_crawlers.remove(crawler)
+
+    def _cancel_active_crawlers(self) -> None:
+        """
+        Signals every running crawler to stop, as if it had reached its own limit.
+        """
+        with self._crawlers_lock:
+            crawlers = list(self._active_crawlers)
+
+        for crawler in crawlers:
+            signal = getattr(crawler, "signal", None)
+            if signal is not None:
+                signal.set(reach_max_num=True)
+
     def _should_stop_processing(self, max_num: int) -> bool:
         """
         Checks if the image downloading process should be stopped.
@@ -268,20 +643,31 @@ class EngineProcessor:
                 self.image_downloader.total_downloaded >= max_num)
 
 
-    def create_crawler(self, crawler_class: Type[Any], out_dir: str) -> Any:
+    def create_crawler(self, crawler_class: Type[Any], out_dir: str,
+                       storage: Optional[Any] = None,
+                       engine_name: Optional[str] = None) -> Any:
         """
         Creates a crawler instance with proper configuration.
+        If the image downloader has a URL index, the crawler skips URLs already in it.
+        If it has a download manifest, every download is recorded there.
+        If it has a search result cache and the engine is named, result pages already
+        parsed are served from the cache.
 
         Args:
             crawler_class: The crawler class to instantiate
             out_dir: Output directory for downloaded images
+            storage: Optional iCrawler storage backend used instead of a digest-checking
+                     file system storage rooted at out_dir
+            engine_name: Name of the engine the crawler searches, used as cache key
 
         Returns:
             Any: Configured crawler instance
         """
         try:
-            return crawler_class(
-                storage={'root_dir': out_dir},
+            crawler = crawler_class(
+                storage=storage if storage is not None else DigestStorage(
+                    out_dir, getattr(self.image_downloader, "content_digests", None),
+                    self.download_counter),
                 log_level=self.image_downloader.log_level,
                 feeder_threads=self.image_downloader.feeder_threads,
                 parser_threads=self.image_downloader.parser_threads,
@@ -290,6 +676,27 @@ class EngineProcessor:
         except Exception as e:
             raise CrawlerInitializationError(f"Failed to create crawler: {e}") from e
 
+        # Count attempted downloads for the yield statistics; attached first so
+        # URLs skipped by the index below are not counted
+        track_download_attempts(crawler)
+
+        # Record every download for resume; attached before the URL index so only
+        # URLs the index lets through are recorded
+        download_manifest = getattr(self.image_downloader, "download_manifest", None)
+        if download_manifest is not None:
+            download_manifest.attach(crawler)
+
+        # Skip URLs another variation or engine of this job has already fetched
+        url_index = getattr(self.image_downloader, "url_index", None)
+        if url_index is not None:
+            url_index.attach(crawler)
+
+        # Reuse result pages parsed by earlier variations, retries and runs
+        search_cache = getattr(self.image_downloader, "search_cache", None)
+        if search_cache is not None and engine_name:
+            search_cache.attach(crawler, engine_name)
+        return crawler
+
     @staticmethod
     def get_crawler_class(engine_name: str) -> Type[
         Union[GoogleImageCrawler, BingImageCrawler, BaiduImageCrawler, Any]]:
@@ -342,7 +749,9 @@ class SingleEngineProcessor:
             logger.info(f"Starting {config.name} engine (target: {max_num} images)")
 
             # Calculate variations to process
-            variations_to_process = select_variations(variations, max_num)
+            variations_to_process = select_variations(variations, max_num,
+                                                      self.engine_processor.scheduler,
+                                                      self.engine_processor.current_keyword)
 
             # Process variations sequentially
             variation_results = self._process_variations_sequential(
@@ -411,6 +820,9 @@ class SingleEngineProcessor:
             if remaining_limit <= 0:
                 break
 
+            # Wait for the engine's current budget instead of a fixed delay
+            self.engine_processor.rate_controller.acquire(config.name)
+
             result = self._process_single_variation(
                 config, variation, i, out_dir, remaining_limit, total_max
             )
@@ -419,9 +831,6 @@ class SingleEngineProcessor:
             downloaded_so_far += result.downloaded_count
             self._update_global_counters(result)
 
-            # Small delay between variations
-            time.sleep(self.image_downloader.delay_between_searches)
-
         return results
 
     def _process_single_variation(self, config: SearchEngineConfig, variation: str,
@@ -471,6 +880,10 @@ class SingleEngineProcessor:
             # Create and configure crawler
             crawler = self._create_enhanced_crawler(config.name, out_dir)
             file_idx_offset = self._get_current_file_offset()
+            saved_before = self.engine_processor.download_counter.count(out_dir)
+            attempts_before = download_attempts_of(crawler)
+            set_yield_source(crawler, config.name,
+                             template_of(variation, self.engine_processor.current_keyword))
 
             # Perform crawl with timeout protection
             try:
@@ -486,7 +899,10 @@ class SingleEngineProcessor:
                 # Continue to count what we got
 
             # Count results
-            downloaded_count = self._count_variation_results(out_dir, file_idx_offset)
+            downloaded_count = self._count_variation_results(out_dir, saved_before)
+            self.engine_processor.record_yield(
+                config.name, variation, downloaded_count,
+                download_attempts_of(crawler) - attempts_before)
             processing_time = time.time() - start_time
 
             logger.info(
@@ -532,45 +948,68 @@ class SingleEngineProcessor:
                 f"No crawler class found for engine: {engine_name}")
 
         try:
-            crawler = self.engine_processor.create_crawler(crawler_class, out_dir)
-            self._apply_safe_parser_wrapper(crawler, engine_name)
+            crawler = self.engine_processor.create_crawler(crawler_class, out_dir,
+                                                           engine_name=engine_name)
+            self._apply_safe_parser_wrapper(crawler, engine_name,
+                                            self.engine_processor.rate_controller)
             return crawler
         except Exception as e:
             raise CrawlerInitializationError(
                 f"Failed to initialize crawler for {engine_name}: {e}") from e
 
     @staticmethod
-    def _apply_safe_parser_wrapper(crawler: Any, engine_name: str) -> None:
+    def _apply_safe_parser_wrapper(crawler: Any, engine_name: str,
+                                   rate_controller: Optional[AdaptiveRateController] = None) -> None:
         """
         Applies an enhanced parser wrapper to the crawler to improve error handling and result validation.
+        If a rate controller is given, every result page is reported to it: 429/503 responses
+        and empty pages slow the engine down, pages with results speed it up.
 
         Args:
             crawler (Any): The crawler instance to wrap.
             engine_name (str): The name of the engine associated with the crawler.
+            rate_controller (Optional[AdaptiveRateController]): The controller pacing the engine.
         """
         try:
             original_parse = crawler.parser.parse
 
-            def enhanced_parse_wrapper(*args, **kwargs):
+            def enhanced_parse_wrapper(response, *args, **kwargs):
+                # Pages served from the search cache cost the engine nothing
+                track_rate = rate_controller is not None and not getattr(response, "from_cache",
+                                                                         False)
+                status_code = getattr(response, "status_code", None)
+                if track_rate and status_code is not None and status_code >= 400:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    rate_controller.record_status(engine_name, status_code, retry_after)
+
                 try:
-                    result = original_parse(*args, **kwargs)
+                    result = original_parse(response, *args, **kwargs)
 
                     # Handle None results
                     if result is None:
                         logger.debug(f"Parser for {engine_name} returned None")
-                        return []
+                        result = []
 
                     # Ensure result is iterable
                     if not hasattr(result, '__iter__'):
                         logger.warning(
                             f"Parser for {engine_name} returned non-iterable: {type(result)}")
-                        return []
+                        result = []
 
-                    return result
+                    # Parsers are generators; materialize the page so parse errors are
+                    # caught here and empty pages can be detected
+                    result = list(result)
 
                 except Exception as e:
                     logger.warning(f"Parser exception in {engine_name}: {e}")
-                    return []
+                    result = []
+
+                if track_rate and (status_code is None or status_code < 400):
+                    if result:
+                        rate_controller.record_success(engine_name)
+                    else:
+                        rate_controller.record_empty(engine_name)
+                return result
 
             crawler.parser.parse = enhanced_parse_wrapper
 
@@ -613,25 +1052,18 @@ class SingleEngineProcessor:
         with self.image_downloader.lock:
             return self.image_downloader.total_downloaded
 
-    def _count_variation_results(self, out_dir: str, file_idx_offset: int) -> int:
+    def _count_variation_results(self, out_dir: str, saved_before: int) -> int:
         """
-        Counts the number of valid images downloaded in the latest batch for a specific variation.
+        Counts the images saved by the latest variation from the storage's save events.
 
         Args:
             out_dir (str): The output directory where images are downloaded.
-            file_idx_offset (int): The starting file index offset for counting.
+            saved_before (int): The download counter of the directory before the crawl.
 
         Returns:
-            int: The number of valid images found.
+            int: The number of images saved since.
         """
-        with self.image_downloader.lock:
-            # Basic count of files - validation moved to validator package
-            try:
-                files = [f for f in os.listdir(out_dir) if f.lower().endswith(
-                    ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'))]
-                return len(files) - file_idx_offset
-            except OSError:
-                return 0
+        return max(0, self.engine_processor.download_counter.count(out_dir) - saved_before)
 
     def _update_global_counters(self, result: VariationResult) -> None:
         """
@@ -23,30 +23,39 @@ Features:
 - AI-powered keyword generation for diverse image collection
 - Progress tracking and caching for resuming interrupted runs
 - Automatic label file generation in multiple formats (TXT, JSON, CSV, YAML)
+- Single consolidated label manifest (JSONL or Parquet) built by a worker pool
 - Comprehensive report generation for dataset overview
+- Columnar dataset manifest (Parquet or Arrow) written with every build
 
 Note: Image integrity checking and duplicate detection have been moved to the validator package.
 Note: Report generation has been moved to the src package.
 """
 
 import json
+import logging
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple, Final, Iterator, Union
+from typing import Optional, List, Dict, Any, Tuple, Final, Iterator, Union, Callable
 
 import jsonschema
 from PIL import Image
 from jsonschema import validate
 
+from ._dataset_manifest import build_dataset_manifest, write_manifest
+from ._keyword_cache import KeywordCache
 from ._keywords import KeywordManagement, keyword_stats, AlternativeKeyTermGenerator
 from ._predefined_variations import get_search_variations
-from ._search_engines import download_images_ddgs
+from ._search_engines import download_images_ddgs, DDGS_ENGINE_NAME
+from ._rate_control import AdaptiveRateController
+from ._search_cache import SearchResultCache
+from ._concurrency import DownloadCounter
 from ._config import DatasetGenerationConfig, CONFIG_SCHEMA
-from ._constants import DEFAULT_CACHE_FILE, ENGINES, IMAGE_EXTENSIONS
+from ._constants import DEFAULT_CACHE_FILE, ENGINES
 from ._downloader import ImageDownloader
 from ._exceptions import ConfigurationError, DownloadError, GenerationError
 from ._helpers import DatasetTracker, ProgressManager, progress, valid_image_ext, rename_images_sequentially
@@ -66,6 +75,29 @@ logger = get_logger(__name__)
 
 BACKOFF_DELAY: Final[float] = 0.5
 
+# Consolidated label manifest written instead of (or next to) per-image label files
+LABEL_MANIFEST_FORMATS: Final[Tuple[str, ...]] = ("jsonl", "parquet")
+LABEL_MANIFEST_NAME: Final[str] = "manifest"
+LABEL_MANIFEST_FIELDS: Final[Tuple[str, ...]] = (
+    "image_path", "category", "keyword", "filename", "size", "width", "height",
+    "format_", "mode", "timestamp")
+LABEL_MANIFEST_BATCH_SIZE: Final[int] = 1024
+
+
+def _label_manifest_schema() -> Any:
+    """
+    Returns the Arrow schema of the label manifest.
+
+    Returns:
+        Any: A pyarrow.Schema.
+    """
+    import pyarrow as pa
+    return pa.schema([
+        ("image_path", pa.string()), ("category", pa.string()), ("keyword", pa.string()),
+        ("filename", pa.string()), ("size", pa.int64()), ("width", pa.int32()),
+        ("height", pa.int32()), ("format_", pa.string()), ("mode", pa.string()),
+        ("timestamp", pa.float64())])
+
 
 # Integrity management moved to backend package
 
@@ -123,6 +155,7 @@ class RetryStrategy(Enum):
 class RetryConfig:
     """Configuration for retry behavior"""
     max_retries: int = 5
+    # Minimum wait before a retry; longer while the engines it uses are throttled
     backoff_delay: float = 2.0
     strategy: RetryStrategy = RetryStrategy.ALTERNATING
     feeder_threads: int = 2
@@ -156,41 +189,12 @@ class Retry:
         """
         self.config = config or RetryConfig()
         self.stats = RetryStats()
-        self._image_extensions = tuple(IMAGE_EXTENSIONS)
-
-    def _get_image_files(self, directory: str) -> List[str]:
-        """Get all image files in a directory"""
-        try:
-            return [f for f in os.listdir(directory)
-                    if f.lower().endswith(self._image_extensions)]
-        except OSError as e:
-            logger.warning(f"Error accessing directory {directory}: {e}")
-            return []
-
-    def _update_image_count(self, out_dir: str) -> int:
-        """
-        Updates the count of images in a directory after removing duplicates.
-
-        Args:
-            out_dir (str): The directory containing images.
-
-        Returns:
-            int: The updated count of unique images remaining in the directory.
-        """
-        image_files = self._get_image_files(out_dir)
-
-        if not image_files:
-            return 0
-
-        if len(image_files) == 1:
-            return 1
-
-        # Duplicate removal moved to validator package
-        # Basic duplicate removal can be done post-processing if needed
-
-        # Count remaining images
-        remaining_images = self._get_image_files(out_dir)
-        return len(remaining_images)
+        # Shared by every engine attempt, so retries reuse result pages already parsed
+        self.search_cache = SearchResultCache()
+        # Images in the output directory: counted once, then advanced by what each attempt saved
+        self.download_counter = DownloadCounter()
+        # Shared by every attempt, so retries wait for the engines' throttling to clear
+        self.rate_controller = AdaptiveRateController()
 
     def _initial_download(self, max_num: int, keyword: str, out_dir: str) -> int:
         """Perform the initial download attempt"""
@@ -200,7 +204,9 @@ class Retry:
         downloader = ImageDownloader(
             feeder_threads=self.config.feeder_threads,
             parser_threads=self.config.parser_threads,
-            downloader_threads=self.config.downloader_threads
+            downloader_threads=self.config.downloader_threads,
+            rate_controller=self.rate_controller,
+            search_cache=self.search_cache
         )
 
         success, count = downloader.download(keyword, out_dir, max_num)
@@ -208,16 +214,24 @@ class Retry:
 
         if success:
             self.stats.successful_attempts += 1
-            return self._update_image_count(out_dir) if count > 1 else count
         else:
             self.stats.failed_attempts += 1
-            return count
+        return count
 
     def _attempt_retry(self, retries: int, keyword: str, out_dir: str,
-                       images_needed: int) -> int:
-        """Perform a single retry attempt"""
-        if self.config.backoff_delay > 0:
-            time.sleep(self.config.backoff_delay)
+                       images_needed: int, max_num: int) -> int:
+        """
+        Perform a single retry attempt and return the number of images it saved.
+
+        ImageDownloader resumes from the directory's download manifest and counts those
+        images toward its target, so it is given the directory target ``max_num``;
+        DuckDuckGo only downloads the ``images_needed`` still missing.
+        """
+        use_ddgs = (self.config.strategy == RetryStrategy.DDGS_ONLY or
+                    (self.config.strategy == RetryStrategy.ALTERNATING and retries % 2 == 1))
+        delay = self._retry_delay(use_ddgs)
+        if delay > 0:
+            time.sleep(delay)
 
         # Get the next intelligent term combination
         retry_term = generator.next_term(keyword, retries)
@@ -237,30 +251,33 @@ class Retry:
             if self.config.strategy == RetryStrategy.DDGS_ONLY:
                 logger.info(
                     f"Retry #{retries}: Using DuckDuckGo with term '{retry_term}'")
-                success, _ = download_images_ddgs(retry_term, out_dir, images_needed)
+                success, downloaded = download_images_ddgs(
+                    retry_term, out_dir, images_needed, rate_controller=self.rate_controller)
 
             elif self.config.strategy == RetryStrategy.ENGINE_ONLY:
                 retry_engine = ENGINES[retries % len(ENGINES)]
                 logger.info(
                     f"Retry #{retries}: Using {retry_engine} with term '{retry_term}'")
-                downloader = ImageDownloader()
-                success, _ = downloader.download(retry_term, out_dir, images_needed)
+                downloader = ImageDownloader(rate_controller=self.rate_controller,
+                                             search_cache=self.search_cache)
+                success, downloaded = downloader.download(retry_term, out_dir, max_num)
 
             else:  # ALTERNATING strategy (default)
                 if retries % 2 == 0:
                     retry_engine = ENGINES[retries % len(ENGINES)]
                     logger.info(
                         f"Retry #{retries}: Using {retry_engine} with term '{retry_term}'")
-                    downloader = ImageDownloader()
-                    success, _ = downloader.download(retry_term, out_dir, images_needed)
+                    downloader = ImageDownloader(rate_controller=self.rate_controller,
+                                                 search_cache=self.search_cache)
+                    success, downloaded = downloader.download(retry_term, out_dir, max_num)
                 else:
                     logger.info(
                         f"Retry #{retries}: Using DuckDuckGo with term '{retry_term}'")
-                    success, _ = download_images_ddgs(retry_term, out_dir,
-                                                      images_needed)
+                    success, downloaded = download_images_ddgs(
+                        retry_term, out_dir, images_needed, rate_controller=self.rate_controller)
 
             self.stats.total_attempts += 1
-            result = self._update_image_count(out_dir) if success else 0
+            result = downloaded if success else 0
 
             if success:
                 self.stats.successful_attempts += 1
@@ -279,6 +296,25 @@ class Retry:
         finally:
             self.stats.retry_history.append(attempt_info)
 
+    def _retry_delay(self, use_ddgs: bool) -> float:
+        """
+        Returns the wait before a retry, taken from the engines' rate control.
+
+        A DuckDuckGo retry waits for the DuckDuckGo key; an engine retry only until the
+        first engine seen so far is free again, since the downloader moves on between
+        engines. `backoff_delay` is the minimum.
+
+        Args:
+            use_ddgs: Whether the retry uses DuckDuckGo
+
+        Returns:
+            float: Seconds to wait
+        """
+        keys = [DDGS_ENGINE_NAME] if use_ddgs else [
+            key for key in self.rate_controller.rates() if key != DDGS_ENGINE_NAME]
+        delay = min((self.rate_controller.delay_of(key) for key in keys), default=0.0)
+        return max(self.config.backoff_delay, delay)
+
     def retry_download(self, keyword: str, out_dir: str, max_num: int,
                        max_retries: Optional[int] = None) -> Tuple[bool, int]:
         """
@@ -297,16 +333,20 @@ class Retry:
         Raises:
             DownloadError: If no images are successfully downloaded after all retries.
         """
-        # Reset stats for new download session
+        # Reset stats and counts for new download session
         self.stats = RetryStats()
+        self.download_counter = DownloadCounter()
 
         # Use provided max_retries or fall back to config
         effective_max_retries = max_retries if max_retries is not None else self.config.max_retries
 
         # --- Initial Download Phase ---
-        count = self._initial_download(max_num, keyword, out_dir)
+        # The directory is scanned once; afterwards the count follows what each attempt saved
+        self.download_counter.seed(out_dir)
+        count = self.download_counter.record_saved(
+            out_dir, self._initial_download(max_num, keyword, out_dir))
         if count:
-            logger.info(f"After removing duplicates: {count} unique images remain")
+            logger.info(f"After initial download: {count} unique images")
 
         # --- Retry Phase ---
         retries = 0
@@ -315,21 +355,19 @@ class Retry:
             images_needed = max(0, max_num - count)
             logger.info(f"Retry #{retries}: Need {images_needed} more images")
 
-            new_count = self._attempt_retry(retries, keyword, out_dir, images_needed)
+            downloaded = self._attempt_retry(retries, keyword, out_dir, images_needed, max_num)
 
-            if new_count > count:
-                count = new_count
+            if downloaded > 0:
+                count = self.download_counter.record_saved(out_dir, downloaded)
                 logger.info(f"After retry #{retries}: {count}/{max_num} unique images")
 
             if count >= max_num:
                 break
 
         # --- Finalization Phase ---
-        count = self._update_image_count(out_dir) if count > 1 else count
-
         if count > 0:
             try:
-                renamed = rename_images_sequentially(out_dir)
+                renamed = rename_images_sequentially(out_dir, incremental=True)
                 self.stats.images_renamed = renamed
                 logger.info(f"Final step: Renamed {renamed} images sequentially")
             except Exception as e:
@@ -581,15 +619,31 @@ class LabelGenerator:
     which can be used for machine learning tasks like classification or object detection.
     It supports multiple output formats (txt, json, csv, yaml) and ensures proper
     organization matching the dataset structure.
+
+    With a manifest format, the dataset is walked once, image metadata is extracted by a
+    bounded worker pool and all labels go into one manifest file; per-image label files are
+    then an optional extra output.
     """
 
-    def __init__(self, format_type: str = "txt"):
+    def __init__(self, format_type: str = "txt", manifest_format: Optional[str] = None,
+                 per_image_labels: bool = False, max_workers: Optional[int] = None,
+                 metadata_provider: Optional[Callable[[Path], Optional[Dict[str, Any]]]] = None):
         """
         Initializes the LabelGenerator with a specified output format_ for label files.
 
         Args:
             format_type (str): The desired format_ for label files ('txt', 'json', 'csv', 'yaml').
                                 If an unsupported format_ is provided, it defaults to 'txt'.
+            manifest_format (Optional[str]): Write a consolidated label manifest ('jsonl' or
+                                             'parquet') with a parallel single pass. None keeps
+                                             the serial per-image mode.
+            per_image_labels (bool): Whether the manifest mode also writes a label file per
+                                     image, for consumers of the per-image layout.
+            max_workers (Optional[int]): Worker threads of the manifest mode. Defaults to
+                                         twice the CPU count, capped at 32.
+            metadata_provider (Optional[Callable[[Path], Optional[Dict[str, Any]]]]): Returns
+                the already known width, height, format_ and mode of an image, e.g. from the
+                validator's single-decode analysis, or None to read them from the image.
         """
         self.format_type = format_type.lower()
         self.supported_formats = {"txt", "json", "csv", "yaml"}
@@ -599,6 +653,16 @@ class LabelGenerator:
                 f"Unsupported label format_: {format_type}. Defaulting to 'txt'.")
             self.format_type = "txt"
 
+        self.manifest_format = manifest_format.lower() if manifest_format else None
+        if self.manifest_format and self.manifest_format not in LABEL_MANIFEST_FORMATS:
+            logger.warning(
+                f"Unsupported label manifest format: {manifest_format}. Defaulting to 'jsonl'.")
+            self.manifest_format = "jsonl"
+        self.per_image_labels = per_image_labels
+        # Metadata extraction only reads image headers, so threads overlap the file I/O
+        self.max_workers = max(1, max_workers or min(32, 2 * (os.cpu_count() or 1)))
+        self.metadata_provider = metadata_provider
+
     def generate_dataset_labels(self, dataset_dir: str) -> List[str]:
         """
         Generates label files for all images within the specified dataset directory.
@@ -618,17 +682,21 @@ class LabelGenerator:
         labels_dir = dataset_path / "labels"
         labels_dir.mkdir(parents=True, exist_ok=True)
 
+        if self.manifest_format:
+            return self._generate_manifest_labels(dataset_path, labels_dir)
+
         # Process each category directory
         category_dirs = [d for d in dataset_path.iterdir() if
                          d.is_dir() and d.name != "labels"]
 
-        # Count total images for progress tracking
-        total_images = sum(
-            len([f for f in Path(keyword_dir).glob("**/*") if
-                 f.is_file() and valid_image_ext(f)])
+        # List every keyword's images once; the list drives both progress and labelling
+        keyword_images = {
+            keyword_dir: [f for f in keyword_dir.iterdir()
+                          if f.is_file() and valid_image_ext(f)]
             for category_dir in category_dirs
-            for keyword_dir in [d for d in category_dir.iterdir() if d.is_dir()]
-        )
+            for keyword_dir in category_dir.iterdir() if keyword_dir.is_dir()
+        }
+        total_images = sum(len(images) for images in keyword_images.values())
 
         # Create metadata file for the dataset with overall information
         self._generate_dataset_metadata(dataset_path, labels_dir, len(category_dirs),
@@ -648,7 +716,7 @@ class LabelGenerator:
             category_name = category_dir.name
             progress.start_subtask(f"Category: {category_name}")
             category_files = self._process_category(category_dir, category_name,
-                                                    labels_dir, progress)
+                                                    labels_dir, progress, keyword_images)
             generated_files.extend(category_files)
             progress.close_subtask()
 
@@ -659,6 +727,106 @@ class LabelGenerator:
 
         return generated_files
 
+    def _generate_manifest_labels(self, dataset_path: Path, labels_dir: Path) -> List[str]:
+        """
+        Generates the consolidated label manifest in a single parallel pass over the dataset.
+
+        Images are listed with one walk of the tree, their metadata is extracted by a thread
+        pool in batches, and every record is written to the manifest in listing order.
+
+        Args:
+            dataset_path (Path): The root path of the dataset.
+            labels_dir (Path): The directory where label files are stored.
+
+        Returns:
+            List[str]: Paths of the per-image label files, if any, followed by the manifest path.
+        """
+        categories, images = self._walk_dataset(dataset_path)
+
+        self._generate_dataset_metadata(dataset_path, labels_dir, len(categories), len(images))
+        self._generate_category_index(labels_dir, categories)
+
+        if self.per_image_labels:
+            for category, keyword in {(category, keyword) for category, keyword, _ in images}:
+                (labels_dir / category / keyword).mkdir(parents=True, exist_ok=True)
+
+        progress.start_step("labels", total=len(images))
+        generated_files: List[str] = []
+
+        def label_image(item: Tuple[str, str, Path]) -> Dict[str, Any]:
+            category, keyword, image_file = item
+            metadata = self._extract_image_metadata(image_file)
+            if self.per_image_labels:
+                label_file = self._generate_label_file(image_file, labels_dir / category / keyword,
+                                                       category, keyword, metadata)
+                if label_file:
+                    generated_files.append(str(label_file))
+            record = {"image_path": image_file.relative_to(dataset_path).as_posix(),
+                      "category": category, "keyword": keyword, **metadata}
+            return {name: record.get(name) for name in LABEL_MANIFEST_FIELDS}
+
+        def record_batches() -> Iterator[List[Dict[str, Any]]]:
+            with ThreadPoolExecutor(max_workers=self.max_workers,
+                                    thread_name_prefix="label-metadata") as executor:
+                for start in range(0, len(images), LABEL_MANIFEST_BATCH_SIZE):
+                    batch = images[start:start + LABEL_MANIFEST_BATCH_SIZE]
+                    yield list(executor.map(label_image, batch))
+                    progress.update_step(len(batch))
+
+        manifest_path = self._write_label_manifest(labels_dir, record_batches())
+        progress.close()
+
+        generated_files.sort()
+        generated_files.append(str(manifest_path))
+        return generated_files
+
+    @staticmethod
+    def _walk_dataset(dataset_path: Path) -> Tuple[List[str], List[Tuple[str, str, Path]]]:
+        """
+        Lists the categories and images of a dataset in one walk of the category/keyword tree.
+
+        Args:
+            dataset_path (Path): The root path of the dataset.
+
+        Returns:
+            Tuple[List[str], List[Tuple[str, str, Path]]]: The category names and the
+                (category, keyword, image path) of every image, both in sorted order.
+        """
+        def subdirs(path: Union[str, Path], skip: Tuple[str, ...] = ()) -> List[os.DirEntry]:
+            with os.scandir(path) as entries:
+                return sorted((e for e in entries if e.is_dir() and e.name not in skip),
+                              key=lambda e: e.name)
+
+        categories = subdirs(dataset_path, skip=("labels",))
+        images = []
+        for category in categories:
+            for keyword in subdirs(category.path):
+                with os.scandir(keyword.path) as entries:
+                    files = sorted((e for e in entries
+                                    if e.is_file() and valid_image_ext(Path(e.name))),
+                                   key=lambda e: e.name)
+                images.extend((category.name, keyword.name, Path(e.path)) for e in files)
+        return [category.name for category in categories], images
+
+    def _write_label_manifest(self, labels_dir: Path,
+                              batches: Iterator[List[Dict[str, Any]]]) -> Path:
+        """
+        Writes the label manifest from record batches, replacing the previous one atomically.
+
+        Parquet needs pyarrow; without it the manifest is written as JSONL.
+
+        Args:
+            labels_dir (Path): The directory where label files are stored.
+            batches (Iterator[List[Dict[str, Any]]]): Batches of manifest records.
+
+        Returns:
+            Path: Path of the manifest.
+        """
+        records = (record for batch in batches for record in batch)
+        return write_manifest(records, labels_dir / f"{LABEL_MANIFEST_NAME}.{self.manifest_format}",
+                              LABEL_MANIFEST_FIELDS, _label_manifest_schema,
+                              self.manifest_format, description="label manifest")
+
     def _generate_dataset_metadata(self, dataset_path: Path, labels_dir: Path,
                                    category_count: int, image_count: int) -> None:
         """
@@ -679,6 +847,8 @@ class LabelGenerator:
             "images_count": image_count,
             "label_format": self.format_type
         }
+        if self.manifest_format:
+            metadata["label_manifest"] = self.manifest_format
 
         # Write to appropriate format_
         if self.format_type == "json":
@@ -736,7 +906,8 @@ class LabelGenerator:
                     f.write(f"{name}: {idx}\n")
 
     def _process_category(self, category_dir: Path, category_name: str,
-                          labels_dir: Path, progress: ProgressManager) -> List[str]:
+                          labels_dir: Path, progress: ProgressManager,
+                          keyword_images: Optional[Dict[Path, List[Path]]] = None) -> List[str]:
         """
         Processes a single category directory, iterating through its keyword subdirectories
         to generate labels for images within them.
@@ -746,6 +917,8 @@ class LabelGenerator:
             category_name (str): The name of the category.
             labels_dir (Path): The base directory where all label files are stored.
             progress (ProgressManager): An instance of the ProgressManager for updating progress bars.
+            keyword_images (Optional[Dict[Path, List[Path]]]): Images already listed per keyword
+                                                               directory; listed here if missing.
 
         Returns:
             List[str]: List of paths to generated label files for this category.
@@ -763,14 +936,15 @@ class LabelGenerator:
             progress.set_subtask_description(f"Keyword: {keyword_name}")
             keyword_files = self._process_keyword(keyword_dir, category_name,
                                                   keyword_name,
-                                                  category_label_dir, progress)
+                                                  category_label_dir, progress,
+                                                  (keyword_images or {}).get(keyword_dir))
             generated_files.extend(keyword_files)
 
         return generated_files
 
     def _process_keyword(self, keyword_dir: Path, category_name: str, keyword_name: str,
-                         category_label_dir: Path, progress: ProgressManager) -> List[
-        str]:
+                         category_label_dir: Path, progress: ProgressManager,
+                         image_files: Optional[List[Path]] = None) -> List[str]:
         """
         Processes a keyword directory, generating label files for each image within it.
 
@@ -780,6 +954,7 @@ class LabelGenerator:
             keyword_name (str): The name of the keyword.
             category_label_dir (Path): The directory to store label files for this category.
             progress (ProgressManager): An instance of the ProgressManager for updating progress bars.
+            image_files (Optional[List[Path]]): The keyword's images if already listed.
 
         Returns:
             List[str]: List of paths to generated label files for this keyword.
@@ -791,10 +966,11 @@ class LabelGenerator:
         generated_files = []
 
         # Get all image files regardless of naming pattern
-        image_files = [
-            f for f in keyword_dir.iterdir()
-            if f.is_file() and valid_image_ext(f)
-        ]
+        if image_files is None:
+            image_files = [
+                f for f in keyword_dir.iterdir()
+                if f.is_file() and valid_image_ext(f)
+            ]
 
         # Generate label for each image
         for image_file in image_files:
@@ -811,7 +987,8 @@ class LabelGenerator:
         return generated_files
 
     def _generate_label_file(self, image_file: Path, label_dir: Path, category: str,
-                             keyword: str) -> Optional[Path]:
+                             keyword: str,
+                             image_metadata: Optional[Dict[str, Any]] = None) -> Optional[Path]:
         """
         Generates a label file for a single image based on the configured format_.
         It extracts image metadata and writes the label content to the specified directory.
@@ -821,6 +998,7 @@ class LabelGenerator:
             label_dir (Path): The directory where the label file will be stored.
             category (str): The category name associated with the image.
             keyword (str): The keyword name associated with the image.
+            image_metadata (Optional[Dict[str, Any]]): Metadata already extracted from the image.
 
         Returns:
             Optional[Path]: Path to the generated label file, or None if generation failed.
@@ -832,7 +1010,8 @@ class LabelGenerator:
 
         try:
             # Try to get image metadata if possible
-            image_metadata = self._extract_image_metadata(image_file)
+            if image_metadata is None:
+                image_metadata = self._extract_image_metadata(image_file)
 
             # Generate label content based on format_
             if self.format_type == "txt":
@@ -861,10 +1040,10 @@ class LabelGenerator:
             logger.warning(f"Unexpected error generating label for {image_file}: {e}")
             return None
 
-    @staticmethod
-    def _extract_image_metadata(image_path: Path) -> Dict[str, Any]:
+    def _extract_image_metadata(self, image_path: Path) -> Dict[str, Any]:
         """
-        Extracts metadata (e.g., dimensions, size, format_) from an image file.
+        Extracts metadata (e.g., dimensions, size, format_) from an image file. Dimensions
+        known to the metadata provider are taken from it without opening the image.
 
         Args:
             image_path (Path): The path to the image file.
@@ -880,6 +1059,11 @@ class LabelGenerator:
             # Store parent directory name for context
         }
 
+        known = self.metadata_provider(image_path) if self.metadata_provider else None
+        if known:
+            metadata.update(known)
+            return metadata
+
         # Try to get image dimensions
         try:
             with Image.open(image_path) as img:
@@ -1072,13 +1256,18 @@ class DatasetGenerator:
         self.root_dir = self._setup_output_directory()
         self.tracker = DatasetTracker()
         self.progress_cache = self._initialize_progress_cache()
-        self.label_generator = LabelGenerator() if self.config.generate_labels else None
+        self.label_generator = LabelGenerator(
+            manifest_format=self.config.label_manifest_format,
+            per_image_labels=self.config.per_image_labels
+        ) if self.config.generate_labels else None
 
         # Initialize KeywordManagement instance
         self.keyword_manager = KeywordManagement(
             ai_model=self.config.ai_model,
             keyword_generation=self.config.keyword_generation,
-            generation_strategy=getattr(self.config, 'generation_strategy', 'ai')
+            generation_strategy=getattr(self.config, 'generation_strategy', 'predefined'),
+            # Expansions are kept with the dataset, so re-runs do not prompt the model again
+            keyword_cache=KeywordCache.for_directory(self.root_dir)
         )
 
         # Add missing attributes that are referenced in methods but not initialized
@@ -1098,12 +1287,20 @@ class DatasetGenerator:
         self.progress.update_step(1)
         self.progress.close()
 
-    def generate(self) -> None:
+    def generate(self,
+                 on_keyword_completed: Optional[Callable[[str, str, Path], None]] = None) -> None:
         """
         Generates the dataset based on the provided configuration.
         This is the main entry point for the dataset generation process,
         orchestrating keyword processing, image downloading,
         label generation, and report creation.
+
+        Args:
+            on_keyword_completed (Optional[Callable[[str, str, Path], None]]): Called with the
+                category, keyword and keyword directory as soon as a keyword's download is done,
+                so callers can consume its images while later keywords are still downloading.
+                Keywords skipped by `continue_from_last` are reported with their existing
+                directory.
         """
         # Pre-process all keywords to get accurate totals
         all_keyword_results = {}
@@ -1131,17 +1328,29 @@ class DatasetGenerator:
 
             # Report generation moved to src package
 
-            self._process_category(category_name, keyword_result['keywords'])
+            self._process_category(category_name, keyword_result['keywords'],
+                                   on_keyword_completed)
             self.progress.close_subtask()
 
         # Close download progress
         self.progress.close()
 
+        # Put the last batch of journaled completions on disk
+        if self.progress_cache:
+            self.progress_cache.close()
+
         # Generate labels if enabled
         if self.config.generate_labels and self.label_generator:
             logger.info("Generating labels for the dataset")
             self.label_generator.generate_dataset_labels(str(self.root_dir))
 
+        # One columnar manifest describes the whole dataset for exports and training loaders
+        if self.config.dataset_manifest_format:
+            try:
+                build_dataset_manifest(self.root_dir, self.config.dataset_manifest_format)
+            except Exception as e:
+                logger.warning(f"Could not write the dataset manifest: {e}")
+
         # Report generation moved to src package
         self.progress.close()
 
@@ -1202,13 +1411,17 @@ class DatasetGenerator:
 
         return dataset_config
 
-    def _process_category(self, category_name: str, keywords: List[str]) -> None:
+    def _process_category(self, category_name: str, keywords: List[str],
+                          on_keyword_completed: Optional[
+                              Callable[[str, str, Path], None]] = None) -> None:
         """
         Processes a single category, creating its directory and handling its keywords.
 
         Args:
             category_name (str): The name of the category.
             keywords (List[str]): A list of keywords associated with this category.
+            on_keyword_completed (Optional[Callable[[str, str, Path], None]]): Called after each
+                                                                               keyword's download.
         """
         # Create category directory
         category_path = self.root_dir / category_name
@@ -1216,7 +1429,7 @@ class DatasetGenerator:
 
         # Process each keyword
         for keyword in keywords:
-            self._process_keyword(category_name, keyword, category_path)
+            self._process_keyword(category_name, keyword, category_path, on_keyword_completed)
             # Update main progress
             self.progress.update_step(1)
             # Update subtask description to show completion
@@ -1224,7 +1437,9 @@ class DatasetGenerator:
                 f"Category: {category_name} ({keywords.index(keyword) + 1}/{len(keywords)})")
 
     def _process_keyword(self, category_name: str, keyword: str,
-                         category_path: Path) -> None:
+                         category_path: Path,
+                         on_keyword_completed: Optional[
+                             Callable[[str, str, Path], None]] = None) -> None:
         """
         Processes a single keyword, including downloading images, checking for duplicates,
         and performing integrity checks.
@@ -1233,19 +1448,26 @@ class DatasetGenerator:
             category_name (str): The name of the category the keyword belongs to.
             keyword (str): The specific keyword to process.
             category_path (Path): The path to the category's directory.
+            on_keyword_completed (Optional[Callable[[str, str, Path], None]]): Called with the
+                                                                               keyword directory
+                                                                               once downloaded.
         """
         # Update subtask postfix to show current keyword
         self.progress.set_subtask_postfix(keyword=keyword)
 
-        # Skip if already processed and continuing from last run
+        keyword_safe = keyword.replace('/', '_').replace('\\', '_')
+        keyword_path = category_path / keyword_safe
+
+        # Skip if already processed and continuing from last run; its images are
+        # still reported so streaming callers see the whole dataset
         if self.config.continue_from_last and self.progress_cache and self.progress_cache.is_completed(
             category_name, keyword):
             logger.info(f"Skipping already processed: {category_name}/{keyword}")
+            if on_keyword_completed is not None and keyword_path.is_dir():
+                on_keyword_completed(category_name, keyword, keyword_path)
             return
 
         # Create keyword directory
-        keyword_safe = keyword.replace('/', '_').replace('\\', '_')
-        keyword_path = category_path / keyword_safe
         keyword_path.mkdir(parents=True, exist_ok=True)
 
         # Download images
@@ -1276,6 +1498,9 @@ class DatasetGenerator:
             }
             self.progress_cache.mark_completed(category_name, keyword, metadata)
 
+        if on_keyword_completed is not None:
+            on_keyword_completed(category_name, keyword, keyword_path)
+
         # Small delay to be respectful to image services
         time.sleep(0.5)
 
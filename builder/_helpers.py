@@ -21,11 +21,12 @@ Note: Report generation has been moved to the src package.
 import os
 import shutil
 from pathlib import Path
-from typing import Optional, List, Any, Union, Callable
+from typing import Optional, List, Any, Union, Callable, Dict
 
 from tqdm.auto import tqdm
 
 from builder._constants import logger, IMAGE_EXTENSIONS
+from builder._content_digest import ContentDigestIndex, CONTENT_DIGEST_MANIFEST
 from builder._exceptions import PixCrawlerError
 
 __all__ = [
@@ -128,11 +129,16 @@ class DatasetTracker:
 class FSRenamer:
     """
     A self-encapsulated class for renaming image files sequentially within a specified directory.
-    It handles the complete process of renaming image files to a sequential, zero-padded format_
-    while maintaining data integrity through temporary directory operations.
+    It renames image files to a sequential, zero-padded format_ without copying any data: files
+    are moved with `os.replace` into a temporary directory under their new names and then moved
+    back, so each image is only relinked, never rewritten.
+
+    In incremental mode, images that already carry a sequential name of this renamer's width are
+    left untouched and only newly added images are numbered, continuing after the highest
+    existing number.
     """
 
-    def __init__(self, directory: str, padding_width: Optional[int] = None):
+    def __init__(self, directory: str, padding_width: Optional[int] = None, incremental: bool = False):
         """
         Initializes the FSRenamer with the target directory.
 
@@ -140,18 +146,22 @@ class FSRenamer:
             directory (str): The path to the directory containing images to rename.
             padding_width (Optional[int]): The desired width for zero-padding sequential filenames.
                                           If None, it will be calculated based on the number of files (min 3).
+            incremental (bool): If True, keep existing sequentially named images and only name new ones.
         """
         self.directory_path = Path(directory)
         self.temp_dir: Optional[Path] = None
         self.image_files: List[Path] = []
         self._user_defined_padding_width = padding_width
         self.padding_width: int = 0
+        self.incremental = incremental
+        self.start_index: int = 1
+        self.renames: Dict[str, str] = {}
 
     def rename_sequentially(self) -> int:
         """
-        Renames all image files in the initialized directory to a sequential, zero-padded format_.
-        This process involves copying files to a temporary directory with new names, deleting
-        original files, moving the renamed files back, and cleaning up the temporary directory.
+        Renames the image files in the initialized directory to a sequential, zero-padded format_.
+        Files are moved into a temporary directory under their new names and moved back, which
+        avoids collisions between old and new names without copying file contents.
 
         Returns:
             int: The number of files successfully renamed.
@@ -159,21 +169,38 @@ class FSRenamer:
         if not self._validate_directory_exists():
             return 0
 
+        self.temp_dir = self.directory_path / ".temp_rename"
+        self._recover_interrupted_rename()
+
         self.image_files = self._get_sorted_image_files()
 
-        if not self.image_files:
+        if self.incremental:
+            self.start_index = self._highest_sequential_index() + 1
+            self.image_files = [f for f in self.image_files if not self._is_sequential_name(f)]
+            if not self.image_files:
+                logger.debug(f"No new images to rename in {self.directory_path}")
+                return 0
+        elif not self.image_files:
             logger.warning(f"No image files found in {self.directory_path}")
             return 0
 
-        self.temp_dir = self._create_temp_directory()
         self.padding_width = self._user_defined_padding_width if self._user_defined_padding_width is not None else self._calculate_padding_width(
-            len(self.image_files))
+            self.start_index + len(self.image_files) - 1)
 
-        renamed_count = self._copy_files_to_temp_with_new_names()
+        # Loaded before renaming, while the recorded names still exist
+        digests = self._load_content_digests()
+
+        if self.incremental:
+            # New names lie above every existing sequential name, so they cannot collide
+            renamed_count = self._rename_files_in_place()
+        else:
+            self._create_temp_directory()
+            renamed_count = self._move_files_to_temp_with_new_names()
+            self._move_files_from_temp_to_original()
+            self._cleanup_temp_directory()
 
-        self._delete_original_files()
-        self._move_files_from_temp_to_original()
-        self._cleanup_temp_directory()
+        if digests is not None:
+            digests.rewrite(self.renames)
 
         logger.info(
             f"Renamed {renamed_count} images in {self.directory_path} with sequential numbering")
@@ -207,16 +234,68 @@ class FSRenamer:
         image_files.sort(key=lambda x: x.name)
         return image_files
 
+    def _is_sequential_name(self, file_path: Path) -> bool:
+        """
+        Checks whether a file already carries a sequential name given by this renamer.
+
+        Numeric names of other writers, such as iCrawler's six-digit ones, do not count:
+        the stem must be zero-padded to the configured padding width, or without one, to
+        a width between 3 and the width needed for the images in the directory.
+
+        Args:
+            file_path (Path): The image file.
+
+        Returns:
+            bool: True if the file name stem is a number padded to a width this renamer uses.
+        """
+        stem = file_path.stem
+        if not stem.isdigit():
+            return False
+        if self._user_defined_padding_width is not None:
+            return len(stem) == self._user_defined_padding_width
+        return 3 <= len(stem) <= self._calculate_padding_width(len(self.image_files))
+
+    def _highest_sequential_index(self) -> int:
+        """
+        Finds the highest number used by the sequentially named images in the directory.
+
+        Returns:
+            int: The highest sequential number, or 0 if there is none.
+        """
+        return max((int(f.stem) for f in self.image_files if self._is_sequential_name(f)), default=0)
+
     def _create_temp_directory(self) -> Path:
         """
         Creates a temporary directory within the target directory for renaming operations.
+        It lives on the same file system, so moving files into it does not copy their data.
 
         Returns:
             Path: The path to the created temporary directory.
         """
-        temp_dir = self.directory_path / ".temp_rename"
-        temp_dir.mkdir(exist_ok=True)
-        return temp_dir
+        self.temp_dir.mkdir(exist_ok=True)
+        return self.temp_dir
+
+    def _recover_interrupted_rename(self) -> None:
+        """
+        Moves back files left in the temporary directory by an interrupted rename, so they are
+        picked up again instead of being lost.
+        """
+        if not self.temp_dir.is_dir():
+            return
+
+        for file_path in self.temp_dir.iterdir():
+            target = self.directory_path / file_path.name
+            if target.exists():
+                target = self.directory_path / f"recovered_{file_path.name}"
+            if target.exists():
+                logger.error(f"Cannot recover {file_path}, {target.name} already exists")
+                continue
+            try:
+                os.replace(file_path, target)
+            except OSError as ose:
+                logger.error(f"Failed to recover {file_path} from temp directory: {ose}")
+        if not any(self.temp_dir.iterdir()):
+            self._cleanup_temp_directory()
 
     @staticmethod
     def _calculate_padding_width(file_count: int) -> int:
@@ -231,51 +310,90 @@ class FSRenamer:
         """
         return max(3, len(str(file_count)))
 
-    def _copy_files_to_temp_with_new_names(self) -> int:
+    def _load_content_digests(self) -> Optional[ContentDigestIndex]:
         """
-        Copies image files from the original directory to the temporary directory with new sequential names.
+        Loads the content digests recorded for the directory, so they can follow the renames.
 
         Returns:
-            int: The number of files successfully copied and renamed.
+            Optional[ContentDigestIndex]: The digest index, or None if no manifest exists.
         """
-        renamed_count = 0
+        if not (self.directory_path / CONTENT_DIGEST_MANIFEST).exists():
+            return None
+        return ContentDigestIndex(self.directory_path)
 
-        for i, file_path in enumerate(self.image_files, 1):
-            extension = file_path.suffix.lower()
-            new_filename = f"{i:0{self.padding_width}d}{extension}"
-            temp_path = self.temp_dir / new_filename
+    def _new_filename(self, index: int, file_path: Path) -> str:
+        """
+        Builds the sequential file name of an image.
 
-            try:
-                shutil.copy2(file_path, temp_path)
-                renamed_count += 1
-                # Log progress every 10 files
-                if renamed_count % 10 == 0 or renamed_count == len(self.image_files):
-                    logger.debug(
-                        f"Renamed {renamed_count}/{len(self.image_files)} images")
-            except IOError as ioe:
-                logger.error(f"Failed to copy {file_path} to temp directory: {ioe}")
-                raise PixCrawlerError(
-                    f"Failed to copy {file_path} to temp directory: {ioe}") from ioe
-            except Exception as e:
-                logger.error(
-                    f"An unexpected error occurred while copying {file_path} to temp directory: {e}")
-                raise PixCrawlerError(
-                    f"Unexpected error copying {file_path} to temp directory: {e}") from e
+        Args:
+            index (int): The position of the image in `image_files`, starting at 0.
+            file_path (Path): The image file.
+
+        Returns:
+            str: The new file name.
+        """
+        return f"{self.start_index + index:0{self.padding_width}d}{file_path.suffix.lower()}"
+
+    def _move_file(self, file_path: Path, target: Path) -> None:
+        """
+        Moves one image to its new name.
+
+        Args:
+            file_path (Path): The image file.
+            target (Path): The new path, on the same file system.
+
+        Raises:
+            PixCrawlerError: If the file cannot be moved.
+        """
+        try:
+            os.replace(file_path, target)
+        except OSError as ose:
+            logger.error(f"Failed to move {file_path} to {target}: {ose}")
+            raise PixCrawlerError(f"Failed to move {file_path} to {target}: {ose}") from ose
+
+    def _log_rename_progress(self, renamed_count: int) -> None:
+        # Log progress every 10 files
+        if renamed_count % 10 == 0 or renamed_count == len(self.image_files):
+            logger.debug(f"Renamed {renamed_count}/{len(self.image_files)} images")
+
+    def _rename_files_in_place(self) -> int:
+        """
+        Renames image files directly to their new names. Only safe when no new name can be
+        taken by another image, as in incremental mode.
+
+        Returns:
+            int: The number of files successfully renamed.
+        """
+        renamed_count = 0
+
+        for i, file_path in enumerate(self.image_files):
+            new_filename = self._new_filename(i, file_path)
+            self._move_file(file_path, self.directory_path / new_filename)
+            self.renames[file_path.name] = new_filename
+            renamed_count += 1
+            self._log_rename_progress(renamed_count)
 
         return renamed_count
 
-    def _delete_original_files(self) -> None:
+    def _move_files_to_temp_with_new_names(self) -> int:
         """
-        Deletes the original image files from the target directory after they have been copied and renamed.
+        Moves image files from the original directory to the temporary directory under new
+        sequential names. Files that already have their new name stay where they are.
+
+        Returns:
+            int: The number of files successfully renamed.
         """
-        for file_path in self.image_files:
-            try:
-                os.remove(file_path)
-            except OSError as ose:
-                logger.error(f"Failed to delete original file {file_path}: {ose}")
-            except Exception as e:
-                logger.error(
-                    f"An unexpected error occurred while deleting original file {file_path}: {e}")
+        renamed_count = 0
+
+        for i, file_path in enumerate(self.image_files):
+            new_filename = self._new_filename(i, file_path)
+            if new_filename != file_path.name:
+                self._move_file(file_path, self.temp_dir / new_filename)
+                self.renames[file_path.name] = new_filename
+            renamed_count += 1
+            self._log_rename_progress(renamed_count)
+
+        return renamed_count
 
     def _move_files_from_temp_to_original(self) -> None:
         """
@@ -287,14 +405,10 @@ class FSRenamer:
         for file_path in self.temp_dir.iterdir():
             if file_path.is_file():
                 try:
-                    shutil.move(str(file_path),
-                                str(self.directory_path / file_path.name))
-                except IOError as ioe:
-                    logger.error(
-                        f"Failed to move {file_path} from temp directory: {ioe}")
-                except Exception as e:
+                    os.replace(file_path, self.directory_path / file_path.name)
+                except OSError as ose:
                     logger.error(
-                        f"An unexpected error occurred while moving {file_path} from temp directory: {e}")
+                        f"Failed to move {file_path} from temp directory: {ose}")
 
     def _cleanup_temp_directory(self) -> None:
         """
@@ -614,16 +728,19 @@ class ProgressManager:
 progress = ProgressManager()
 
 
-def rename_images_sequentially(directory: str, padding_width: Optional[int] = 4) -> int:
+def rename_images_sequentially(directory: str, padding_width: Optional[int] = 4,
+                               incremental: bool = False) -> int:
     """
-    Rename all image files in a directory to a sequential, zero-padded format_.
+    Rename image files in a directory to a sequential, zero-padded format_.
 
     Args:
         directory: Directory containing images to rename
         padding_width: The desired width for zero-padding sequential filenames. Defaults to 4.
+        incremental: If True, keep images that are already sequentially named and only
+                     number newly added ones, continuing after the highest existing number.
 
     Returns:
         int: Number of renamed files
     """
-    renamer = FSRenamer(directory, padding_width)
+    renamer = FSRenamer(directory, padding_width, incremental)
     return renamer.rename_sequentially()
@@ -0,0 +1,195 @@
+"""
+Cache of AI keyword expansions shared by keyword generation paths.
+
+Classes:
+    KeywordCache: Maps (category, model, strategy) to the keywords generated for it.
+
+Features:
+    - A category expanded once is not sent to the AI model again until the entry expires.
+    - In-memory entries per process with an optional SQLite store shared between jobs.
+    - Counts hits and misses so saved model calls can be reported.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple, Final, Union
+
+from ._constants import logger
+
+__all__ = [
+    'KeywordCache',
+    'KEYWORD_CACHE_FILENAME'
+]
+
+KEYWORD_CACHE_FILENAME: Final[str] = ".keyword_cache.sqlite"
+
+
+class KeywordCache:
+    """
+    Caches generated keywords, keyed by category, AI model and generation strategy.
+
+    Entries live in memory. When a store path is given they are also kept in SQLite, so
+    later jobs sharing that store reuse them. Empty keyword lists are never cached.
+    """
+
+    def __init__(self, ttl: float = 30 * 24 * 3600,
+                 store_path: Optional[Union[str, Path]] = None):
+        """
+        Initializes the KeywordCache.
+
+        Args:
+            ttl (float): Seconds an entry stays valid.
+            store_path (Optional[Union[str, Path]]): Optional SQLite file for a persistent store.
+        """
+        self.ttl = ttl
+        self.store_path = Path(store_path) if store_path else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if self.store_path is not None:
+            self._conn = self._open_store(self.store_path)
+
+    @classmethod
+    def for_directory(cls, directory: Union[str, Path], **kwargs) -> "KeywordCache":
+        """
+        Creates a cache persisted in a directory.
+
+        Args:
+            directory (Union[str, Path]): The directory holding the store.
+            **kwargs: Passed on to the constructor.
+
+        Returns:
+            KeywordCache: The cache.
+        """
+        return cls(store_path=Path(directory) / KEYWORD_CACHE_FILENAME, **kwargs)
+
+    @staticmethod
+    def _open_store(path: Path) -> Optional[sqlite3.Connection]:
+        """
+        Opens the SQLite store, creating it if needed.
+
+        Args:
+            path (Path): The SQLite file.
+
+        Returns:
+            Optional[sqlite3.Connection]: The connection, or None if the store cannot be opened.
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS expansions "
+                         "(key TEXT PRIMARY KEY, keywords TEXT NOT NULL, expires_at REAL NOT NULL)")
+            return conn
+        except sqlite3.Error as e:
+            logger.warning(f"Keyword cache store unavailable at {path}, using memory only: {e}")
+            return None
+
+    @staticmethod
+    def make_key(category: str, model: str, strategy: str) -> str:
+        """
+        Builds the cache key of a category expansion.
+
+        Args:
+            category (str): The category or keyword that was expanded.
+            model (str): The AI model name.
+            strategy (str): The keyword generation strategy.
+
+        Returns:
+            str: The key.
+        """
+        return json.dumps([' '.join(category.lower().split()), model, strategy])
+
+    def get(self, category: str, model: str, strategy: str) -> Optional[List[str]]:
+        """
+        Looks up the keywords generated for a category.
+
+        Args:
+            category (str): The category.
+            model (str): The AI model name.
+            strategy (str): The keyword generation strategy.
+
+        Returns:
+            Optional[List[str]]: The keywords, or None on a miss or an expired entry.
+        """
+        key = self.make_key(category, model, strategy)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None and self._conn is not None:
+                entry = self._load(key, now)
+                if entry is not None:
+                    self._entries[key] = entry
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, category: str, model: str, strategy: str, keywords: List[str]) -> None:
+        """
+        Stores the keywords generated for a category. Empty lists are not stored.
+
+        Args:
+            category (str): The category.
+            model (str): The AI model name.
+            strategy (str): The keyword generation strategy.
+            keywords (List[str]): The generated keywords.
+        """
+        if not keywords:
+            return
+        key = self.make_key(category, model, strategy)
+        entry = (time.time() + self.ttl, list(keywords))
+        with self._lock:
+            self._entries[key] = entry
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO expansions (key, keywords, expires_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(entry[1]), entry[0]))
+                except sqlite3.Error as e:
+                    logger.debug(f"Keyword cache store write failed: {e}")
+
+    def _load(self, key: str, now: float) -> Optional[Tuple[float, List[str]]]:
+        """
+        Reads a valid entry from the persistent store. Must be called with the lock held.
+
+        Args:
+            key (str): The cache key.
+            now (float): The current time.
+
+        Returns:
+            Optional[Tuple[float, List[str]]]: The entry, or None if missing or expired.
+        """
+        try:
+            row = self._conn.execute(
+                "SELECT expires_at, keywords FROM expansions WHERE key = ? AND expires_at > ?",
+                (key, now)).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Keyword cache store read failed: {e}")
+            return None
+        return (row[0], json.loads(row[1])) if row else None
+
+    def close(self) -> None:
+        """
+        Closes the persistent store, if any.
+        """
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -1,10 +1,14 @@
+import ast
+import asyncio
 import contextlib
+import json
 import random
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from ._constants import logger
 from ._exceptions import GenerationError
+from ._keyword_cache import KeywordCache
 from ._predefined_variations import get_basic_variations, get_quality_variations, \
     get_style_variations, get_time_period_variations, \
     get_emotional_aesthetic_variations, get_meme_culture_variations, \
@@ -22,16 +26,27 @@ class KeywordManagement:
     of final keyword lists based on configuration settings.
     """
 
-    def __init__(self, ai_model: str = "gpt4-mini", keyword_generation: str = "auto"):
+    # Categories sent to the model in one batch prompt
+    MAX_CATEGORIES_PER_PROMPT = 20
+
+    def __init__(self, ai_model: str = "gpt4-mini", keyword_generation: str = "auto",
+                 generation_strategy: str = "predefined",
+                 keyword_cache: Optional[KeywordCache] = None):
         """
         Initializes the KeywordManagement instance.
 
         Args:
             ai_model (str): The AI model to use for keyword generation (e.g., "gpt4", "gpt4-mini").
             keyword_generation (str): The keyword generation mode ("auto", "enabled", "disabled").
+            generation_strategy (str): The keyword variation strategy ("predefined",
+                                       "ai-assisted", "ai-only").
+            keyword_cache (Optional[KeywordCache]): Cache of earlier expansions; an in-memory
+                                                    cache is used if None.
         """
         self.ai_model = ai_model
         self.keyword_generation = keyword_generation
+        self.generation_strategy = generation_strategy
+        self.keyword_cache = keyword_cache if keyword_cache is not None else KeywordCache()
 
     def prepare_keywords(self, category_name: str, keywords: List[str]) -> Dict[
         str, Any]:
@@ -92,6 +107,7 @@ class KeywordManagement:
         """
         Generates related keywords for a given category using the G4F (GPT-4) API.
         This function attempts to generate diverse and high-quality search terms.
+        Expansions are cached per category, model and strategy.
 
         Args:
             category (str): The category name for which to generate keywords.
@@ -102,30 +118,21 @@ class KeywordManagement:
         Raises:
             GenerationError: If keyword generation fails after retries.
         """
-        try:
-            # Import g4f here to avoid import issues if not available
-            import g4f
-
-            # Select the appropriate model
-            provider = None  # Let g4f choose the best available provider
-            model = g4f.models.gpt_4 if self.ai_model == "gpt4" else g4f.models.gpt_4o_mini
-
-            # Create the prompt
-            prompt = self._get_prompt(category)
+        cached = self.keyword_cache.get(category, self.ai_model, self.generation_strategy)
+        if cached is not None:
+            logger.debug(f"Using cached keywords for '{category}'")
+            return cached
 
-            # Make the API call
+        try:
             logger.info(f"Generating keywords for '{category}' using {self.ai_model}")
-            response = g4f.ChatCompletion.create(
-                model=model,
-                provider=provider,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            response = self._complete(self._get_prompt(category))
 
             # Extract keywords from response
             keywords = self._extract_keywords_from_response(response, category)
 
             logger.info(
                 f"Generated {len(keywords)} keywords for '{category}' using {self.ai_model}")
+            self.keyword_cache.put(category, self.ai_model, self.generation_strategy, keywords)
             return keywords
 
         except Exception as e:
@@ -134,7 +141,107 @@ class KeywordManagement:
             raise GenerationError(
                 f"Failed to generate keywords for '{category}' using {self.ai_model}: {e}") from e
 
+    def generate_keywords_batch(self, categories: List[str]) -> Dict[str, List[str]]:
+        """
+        Generates keywords for many categories, asking the model about all uncached
+        categories in as few prompts as possible.
+
+        Categories the model's answer leaves out are generated one by one.
+
+        Args:
+            categories (List[str]): The category names.
+
+        Returns:
+            Dict[str, List[str]]: Generated keywords per category.
+
+        Raises:
+            GenerationError: If a batch prompt fails.
+        """
+        results: Dict[str, List[str]] = {}
+        missing = []
+        for category in dict.fromkeys(categories):
+            cached = self.keyword_cache.get(category, self.ai_model, self.generation_strategy)
+            if cached is not None:
+                results[category] = cached
+            else:
+                missing.append(category)
+
+        for start in range(0, len(missing), self.MAX_CATEGORIES_PER_PROMPT):
+            batch = missing[start:start + self.MAX_CATEGORIES_PER_PROMPT]
+            try:
+                logger.info(f"Generating keywords for {len(batch)} categories in one prompt "
+                            f"using {self.ai_model}")
+                response = self._complete(self._get_batch_prompt(batch))
+            except Exception as e:
+                logger.warning(f"Batch keyword generation failed using {self.ai_model}: {e}")
+                raise GenerationError(
+                    f"Failed to generate keywords for {len(batch)} categories "
+                    f"using {self.ai_model}: {e}") from e
+
+            parsed = self._extract_batch_response(response, batch)
+            for category in batch:
+                if category in parsed:
+                    results[category] = parsed[category]
+                    self.keyword_cache.put(category, self.ai_model, self.generation_strategy,
+                                           parsed[category])
+                else:
+                    results[category] = self.generate_keywords(category)
+
+        return results
+
+    async def generate_keywords_async(self, categories: List[str],
+                                      timeout: float = 30.0) -> Dict[str, List[str]]:
+        """
+        Generates keywords for many categories without blocking the event loop, giving up
+        after a timeout.
+
+        Categories that could not be expanded in time map to themselves. A batch that
+        times out keeps running in the background and still fills the cache.
+
+        Args:
+            categories (List[str]): The category names.
+            timeout (float): Seconds to wait for the model.
+
+        Returns:
+            Dict[str, List[str]]: Keywords per category; never raises for model failures.
+        """
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(self.generate_keywords_batch, categories), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Keyword generation for {len(categories)} categories timed out "
+                           f"after {timeout}s, using cached or original keywords")
+        except GenerationError as e:
+            logger.warning(f"Keyword generation failed, using cached or original keywords: {e}")
+
+        return {
+            category: self.keyword_cache.get(category, self.ai_model,
+                                             self.generation_strategy) or [category]
+            for category in categories
+        }
 
+    def _complete(self, prompt: str) -> str:
+        """
+        Sends a prompt to the configured AI model.
+
+        Args:
+            prompt (str): The prompt text.
+
+        Returns:
+            str: The model's response.
+        """
+        # Import g4f here to avoid import issues if not available
+        import g4f
+
+        # Select the appropriate model
+        provider = None  # Let g4f choose the best available provider
+        model = g4f.models.gpt_4 if self.ai_model == "gpt4" else g4f.models.gpt_4o_mini
+
+        return g4f.ChatCompletion.create(
+            model=model,
+            provider=provider,
+            messages=[{"role": "user", "content": prompt}]
+        )
 
     @staticmethod
     def _get_prompt(category: str) -> str:
@@ -147,6 +254,52 @@ class KeywordManagement:
             Example format: ["keyword 1", "keyword 2", "keyword 3"]
             """
 
+    @staticmethod
+    def _get_batch_prompt(categories: List[str]) -> str:
+        return f"""For each of these categories, generate 10-15 search keywords that would be
+            useful for finding diverse, high-quality images of that concept: {json.dumps(categories)}
+
+            Include variations that would work well for image search engines.
+
+            Return ONLY a JSON object mapping every category, spelled exactly as given, to its
+            list of keywords, with no explanation or other text.
+            Example format: {{"category 1": ["keyword 1", "keyword 2"], "category 2": ["keyword 3"]}}
+            """
+
+    def _extract_batch_response(self, response: str, categories: List[str]) -> Dict[
+        str, List[str]]:
+        """
+        Extracts per-category keyword lists from a batch prompt response.
+
+        Args:
+            response (str): The raw response text received from the AI model.
+            categories (List[str]): The categories the prompt asked about.
+
+        Returns:
+            Dict[str, List[str]]: Cleaned keywords for each category found in the response.
+        """
+        match = re.search(r'\{.*\}', response or '', re.DOTALL)
+        if not match:
+            logger.warning("AI batch response contained no keyword mapping")
+            return {}
+
+        data = None
+        for parse in (json.loads, ast.literal_eval):
+            with contextlib.suppress(Exception):
+                data = parse(match.group(0))
+                break
+        if not isinstance(data, dict):
+            logger.warning("Could not parse AI batch response as a keyword mapping")
+            return {}
+
+        by_name = {' '.join(str(name).lower().split()): value for name, value in data.items()}
+        results = {}
+        for category in categories:
+            keywords = by_name.get(' '.join(category.lower().split()))
+            if isinstance(keywords, list) and all(isinstance(k, str) for k in keywords):
+                results[category] = self._clean_and_deduplicate_keywords(keywords, category)
+        return results
+
     def _extract_keywords_from_response(self, response: str, category: str) -> List[
         str]:
         """
@@ -0,0 +1,319 @@
+"""
+Adaptive rate control for requests issued by the builder download paths.
+
+Classes:
+    RateState: Current budget and outcome counters of one rate-controlled key.
+    AdaptiveRateController: Token-bucket rate limiter per key that adapts to responses.
+
+Functions:
+    host_of: Extracts the host part of a URL.
+    parse_retry_after: Parses a Retry-After header value into seconds.
+
+Features:
+    - One budget per search engine or per image host instead of fixed sleeps, so
+      requests to different engines and hosts never wait on each other.
+    - Additive increase while responses are healthy, multiplicative decrease on
+      HTTP 429/503 and a milder one on empty result pages.
+    - Retry-After is honoured by blocking the key, not the worker that saw it.
+    - Thread-safe slot reservation, so concurrent workers using one key are spread
+      out rather than released together.
+    - Current rates and counters can be read at any time to explain slow jobs.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Any, Final
+from urllib.parse import urlsplit
+
+__all__ = [
+    'RateState',
+    'AdaptiveRateController',
+    'host_of',
+    'parse_retry_after',
+    'THROTTLE_STATUS_CODES'
+]
+
+# HTTP statuses that mean the remote side wants fewer requests
+THROTTLE_STATUS_CODES: Final[frozenset] = frozenset({429, 503})
+
+
+def host_of(url: str) -> str:
+    """
+    Extracts the host part of a URL.
+
+    Args:
+        url (str): The URL.
+
+    Returns:
+        str: The lower-cased host, or an empty string if the URL has none.
+    """
+    return urlsplit(url).netloc.lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header value given in seconds.
+
+    Args:
+        value (Optional[str]): The header value.
+
+    Returns:
+        Optional[float]: The number of seconds, or None if the value is missing or not a
+                         number (HTTP dates are not used by the engines we talk to).
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value.strip())
+    except ValueError:
+        return None
+    return seconds if seconds >= 0 else None
+
+
+@dataclass
+class RateState:
+    """
+    Current budget and outcome counters of one rate-controlled key.
+
+    Attributes:
+        rate (float): Allowed requests per second; infinite when unlimited.
+        tokens (float): Tokens left in the bucket; negative when slots are reserved ahead.
+        updated (float): Monotonic time of the last refill.
+        blocked_until (float): Monotonic time before which no request is allowed.
+        successes (int): Number of healthy responses recorded.
+        throttles (int): Number of 429/503 responses recorded.
+        empties (int): Number of empty result pages recorded.
+        waited (float): Total seconds callers spent waiting for this key.
+    """
+    rate: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    successes: int = 0
+    throttles: int = 0
+    empties: int = 0
+    waited: float = 0.0
+
+
+class AdaptiveRateController:
+    """
+    Paces requests per key (a search engine or an image host) with a token bucket
+    whose rate follows the health of the responses.
+
+    Call `acquire` before each request and one of `record_success`, `record_throttle`
+    or `record_empty` once its outcome is known.
+    """
+
+    def __init__(self, initial_rate: float = 2.0, min_rate: float = 0.05,
+                 max_rate: float = 10.0, burst: float = 1.0,
+                 increase_step: float = 0.1, decrease_factor: float = 0.5,
+                 empty_factor: float = 0.8):
+        """
+        Initializes the AdaptiveRateController.
+
+        Args:
+            initial_rate (float): Requests per second a new key starts with. Zero or a
+                                  negative value disables pacing (Retry-After still applies).
+            min_rate (float): Lowest rate a key is slowed down to.
+            max_rate (float): Highest rate a key is sped up to.
+            burst (float): Bucket size, i.e. how many requests may go out back to back.
+            increase_step (float): Requests per second added after each healthy response.
+            decrease_factor (float): Factor applied to the rate on a 429/503 response.
+            empty_factor (float): Factor applied to the rate on an empty result page.
+        """
+        if min_rate <= 0 or max_rate < min_rate:
+            raise ValueError("min_rate must be positive and not above max_rate")
+
+        self.unlimited = initial_rate <= 0
+        self.initial_rate = math.inf if self.unlimited else min(max(initial_rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = max(1.0, burst)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.empty_factor = empty_factor
+        self._states: Dict[str, RateState] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_interval(cls, interval: float, **kwargs) -> "AdaptiveRateController":
+        """
+        Creates a controller whose keys start with one request per `interval` seconds.
+
+        Args:
+            interval (float): Seconds between requests; zero disables pacing.
+            **kwargs: Passed on to the constructor.
+
+        Returns:
+            AdaptiveRateController: The controller.
+        """
+        initial_rate = 1.0 / interval if interval > 0 else 0.0
+        kwargs.setdefault("max_rate", max(10.0, initial_rate))
+        return cls(initial_rate=initial_rate, **kwargs)
+
+    def _state(self, key: str, now: float) -> RateState:
+        """
+        Returns the state of a key, creating and refilling it. Must be called with the lock held.
+
+        Args:
+            key (str): The engine name or host.
+            now (float): The current monotonic time.
+
+        Returns:
+            RateState: The state.
+        """
+        state = self._states.get(key)
+        if state is None:
+            state = RateState(rate=self.initial_rate, tokens=self.burst, updated=now)
+            self._states[key] = state
+        elif not self.unlimited:
+            state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+            state.updated = now
+        return state
+
+    def acquire(self, key: str, stop_event: Optional[threading.Event] = None) -> float:
+        """
+        Blocks until a request for the key is allowed.
+
+        Args:
+            key (str): The engine name or host.
+            stop_event (Optional[threading.Event]): Ends the wait early when set.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(key, now)
+            delay = max(0.0, state.blocked_until - now)
+            if not self.unlimited:
+                state.tokens -= 1.0
+                if state.tokens < 0:
+                    delay = max(delay, -state.tokens / state.rate)
+            state.waited += delay
+
+        if delay <= 0:
+            return 0.0
+        if stop_event is not None:
+            stop_event.wait(delay)
+        else:
+            time.sleep(delay)
+        return delay
+
+    def delay_of(self, key: str) -> float:
+        """
+        Returns how long a request for the key would wait now, without reserving a slot.
+
+        Args:
+            key (str): The engine name or host.
+
+        Returns:
+            float: Seconds until the key is unblocked and has a token; 0.0 for unseen keys.
+        """
+        with self._lock:
+            if key not in self._states:
+                return 0.0
+            now = time.monotonic()
+            state = self._state(key, now)
+            delay = max(0.0, state.blocked_until - now)
+            if not self.unlimited and state.tokens < 1.0:
+                delay = max(delay, (1.0 - state.tokens) / state.rate)
+            return delay
+
+    def record_success(self, key: str) -> None:
+        """
+        Records a healthy response and speeds the key up.
+
+        Args:
+            key (str): The engine name or host.
+        """
+        with self._lock:
+            state = self._state(key, time.monotonic())
+            state.successes += 1
+            if not self.unlimited:
+                state.rate = min(self.max_rate, state.rate + self.increase_step)
+
+    def record_throttle(self, key: str, retry_after: Optional[float] = None) -> None:
+        """
+        Records a 429/503 response, slows the key down and blocks it for a while.
+
+        Args:
+            key (str): The engine name or host.
+            retry_after (Optional[float]): Seconds the server asked to wait, if any.
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(key, now)
+            state.throttles += 1
+            if not self.unlimited:
+                state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+                state.tokens = min(state.tokens, 0.0)
+                pause = retry_after if retry_after is not None else 1.0 / state.rate
+            else:
+                pause = retry_after or 0.0
+            state.blocked_until = max(state.blocked_until, now + pause)
+
+    def record_empty(self, key: str) -> None:
+        """
+        Records an empty result page, which engines often serve instead of an error
+        when they throttle, and slows the key down slightly.
+
+        Args:
+            key (str): The engine name or host.
+        """
+        with self._lock:
+            state = self._state(key, time.monotonic())
+            state.empties += 1
+            if not self.unlimited:
+                state.rate = max(self.min_rate, state.rate * self.empty_factor)
+
+    def record_status(self, key: str, status_code: int,
+                      retry_after: Optional[float] = None) -> None:
+        """
+        Records the outcome of a response from its HTTP status code.
+
+        Args:
+            key (str): The engine name or host.
+            status_code (int): The HTTP status code.
+            retry_after (Optional[float]): Seconds the server asked to wait, if any.
+        """
+        if status_code in THROTTLE_STATUS_CODES:
+            self.record_throttle(key, retry_after)
+        elif status_code < 400:
+            self.record_success(key)
+
+    def rate_of(self, key: str) -> float:
+        """
+        Returns the current rate of a key.
+
+        Args:
+            key (str): The engine name or host.
+
+        Returns:
+            float: Allowed requests per second; infinite when pacing is disabled.
+        """
+        with self._lock:
+            state = self._states.get(key)
+            return state.rate if state is not None else self.initial_rate
+
+    def rates(self) -> Dict[str, float]:
+        """
+        Returns the current rate of every key seen so far.
+
+        Returns:
+            Dict[str, float]: Requests per second by key.
+        """
+        with self._lock:
+            return {key: state.rate for key, state in self._states.items()}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the current rate and counters of every key seen so far.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The fields of each key's RateState, by key.
+        """
+        with self._lock:
+            return {key: asdict(state) for key, state in self._states.items()}
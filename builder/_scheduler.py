@@ -0,0 +1,569 @@
+"""
+Yield statistics and yield-aware scheduling of search engines and variations.
+
+Classes:
+    YieldRecord: Searches, new images, download attempts and validation rejections counted
+                 for one engine or template.
+    YieldStats: Per-engine and per-template yield counters with an optional SQLite store.
+    YieldScheduler: Orders engines and variations by expected yield, with exploration.
+
+Functions:
+    template_of: Recovers the variation template a search string was built from.
+    track_download_attempts: Counts the image downloads an iCrawler crawler attempts.
+    download_attempts_of: Reads the number of downloads a tracked crawler has attempted.
+    track_search_results: Counts the image results an iCrawler crawler hands to its downloader.
+    search_results_of: Reads the number of image results a tracked crawler has received.
+    set_yield_source: Names the engine and template a crawler's next downloads belong to.
+    record_validation_outcome: Charges images rejected by validation to their engine and template.
+
+Features:
+    - Records, for every search, how many new unique images it produced and how many
+      downloads were attempted for it, so both the yield per search and the share of
+      downloads passing validation are known per engine and per variation template.
+    - Images the validator rejects later are charged back to the engine and template that
+      saved them, so yields count valid images only.
+    - Statistics persist in SQLite and are shared by jobs using the same store, so a
+      template that rarely yields ("{keyword} pixelated") is learned once.
+    - Engines and variations are ordered by smoothed expected yield plus an exploration
+      bonus, so templates with little or no history still get tried.
+"""
+
+import math
+import random
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Any, Final, Union, Callable, TypeVar
+
+from ._constants import logger
+from ._state_dir import state_store_path
+from ._download_manifest import DownloadManifest
+
+__all__ = [
+    'YieldRecord',
+    'YieldStats',
+    'YieldScheduler',
+    'template_of',
+    'track_download_attempts',
+    'download_attempts_of',
+    'track_search_results',
+    'search_results_of',
+    'set_yield_source',
+    'record_validation_outcome',
+    'YIELD_STATS_FILENAME'
+]
+
+YIELD_STATS_FILENAME: Final[str] = "yield_stats.sqlite"
+
+ENGINE: Final[str] = "engine"
+TEMPLATE: Final[str] = "template"
+
+T = TypeVar("T")
+
+
+def template_of(variation: str, keyword: str) -> str:
+    """
+    Recovers the variation template a search string was built from.
+
+    Args:
+        variation (str): The search string, e.g. "cat photo".
+        keyword (str): The keyword it was built for, e.g. "cat".
+
+    Returns:
+        str: The template, e.g. "{keyword} photo", or the search string itself if it
+             does not contain the keyword.
+    """
+    if keyword and keyword in variation:
+        return variation.replace(keyword, "{keyword}", 1)
+    return variation
+
+
+def track_download_attempts(crawler: Any) -> None:
+    """
+    Counts the image downloads an iCrawler crawler attempts in `downloader.download_attempts`.
+
+    Attach it before any wrapper that skips downloads (such as the URL index), so only
+    downloads that were really attempted are counted.
+
+    Args:
+        crawler (Any): The iCrawler crawler instance.
+    """
+    _count_downloads(crawler, "download_attempts")
+
+
+def track_search_results(crawler: Any) -> None:
+    """
+    Counts the image results an iCrawler crawler hands to its downloader in
+    `downloader.search_results`.
+
+    Attach it after every wrapper that skips downloads, so results skipped as already
+    fetched are counted too: a search whose results were all duplicates did return results.
+
+    Args:
+        crawler (Any): The iCrawler crawler instance.
+    """
+    _count_downloads(crawler, "search_results")
+
+
+def _count_downloads(crawler: Any, attribute: str) -> None:
+    """
+    Wraps an iCrawler downloader so every call is counted in one of its attributes.
+
+    Args:
+        crawler (Any): The iCrawler crawler instance.
+        attribute (str): The downloader attribute holding the count.
+    """
+    downloader = getattr(crawler, "downloader", None)
+    if downloader is None or hasattr(downloader, attribute):
+        return
+
+    original_download = downloader.download
+    lock = threading.Lock()
+    setattr(downloader, attribute, 0)
+
+    def counted_download(*args, **kwargs):
+        with lock:
+            setattr(downloader, attribute, getattr(downloader, attribute) + 1)
+        return original_download(*args, **kwargs)
+
+    downloader.download = counted_download
+
+
+def download_attempts_of(crawler: Any) -> int:
+    """
+    Reads the number of downloads a crawler has attempted since tracking started.
+
+    Args:
+        crawler (Any): The iCrawler crawler instance.
+
+    Returns:
+        int: The number of attempts, 0 if the crawler is not tracked.
+    """
+    return getattr(getattr(crawler, "downloader", None), "download_attempts", 0)
+
+
+def search_results_of(crawler: Any) -> int:
+    """
+    Reads the number of image results a crawler has received since tracking started.
+
+    Args:
+        crawler (Any): The iCrawler crawler instance.
+
+    Returns:
+        int: The number of results, 0 if the crawler is not tracked.
+    """
+    return getattr(getattr(crawler, "downloader", None), "search_results", 0)
+
+
+def set_yield_source(crawler: Any, engine_name: str, template: str) -> None:
+    """
+    Names the engine and template the next downloads of an iCrawler crawler belong to.
+
+    The download manifest records them with every saved image, so validation rejections
+    can later be charged to the search that produced the image.
+
+    Args:
+        crawler (Any): The iCrawler crawler instance.
+        engine_name (str): The engine the crawler searches.
+        template (str): The variation template of the next search.
+    """
+    downloader = getattr(crawler, "downloader", None)
+    if downloader is not None:
+        downloader.yield_source = (engine_name, template)
+
+
+@dataclass
+class YieldRecord:
+    """
+    Yield counters of one engine or variation template.
+
+    Attributes:
+        searches (int): Number of searches run.
+        images (int): New unique images kept from those searches.
+        attempts (int): Image downloads attempted for those searches.
+        rejected (int): Kept images the validator rejected afterwards.
+    """
+    searches: int = 0
+    images: int = 0
+    attempts: int = 0
+    rejected: int = 0
+
+    @property
+    def valid_images(self) -> int:
+        """
+        Returns the number of kept images that were not rejected by validation.
+
+        Returns:
+            int: The valid images.
+        """
+        return max(0, self.images - self.rejected)
+
+    @property
+    def images_per_search(self) -> float:
+        """
+        Returns the average number of new valid images per search.
+
+        Returns:
+            float: Images per search, 0.0 without searches.
+        """
+        return self.valid_images / self.searches if self.searches else 0.0
+
+    @property
+    def pass_rate(self) -> Optional[float]:
+        """
+        Returns the share of attempted downloads that were kept and passed validation.
+
+        Returns:
+            Optional[float]: The pass rate, or None if no attempts were counted.
+        """
+        return min(1.0, self.valid_images / self.attempts) if self.attempts else None
+
+
+class YieldStats:
+    """
+    Per-engine and per-template yield counters.
+
+    Counters are kept in memory. When a store path is given they are loaded from and
+    added to a SQLite store, so separate tasks and jobs build on each other's history.
+    """
+
+    def __init__(self, store_path: Optional[Union[str, Path]] = None):
+        """
+        Initializes the YieldStats and loads the store, if any.
+
+        Args:
+            store_path (Optional[Union[str, Path]]): Optional SQLite file for a persistent store.
+        """
+        self.store_path = Path(store_path) if store_path else None
+        self._records: Dict[Tuple[str, str], YieldRecord] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if self.store_path is not None:
+            self._conn = self._open_store(self.store_path)
+            self._load()
+
+    @classmethod
+    def for_directory(cls, directory: Union[str, Path],
+                      state_dir: Optional[Union[str, Path]] = None) -> "YieldStats":
+        """
+        Creates the statistics of a directory, stored outside that directory.
+
+        Args:
+            directory (Union[str, Path]): The directory the statistics belong to.
+            state_dir (Optional[Union[str, Path]]): Directory holding the stores; defaults
+                                                    to `default_state_dir()`.
+
+        Returns:
+            YieldStats: The statistics.
+        """
+        return cls(store_path=state_store_path(directory, YIELD_STATS_FILENAME, state_dir))
+
+    @staticmethod
+    def _open_store(path: Path) -> Optional[sqlite3.Connection]:
+        """
+        Opens the SQLite store, creating it if needed.
+
+        Args:
+            path (Path): The SQLite file.
+
+        Returns:
+            Optional[sqlite3.Connection]: The connection, or None if the store cannot be opened.
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS yields (kind TEXT NOT NULL, name TEXT NOT NULL, "
+                         "searches INTEGER NOT NULL, images INTEGER NOT NULL, "
+                         "attempts INTEGER NOT NULL, rejected INTEGER NOT NULL DEFAULT 0, "
+                         "PRIMARY KEY (kind, name))")
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(yields)")]
+            if "rejected" not in columns:
+                conn.execute("ALTER TABLE yields ADD COLUMN rejected INTEGER NOT NULL DEFAULT 0")
+            return conn
+        except sqlite3.Error as e:
+            logger.warning(f"Yield statistics store unavailable at {path}, using memory only: {e}")
+            return None
+
+    def _load(self) -> None:
+        """
+        Loads the counters kept in the store.
+        """
+        if self._conn is None:
+            return
+        try:
+            rows = self._conn.execute(
+                "SELECT kind, name, searches, images, attempts, rejected FROM yields").fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read yield statistics from {self.store_path}: {e}")
+            return
+        for kind, name, searches, images, attempts, rejected in rows:
+            self._records[(kind, name)] = YieldRecord(searches, images, attempts, rejected)
+
+    def record(self, engine_name: str, template: str, images: int, attempts: int = 0) -> None:
+        """
+        Records the outcome of one search.
+
+        Args:
+            engine_name (str): The engine that ran the search.
+            template (str): The variation template of the search.
+            images (int): New unique images the search produced.
+            attempts (int): Image downloads attempted for the search, if known.
+        """
+        images, attempts = max(0, images), max(0, attempts)
+        with self._lock:
+            for key in ((ENGINE, engine_name), (TEMPLATE, template)):
+                record = self._records.setdefault(key, YieldRecord())
+                record.searches += 1
+                record.images += images
+                record.attempts += attempts
+                if self._conn is not None:
+                    try:
+                        self._conn.execute(
+                            "INSERT INTO yields (kind, name, searches, images, attempts) "
+                            "VALUES (?, ?, 1, ?, ?) ON CONFLICT (kind, name) DO UPDATE SET "
+                            "searches = searches + 1, images = images + excluded.images, "
+                            "attempts = attempts + excluded.attempts",
+                            (key[0], key[1], images, attempts))
+                    except sqlite3.Error as e:
+                        logger.debug(f"Yield statistics store write failed: {e}")
+
+    def record_rejected(self, engine_name: str, template: str, count: int = 1) -> None:
+        """
+        Records kept images of an engine and template that validation rejected afterwards.
+
+        Args:
+            engine_name (str): The engine that found the images.
+            template (str): The variation template of the search that found them.
+            count (int): Number of rejected images.
+        """
+        if count <= 0:
+            return
+        with self._lock:
+            for key in ((ENGINE, engine_name), (TEMPLATE, template)):
+                self._records.setdefault(key, YieldRecord()).rejected += count
+                if self._conn is not None:
+                    try:
+                        self._conn.execute(
+                            "INSERT INTO yields (kind, name, searches, images, attempts, rejected) "
+                            "VALUES (?, ?, 0, 0, 0, ?) ON CONFLICT (kind, name) DO UPDATE SET "
+                            "rejected = rejected + excluded.rejected",
+                            (key[0], key[1], count))
+                    except sqlite3.Error as e:
+                        logger.debug(f"Yield statistics store write failed: {e}")
+
+    def engine(self, engine_name: str) -> YieldRecord:
+        """
+        Returns a copy of the counters of an engine.
+
+        Args:
+            engine_name (str): The engine.
+
+        Returns:
+            YieldRecord: The counters, all zero if the engine has no history.
+        """
+        return self.get(ENGINE, engine_name)
+
+    def template(self, template: str) -> YieldRecord:
+        """
+        Returns a copy of the counters of a variation template.
+
+        Args:
+            template (str): The template.
+
+        Returns:
+            YieldRecord: The counters, all zero if the template has no history.
+        """
+        return self.get(TEMPLATE, template)
+
+    def get(self, kind: str, name: str) -> YieldRecord:
+        """
+        Returns a copy of the counters of an engine or template.
+
+        Args:
+            kind (str): "engine" or "template".
+            name (str): The engine name or template.
+
+        Returns:
+            YieldRecord: The counters, all zero if there is no history.
+        """
+        with self._lock:
+            record = self._records.get((kind, name))
+            return YieldRecord(record.searches, record.images, record.attempts,
+                               record.rejected) if record else YieldRecord()
+
+    def totals(self, kind: str) -> YieldRecord:
+        """
+        Sums the counters of every engine or every template.
+
+        Args:
+            kind (str): "engine" or "template".
+
+        Returns:
+            YieldRecord: The summed counters.
+        """
+        total = YieldRecord()
+        with self._lock:
+            for (record_kind, _), record in self._records.items():
+                if record_kind == kind:
+                    total.searches += record.searches
+                    total.images += record.images
+                    total.attempts += record.attempts
+                    total.rejected += record.rejected
+        return total
+
+    def close(self) -> None:
+        """
+        Closes the persistent store, if any.
+        """
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+
+def record_validation_outcome(directory: Union[str, Path], rejected_hashes: Iterable[str],
+                              yield_stats: YieldStats) -> int:
+    """
+    Charges images rejected by validation to the engine and template that saved them.
+
+    The download manifest of the directory maps each image's content digest to the search
+    that found it, so yields and pass rates reflect images that survive validation.
+
+    Args:
+        directory (Union[str, Path]): The output directory the images were downloaded to.
+        rejected_hashes (Iterable[str]): Content digests (MD5) of the rejected images.
+        yield_stats (YieldStats): The yield history to update.
+
+    Returns:
+        int: The number of rejected images that could be attributed.
+    """
+    sources = DownloadManifest(directory).sources_of(rejected_hashes)
+    for (engine_name, template), count in sources.items():
+        yield_stats.record_rejected(engine_name, template, count)
+    return sum(sources.values())
+
+
+class YieldScheduler:
+    """
+    Orders engines and variations by expected yield.
+
+    The expected yield of an engine or template is its images per search, smoothed
+    towards the average of its kind so a single unlucky search does not bury it. An
+    exploration bonus that shrinks with the number of searches (UCB1) keeps untried
+    and rarely tried templates in rotation.
+    """
+
+    def __init__(self, stats: Optional[YieldStats] = None, exploration: float = 1.0,
+                 prior_searches: float = 2.0):
+        """
+        Initializes the YieldScheduler.
+
+        Args:
+            stats (Optional[YieldStats]): The statistics to schedule by. Defaults to in-memory ones.
+            exploration (float): Weight of the exploration bonus; 0 ranks by history only.
+            prior_searches (float): How many average searches the smoothing prior is worth.
+        """
+        self.stats = stats if stats is not None else YieldStats()
+        self.exploration = exploration
+        self.prior_searches = prior_searches
+
+    def expected_yield(self, record: YieldRecord, total: YieldRecord) -> float:
+        """
+        Estimates the images per search of an engine or template.
+
+        Args:
+            record (YieldRecord): The counters of the engine or template.
+            total (YieldRecord): The summed counters of its kind.
+
+        Returns:
+            float: The smoothed images per search.
+        """
+        prior = total.images_per_search if total.searches else 1.0
+        return (record.valid_images + prior * self.prior_searches) / \
+            (record.searches + self.prior_searches)
+
+    def _score(self, record: YieldRecord, total: YieldRecord) -> float:
+        """
+        Scores an engine or template as expected yield plus exploration bonus.
+
+        Args:
+            record (YieldRecord): The counters of the engine or template.
+            total (YieldRecord): The summed counters of its kind.
+
+        Returns:
+            float: The score; higher is scheduled first.
+        """
+        scale = total.images_per_search if total.valid_images else 1.0
+        bonus = math.sqrt(math.log(total.searches + 1) / (record.searches + 1))
+        return self.expected_yield(record, total) + self.exploration * scale * bonus
+
+    def _order(self, items: List[T], kind: str, name_of: Callable[[T], str]) -> List[T]:
+        """
+        Orders items by descending score, breaking ties randomly.
+
+        Args:
+            items (List[T]): The items.
+            kind (str): "engine" or "template".
+            name_of (Callable[[T], str]): Maps an item to its statistics name.
+
+        Returns:
+            List[T]: The ordered items.
+        """
+        total = self.stats.totals(kind)
+        keyed = [(self._score(self.stats.get(kind, name_of(item)), total), random.random(), i)
+                 for i, item in enumerate(items)]
+        keyed.sort(reverse=True)
+        return [items[i] for _, _, i in keyed]
+
+    def order_variations(self, variations: List[str], keyword: str) -> List[str]:
+        """
+        Orders search variations by the expected yield of their templates.
+
+        Args:
+            variations (List[str]): The search strings built for the keyword.
+            keyword (str): The keyword.
+
+        Returns:
+            List[str]: The variations, highest expected yield first.
+        """
+        return self._order(list(variations), TEMPLATE, lambda v: template_of(v, keyword))
+
+    def order_engines(self, configs: List[T]) -> List[T]:
+        """
+        Orders engine configurations by the expected yield of their engines.
+
+        Args:
+            configs (List[T]): Objects with a `name` attribute.
+
+        Returns:
+            List[T]: The configurations, highest expected yield first.
+        """
+        return self._order(list(configs), ENGINE, lambda config: config.name)
+
+    def summary(self, engine_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarizes the history and expected yield of engines.
+
+        Args:
+            engine_names (List[str]): The engines to summarize.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Searches, images per search, pass rate and expected
+                                       yield by engine.
+        """
+        total = self.stats.totals(ENGINE)
+        summary = {}
+        for name in engine_names:
+            record = self.stats.engine(name)
+            summary[name] = {
+                "searches": record.searches,
+                "images_per_search": record.images_per_search,
+                "pass_rate": record.pass_rate,
+                "expected_yield": self.expected_yield(record, total),
+            }
+        return summary
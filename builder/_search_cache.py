@@ -0,0 +1,311 @@
+"""
+Cache of search engine result pages shared by the builder download paths.
+
+Classes:
+    CachedPage: Stand-in for a result page response served from the cache.
+    SearchResultCache: Maps (engine, query, offset) to the image URLs found there.
+
+Features:
+    - Retries, re-runs of a keyword and jobs sharing keywords reuse result pages that
+      were already parsed instead of requesting them from the engine again.
+    - Entries expire after a TTL, so stale result pages are eventually re-fetched.
+    - In-memory LRU per job with an optional SQLite store shared between tasks and jobs.
+    - iCrawler crawlers are served from the cache at the page request, so a hit costs
+      no engine request at all.
+    - Counts hits and misses so the saved engine traffic can be reported.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, List, Tuple, Dict, Any, Final, Union
+
+from ._constants import logger
+from ._state_dir import state_store_path
+
+__all__ = [
+    'CachedPage',
+    'SearchResultCache',
+    'SEARCH_CACHE_FILENAME'
+]
+
+SEARCH_CACHE_FILENAME: Final[str] = "search_cache.sqlite"
+
+
+@dataclass
+class CachedPage:
+    """
+    Stand-in for a result page response whose image URLs came from the cache.
+
+    Attributes:
+        url (str): The page URL that was requested.
+        urls (List[str]): The image URLs parsed from the page earlier.
+        status_code (int): Always 200, so callers treat it as a healthy page.
+        headers (Dict[str, str]): Always empty.
+        from_cache (bool): Always True.
+    """
+    url: str
+    urls: List[str]
+    status_code: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = True
+
+
+class _CachingPageSession:
+    """
+    Wraps a crawler parser's HTTP session so cached result pages are not requested.
+    Everything except `get` is delegated to the wrapped session.
+    """
+
+    def __init__(self, session: Any, cache: "SearchResultCache", engine_name: str):
+        self._session = session
+        self._cache = cache
+        self._engine_name = engine_name
+
+    def get(self, url: str, *args, **kwargs) -> Any:
+        urls = self._cache.get(self._engine_name, url)
+        if urls is not None:
+            return CachedPage(url=url, urls=urls)
+        response = self._session.get(url, *args, **kwargs)
+        response.search_cache_key = url
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+
+class SearchResultCache:
+    """
+    Caches the image URLs found on search result pages, keyed by engine, query and offset.
+
+    Entries live in an in-memory LRU. When a store path is given they are also kept in
+    SQLite, so other tasks and later jobs sharing that store reuse them too. Empty
+    results are never cached, since engines often serve them when throttling.
+    """
+
+    def __init__(self, ttl: float = 24 * 3600, max_entries: int = 10_000,
+                 store_path: Optional[Union[str, Path]] = None):
+        """
+        Initializes the SearchResultCache.
+
+        Args:
+            ttl (float): Seconds an entry stays valid.
+            max_entries (int): Number of entries kept in memory.
+            store_path (Optional[Union[str, Path]]): Optional SQLite file for a persistent store.
+        """
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.store_path = Path(store_path) if store_path else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if self.store_path is not None:
+            self._conn = self._open_store(self.store_path)
+
+    @classmethod
+    def for_directory(cls, directory: Union[str, Path],
+                      state_dir: Optional[Union[str, Path]] = None,
+                      **kwargs) -> "SearchResultCache":
+        """
+        Creates the cache of a dataset directory, stored outside that directory.
+
+        Args:
+            directory (Union[str, Path]): The dataset output directory.
+            state_dir (Optional[Union[str, Path]]): Directory holding the stores; defaults
+                                                    to `default_state_dir()`.
+            **kwargs: Passed on to the constructor.
+
+        Returns:
+            SearchResultCache: The cache.
+        """
+        return cls(store_path=state_store_path(directory, SEARCH_CACHE_FILENAME, state_dir),
+                   **kwargs)
+
+    @staticmethod
+    def _open_store(path: Path) -> Optional[sqlite3.Connection]:
+        """
+        Opens the SQLite store, creating it if needed.
+
+        Args:
+            path (Path): The SQLite file.
+
+        Returns:
+            Optional[sqlite3.Connection]: The connection, or None if the store cannot be opened.
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS pages "
+                         "(key TEXT PRIMARY KEY, urls TEXT NOT NULL, expires_at REAL NOT NULL)")
+            return conn
+        except sqlite3.Error as e:
+            logger.warning(f"Search cache store unavailable at {path}, using memory only: {e}")
+            return None
+
+    @staticmethod
+    def make_key(engine_name: str, query: str, offset: int = 0) -> str:
+        """
+        Builds the cache key of a result page.
+
+        Args:
+            engine_name (str): The search engine.
+            query (str): The query string, or the page URL for crawler pages (it already
+                         carries the query and offset).
+            offset (int): The result offset.
+
+        Returns:
+            str: The key.
+        """
+        return json.dumps([engine_name.lower(), query, offset])
+
+    def get(self, engine_name: str, query: str, offset: int = 0,
+            min_results: int = 0) -> Optional[List[str]]:
+        """
+        Looks up the image URLs of a result page.
+
+        Args:
+            engine_name (str): The search engine.
+            query (str): The query string or page URL.
+            offset (int): The result offset.
+            min_results (int): Entries with fewer URLs count as a miss.
+
+        Returns:
+            Optional[List[str]]: The image URLs, or None on a miss or an expired entry.
+        """
+        key = self.make_key(engine_name, query, offset)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None and self._conn is not None:
+                entry = self._load(key, now)
+                if entry is not None:
+                    self._remember(key, entry)
+            if entry is None or len(entry[1]) < min_results:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, engine_name: str, query: str, offset: int, urls: List[str]) -> None:
+        """
+        Stores the image URLs of a result page. Empty results are not stored.
+
+        Args:
+            engine_name (str): The search engine.
+            query (str): The query string or page URL.
+            offset (int): The result offset.
+            urls (List[str]): The image URLs found on the page.
+        """
+        if not urls:
+            return
+        key = self.make_key(engine_name, query, offset)
+        entry = (time.time() + self.ttl, list(urls))
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO pages (key, urls, expires_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(entry[1]), entry[0]))
+                except sqlite3.Error as e:
+                    logger.debug(f"Search cache store write failed: {e}")
+
+    def _remember(self, key: str, entry: Tuple[float, List[str]]) -> None:
+        """
+        Adds an entry to the in-memory LRU. Must be called with the lock held.
+
+        Args:
+            key (str): The cache key.
+            entry (Tuple[float, List[str]]): The expiry time and image URLs.
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str, now: float) -> Optional[Tuple[float, List[str]]]:
+        """
+        Reads a valid entry from the persistent store. Must be called with the lock held.
+
+        Args:
+            key (str): The cache key.
+            now (float): The current time.
+
+        Returns:
+            Optional[Tuple[float, List[str]]]: The entry, or None if missing or expired.
+        """
+        try:
+            row = self._conn.execute(
+                "SELECT expires_at, urls FROM pages WHERE key = ? AND expires_at > ?",
+                (key, now)).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Search cache store read failed: {e}")
+            return None
+        return (row[0], json.loads(row[1])) if row else None
+
+    def attach(self, crawler: Any, engine_name: str) -> None:
+        """
+        Serves an iCrawler crawler's result pages from the cache and caches new ones.
+
+        Args:
+            crawler (Any): The iCrawler crawler instance.
+            engine_name (str): The engine the crawler searches.
+        """
+        parser = getattr(crawler, "parser", None)
+        if parser is None or getattr(parser, "_search_cache", None) is self:
+            return
+
+        original_parse = parser.parse
+
+        def parse_cached(response, *args, **kwargs):
+            if isinstance(response, CachedPage):
+                return [{"file_url": url} for url in response.urls]
+            tasks = list(original_parse(response, *args, **kwargs) or [])
+            page_url = getattr(response, "search_cache_key", None)
+            if page_url and getattr(response, "status_code", 200) < 400:
+                self.put(engine_name, page_url, 0,
+                         [task["file_url"] for task in tasks
+                          if isinstance(task, dict) and task.get("file_url")])
+            return tasks
+
+        parser.session = _CachingPageSession(parser.session, self, engine_name)
+        parser.parse = parse_cached
+        parser._search_cache = self
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Returns the share of lookups served from the cache.
+
+        Returns:
+            float: The hit rate between 0 and 1.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self) -> None:
+        """
+        Closes the persistent store, if any.
+        """
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -1,17 +1,32 @@
+import itertools
 import os
 import random
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Tuple, Optional, List, Type, Any, Final
 
 import requests
+from requests.adapters import HTTPAdapter
 from ddgs import DDGS
+from ddgs.exceptions import RatelimitException
 
 from icrawler.builtin import GoogleImageCrawler, BingImageCrawler, BaiduImageCrawler
 
 from ._base import ISearchEngineDownloader
+from ._concurrency import DownloadQuota, DownloadCounter
+from ._content_digest import ContentDigestIndex, DigestStorage
+from ._download_manifest import DownloadManifest, STATUS_SAVED, STATUS_REJECTED, STATUS_FAILED
 from ._constants import logger
+from ._search_cache import SearchResultCache
+from ._scheduler import template_of, track_download_attempts, download_attempts_of, \
+    track_search_results, search_results_of, set_yield_source
+from ._rate_control import AdaptiveRateController, host_of, parse_retry_after
+from ._streaming import StreamLimits, stream_response_to_file
+from ._url_index import URLIndex
 from ._exceptions import (
     DownloadError,
     TimeoutException,
@@ -83,20 +98,103 @@ class EngineResult:
 USER_AGENT: Final[
     str] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 
+# Rate controller key of the DuckDuckGo search engine
+DDGS_ENGINE_NAME: Final[str] = "duckduckgo"
+
 
 class DDGSImageDownloader(ISearchEngineDownloader):
     """
     A class to download images using DuckDuckGo search.
+
+    By default results are fetched concurrently by a bounded worker pool over a
+    reused HTTP session. The sequential mode downloads one result at a time.
+    Call `close` or use the downloader as a context manager to release the session.
     """
 
-    def __init__(self):
+    def __init__(self, concurrent: bool = True, max_workers: int = 8,
+                 per_host_interval: float = 0.2,
+                 stream_limits: Optional[StreamLimits] = None,
+                 url_index: Optional[URLIndex] = None,
+                 content_digests: Optional[ContentDigestIndex] = None,
+                 rate_controller: Optional[AdaptiveRateController] = None,
+                 search_cache: Optional[SearchResultCache] = None,
+                 download_counter: Optional[DownloadCounter] = None,
+                 download_manifest: Optional[DownloadManifest] = None):
         """
         Initializes the DuckDuckGo downloader with default settings.
+
+        Args:
+            concurrent (bool): Whether to download search results with a worker pool.
+            max_workers (int): Maximum number of concurrent image fetches.
+            per_host_interval (float): Seconds between two requests to the same host to start
+                                       with; the per-host rate then adapts to the responses.
+                                       Zero disables per-host pacing.
+            stream_limits (Optional[StreamLimits]): Size and dimension limits enforced while
+                                                    image bodies are streamed.
+            url_index (Optional[URLIndex]): Index of URLs already fetched by the job; repeats
+                                            are skipped before any request is made.
+            content_digests (Optional[ContentDigestIndex]): Digests of the images already kept;
+                                                            exact duplicates are not written. An
+                                                            index for the output directory is
+                                                            created on download if not given.
+            rate_controller (Optional[AdaptiveRateController]): Engine-level controller pacing the
+                                                                DuckDuckGo searches. Pass the job's
+                                                                controller to share its budget.
+            search_cache (Optional[SearchResultCache]): Cache of earlier search results; queries
+                                                        found there are not sent to DuckDuckGo.
+            download_counter (Optional[DownloadCounter]): Counter every saved image is reported to.
+                                                          Pass the job's counter to share it.
+            download_manifest (Optional[DownloadManifest]): Manifest of the output directory; URLs
+                                                            finished by an earlier run are skipped.
+                                                            Created for the output directory on
+                                                            download if not given.
         """
         self.user_agent = USER_AGENT
         self.timeout = 20
         self.min_file_size = 1000  # bytes
-        self.delay = 0.2  # seconds between downloads
+        self.stream_limits = stream_limits or StreamLimits(min_bytes=self.min_file_size)
+        self.url_index = url_index
+        self.content_digests = content_digests
+        self.delay = per_host_interval  # initial seconds between requests to one host
+        self.concurrent = concurrent
+        self.max_workers = max(1, max_workers)
+        self.host_rates = AdaptiveRateController.from_interval(per_host_interval)
+        self.rate_controller = rate_controller or AdaptiveRateController.from_interval(0.5)
+        self.search_cache = search_cache
+        self.download_counter = download_counter or DownloadCounter()
+        self.download_manifest = download_manifest
+        # Names stay unique across searches of this downloader and other downloaders
+        # writing to the same directory before it is renamed
+        self.file_prefix = f"ddgs_{uuid.uuid4().hex[:8]}"
+        self._file_numbers = itertools.count(1)
+        self.session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """
+        Creates an HTTP session whose connection pool fits the worker pool.
+
+        Returns:
+            requests.Session: The configured session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers,
+                              pool_maxsize=self.max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({'User-Agent': self.user_agent})
+        return session
+
+    def close(self) -> None:
+        """
+        Closes the HTTP session and its pooled connections.
+        """
+        self.session.close()
+
+    def __enter__(self) -> "DDGSImageDownloader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
     # NOTE: Retry logic temporarily disabled - tenacity not installed
     # Future TODO: Add tenacity to dependencies or implement custom retry logic
@@ -112,9 +210,14 @@ class DDGSImageDownloader(ISearchEngineDownloader):
     #     before_sleep=before_sleep_log(logger, 30),
     #     reraise=True
     # )
-    def _get_image(self, image_url: str, file_path: str) -> bool:
+    def _get_image(self, image_url: str, file_path: str,
+                   quota: Optional[DownloadQuota] = None,
+                   stop_event: Optional[threading.Event] = None) -> bool:
         """
         Downloads a single image from a given URL and saves it to the specified file path.
+        The body is streamed: headers, magic bytes and image dimensions are checked before
+        the rest is read, and accepted bodies are written to disk in chunks. The saved file
+        takes the extension of the detected image format.
         NOTE: Automatic retry disabled - tenacity not available
 
         Retry Strategy:
@@ -131,11 +234,16 @@ class DDGSImageDownloader(ISearchEngineDownloader):
             
         Does NOT retry on:
             - Permanent errors (404, 401, 403, 400)
-            - Validation errors (non-image content, file too small)
+            - Validation errors (non-image content, file too small or too large)
 
         Args:
             image_url (str): The URL of the image to download.
             file_path (str): The absolute path where the image should be saved.
+            quota (Optional[DownloadQuota]): Shared quota; the image is only written
+                                             if a slot can be reserved.
+            stop_event (Optional[threading.Event]): Cancels the fetch when set; a body being
+                                                    streamed is abandoned and its partial
+                                                    file removed.
 
         Returns:
             bool: True if the download and validation were successful, False otherwise.
@@ -144,61 +252,53 @@ class DDGSImageDownloader(ISearchEngineDownloader):
             PermanentError: For non-retryable errors (404, validation failures)
             TransientError: After all retries exhausted
         """
+        host = host_of(image_url)
         try:
+            self.host_rates.acquire(host, stop_event)
+            if stop_event is not None and stop_event.is_set():
+                return False
+
             # First try with verification
-            response = requests.get(
-                image_url,
-                timeout=self.timeout,
-                verify=True,
-                headers={'User-Agent': self.user_agent}
-            )
-
-            # Retry without SSL verification if it fails with verification
-            if response.status_code != 200:
+            try:
+                response = self.session.get(image_url, timeout=self.timeout, verify=True,
+                                            stream=True)
+            except requests.exceptions.SSLError:
+                # Retry without SSL verification only when the handshake itself failed
                 logger.warning(
-                    f"Initial request failed with status {response.status_code}. Retrying without SSL verification.")
-                response = requests.get(
-                    image_url,
-                    timeout=self.timeout,
-                    verify=False,
-                    headers={'User-Agent': self.user_agent}
-                )
-
-            # Handle rate limiting with Retry-After header
-            if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', 5))
-                logger.warning(f"Rate limited, waiting {retry_after}s for {image_url}")
-                time.sleep(retry_after)
-                raise RateLimitError(f"Rate limited: {image_url}")
-
-            # Classify HTTP errors for proper retry behavior
-            if response.status_code >= 400:
-                error_class = classify_http_error(response.status_code)
-                raise error_class(f"HTTP {response.status_code}: {image_url}")
-
-            response.raise_for_status()
-
-            # Check content type and file size before saving
-            content_type = response.headers.get('Content-Type', '')
-            if not content_type.startswith('image/'):
-                raise DownloadError(f"Skipping non-image content type: {content_type}")
-
-            if len(response.content) < self.min_file_size:
-                raise DownloadError(
-                    f"Skipping too small image ({len(response.content)} bytes)")
-
-            with open(file_path, "wb") as f:
-                f.write(response.content)
-
-            # Basic validation - check if file exists and has content
-            if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
-                # Remove empty or missing file
-                try:
-                    os.remove(file_path)
-                    logger.warning(f"Removed corrupted image: {file_path}")
-                except OSError as ose:
-                    logger.error(f"Error removing corrupted image {file_path}: {ose}")
-                raise DownloadError(f"Downloaded image failed validation: {file_path}")
+                    f"SSL verification failed for {image_url}. Retrying without SSL verification.")
+                response = self.session.get(image_url, timeout=self.timeout, verify=False,
+                                            stream=True)
+
+            with response:
+                # Rate limiting slows the host down and honours Retry-After for
+                # every later request to it, instead of stalling this worker
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                self.host_rates.record_status(host, response.status_code, retry_after)
+                if response.status_code == 429:
+                    logger.warning(f"Rate limited by {host}, backing off for {image_url}")
+                    raise RateLimitError(f"Rate limited: {image_url}")
+
+                # Classify HTTP errors for proper retry behavior
+                if response.status_code >= 400:
+                    error_class = classify_http_error(response.status_code)
+                    raise error_class(f"HTTP {response.status_code}: {image_url}")
+
+                response.raise_for_status()
+
+                # Headers and the first chunks are checked before the rest of the body
+                # is read; accepted bodies go to disk chunk by chunk
+                commit = quota.try_acquire if quota is not None else None
+                rollback = quota.release if quota is not None else None
+                saved_path = stream_response_to_file(response, file_path,
+                                                     self.stream_limits, commit,
+                                                     self.content_digests, rollback,
+                                                     stop_event)
+
+            if saved_path is None:
+                return False
+            self.download_counter.record_saved(os.path.dirname(saved_path))
+            if self.download_manifest is not None:
+                self.download_manifest.finish(image_url, STATUS_SAVED, saved_path)
             return True
 
         except requests.exceptions.Timeout as timeout_e:
@@ -222,14 +322,17 @@ class DDGSImageDownloader(ISearchEngineDownloader):
                 f"An unexpected error occurred while downloading {image_url}: {e}")
             raise DownloadError(f"Unexpected error downloading {image_url}: {e}") from e
 
-    def _download_single_image(self, result: dict, out_dir: str, index: int) -> bool:
+    def _download_single_image(self, result: dict, out_dir: str,
+                               quota: Optional[DownloadQuota] = None,
+                               stop_event: Optional[threading.Event] = None) -> bool:
         """
         Downloads a single image from a search result dictionary.
 
         Args:
             result (dict): A dictionary containing image information, including its URL.
             out_dir (str): The output directory where the image will be saved.
-            index (int): The index of the image, used for generating a unique filename.
+            quota (Optional[DownloadQuota]): Shared quota limiting how many images are written.
+            stop_event (Optional[threading.Event]): Cancels the fetch when set.
 
         Returns:
             bool: True if the image was successfully downloaded, False otherwise.
@@ -238,17 +341,47 @@ class DDGSImageDownloader(ISearchEngineDownloader):
         if not image_url:
             return False
 
-        # Create a unique filename based on the index
-        filename = f"ddgs_{index:03d}.jpg"
-        file_path = os.path.join(out_dir, filename)
+        manifest = self.download_manifest
+        if manifest is not None and manifest.is_done(image_url):
+            logger.debug(f"Skipping URL finished by an earlier run: {image_url}")
+            return False
 
-        # Download the image
-        success = self._get_image(image_url, file_path)
+        if self.url_index is not None and not self.url_index.check_and_add(image_url):
+            logger.debug(f"Skipping already fetched URL: {image_url}")
+            return False
 
-        # Add small delay between downloads
-        time.sleep(self.delay)
+        # Create a unique filename from the downloader's running number
+        filename = f"{self.file_prefix}_{next(self._file_numbers):03d}.jpg"
+        file_path = os.path.join(out_dir, filename)
 
-        return success
+        # Download the image; pacing is handled per host by the rate controller.
+        # The URL stays pending in the manifest until its outcome is known
+        if manifest is not None:
+            manifest.start(image_url)
+        try:
+            saved = self._get_image(image_url, file_path, quota, stop_event)
+        except BaseException:
+            if manifest is not None:
+                manifest.finish(image_url, STATUS_FAILED)
+            self._forget_url(image_url)
+            raise
+        if not saved:
+            if manifest is not None:
+                # A cancelled fetch was never judged, so a resumed run tries it again
+                cancelled = stop_event is not None and stop_event.is_set()
+                manifest.finish(image_url, STATUS_FAILED if cancelled else STATUS_REJECTED)
+            self._forget_url(image_url)
+        return saved
+
+    def _forget_url(self, image_url: str) -> None:
+        """
+        Lets a URL that did not produce a saved image be fetched again later.
+
+        Args:
+            image_url (str): The image URL.
+        """
+        if self.url_index is not None:
+            self.url_index.forget(image_url)
 
     def _search_and_download_sequential(self, keyword: str, out_dir: str,
                                         max_count: int) -> int:
@@ -266,19 +399,77 @@ class DDGSImageDownloader(ISearchEngineDownloader):
         downloaded = 0
 
         try:
-            # Fetch search results
-            results = self._fetch_search_results(keyword, max_count)
-            if not results:
-                return 0
-
-            # Download images sequentially
-            downloaded = self._execute_sequential_downloads(results, out_dir, max_count)
+            results = self._cached_search_results(keyword, max_count)
+            if results is None:
+                # Fetch search results within the engine's current budget
+                self.rate_controller.acquire(DDGS_ENGINE_NAME)
+                try:
+                    results = self._fetch_search_results(keyword, max_count)
+                except RatelimitException:
+                    self.rate_controller.record_throttle(DDGS_ENGINE_NAME)
+                    raise
+                if not results:
+                    self.rate_controller.record_empty(DDGS_ENGINE_NAME)
+                    return 0
+                self.rate_controller.record_success(DDGS_ENGINE_NAME)
+                if self.search_cache is not None:
+                    self.search_cache.put(DDGS_ENGINE_NAME, keyword, 0,
+                                          [r["image"] for r in results if r.get("image")])
+
+            if self.concurrent:
+                downloaded = self._execute_concurrent_downloads(results, out_dir,
+                                                                max_count)
+            else:
+                downloaded = self._execute_sequential_downloads(results, out_dir,
+                                                                max_count)
+
+            # Searches that fail above are not recorded, so a resumed run tries them again
+            if self.download_manifest is not None:
+                self.download_manifest.complete_variation(DDGS_ENGINE_NAME, keyword)
 
         except Exception as e:
             logger.warning(f"Failed to search for keyword '{keyword}': {e}")
 
         return downloaded
 
+    def _search_unless_completed(self, keyword: str, out_dir: str, max_count: int) -> int:
+        """
+        Searches and downloads for a keyword unless an earlier run already completed that search.
+
+        Args:
+            keyword (str): The search term for images.
+            out_dir (str): The output directory where images will be saved.
+            max_count (int): The maximum number of images to download.
+
+        Returns:
+            int: The number of successfully downloaded images.
+        """
+        manifest = self.download_manifest
+        if manifest is not None and manifest.is_variation_done(DDGS_ENGINE_NAME, keyword):
+            logger.info(f"Skipping search completed by an earlier run: '{keyword}'")
+            return 0
+        return self._search_and_download_sequential(keyword, out_dir, max_count)
+
+    def _cached_search_results(self, keyword: str, max_count: int) -> Optional[List[dict]]:
+        """
+        Looks up earlier search results for a keyword.
+
+        Args:
+            keyword (str): The search term.
+            max_count (int): The maximum number of images needed.
+
+        Returns:
+            Optional[List[dict]]: Search results with only the image URL, or None if the cache
+                                  holds fewer results than a fresh search would request.
+        """
+        if self.search_cache is None:
+            return None
+        urls = self.search_cache.get(DDGS_ENGINE_NAME, keyword, 0, min_results=max_count * 3)
+        if urls is None:
+            return None
+        logger.info(f"Using {len(urls)} cached search results for '{keyword}'")
+        return [{"image": url} for url in urls]
+
     @staticmethod
     def _fetch_search_results(keyword: str, max_count: int) -> List[dict]:
         """
@@ -321,7 +512,7 @@ class DDGSImageDownloader(ISearchEngineDownloader):
                 break
 
             try:
-                if self._download_single_image(result, out_dir, i + 1):
+                if self._download_single_image(result, out_dir):
                     downloaded += 1
                     logger.info(
                         f"Downloaded image from DuckDuckGo [{downloaded}/{max_count}]")
@@ -333,6 +524,60 @@ class DDGSImageDownloader(ISearchEngineDownloader):
 
         return downloaded
 
+    def _execute_concurrent_downloads(self, results: List[dict], out_dir: str,
+                                      max_count: int) -> int:
+        """
+        Downloads images from a list of search results with a bounded worker pool.
+
+        Workers share the HTTP session and a download quota. As soon as `max_count`
+        images are saved, queued fetches are cancelled and fetches still in flight
+        stop streaming at their next chunk and remove their partial files.
+
+        Args:
+            results (List[dict]): A list of search result dictionaries.
+            out_dir (str): The output directory for downloaded images.
+            max_count (int): The maximum number of images to download.
+
+        Returns:
+            int: The number of successfully downloaded images.
+        """
+        # Limit to avoid excessive processing, as in sequential mode
+        candidates = results[:max_count * 2]
+        if not candidates or max_count <= 0:
+            return 0
+
+        quota = DownloadQuota(max_count)
+        stop_event = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(candidates)),
+                                      thread_name_prefix="ddgs-download")
+
+        def fetch(result: dict) -> bool:
+            if stop_event.is_set() or quota.is_full:
+                return False
+            return self._download_single_image(result, out_dir, quota, stop_event)
+
+        futures = [executor.submit(fetch, result) for result in candidates]
+        try:
+            for future in as_completed(futures):
+                try:
+                    if future.result():
+                        logger.info(
+                            f"Downloaded image from DuckDuckGo [{quota.count}/{max_count}]")
+                except DownloadError as e:
+                    logger.warning(f"Error downloading image: {e}")
+                except Exception as e:
+                    logger.error(
+                        f"An unexpected error occurred during download: {e}")
+
+                if quota.is_full:
+                    stop_event.set()
+                    break
+        finally:
+            stop_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return quota.count
+
     def download(self, keyword: str, out_dir: str, max_num: int) -> Tuple[bool, int]:
         """
         Downloads images using DuckDuckGo search, including fallback mechanisms with alternate keywords.
@@ -350,10 +595,15 @@ class DDGSImageDownloader(ISearchEngineDownloader):
 
         try:
             Path(out_dir).mkdir(parents=True, exist_ok=True)
+            if max_num <= 0:
+                return False, 0
+            self.content_digests = ContentDigestIndex.for_directory(out_dir, self.content_digests)
+            self.download_manifest = DownloadManifest.for_directory(out_dir,
+                                                                    self.download_manifest,
+                                                                    self.content_digests)
 
             # Try with the original keyword first
-            downloaded_count: int = self._search_and_download_sequential(keyword, out_dir,
-                                                                         max_num)
+            downloaded_count: int = self._search_unless_completed(keyword, out_dir, max_num)
 
             # Try additional search terms if we still don't have enough images
             if downloaded_count < max_num:
@@ -372,8 +622,8 @@ class DDGSImageDownloader(ISearchEngineDownloader):
                     logger.info(f"Trying alternate keyword: '{alt_keyword}'")
                     remaining = max_num - downloaded_count
 
-                    # The _search_and_download_sequential function will update our count
-                    additional_count = self._search_and_download_sequential(
+                    # The _search_unless_completed function will update our count
+                    additional_count = self._search_unless_completed(
                         alt_keyword,
                         out_dir,
                         remaining
@@ -400,23 +650,52 @@ def _download_images_with_icrawler(engine_name: str, crawler_class: Type, keywor
     """Generic function to download images using any crawler."""
     start_time = time.time()
     variation_results = []
+    downloaded_so_far = 0
+    counter = getattr(image_downloader, "download_counter", None) or DownloadCounter()
 
     try:
         crawler = crawler_class(
-            storage={'root_dir': out_dir},
+            storage=DigestStorage(out_dir, getattr(image_downloader, "content_digests", None),
+                                  counter),
             log_level=image_downloader.log_level,
             feeder_threads=image_downloader.feeder_threads,
             parser_threads=image_downloader.parser_threads,
             downloader_threads=image_downloader.downloader_threads
         )
+        track_download_attempts(crawler)
+        download_manifest = getattr(image_downloader, "download_manifest", None)
+        if download_manifest is not None:
+            download_manifest.attach(crawler)
+        url_index = getattr(image_downloader, "url_index", None)
+        if url_index is not None:
+            url_index.attach(crawler)
+        # Outermost, so results skipped as already fetched still count as results
+        track_search_results(crawler)
+        yield_stats = getattr(image_downloader, "yield_stats", None)
+        search_cache = getattr(image_downloader, "search_cache", None)
+        if search_cache is not None:
+            search_cache.attach(crawler, engine_name)
+        rate_controller = getattr(image_downloader, "rate_controller", None)
 
         for i, variation in enumerate(variations):
-            if image_downloader.stop_workers or image_downloader.total_downloaded >= max_num:
+            if image_downloader.stop_workers or downloaded_so_far >= max_num:
                 break
+            if download_manifest is not None and download_manifest.is_variation_done(engine_name,
+                                                                                     variation):
+                logger.info(f"{engine_name}: skipping variation completed by an earlier run: "
+                            f"'{variation}'")
+                continue
 
             try:
+                if rate_controller is not None:
+                    rate_controller.acquire(engine_name)
                 current_offset = config.random_offset + (i * config.variation_step)
-                file_idx_offset = image_downloader.total_downloaded
+                with image_downloader.lock:
+                    file_idx_offset = image_downloader.total_downloaded
+                saved_before = counter.count(out_dir)
+                attempts_before = download_attempts_of(crawler)
+                results_before = search_results_of(crawler)
+                set_yield_source(crawler, engine_name, template_of(variation, keyword))
 
                 crawler.crawl(
                     keyword=variation,
@@ -425,14 +704,26 @@ def _download_images_with_icrawler(engine_name: str, crawler_class: Type, keywor
                     offset=current_offset,
                     file_idx_offset=file_idx_offset
                 )
-
-                # Basic count of downloaded files - validation moved to validator package
-                try:
-                    files = [f for f in os.listdir(out_dir) if f.lower().endswith(
-                        ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'))]
-                    downloaded_count = len(files) - file_idx_offset
-                except OSError:
-                    downloaded_count = 0
+                if download_manifest is not None:
+                    download_manifest.complete_variation(engine_name, variation)
+
+                # Counted from the storage's save events - validation moved to validator package
+                downloaded_count = max(0, counter.count(out_dir) - saved_before)
+                downloaded_so_far += downloaded_count
+                with image_downloader.lock:
+                    image_downloader.total_downloaded += downloaded_count
+                if yield_stats is not None:
+                    yield_stats.record(engine_name, template_of(variation, keyword),
+                                       downloaded_count,
+                                       download_attempts_of(crawler) - attempts_before)
+
+                # Only a search that returned nothing counts as empty; one whose results
+                # were all duplicates was answered
+                if rate_controller is not None:
+                    if downloaded_count > 0 or search_results_of(crawler) > results_before:
+                        rate_controller.record_success(engine_name)
+                    else:
+                        rate_controller.record_empty(engine_name)
 
                 variation_results.append(VariationResult(
                     variation=variation,
@@ -496,7 +787,13 @@ def download_baidu_images(keyword: str, variations: List[str], out_dir: str,
                                           image_downloader)
 
 
-def download_images_ddgs(keyword: str, out_dir: str, max_num: int) -> Tuple[bool, int]:
+def download_images_ddgs(keyword: str, out_dir: str, max_num: int,
+                         url_index: Optional[URLIndex] = None,
+                         content_digests: Optional[ContentDigestIndex] = None,
+                         rate_controller: Optional[AdaptiveRateController] = None,
+                         search_cache: Optional[SearchResultCache] = None,
+                         download_counter: Optional[DownloadCounter] = None,
+                         download_manifest: Optional[DownloadManifest] = None) -> Tuple[bool, int]:
     """
     Downloads images directly using the DuckDuckGo search engine.
     This function serves as a wrapper for the `DuckDuckGo` class.
@@ -505,6 +802,13 @@ def download_images_ddgs(keyword: str, out_dir: str, max_num: int) -> Tuple[bool
         keyword (str): The search term for images.
         out_dir (str): The output directory path where images will be saved.
         max_num (int): The maximum number of images to download.
+        url_index (Optional[URLIndex]): Index of URLs already fetched by the job.
+        content_digests (Optional[ContentDigestIndex]): Digests of the images already kept.
+        rate_controller (Optional[AdaptiveRateController]): The job's engine rate controller.
+        search_cache (Optional[SearchResultCache]): Cache of earlier search results.
+        download_counter (Optional[DownloadCounter]): The job's download counter.
+        download_manifest (Optional[DownloadManifest]): Manifest of the output directory, for
+                                                        resuming an interrupted download.
 
     Returns:
         Tuple[bool, int]: A tuple where the first element is True if any images were downloaded,
@@ -515,22 +819,17 @@ def download_images_ddgs(keyword: str, out_dir: str, max_num: int) -> Tuple[bool
         Path(out_dir).mkdir(parents=True, exist_ok=True)
 
         # Initialize the DuckDuckGo downloader
-        ddg_downloader = DDGSImageDownloader()
-
-        # Get the current count of images in the directory
-        initial_count = len([f for f in os.listdir(out_dir) if
-                             f.lower().endswith(('.jpg', '.jpeg', '.png'))])
-
-        logger.info(
-            f"Using DuckDuckGo to download up to {max_num} images for '{keyword}'")
-
-        # Download images
-        _ = ddg_downloader.download(keyword, out_dir, max_num)
-
-        # Get the new count of images
-        final_count = len([f for f in os.listdir(out_dir) if
-                           f.lower().endswith(('.jpg', '.jpeg', '.png'))])
-        actual_downloaded = final_count - initial_count
+        with DDGSImageDownloader(url_index=url_index,
+                                 content_digests=content_digests,
+                                 rate_controller=rate_controller,
+                                 search_cache=search_cache,
+                                 download_counter=download_counter,
+                                 download_manifest=download_manifest) as ddg_downloader:
+            logger.info(
+                f"Using DuckDuckGo to download up to {max_num} images for '{keyword}'")
+
+            # The count comes from the images the downloader reported as saved
+            _, actual_downloaded = ddg_downloader.download(keyword, out_dir, max_num)
 
         logger.info(f"DuckDuckGo download complete: {actual_downloaded} new images")
 
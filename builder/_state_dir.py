@@ -0,0 +1,53 @@
+"""
+Location of the builder's persistent job stores.
+
+The URL index, search result cache and yield history are SQLite stores shared by the
+tasks and jobs writing to the same dataset. They live in the user cache directory,
+keyed by the dataset path, so they are never packed, uploaded or exported with the
+images.
+
+Functions:
+    default_state_dir: Returns the directory holding the stores of every dataset.
+    state_store_path: Returns the path of one store of a dataset directory.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+__all__ = [
+    'default_state_dir',
+    'state_store_path'
+]
+
+
+def default_state_dir() -> Path:
+    """
+    Returns the directory holding the job stores: ``pixcrawler/builder`` in the user cache
+    directory ($XDG_CACHE_HOME, or ~/.cache).
+
+    Returns:
+        Path: The state directory.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pixcrawler" / "builder"
+
+
+def state_store_path(directory: Union[str, Path], filename: str,
+                     state_dir: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Returns the path of a store belonging to a dataset directory, outside that directory.
+
+    Args:
+        directory (Union[str, Path]): The dataset directory the store belongs to.
+        filename (str): File name of the store.
+        state_dir (Optional[Union[str, Path]]): Directory holding the stores; defaults to
+                                                `default_state_dir()`.
+
+    Returns:
+        Path: The store path.
+    """
+    key = hashlib.sha1(os.path.abspath(directory).encode("utf-8")).hexdigest()[:16]
+    root = Path(state_dir) if state_dir is not None else default_state_dir()
+    return root / key / filename
@@ -0,0 +1,354 @@
+"""
+Streaming inspection of image responses for the builder download paths.
+
+Classes:
+    StreamLimits: Size and dimension limits applied while an image body is streamed.
+    ImageStreamValidator: Incrementally validates an image body chunk by chunk.
+
+Functions:
+    sniff_image_format: Detects the image format from the leading magic bytes.
+    read_image_header: Reads the format and dimensions of an image file from its head.
+    stream_response_to_file: Streams a requests response to disk through a validator.
+
+Features:
+    - Rejects responses from their headers (Content-Type, Content-Length) before any
+      body is read.
+    - Rejects HTML error pages and other non-images from the first bytes, and tracking
+      pixels or oversized images from the dimensions in the image header.
+    - Enforces a maximum byte size and pixel count while streaming, so memory use does
+      not grow with the size of the source image.
+    - Accepted bodies are written to a partial file in chunks and only moved into place
+      once the whole body has passed validation.
+    - A stop event aborts a stream between chunks and removes its partial file.
+    - Bodies are hashed as they stream, so exact duplicates are discarded before they
+      are moved into the dataset directory.
+"""
+
+import io
+import os
+import threading
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Callable, Any, Final, Union
+
+from PIL import Image
+
+from ._content_digest import ContentDigestIndex, new_content_hash
+from ._exceptions import DownloadError
+
+__all__ = [
+    'StreamLimits',
+    'ImageStreamValidator',
+    'sniff_image_format',
+    'read_image_header',
+    'stream_response_to_file'
+]
+
+# Leading byte signatures mapped to (format, file extension)
+IMAGE_SIGNATURES: Final[Tuple[Tuple[bytes, str, str], ...]] = (
+    (b'\xff\xd8\xff', 'jpeg', '.jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png', '.png'),
+    (b'GIF87a', 'gif', '.gif'),
+    (b'GIF89a', 'gif', '.gif'),
+    (b'BM', 'bmp', '.bmp'),
+    (b'II*\x00', 'tiff', '.tiff'),
+    (b'MM\x00*', 'tiff', '.tiff'),
+)
+
+# Content types that do not name an image but may still carry one
+GENERIC_CONTENT_TYPES: Final[Tuple[str, ...]] = ('', 'application/octet-stream',
+                                                 'binary/octet-stream')
+
+PARTIAL_SUFFIX: Final[str] = ".part"
+
+
+def sniff_image_format(head: bytes) -> Optional[Tuple[str, str]]:
+    """
+    Detects the image format from the leading bytes of a body.
+
+    Args:
+        head (bytes): The first bytes of the body (at least 12 bytes for WebP).
+
+    Returns:
+        Optional[Tuple[str, str]]: (format, extension), or None if no known signature matches.
+    """
+    if len(head) >= 12 and head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp', '.webp'
+    for signature, image_format, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return image_format, extension
+    return None
+
+
+@dataclass
+class StreamLimits:
+    """
+    Limits applied to an image body while it is streamed.
+
+    Attributes:
+        min_bytes (int): Minimum accepted body size in bytes.
+        max_bytes (int): Maximum accepted body size in bytes.
+        max_pixels (int): Maximum accepted width * height.
+        min_dimensions (Tuple[int, int]): Minimum accepted (width, height).
+        sniff_bytes (int): How many leading bytes may be buffered to find the image header.
+        chunk_size (int): Size of the chunks read from the network.
+    """
+    min_bytes: int = 1000
+    max_bytes: int = 25 * 1024 * 1024
+    max_pixels: int = 40_000_000
+    min_dimensions: Tuple[int, int] = (16, 16)
+    sniff_bytes: int = 64 * 1024
+    chunk_size: int = 64 * 1024
+
+
+class ImageStreamValidator:
+    """
+    Incrementally validates an image body as its chunks arrive.
+
+    Call `check_headers` before reading the body, `feed` for every chunk and `finish`
+    at the end. Every check raises DownloadError as soon as the body can be rejected.
+    """
+
+    def __init__(self, limits: Optional[StreamLimits] = None):
+        """
+        Initializes the ImageStreamValidator.
+
+        Args:
+            limits (Optional[StreamLimits]): The limits to enforce. Defaults to StreamLimits().
+        """
+        self.limits = limits or StreamLimits()
+        self.size = 0
+        self.image_format: Optional[str] = None
+        self.extension: Optional[str] = None
+        self.dimensions: Optional[Tuple[int, int]] = None
+        self._head: Optional[bytearray] = bytearray()
+        self._content_hash = new_content_hash()
+
+    def check_headers(self, content_type: Optional[str],
+                      content_length: Optional[str]) -> None:
+        """
+        Rejects a response from its headers alone.
+
+        Args:
+            content_type (Optional[str]): The Content-Type header value.
+            content_length (Optional[str]): The Content-Length header value.
+
+        Raises:
+            DownloadError: If the headers show the body cannot be an acceptable image.
+        """
+        media_type = (content_type or '').split(';')[0].strip().lower()
+        if not media_type.startswith('image/') and media_type not in GENERIC_CONTENT_TYPES:
+            raise DownloadError(f"Skipping non-image content type: {media_type}")
+
+        if content_length and content_length.isdigit():
+            length = int(content_length)
+            if length > self.limits.max_bytes:
+                raise DownloadError(f"Skipping too large image ({length} bytes)")
+            if length < self.limits.min_bytes:
+                raise DownloadError(f"Skipping too small image ({length} bytes)")
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Validates the next chunk of the body.
+
+        Args:
+            chunk (bytes): The chunk just received.
+
+        Raises:
+            DownloadError: If the body exceeds the byte limit, is not an image, or
+                           its header shows dimensions outside the limits.
+        """
+        self.size += len(chunk)
+        if self.size > self.limits.max_bytes:
+            raise DownloadError(f"Skipping image larger than {self.limits.max_bytes} bytes")
+        self._content_hash.update(chunk)
+
+        if self._head is None:
+            return
+
+        self._head.extend(chunk)
+        if self.image_format is None:
+            if len(self._head) < 12:
+                return
+            sniffed = sniff_image_format(bytes(self._head))
+            if sniffed is None:
+                raise DownloadError("Skipping body without a known image signature")
+            self.image_format, self.extension = sniffed
+
+        self._probe_dimensions()
+
+    def _probe_dimensions(self) -> None:
+        """
+        Reads the image dimensions from the buffered head once it contains the header.
+
+        Only the header is parsed; no pixel data is decoded. The buffer is released once
+        the dimensions are known or `sniff_bytes` have been seen without finding them.
+
+        Raises:
+            DownloadError: If the dimensions are outside the limits.
+        """
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+                with Image.open(io.BytesIO(self._head)) as image:
+                    self.dimensions = image.size
+        except Image.DecompressionBombError as e:
+            raise DownloadError(f"Skipping image with too many pixels: {e}") from e
+        except Exception:
+            # Header not complete yet; give up once the sniff window is exhausted
+            if len(self._head) >= self.limits.sniff_bytes:
+                self._head = None
+            return
+
+        self._head = None
+        width, height = self.dimensions
+        min_width, min_height = self.limits.min_dimensions
+        if width < min_width or height < min_height:
+            raise DownloadError(f"Skipping too small image ({width}x{height})")
+        if width * height > self.limits.max_pixels:
+            raise DownloadError(f"Skipping image with too many pixels ({width}x{height})")
+
+    @property
+    def content_hash(self) -> str:
+        """
+        Returns the digest of the bytes fed so far.
+
+        Returns:
+            str: The hex content digest.
+        """
+        return self._content_hash.hexdigest()
+
+    def finish(self) -> None:
+        """
+        Applies the checks that need the complete body.
+
+        Raises:
+            DownloadError: If the body is too small or was never identified as an image.
+        """
+        if self.size < self.limits.min_bytes:
+            raise DownloadError(f"Skipping too small image ({self.size} bytes)")
+        if self.image_format is None:
+            raise DownloadError("Skipping body without a known image signature")
+
+
+def read_image_header(path: Union[str, Path],
+                      limits: Optional[StreamLimits] = None) -> Tuple[Optional[str],
+                                                                     Optional[Tuple[int, int]]]:
+    """
+    Reads the format and dimensions of an image file from its leading bytes only.
+
+    At most `sniff_bytes` are read and only the header in them is parsed, so the cost does
+    not grow with the size of the image.
+
+    Args:
+        path (Union[str, Path]): The image file.
+        limits (Optional[StreamLimits]): Limits whose `sniff_bytes` bound the read.
+
+    Returns:
+        Tuple[Optional[str], Optional[Tuple[int, int]]]: The lower-case format, or None if
+            the file is not a recognizable image, and the (width, height), or None if the
+            header does not fit in the bytes read.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    limits = limits or StreamLimits()
+    with open(path, "rb") as f:
+        head = f.read(limits.sniff_bytes)
+    sniffed = sniff_image_format(head)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            with Image.open(io.BytesIO(head)) as image:
+                image_format = image.format or (sniffed[0] if sniffed else None)
+                return (image_format.lower() if image_format else None), image.size
+    except Exception:
+        return (sniffed[0] if sniffed else None), None
+
+
+def stream_response_to_file(response: Any, file_path: str,
+                            limits: Optional[StreamLimits] = None,
+                            commit: Optional[Callable[[], bool]] = None,
+                            digests: Optional[ContentDigestIndex] = None,
+                            rollback: Optional[Callable[[], object]] = None,
+                            stop_event: Optional[threading.Event] = None) -> Optional[str]:
+    """
+    Streams a `requests` response opened with `stream=True` to disk through a validator.
+
+    The body is hashed and written to a partial file next to `file_path`. Once it has
+    passed every check it is moved into place with the extension of the detected format.
+    Bodies whose digest is already in `digests` are discarded as duplicates. `commit` is
+    called just before the move; if it returns False the body is discarded. If the move
+    fails after `commit` succeeded, `rollback` undoes the reservation. Once `stop_event`
+    is set, the stream is abandoned at the next chunk and the partial file removed.
+
+    Args:
+        response (Any): A requests.Response opened with stream=True.
+        file_path (str): The destination path; its extension is replaced by the detected one.
+        limits (Optional[StreamLimits]): The limits to enforce.
+        commit (Optional[Callable[[], bool]]): Last-moment check, e.g. a quota reservation.
+        digests (Optional[ContentDigestIndex]): The job's content digest index.
+        rollback (Optional[Callable[[], object]]): Undoes `commit`, e.g. releases the quota slot.
+        stop_event (Optional[threading.Event]): Cancels the download when set, e.g. once the
+                                                quota is full.
+
+    Returns:
+        Optional[str]: The final file path, or None if `commit` declined the image or the
+                       download was cancelled.
+
+    Raises:
+        DownloadError: If the response is rejected or duplicates a kept image.
+        OSError: If the file cannot be written.
+    """
+    validator = ImageStreamValidator(limits)
+    validator.check_headers(response.headers.get('Content-Type'),
+                            response.headers.get('Content-Length'))
+
+    partial_path = file_path + PARTIAL_SUFFIX
+    try:
+        cancelled = False
+        with open(partial_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=validator.limits.chunk_size):
+                if stop_event is not None and stop_event.is_set():
+                    cancelled = True
+                    break
+                if not chunk:
+                    continue
+                validator.feed(chunk)
+                f.write(chunk)
+        if cancelled:
+            os.remove(partial_path)
+            return None
+        validator.finish()
+
+        digest = validator.content_hash
+        if digests is not None and not digests.claim(digest):
+            raise DownloadError("Skipping duplicate image content")
+
+        if commit is not None and not commit():
+            if digests is not None:
+                digests.release(digest)
+            os.remove(partial_path)
+            return None
+
+        final_path = os.path.splitext(file_path)[0] + validator.extension
+        try:
+            os.replace(partial_path, final_path)
+        except OSError:
+            if digests is not None:
+                digests.release(digest)
+            if commit is not None and rollback is not None:
+                rollback()
+            raise
+
+        if digests is not None:
+            digests.record(Path(os.path.relpath(final_path, digests.directory)).as_posix(),
+                           digest, validator.size)
+        return final_path
+    except BaseException:
+        try:
+            os.remove(partial_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,337 @@
+"""
+URL de-duplication index shared by the builder download paths.
+
+Classes:
+    BloomFilter: Fixed-size, thread-safe Bloom filter over URL fingerprints.
+    URLIndex: Records every image URL a job has fetched and skips repeats.
+
+Functions:
+    normalize_url: Reduces a URL to the form used for de-duplication.
+    url_fingerprint: Hashes a normalized URL to a fixed-size fingerprint.
+
+Features:
+    - The same image URL returned by several variations or engines is fetched once.
+    - In-memory Bloom filter per job for constant-memory membership checks.
+    - Optional SQLite store, so separate tasks and jobs writing to the same dataset
+      skip URLs any of them has already fetched.
+    - Counts skipped fetches so the builder can report them.
+    - URLs whose fetch did not end in a saved image are forgotten again, so retries in
+      the same job and later jobs sharing the store fetch them.
+"""
+
+import hashlib
+import math
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Any, Final, Set, Union
+from urllib.parse import urlsplit, urlunsplit
+
+from ._constants import logger
+from ._state_dir import state_store_path
+
+__all__ = [
+    'BloomFilter',
+    'URLIndex',
+    'normalize_url',
+    'url_fingerprint',
+    'URL_INDEX_FILENAME'
+]
+
+URL_INDEX_FILENAME: Final[str] = "url_index.sqlite"
+
+DEFAULT_PORTS: Final[dict] = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Reduces a URL to the form used for de-duplication.
+
+    The scheme and host are lower-cased, default ports and fragments are dropped.
+    Path and query are kept as-is since they usually identify the image.
+
+    Args:
+        url (str): The URL to normalize.
+
+    Returns:
+        str: The normalized URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    netloc = host
+    if parts.port is not None and DEFAULT_PORTS.get(scheme) != parts.port:
+        netloc = f"{host}:{parts.port}"
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+def url_fingerprint(url: str) -> bytes:
+    """
+    Hashes a normalized URL to a 16-byte fingerprint.
+
+    Args:
+        url (str): The URL to fingerprint.
+
+    Returns:
+        bytes: The fingerprint.
+    """
+    return hashlib.blake2b(normalize_url(url).encode('utf-8'), digest_size=16).digest()
+
+
+class BloomFilter:
+    """
+    Fixed-size, thread-safe Bloom filter over 16-byte fingerprints.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        """
+        Initializes the BloomFilter.
+
+        Args:
+            capacity (int): The number of items the filter is sized for.
+            error_rate (float): The false-positive rate at full capacity.
+        """
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1")
+
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, fingerprint: bytes):
+        """
+        Derives the bit positions of a fingerprint by double hashing.
+
+        Args:
+            fingerprint (bytes): The 16-byte fingerprint.
+
+        Returns:
+            Iterator[int]: The bit positions.
+        """
+        h1 = int.from_bytes(fingerprint[:8], 'little')
+        h2 = int.from_bytes(fingerprint[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, fingerprint: bytes) -> bool:
+        """
+        Adds a fingerprint.
+
+        Args:
+            fingerprint (bytes): The 16-byte fingerprint.
+
+        Returns:
+            bool: True if the fingerprint may have been present already, False if it was new.
+        """
+        present = True
+        with self._lock:
+            for position in self._positions(fingerprint):
+                byte, mask = position >> 3, 1 << (position & 7)
+                if not self._bits[byte] & mask:
+                    present = False
+                    self._bits[byte] |= mask
+        return present
+
+    def __contains__(self, fingerprint: bytes) -> bool:
+        with self._lock:
+            return all(self._bits[position >> 3] & (1 << (position & 7))
+                       for position in self._positions(fingerprint))
+
+
+class URLIndex:
+    """
+    Records the image URLs fetched by a job so repeats are skipped before any request.
+
+    Membership is checked in an in-memory Bloom filter. When a store path is given,
+    fingerprints are also kept in SQLite, so other tasks and later jobs sharing that
+    store skip URLs fetched there too. A URL is claimed when its fetch starts; callers
+    `forget` it when the fetch fails or the image is not saved.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001,
+                 store_path: Optional[Union[str, Path]] = None):
+        """
+        Initializes the URLIndex.
+
+        Args:
+            capacity (int): The number of URLs the Bloom filter is sized for.
+            error_rate (float): The Bloom filter false-positive rate at full capacity.
+            store_path (Optional[Union[str, Path]]): Optional SQLite file for a persistent store.
+        """
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.store_path = Path(store_path) if store_path else None
+        self.checked = 0
+        self.skipped = 0
+        self._readmitted: Set[bytes] = set()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if self.store_path is not None:
+            self._conn = self._open_store(self.store_path)
+
+    @classmethod
+    def for_directory(cls, directory: Union[str, Path],
+                      state_dir: Optional[Union[str, Path]] = None, **kwargs) -> "URLIndex":
+        """
+        Creates the index of a dataset directory, stored outside that directory.
+
+        Args:
+            directory (Union[str, Path]): The dataset output directory.
+            state_dir (Optional[Union[str, Path]]): Directory holding the stores; defaults
+                                                    to `default_state_dir()`.
+            **kwargs: Passed on to the constructor.
+
+        Returns:
+            URLIndex: The index.
+        """
+        return cls(store_path=state_store_path(directory, URL_INDEX_FILENAME, state_dir),
+                   **kwargs)
+
+    @staticmethod
+    def _open_store(path: Path) -> Optional[sqlite3.Connection]:
+        """
+        Opens the SQLite store, creating it if needed.
+
+        Args:
+            path (Path): The SQLite file.
+
+        Returns:
+            Optional[sqlite3.Connection]: The connection, or None if the store cannot be opened.
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS urls (fingerprint BLOB PRIMARY KEY)")
+            return conn
+        except sqlite3.Error as e:
+            logger.warning(f"URL index store unavailable at {path}, using memory only: {e}")
+            return None
+
+    def check_and_add(self, url: str) -> bool:
+        """
+        Records a URL and reports whether it should be fetched.
+
+        Args:
+            url (str): The image URL about to be fetched.
+
+        Returns:
+            bool: True if the URL is new and should be fetched, False if it was seen before.
+        """
+        fingerprint = url_fingerprint(url)
+        is_new = not self.bloom.add(fingerprint)
+
+        if is_new and self._conn is not None:
+            is_new = self._insert(fingerprint)
+
+        readmitted = False
+        with self._lock:
+            if not is_new and fingerprint in self._readmitted:
+                self._readmitted.discard(fingerprint)
+                is_new = readmitted = True
+            self.checked += 1
+            if not is_new:
+                self.skipped += 1
+        if readmitted and self._conn is not None:
+            # Claimed again, so other tasks sharing the store skip it while it is fetched
+            self._insert(fingerprint)
+        return is_new
+
+    def forget(self, url: str) -> None:
+        """
+        Rolls back the claim on a URL whose fetch failed or whose image was not saved.
+
+        The URL is removed from the persistent store and passes this index's next check,
+        so a retry in this job or a later job sharing the store fetches it again.
+
+        Args:
+            url (str): The image URL.
+        """
+        fingerprint = url_fingerprint(url)
+        with self._lock:
+            self._readmitted.add(fingerprint)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute("DELETE FROM urls WHERE fingerprint = ?", (fingerprint,))
+            except sqlite3.Error as e:
+                logger.debug(f"URL index store delete failed: {e}")
+
+    def readmit(self, url: str) -> None:
+        """
+        Lets a URL that was recorded but never fetched to completion pass the next check once.
+
+        Used when resuming an interrupted download, whose in-flight URLs are already in the index.
+
+        Args:
+            url (str): The image URL.
+        """
+        with self._lock:
+            self._readmitted.add(url_fingerprint(url))
+
+    def _insert(self, fingerprint: bytes) -> bool:
+        """
+        Inserts a fingerprint into the persistent store.
+
+        Args:
+            fingerprint (bytes): The fingerprint.
+
+        Returns:
+            bool: True if it was not in the store yet.
+        """
+        try:
+            with self._lock:
+                if self._conn is None:
+                    return True
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO urls (fingerprint) VALUES (?)", (fingerprint,))
+            return cursor.rowcount == 1
+        except sqlite3.Error as e:
+            logger.debug(f"URL index store write failed: {e}")
+            return True
+
+    def attach(self, crawler: Any) -> None:
+        """
+        Makes an iCrawler crawler skip URLs already in the index before requesting them.
+
+        Args:
+            crawler (Any): The iCrawler crawler instance.
+        """
+        downloader = getattr(crawler, "downloader", None)
+        if downloader is None or getattr(downloader, "_url_index", None) is self:
+            return
+
+        original_download = downloader.download
+
+        def download_unseen(task, *args, **kwargs):
+            url = task["file_url"]
+            if not self.check_and_add(url):
+                task["success"] = False
+                task["filename"] = None
+                return
+            try:
+                result = original_download(task, *args, **kwargs)
+            except BaseException:
+                self.forget(url)
+                raise
+            # Timeouts, HTTP errors and rejected images leave the task unsuccessful
+            if not (task.get("success") and task.get("filename")):
+                self.forget(url)
+            return result
+
+        downloader.download = download_unseen
+        downloader._url_index = self
+
+    def close(self) -> None:
+        """
+        Closes the persistent store, if any.
+        """
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        return self.checked - self.skipped
@@ -0,0 +1,279 @@
+"""
+Job-isolated crawl workspaces with sharded dataset storage.
+
+Classes:
+    CrawlWorkspace: On-disk layout of one crawl job, with a private write area per chunk.
+
+Functions:
+    chunk_id: Builds the stable directory name of a keyword/engine chunk.
+
+Features:
+    - Every keyword x engine chunk writes into its own directory, so concurrent tasks never
+      collide on file names and sequential renaming only ever touches the chunk's own files.
+    - Finished chunks are published into a hash-prefix sharded dataset directory by
+      hard-linking, which keeps every directory small at 100k+ images per job.
+    - Each chunk writes its own manifest with an atomic replace; the job manifest is the
+      concatenation of the chunk manifests, written the same way.
+    - Job-wide state (URL index, search cache, yield history) lives at the workspace root so
+      chunks still share it.
+    - Published images go through the shared content store next to the workspaces, so an
+      image crawled by several jobs is kept on disk once.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union, Final
+
+from ._constants import logger, IMAGE_EXTENSIONS
+from ._content_digest import ContentDigestIndex
+from ._content_store import ContentStore
+
+__all__ = [
+    'CrawlWorkspace',
+    'chunk_id',
+    'WORKSPACE_CHUNKS_DIR',
+    'WORKSPACE_DATASET_DIR',
+    'WORKSPACE_MANIFEST'
+]
+
+WORKSPACE_CHUNKS_DIR: Final[str] = "chunks"
+WORKSPACE_DATASET_DIR: Final[str] = "dataset"
+WORKSPACE_MANIFEST: Final[str] = "manifest.jsonl"
+CHUNK_MANIFESTS_DIR: Final[str] = ".manifests"
+
+# 256 shard directories keep ~400 files per directory at 100k images
+DEFAULT_SHARD_LEVELS: Final[int] = 1
+
+
+def chunk_id(keyword: str, engine: str) -> str:
+    """
+    Builds the directory name of a keyword/engine chunk.
+
+    The name is readable but also carries a short hash of the keyword, so keywords that
+    slugify to the same text still get separate directories.
+
+    Args:
+        keyword (str): Search keyword of the chunk.
+        engine (str): Search engine of the chunk.
+
+    Returns:
+        str: The chunk identifier.
+    """
+    slug = re.sub(r'[^a-z0-9]+', '_', keyword.lower()).strip('_')[:48] or 'keyword'
+    suffix = hashlib.blake2b(keyword.encode('utf-8'), digest_size=4).hexdigest()
+    return f"{engine.lower()}-{slug}-{suffix}"
+
+
+class CrawlWorkspace:
+    """
+    On-disk layout of one crawl job.
+
+    Layout::
+
+        <root>/chunks/<chunk_id>/       private write area of one keyword x engine task
+        <root>/dataset/<ab>/<file>      published images, sharded by a hash prefix
+        <root>/.manifests/<chunk_id>.jsonl
+        <root>/manifest.jsonl           final dataset view
+
+    With a content store, dataset files are hard links to the store's blobs and manifest
+    entries carry the blob key.
+    """
+
+    def __init__(self, root: Union[str, Path], shard_levels: int = DEFAULT_SHARD_LEVELS,
+                 content_store: Optional[ContentStore] = None):
+        """
+        Initializes the workspace.
+
+        Args:
+            root (Union[str, Path]): Root directory of the job.
+            shard_levels (int): Number of two-hex-digit directory levels in the dataset.
+            content_store (Optional[ContentStore]): Store that published images are added to.
+        """
+        self.root = Path(root)
+        self.shard_levels = max(0, shard_levels)
+        self.content_store = content_store
+        self.chunks_dir = self.root / WORKSPACE_CHUNKS_DIR
+        self.dataset_dir = self.root / WORKSPACE_DATASET_DIR
+        self.manifests_dir = self.root / CHUNK_MANIFESTS_DIR
+        self.manifest_path = self.root / WORKSPACE_MANIFEST
+
+    @classmethod
+    def for_job(cls, job_id: Union[int, str], base_dir: Optional[Union[str, Path]] = None,
+                shard_levels: int = DEFAULT_SHARD_LEVELS) -> 'CrawlWorkspace':
+        """
+        Returns the workspace of a crawl job, using the content store shared by all jobs.
+
+        Args:
+            job_id (Union[int, str]): The crawl job ID.
+            base_dir (Optional[Union[str, Path]]): Parent directory; defaults to the temp directory.
+            shard_levels (int): Number of shard directory levels.
+
+        Returns:
+            CrawlWorkspace: The job's workspace.
+        """
+        base = Path(base_dir) if base_dir is not None else Path(tempfile.gettempdir())
+        return cls(base / f"crawl_{job_id}", shard_levels=shard_levels,
+                   content_store=ContentStore.beside(base))
+
+    @classmethod
+    def containing(cls, directory: Union[str, Path]) -> Optional['CrawlWorkspace']:
+        """
+        Returns the workspace a chunk directory belongs to.
+
+        Args:
+            directory (Union[str, Path]): A directory that may be a workspace chunk.
+
+        Returns:
+            Optional[CrawlWorkspace]: The workspace, or None for a plain output directory.
+        """
+        path = Path(directory)
+        if path.parent.name == WORKSPACE_CHUNKS_DIR:
+            root = path.parent.parent
+            return cls(root, content_store=ContentStore.beside(root.parent))
+        return None
+
+    def chunk_dir(self, keyword: str, engine: str) -> Path:
+        """
+        Returns the private write directory of a keyword/engine chunk.
+
+        Args:
+            keyword (str): Search keyword of the chunk.
+            engine (str): Search engine of the chunk.
+
+        Returns:
+            Path: The chunk directory; it is created by the task that writes to it.
+        """
+        return self.chunks_dir / chunk_id(keyword, engine)
+
+    def shard_dir(self, key: str) -> Path:
+        """
+        Returns the dataset shard directory for a key.
+
+        Args:
+            key (str): Key the shard is derived from, e.g. the published file name.
+
+        Returns:
+            Path: The shard directory.
+        """
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+        parts = [digest[2 * level:2 * level + 2] for level in range(self.shard_levels)]
+        return self.dataset_dir.joinpath(*parts)
+
+    def publish_chunk(self, directory: Union[str, Path],
+                      metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Publishes the images of a finished chunk into the sharded dataset.
+
+        Images are hard-linked (copied across file systems), so publishing is cheap and
+        leaves the chunk intact for retries. With a content store, each image is added to the
+        store first and the dataset file links to its blob. Publishing the same chunk again replaces its
+        manifest, skips files that are already in place and relinks files that changed.
+
+        Args:
+            directory (Union[str, Path]): The chunk directory.
+            metadata (Optional[Dict[str, Any]]): Extra fields stored on every manifest entry,
+                such as the keyword and engine.
+
+        Returns:
+            int: Number of images in the chunk's manifest.
+        """
+        directory = Path(directory)
+        name = directory.name
+        digests = ContentDigestIndex(directory)
+        entries: List[Dict[str, Any]] = []
+
+        try:
+            files = sorted((entry for entry in os.scandir(directory)
+                            if entry.is_file() and Path(entry.name).suffix.lower() in IMAGE_EXTENSIONS),
+                           key=lambda entry: entry.name)
+        except FileNotFoundError:
+            files = []
+
+        for entry in files:
+            published_name = f"{name}_{entry.name}"
+            target = self.shard_dir(published_name) / published_name
+            digest = digests.current_digest(entry.name)
+            blob = None
+            if self.content_store is not None:
+                digest = digest or ContentStore.digest_file(entry.path)
+                blob, _ = self.content_store.put(entry.path, digest)
+                self.content_store.link(blob, target)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if target.exists() and not os.path.samefile(entry.path, target):
+                    # A retried chunk renamed its files; the old link points at other bytes
+                    target.unlink()
+                if not target.exists():
+                    try:
+                        os.link(entry.path, target)
+                    except FileExistsError:
+                        pass
+                    except OSError:
+                        shutil.copy2(entry.path, target)
+            entries.append({
+                'path': target.relative_to(self.root).as_posix(),
+                'chunk': name,
+                'source': entry.name,
+                'size': entry.stat().st_size,
+                'hash': digest,
+                'blob': blob,
+                **(metadata or {})
+            })
+
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        self._write_lines(self.manifests_dir / f"{name}.jsonl", entries)
+        logger.info(f"Published {len(entries)} images from chunk {name}")
+        return len(entries)
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the manifest entries of every published chunk.
+
+        Yields:
+            Dict[str, Any]: One entry per published image.
+        """
+        if not self.manifests_dir.is_dir():
+            return
+        for manifest in sorted(self.manifests_dir.glob('*.jsonl')):
+            with open(manifest, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def write_manifest(self) -> Path:
+        """
+        Writes the job manifest from the published chunk manifests.
+
+        Returns:
+            Path: Path of the job manifest.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._write_lines(self.manifest_path, self.iter_entries())
+        return self.manifest_path
+
+    @staticmethod
+    def _write_lines(path: Path, entries: Any) -> None:
+        """
+        Writes JSON lines to a temporary file and atomically moves it into place.
+
+        Args:
+            path (Path): Destination file.
+            entries (Any): Iterable of JSON-serializable entries.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + '\n')
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
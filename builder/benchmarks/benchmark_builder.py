@@ -0,0 +1,258 @@
+"""
+Offline throughput benchmark of the builder's download paths.
+
+Runs `ImageDownloader.download`, `DDGSImageDownloader.download` and `Builder.generate`
+against a replay server answering from a cassette (see `builder.benchmarks.replay`) and
+reports images per second, response bytes per second, requests per image and peak RSS
+for each. Every run happens in a fresh process, so peak RSS belongs to that run alone
+and no cache or connection pool carries over between runs.
+
+Without a cassette, one of generated images is created for the keywords. `--record`
+captures live traffic into the cassette first, so later runs replay real engines.
+
+Usage:
+    python -m builder.benchmarks.benchmark_builder --keywords cat dog --max-num 30 --profile typical
+    python -m builder.benchmarks.benchmark_builder --cassette ./cassette --record --keywords cat
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Sequence
+
+from builder._constants import IMAGE_EXTENSIONS
+from builder.benchmarks.replay import Cassette, PROFILES, ReplayServer, recording, replaying, \
+    synthesize_cassette
+
+TARGETS = ("image_downloader", "ddgs", "builder")
+
+
+@dataclass
+class RunResult:
+    """Measurements of one benchmark run."""
+    target: str
+    seconds: float
+    images: int
+    requests: int = 0
+    response_bytes: int = 0
+    peak_rss: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def images_per_second(self) -> float:
+        return self.images / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.response_bytes / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def requests_per_image(self) -> float:
+        return self.requests / self.images if self.images else float("inf")
+
+
+@dataclass
+class TargetSummary:
+    """Runs collected for one benchmark target."""
+    target: str
+    runs: List[RunResult] = field(default_factory=list)
+
+    def median(self, metric: str) -> float:
+        values = [getattr(run, metric) for run in self.runs
+                  if run.error is None and getattr(run, metric) is not None]
+        return statistics.median(values) if values else 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "target": self.target,
+            "images_per_second": self.median("images_per_second"),
+            "bytes_per_second": self.median("bytes_per_second"),
+            "requests_per_image": self.median("requests_per_image"),
+            "peak_rss": max((run.peak_rss or 0 for run in self.runs), default=0),
+            "runs": [asdict(run) for run in self.runs],
+        }
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of the current process, or None where it is unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _count_images(directory: str) -> int:
+    """Count the image files below a directory."""
+    count = 0
+    for _, _, files in os.walk(directory):
+        count += sum(1 for name in files if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS)
+    return count
+
+
+def _run_target(target: str, keywords: Sequence[str], max_num: int, out_dir: str) -> None:
+    """Run one benchmark target for all keywords into an output directory."""
+    if target == "image_downloader":
+        from builder._downloader import ImageDownloader
+
+        downloader = ImageDownloader()
+        for keyword in keywords:
+            downloader.download(keyword, os.path.join(out_dir, keyword), max_num)
+    elif target == "ddgs":
+        from builder._search_engines import DDGSImageDownloader
+
+        with DDGSImageDownloader() as downloader:
+            for keyword in keywords:
+                downloader.download(keyword, os.path.join(out_dir, keyword), max_num)
+    elif target == "builder":
+        from builder._builder import Builder
+
+        config_path = os.path.join(out_dir, "benchmark_config.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({"dataset_name": "benchmark", "categories": {"benchmark": list(keywords)}}, f)
+        Builder(config_path=config_path, max_images=max_num,
+                output_dir=os.path.join(out_dir, "dataset"), max_retries=1,
+                cache_file=os.path.join(out_dir, "progress_cache.json"),
+                keyword_generation="disabled", generate_labels=False).generate()
+    else:
+        raise ValueError(f"Unknown benchmark target: {target}")
+
+
+def _child_run(target: str, keywords: Sequence[str], max_num: int, server_url: Optional[str],
+               cassette_dir: Optional[str], results) -> None:
+    """
+    Entry point of a benchmark process: runs a target under replay, or under recording
+    when a cassette directory is given, and reports its timings.
+    """
+    out_dir = tempfile.mkdtemp(prefix="pixcrawler_bench_")
+    error = None
+    start = time.perf_counter()
+    try:
+        if cassette_dir is not None:
+            with recording(Cassette(cassette_dir)):
+                _run_target(target, keywords, max_num, out_dir)
+        else:
+            with replaying(server_url):
+                _run_target(target, keywords, max_num, out_dir)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start
+    try:
+        results.put(RunResult(target, elapsed, _count_images(out_dir),
+                              peak_rss=_peak_rss_bytes(), error=error))
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def _in_fresh_process(target: str, keywords: Sequence[str], max_num: int,
+                      server_url: Optional[str] = None,
+                      cassette_dir: Optional[str] = None) -> RunResult:
+    """Run `_child_run` in a spawned process and return its result."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_child_run,
+                              args=(target, keywords, max_num, server_url, cassette_dir, results))
+    process.start()
+    try:
+        result = results.get()
+    except Exception as e:
+        result = RunResult(target, 0.0, 0, error=f"benchmark process failed: {e}")
+    process.join()
+    return result
+
+
+def run_benchmarks(cassette: Cassette, keywords: Sequence[str], max_num: int,
+                   targets: Sequence[str] = TARGETS, profile: str = "ideal",
+                   rounds: int = 1) -> Dict[str, TargetSummary]:
+    """
+    Runs every target against a replay server and collects the measurements.
+
+    Args:
+        cassette (Cassette): The captured responses to serve.
+        keywords (Sequence[str]): The keywords every target downloads.
+        max_num (int): Images to download per keyword.
+        targets (Sequence[str]): The targets to run, from TARGETS.
+        profile (str): Name of the replay profile in PROFILES.
+        rounds (int): Runs per target.
+
+    Returns:
+        Dict[str, TargetSummary]: The runs of each target.
+    """
+    summaries = {target: TargetSummary(target) for target in targets}
+    with ReplayServer(cassette, PROFILES[profile]) as server:
+        for round_index in range(rounds):
+            for target in targets:
+                server.reset_stats()
+                result = _in_fresh_process(target, keywords, max_num, server_url=server.url)
+                stats = server.reset_stats()
+                result.requests = stats.requests
+                result.response_bytes = stats.bytes_sent
+                summaries[target].runs.append(result)
+                status = f" ({result.error})" if result.error else ""
+                print(f"[round {round_index + 1}] {target:<17}{result.images:>5} images in "
+                      f"{result.seconds:.2f}s, {result.requests} requests, "
+                      f"{stats.misses} misses, {stats.throttled} throttled{status}")
+    return summaries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark builder downloads against replayed traffic")
+    parser.add_argument("--keywords", nargs="+", default=["cat", "mountain landscape"])
+    parser.add_argument("--max-num", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="ideal")
+    parser.add_argument("--cassette", help="Cassette directory; generated images if not given")
+    parser.add_argument("--record", action="store_true",
+                        help="Record live traffic of the targets into the cassette first")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    temp_cassette = None
+    if args.cassette is None:
+        if args.record:
+            parser.error("--record needs --cassette")
+        temp_cassette = tempfile.mkdtemp(prefix="pixcrawler_cassette_")
+        cassette = synthesize_cassette(temp_cassette, args.keywords,
+                                       images_per_keyword=args.max_num * 2)
+    else:
+        if args.record:
+            for target in args.targets:
+                result = _in_fresh_process(target, args.keywords, args.max_num,
+                                           cassette_dir=args.cassette)
+                print(f"[record] {target}: {result.images} images"
+                      + (f" ({result.error})" if result.error else ""))
+        cassette = Cassette(args.cassette)
+
+    try:
+        summaries = run_benchmarks(cassette, args.keywords, args.max_num, args.targets,
+                                   args.profile, args.rounds)
+    finally:
+        if temp_cassette is not None:
+            shutil.rmtree(temp_cassette, ignore_errors=True)
+
+    print()
+    print(f"{'target':<19}{'img/s':>9}{'MB/s':>9}{'req/img':>9}{'peak RSS MB':>13}")
+    for summary in summaries.values():
+        row = summary.to_dict()
+        print(f"{summary.target:<19}{row['images_per_second']:>9.2f}"
+              f"{row['bytes_per_second'] / 1e6:>9.2f}{row['requests_per_image']:>9.2f}"
+              f"{row['peak_rss'] / 1e6:>13.1f}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"profile": args.profile, "keywords": args.keywords, "max_num": args.max_num,
+                       "results": [summary.to_dict() for summary in summaries.values()]}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark of sequential versus parallel search engine processing.
+
+Runs the engine stage of ImageDownloader (without the DuckDuckGo fallback) for a
+set of keywords in both modes and reports wall time and throughput, so that a
+regression of the parallel mode against the sequential one is easy to spot.
+
+Usage:
+    python -m builder.benchmarks.benchmark_engine_modes --keywords cat dog --max-num 40 --rounds 2
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import List
+
+from builder._constants import IMAGE_EXTENSIONS
+from builder._downloader import ImageDownloader
+
+
+@dataclass
+class ModeResult:
+    """Timings and counts collected for one engine mode."""
+    mode: str
+    durations: List[float] = field(default_factory=list)
+    downloaded: List[int] = field(default_factory=list)
+
+    @property
+    def median_duration(self) -> float:
+        return statistics.median(self.durations) if self.durations else 0.0
+
+    @property
+    def throughput(self) -> float:
+        total_time = sum(self.durations)
+        return sum(self.downloaded) / total_time if total_time > 0 else 0.0
+
+
+def run_engines_once(keyword: str, max_num: int, parallel: bool) -> tuple:
+    """Run the engine stage once into a throwaway directory and return (seconds, images)."""
+    downloader = ImageDownloader(parallel_engines=parallel)
+    variations = [template.format(keyword=keyword) for template in downloader.search_variations]
+    out_dir = tempfile.mkdtemp(prefix="pixcrawler_bench_")
+
+    try:
+        start = time.perf_counter()
+        if parallel:
+            downloader.engine_processor.download_with_parallel_engines(keyword, variations,
+                                                                       out_dir, max_num)
+        else:
+            downloader.engine_processor.download_with_sequential_engines(keyword, variations,
+                                                                         out_dir, max_num)
+        elapsed = time.perf_counter() - start
+        images = sum(1 for _ in _iter_images(out_dir))
+        return elapsed, images
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def _iter_images(directory: str):
+    """Yield the image files directly inside a directory."""
+    for entry in os.scandir(directory):
+        if entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+            yield entry
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs parallel engine modes")
+    parser.add_argument("--keywords", nargs="+", default=["cat", "mountain landscape"])
+    parser.add_argument("--max-num", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=1)
+    args = parser.parse_args()
+
+    results = {mode: ModeResult(mode) for mode in ("sequential", "parallel")}
+
+    for round_index in range(args.rounds):
+        for keyword in args.keywords:
+            # Alternate the order so neither mode always runs against a cold or warm cache
+            modes = ["sequential", "parallel"] if round_index % 2 == 0 else ["parallel", "sequential"]
+            for mode in modes:
+                elapsed, images = run_engines_once(keyword, args.max_num, mode == "parallel")
+                results[mode].durations.append(elapsed)
+                results[mode].downloaded.append(images)
+                print(f"[round {round_index + 1}] {mode:<10} '{keyword}': "
+                      f"{images}/{args.max_num} images in {elapsed:.2f}s")
+
+    print()
+    print(f"{'mode':<12}{'median s':>10}{'images':>10}{'img/s':>10}")
+    for result in results.values():
+        print(f"{result.mode:<12}{result.median_duration:>10.2f}"
+              f"{sum(result.downloaded):>10}{result.throughput:>10.2f}")
+
+    sequential, parallel = results["sequential"], results["parallel"]
+    if parallel.median_duration > 0:
+        print(f"\nspeedup (median): {sequential.median_duration / parallel.median_duration:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,640 @@
+"""
+Offline record/replay harness for the builder's HTTP traffic.
+
+A recording session captures every response the builder receives, the search result
+pages of iCrawler engines, image downloads and DuckDuckGo search results, into a
+cassette directory. A replay session routes the same traffic to a local stand-in
+server that answers from the cassette, so download benchmarks and tests run without
+touching live engines and give the same inputs on every run.
+
+Classes:
+    ReplayProfile: Latency, error and rate-limit behaviour of the stand-in server.
+    RecordedResponse: One captured HTTP response.
+    Cassette: Directory of captured responses and search results.
+    ReplayStats: Request and byte counters of a replay server.
+    ReplayServer: Local HTTP server answering from a cassette under a profile.
+
+Functions:
+    recording: Context manager capturing the builder's traffic into a cassette.
+    replaying: Context manager routing the builder's traffic to a replay server.
+    synthesize_cassette: Creates a cassette of generated images for offline runs.
+
+Features:
+    - Intercepts at `requests.Session.send`, which covers the DuckDuckGo downloader
+      and every iCrawler feeder, parser and downloader.
+    - DuckDuckGo searches are replayed through the server too, so they are subject to
+      the same profile and appear in the request counts.
+    - Response bodies are stored once per content digest.
+    - Profiles add per-request latency with jitter, random 5xx responses, dropped
+      connections and per-host 429 rate limiting with Retry-After.
+"""
+
+import hashlib
+import io
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union, Final
+from urllib.parse import urlsplit, parse_qs, quote
+
+import requests
+
+from builder._constants import logger
+
+__all__ = [
+    'ReplayProfile',
+    'RecordedResponse',
+    'Cassette',
+    'ReplayStats',
+    'ReplayServer',
+    'PROFILES',
+    'recording',
+    'replaying',
+    'synthesize_cassette'
+]
+
+CASSETTE_INDEX: Final[str] = "cassette.jsonl"
+CASSETTE_BODIES: Final[str] = "bodies"
+
+# Header carrying the original URL of a request routed to the replay server
+REPLAY_URL_HEADER: Final[str] = "X-Replay-Url"
+
+# Response headers worth replaying; bodies are stored decoded, so encodings are dropped
+RECORDED_HEADERS: Final[Tuple[str, ...]] = ("Content-Type", "Location", "Retry-After")
+
+# 5xx statuses returned by the error profile
+ERROR_STATUSES: Final[Tuple[int, ...]] = (500, 502, 503)
+
+
+@dataclass(frozen=True)
+class ReplayProfile:
+    """
+    Network behaviour simulated by the replay server.
+
+    Attributes:
+        latency (float): Seconds added to every response.
+        jitter (float): Upper bound of a random extra delay per response, in seconds.
+        error_rate (float): Fraction of requests answered with a 5xx status.
+        drop_rate (float): Fraction of requests whose connection is closed without a response.
+        rate_limit (Optional[float]): Requests per second allowed per original host; requests
+                                      beyond it get 429. None disables rate limiting.
+        retry_after (int): Retry-After seconds sent with 429 responses.
+        seed (int): Seed of the random choices, so a profile behaves the same on every run.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    drop_rate: float = 0.0
+    rate_limit: Optional[float] = None
+    retry_after: int = 1
+    seed: int = 0
+
+
+PROFILES: Final[Dict[str, ReplayProfile]] = {
+    "ideal": ReplayProfile(),
+    "typical": ReplayProfile(latency=0.03, jitter=0.05, error_rate=0.02),
+    "flaky": ReplayProfile(latency=0.1, jitter=0.2, error_rate=0.1, drop_rate=0.03),
+    "throttled": ReplayProfile(latency=0.03, jitter=0.02, rate_limit=5.0, retry_after=1),
+}
+
+
+@dataclass
+class RecordedResponse:
+    """
+    One captured HTTP response.
+
+    Attributes:
+        status (int): The HTTP status code.
+        headers (Dict[str, str]): The replayed response headers.
+        body (str): Content digest of the body in the cassette's body store.
+    """
+    status: int
+    headers: Dict[str, str]
+    body: str
+
+
+class Cassette:
+    """
+    Captured responses and DuckDuckGo search results of one or more builder runs.
+
+    The cassette is a directory with a JSON-lines index and a body store keyed by
+    content digest. When a URL was captured more than once, the latest response wins.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Initializes the Cassette and loads any existing index.
+
+        Args:
+            directory (Union[str, Path]): The cassette directory.
+        """
+        self.directory = Path(directory)
+        self.index_path = self.directory / CASSETTE_INDEX
+        self.bodies_dir = self.directory / CASSETTE_BODIES
+        self._responses: Dict[Tuple[str, str], RecordedResponse] = {}
+        self._searches: Dict[str, List[dict]] = {}
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """
+        Loads the cassette index. Torn lines are skipped.
+        """
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    if "search" in entry:
+                        self._searches[entry["search"]] = entry["results"]
+                    else:
+                        self._responses[(entry["method"], entry["url"])] = RecordedResponse(
+                            entry["status"], entry["headers"], entry["body"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def add_response(self, method: str, url: str, status: int,
+                     headers: Mapping[str, str], body: bytes) -> None:
+        """
+        Captures a response.
+
+        Args:
+            method (str): The request method.
+            url (str): The requested URL.
+            status (int): The HTTP status code.
+            headers (Mapping[str, str]): The response headers; only replayable ones are kept.
+            body (bytes): The decoded response body.
+        """
+        kept = {name: headers[name] for name in RECORDED_HEADERS if name in headers}
+        digest = self._store_body(body)
+        entry = {"method": method.upper(), "url": url, "status": status,
+                 "headers": kept, "body": digest}
+        with self._lock:
+            self._responses[(entry["method"], url)] = RecordedResponse(status, kept, digest)
+            self._append(entry)
+
+    def add_search(self, keyword: str, results: List[dict]) -> None:
+        """
+        Captures the DuckDuckGo search results of a keyword.
+
+        Args:
+            keyword (str): The search term.
+            results (List[dict]): The search result dictionaries.
+        """
+        with self._lock:
+            self._searches[keyword] = list(results)
+            self._append({"search": keyword, "results": list(results)})
+
+    def response_for(self, method: str, url: str) -> Optional[RecordedResponse]:
+        """
+        Looks up the captured response of a request.
+
+        Args:
+            method (str): The request method.
+            url (str): The requested URL.
+
+        Returns:
+            Optional[RecordedResponse]: The response, or None if the URL was never captured.
+        """
+        with self._lock:
+            return self._responses.get((method.upper(), url))
+
+    def search_results(self, keyword: str) -> List[dict]:
+        """
+        Looks up the captured search results of a keyword.
+
+        Args:
+            keyword (str): The search term.
+
+        Returns:
+            List[dict]: The results; empty if the keyword was never searched.
+        """
+        with self._lock:
+            return list(self._searches.get(keyword, []))
+
+    def body(self, digest: str) -> bytes:
+        """
+        Reads a response body from the body store, keeping it in memory for later replays.
+
+        Args:
+            digest (str): The content digest of the body.
+
+        Returns:
+            bytes: The body.
+        """
+        with self._lock:
+            cached = self._bodies.get(digest)
+        if cached is None:
+            cached = (self.bodies_dir / digest).read_bytes()
+            with self._lock:
+                self._bodies[digest] = cached
+        return cached
+
+    def _store_body(self, body: bytes) -> str:
+        """
+        Writes a body to the body store once per content digest.
+
+        Args:
+            body (bytes): The body.
+
+        Returns:
+            str: The content digest of the body.
+        """
+        digest = hashlib.sha1(body).hexdigest()
+        path = self.bodies_dir / digest
+        if not path.exists():
+            self.bodies_dir.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+        return digest
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """
+        Appends one entry to the index. Must be called with the lock held.
+
+        Args:
+            entry (Dict[str, Any]): The index entry.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._responses) + len(self._searches)
+
+
+@dataclass
+class ReplayStats:
+    """
+    Counters of the requests a replay server answered.
+
+    Attributes:
+        requests (int): All requests received, searches included.
+        searches (int): DuckDuckGo search requests.
+        hits (int): Requests answered from the cassette.
+        misses (int): Requests for URLs not in the cassette, answered with 404.
+        errors (int): Requests answered with an injected 5xx status.
+        dropped (int): Requests whose connection was closed without a response.
+        throttled (int): Requests answered with 429.
+        bytes_sent (int): Response body bytes sent.
+    """
+    requests: int = 0
+    searches: int = 0
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    dropped: int = 0
+    throttled: int = 0
+    bytes_sent: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """Answers routed requests from the server's cassette."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.replay.handle(self)
+
+    def do_HEAD(self):
+        self.server.replay.handle(self)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.server.replay.handle(self)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer:
+    """
+    Local HTTP stand-in for search engines and image hosts.
+
+    Requests routed by `replaying` carry their original URL in a header and are answered
+    with the captured response. `/search?q=` answers DuckDuckGo searches with the captured
+    results as JSON. The profile is applied to both.
+    """
+
+    def __init__(self, cassette: Cassette, profile: Optional[ReplayProfile] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        """
+        Initializes the ReplayServer.
+
+        Args:
+            cassette (Cassette): The captured responses to serve.
+            profile (Optional[ReplayProfile]): Simulated network behaviour. No delays or
+                                               failures if not given.
+            host (str): The interface to listen on.
+            port (int): The port to listen on; zero picks a free port.
+        """
+        self.cassette = cassette
+        self.profile = profile if profile is not None else ReplayProfile()
+        self.stats = ReplayStats()
+        self._random = random.Random(self.profile.seed)
+        self._host_windows: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _ReplayHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.replay = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        """
+        Starts serving in a background thread.
+
+        Returns:
+            ReplayServer: The server itself.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                            name="replay-server", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops serving and closes the listening socket.
+        """
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def reset_stats(self) -> ReplayStats:
+        """
+        Starts a new measurement.
+
+        Returns:
+            ReplayStats: The counters collected since the last reset.
+        """
+        with self._lock:
+            stats, self.stats = self.stats, ReplayStats()
+        return stats
+
+    def handle(self, handler: BaseHTTPRequestHandler) -> None:
+        """
+        Answers one request under the server's profile.
+
+        Args:
+            handler (BaseHTTPRequestHandler): The request handler of the connection.
+        """
+        parts = urlsplit(handler.path)
+        is_search = parts.path == "/search"
+        original = handler.headers.get(REPLAY_URL_HEADER, "")
+        host = "duckduckgo.com" if is_search else (urlsplit(original).hostname or "")
+
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.searches += int(is_search)
+            delay = self.profile.latency + self._random.uniform(0, self.profile.jitter)
+            roll = self._random.random()
+            throttled = self._over_rate_limit(host)
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if roll < self.profile.drop_rate:
+            with self._lock:
+                self.stats.dropped += 1
+            handler.close_connection = True
+            return
+        if throttled:
+            with self._lock:
+                self.stats.throttled += 1
+            self._send(handler, 429, {"Content-Type": "text/plain",
+                                      "Retry-After": str(self.profile.retry_after)}, b"slow down")
+            return
+        if roll < self.profile.drop_rate + self.profile.error_rate:
+            with self._lock:
+                self.stats.errors += 1
+            status = ERROR_STATUSES[int(roll * 1000) % len(ERROR_STATUSES)]
+            self._send(handler, status, {"Content-Type": "text/plain"}, b"unavailable")
+            return
+
+        if is_search:
+            keyword = parse_qs(parts.query).get("q", [""])[0]
+            body = json.dumps(self.cassette.search_results(keyword)).encode("utf-8")
+            with self._lock:
+                self.stats.hits += 1
+            self._send(handler, 200, {"Content-Type": "application/json"}, body)
+            return
+
+        recorded = self.cassette.response_for(handler.command, original)
+        if recorded is None:
+            with self._lock:
+                self.stats.misses += 1
+            self._send(handler, 404, {"Content-Type": "text/plain"}, b"not recorded")
+            return
+        with self._lock:
+            self.stats.hits += 1
+        self._send(handler, recorded.status, recorded.headers,
+                   self.cassette.body(recorded.body))
+
+    def _over_rate_limit(self, host: str) -> bool:
+        """
+        Counts a request against its host's one-second window. Must be called with the lock held.
+
+        Args:
+            host (str): The original host of the request.
+
+        Returns:
+            bool: True if the request exceeds the profile's rate limit.
+        """
+        if self.profile.rate_limit is None:
+            return False
+        now = time.monotonic()
+        window_start, count = self._host_windows.get(host, (now, 0))
+        if now - window_start >= 1.0:
+            window_start, count = now, 0
+        count += 1
+        self._host_windows[host] = (window_start, count)
+        return count > self.profile.rate_limit
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int,
+              headers: Dict[str, str], body: bytes) -> None:
+        """
+        Writes a response and counts its body bytes.
+
+        Args:
+            handler (BaseHTTPRequestHandler): The request handler of the connection.
+            status (int): The HTTP status code.
+            headers (Dict[str, str]): The response headers.
+            body (bytes): The response body.
+        """
+        try:
+            handler.send_response(status)
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            if handler.command != "HEAD":
+                handler.wfile.write(body)
+                with self._lock:
+                    self.stats.bytes_sent += len(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up, e.g. after rejecting an oversized body
+            handler.close_connection = True
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+def _search_engines_module():
+    """Imports the search engine module lazily, so the harness loads without ddgs."""
+    from builder import _search_engines
+    return _search_engines
+
+
+@contextmanager
+def recording(cassette: Cassette) -> Iterator[Cassette]:
+    """
+    Captures the builder's HTTP responses and DuckDuckGo searches into a cassette.
+
+    Args:
+        cassette (Cassette): The cassette to record into.
+
+    Yields:
+        Cassette: The cassette.
+    """
+    search_engines = _search_engines_module()
+    downloader_class = search_engines.DDGSImageDownloader
+    original_send = requests.Session.send
+    original_search = downloader_class.__dict__["_fetch_search_results"]
+
+    def send_recorded(session, request, **kwargs):
+        response = original_send(session, request, **kwargs)
+        # Reading the content keeps the response usable for streaming callers
+        cassette.add_response(request.method, request.url, response.status_code,
+                              response.headers, response.content)
+        return response
+
+    def search_recorded(keyword: str, max_count: int) -> List[dict]:
+        results = original_search.__func__(keyword, max_count)
+        cassette.add_search(keyword, results)
+        return results
+
+    requests.Session.send = send_recorded
+    downloader_class._fetch_search_results = staticmethod(search_recorded)
+    try:
+        yield cassette
+    finally:
+        requests.Session.send = original_send
+        downloader_class._fetch_search_results = original_search
+        logger.info(f"Recorded {len(cassette)} responses into {cassette.directory}")
+
+
+@contextmanager
+def replaying(server_url: str) -> Iterator[str]:
+    """
+    Routes the builder's HTTP requests and DuckDuckGo searches to a replay server.
+
+    Args:
+        server_url (str): Base URL of the replay server, possibly in another process.
+
+    Yields:
+        str: The server URL.
+    """
+    search_engines = _search_engines_module()
+    downloader_class = search_engines.DDGSImageDownloader
+    original_send = requests.Session.send
+    original_search = downloader_class.__dict__["_fetch_search_results"]
+    replay_endpoint = f"{server_url}/replay"
+
+    def send_replayed(session, request, **kwargs):
+        original_url = request.url
+        if not original_url.startswith(server_url):
+            request.url = replay_endpoint
+            request.headers[REPLAY_URL_HEADER] = original_url
+        # Environment proxies must not intercept the local server
+        kwargs["proxies"] = {}
+        response = original_send(session, request, **kwargs)
+        response.url = original_url
+        return response
+
+    def search_replayed(keyword: str, max_count: int) -> List[dict]:
+        from ddgs.exceptions import DDGSException, RatelimitException
+
+        try:
+            response = requests.get(f"{server_url}/search?q={quote(keyword)}", timeout=20)
+        except requests.exceptions.RequestException as e:
+            raise DDGSException(str(e)) from e
+        if response.status_code == 429:
+            raise RatelimitException(f"{response.status_code} replayed rate limit")
+        if response.status_code != 200:
+            raise DDGSException(f"{response.status_code} replayed search error")
+        return response.json()[:max_count * 3]
+
+    requests.Session.send = send_replayed
+    downloader_class._fetch_search_results = staticmethod(search_replayed)
+    try:
+        yield server_url
+    finally:
+        requests.Session.send = original_send
+        downloader_class._fetch_search_results = original_search
+
+
+def _noise_jpeg(rng: random.Random, size: Tuple[int, int]) -> bytes:
+    """Creates a JPEG of random pixels, so every generated image has distinct content."""
+    from PIL import Image
+
+    img = Image.frombytes("RGB", size, rng.randbytes(size[0] * size[1] * 3))
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def synthesize_cassette(directory: Union[str, Path], keywords: Sequence[str],
+                        images_per_keyword: int = 40, size: Tuple[int, int] = (320, 240),
+                        hosts: int = 4, seed: int = 0) -> Cassette:
+    """
+    Creates a cassette of generated images served as DuckDuckGo results, for runs that
+    have no recorded traffic. iCrawler engines find no results in it and fall through.
+
+    Args:
+        directory (Union[str, Path]): The cassette directory.
+        keywords (Sequence[str]): The keywords to create search results for.
+        images_per_keyword (int): Number of results and images per keyword.
+        size (Tuple[int, int]): Width and height of the generated images.
+        hosts (int): Number of image hosts the results are spread over.
+        seed (int): Seed of the generated content.
+
+    Returns:
+        Cassette: The cassette.
+    """
+    cassette = Cassette(directory)
+    rng = random.Random(seed)
+    for keyword in keywords:
+        slug = quote(keyword.replace(" ", "-"), safe="")
+        results = []
+        for i in range(images_per_keyword):
+            url = f"https://img{i % max(1, hosts)}.replay.invalid/{slug}/{i}.jpg"
+            cassette.add_response("GET", url, 200, {"Content-Type": "image/jpeg"},
+                                  _noise_jpeg(rng, size))
+            results.append({"title": f"{keyword} {i}", "image": url,
+                            "url": f"https://pages.replay.invalid/{slug}/{i}",
+                            "width": size[0], "height": size[1]})
+        cassette.add_search(keyword, results)
+    return cassette
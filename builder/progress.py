@@ -16,6 +16,7 @@ Functions:
 
 import json
 import os
+import threading
 import time
 from typing import Any, Dict, Optional, List
 
@@ -24,6 +25,7 @@ from utility.logging_config import get_logger
 logger = get_logger(__name__)
 
 DEFAULT_CACHE_FILE = "progress_cache.json"
+JOURNAL_SUFFIX = ".journal"
 
 __all__ = [
     'ProgressCache',
@@ -38,48 +40,166 @@ class ProgressCache:
     """
     Manages the caching of progress for dataset generation, allowing the process
     to be resumed from where it left off in case of interruption.
+
+    Completions are appended to a journal next to the cache file instead of rewriting
+    the whole file. Journal lines reach the OS on every write and are fsynced in
+    batches. Once the journal outgrows the snapshot, it is folded back into the JSON
+    cache file with an atomic replace. Loading reads the snapshot and replays the
+    journal, ignoring a torn last line.
     """
 
-    def __init__(self, cache_file: str = DEFAULT_CACHE_FILE):
+    def __init__(self, cache_file: str = DEFAULT_CACHE_FILE, sync_every: int = 32,
+                 sync_interval: float = 5.0, compact_min_entries: int = 1000):
         """
         Initializes the ProgressCache.
 
         Args:
             cache_file (str): The path to the JSON file used for caching progress.
+            sync_every (int): Journal writes between fsyncs.
+            sync_interval (float): Maximum seconds between fsyncs while writes keep coming.
+            compact_min_entries (int): Journal length below which it is never compacted.
         """
         self.cache_file: str = cache_file
+        self.journal_file: str = cache_file + JOURNAL_SUFFIX
+        self.sync_every = max(1, sync_every)
+        self.sync_interval = sync_interval
+        self.compact_min_entries = compact_min_entries
+        self._lock = threading.RLock()
+        self._journal = None
+        self._journal_entries = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
         self.completed_paths: Dict[str, Dict[str, Any]] = self._load_cache()
 
     def _load_cache(self) -> Dict[str, Dict[str, Any]]:
         """
-        Loads the progress cache from the specified cache file.
+        Loads the progress cache from the cache file and replays its journal.
         If the file does not exist or an error occurs during loading, an empty dictionary is returned.
 
         Returns:
             Dict[str, Dict[str, Any]]: A dictionary representing the loaded cache.
         """
+        completed: Dict[str, Dict[str, Any]] = {}
         if os.path.exists(self.cache_file):
             try:
                 with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    completed = json.load(f)
             except (IOError, json.JSONDecodeError) as e:
                 logger.warning(f"Failed to load progress cache: {e}")
-                return {}
-        return {}
+                completed = {}
+
+        if os.path.exists(self.journal_file):
+            try:
+                valid_end = 0
+                with open(self.journal_file, 'rb') as f:
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            # A torn write from an interrupted run
+                            break
+                        valid_end += len(line)
+                        try:
+                            self._apply(completed, json.loads(line))
+                        except (ValueError, KeyError, TypeError, AttributeError):
+                            continue
+                        self._journal_entries += 1
+                if valid_end < os.path.getsize(self.journal_file):
+                    # Drop the torn tail so the next append starts on a fresh line
+                    os.truncate(self.journal_file, valid_end)
+            except IOError as e:
+                logger.warning(f"Failed to replay progress journal: {e}")
+        return completed
+
+    @staticmethod
+    def _apply(completed: Dict[str, Dict[str, Any]], record: Dict[str, Any]) -> None:
+        """
+        Applies one journal record to a completion map.
+
+        Args:
+            completed (Dict[str, Dict[str, Any]]): The completion map to update.
+            record (Dict[str, Any]): The journal record.
+        """
+        op = record.get("op")
+        if op == "done":
+            completed[record["key"]] = record["entry"]
+        elif op == "remove":
+            completed.pop(record["key"], None)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """
+        Appends a record to the journal, syncing and compacting when due.
+
+        Args:
+            record (Dict[str, Any]): The journal record.
+        """
+        with self._lock:
+            try:
+                if self._journal is None:
+                    self._journal = open(self.journal_file, 'a', encoding='utf-8')
+                self._journal.write(json.dumps(record) + "\n")
+                self._journal.flush()
+                self._journal_entries += 1
+                self._unsynced += 1
+                if (self._unsynced >= self.sync_every
+                        or time.monotonic() - self._last_sync >= self.sync_interval):
+                    self.sync()
+                if self._journal_entries > max(self.compact_min_entries,
+                                               len(self.completed_paths)):
+                    self.save_cache()
+            except IOError as ioe:
+                logger.error(f"Failed to append to progress journal: {ioe}")
+
+    def sync(self) -> None:
+        """
+        Forces journal writes to disk.
+        """
+        with self._lock:
+            if self._journal is not None and self._unsynced:
+                try:
+                    os.fsync(self._journal.fileno())
+                except OSError as e:
+                    logger.warning(f"Failed to sync progress journal: {e}")
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
 
     def save_cache(self) -> None:
         """
-        Saves the current progress cache to the cache file.
+        Saves the current progress cache to the cache file and empties the journal.
+        The file is replaced atomically, so an interrupted save leaves the previous
+        snapshot and journal intact.
         """
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.completed_paths, f, indent=2)
-            logger.debug(f"Progress cache saved to {self.cache_file}")
-        except IOError as ioe:
-            logger.error(f"Failed to save progress cache: {ioe}")
-        except Exception as e:
-            logger.error(
-                f"An unexpected error occurred while saving progress cache: {e}")
+        with self._lock:
+            tmp_file = f"{self.cache_file}.tmp"
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.completed_paths, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.cache_file)
+
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                if os.path.exists(self.journal_file):
+                    os.remove(self.journal_file)
+                self._journal_entries = 0
+                self._unsynced = 0
+                self._last_sync = time.monotonic()
+                logger.debug(f"Progress cache saved to {self.cache_file}")
+            except IOError as ioe:
+                logger.error(f"Failed to save progress cache: {ioe}")
+            except Exception as e:
+                logger.error(
+                    f"An unexpected error occurred while saving progress cache: {e}")
+
+    def close(self) -> None:
+        """
+        Syncs and closes the journal. The cache can still be used afterwards.
+        """
+        with self._lock:
+            self.sync()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
 
     def is_completed(self, category: str, keyword: str) -> bool:
         """
@@ -99,7 +219,7 @@ class ProgressCache:
                        metadata: Optional[Dict[str, Any]] = None) -> None:
         """
         Marks a specific category/keyword combination as completed and stores optional metadata.
-        The cache is saved immediately after marking to ensure persistence.
+        The record is appended to the journal immediately to ensure persistence.
 
         Args:
             category (str): The category name.
@@ -107,14 +227,15 @@ class ProgressCache:
             metadata (Optional[Dict[str, Any]]): Optional dictionary of metadata to store with the completion record.
         """
         path_key = f"{category}/{keyword}"
-        self.completed_paths[path_key] = {
+        entry = {
             "timestamp": time.time(),
             "category": category,
             "keyword": keyword,
             "metadata": metadata or {}
         }
-        # Save after each update to ensure progress is not lost
-        self.save_cache()
+        with self._lock:
+            self.completed_paths[path_key] = entry
+            self._append({"op": "done", "key": path_key, "entry": entry})
 
     def get_completion_stats(self) -> Dict[str, int]:
         """
@@ -132,8 +253,9 @@ class ProgressCache:
 
     def clear_cache(self) -> None:
         """Clear all cached progress."""
-        self.completed_paths.clear()
-        self.save_cache()
+        with self._lock:
+            self.completed_paths.clear()
+            self.save_cache()
 
     def remove_completed(self, category: str, keyword: str) -> bool:
         """
@@ -147,10 +269,11 @@ class ProgressCache:
             bool: True if the record was removed, False if it didn't exist.
         """
         path_key = f"{category}/{keyword}"
-        if path_key in self.completed_paths:
-            del self.completed_paths[path_key]
-            self.save_cache()
-            return True
+        with self._lock:
+            if path_key in self.completed_paths:
+                del self.completed_paths[path_key]
+                self._append({"op": "remove", "key": path_key})
+                return True
         return False
 
 
@@ -18,12 +18,18 @@ Architecture:
     - One task per search engine for parallel execution
     - Uses real builder functionality (no reimplementation)
     - Follows celery_core patterns (impl + task decorator)
+    - Tasks writing into a crawl workspace chunk publish it to the job's sharded dataset
+    - Re-delivered tasks resume from the download manifest of their output directory
+    - Job-wide stores are opened per task and closed when it finishes
 """
 
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
 from builder._config import get_engines
+from builder._download_manifest import DownloadManifest
 from builder._downloader import ImageDownloader
 from builder._generator import LabelGenerator
 from builder._exceptions import PermanentError
@@ -36,6 +42,10 @@ from builder._search_engines import (
     download_baidu_images,
     download_images_ddgs
 )
+from builder._search_cache import SearchResultCache
+from builder._scheduler import YieldStats, YieldScheduler
+from builder._url_index import URLIndex
+from builder._workspace import CrawlWorkspace
 from celery_core.app import get_celery_app
 from celery_core.base import BaseTask
 from utility.logging_config import get_logger
@@ -53,6 +63,115 @@ __all__ = [
 ]
 
 
+def _shared_state_dirs(output_dir: str) -> Tuple[Path, Path]:
+    """
+    Returns the directories whose job-wide indexes and yield history an output directory uses.
+
+    Chunks of a crawl workspace share the workspace root. A plain output directory keeps its
+    own indexes and shares yield history with its sibling keyword directories. The stores
+    are kept in the builder's state directory, keyed by these paths, so no SQLite file is
+    written into the dataset.
+
+    Args:
+        output_dir: Output directory of the task
+
+    Returns:
+        Tuple of (index directory, yield history directory)
+    """
+    workspace = CrawlWorkspace.containing(output_dir)
+    if workspace is not None:
+        return workspace.root, workspace.root
+    return Path(output_dir), Path(output_dir).parent
+
+
+def _open_download_manifest(output_dir: str,
+                            url_index: URLIndex) -> Tuple[DownloadManifest, int]:
+    """
+    Opens the download manifest of an output directory and prepares it for a resumed run.
+
+    Tasks are acknowledged late, so a task whose worker died is delivered again and
+    continues from the images and URLs its earlier run recorded.
+
+    Args:
+        output_dir: Output directory of the task
+        url_index: URL index of the job
+
+    Returns:
+        Tuple of (download manifest, number of images kept by earlier runs)
+    """
+    download_manifest = DownloadManifest.for_directory(output_dir)
+    return download_manifest, download_manifest.resume(url_index)
+
+
+@dataclass
+class _JobStores:
+    """
+    Persistent state an engine task downloads with.
+
+    Attributes:
+        url_index: URL index shared by every engine task of the job
+        search_cache: Search result cache shared by every engine task of the job
+        yield_stats: Yield history shared by the keywords of the dataset, if opened
+        download_manifest: Download manifest of the output directory
+        resumed: Number of images kept by earlier runs
+    """
+    url_index: URLIndex
+    search_cache: SearchResultCache
+    yield_stats: Optional[YieldStats]
+    download_manifest: DownloadManifest
+    resumed: int
+
+
+@contextmanager
+def _job_stores(output_dir: str, yield_history: bool = True) -> Iterator[_JobStores]:
+    """
+    Opens the persistent stores of an engine task and closes them when the task is done.
+
+    The SQLite connections are closed even if the download fails, so worker processes do
+    not accumulate file descriptors and WAL files are checkpointed. The manifests are
+    JSON-lines files opened per append and hold no handle.
+
+    Args:
+        output_dir: Output directory of the task
+        yield_history: Whether to open the yield history used to order variations
+
+    Yields:
+        The opened stores
+    """
+    state_dir, yield_dir = _shared_state_dirs(output_dir)
+    url_index = URLIndex.for_directory(state_dir)
+    search_cache = yield_stats = None
+    try:
+        search_cache = SearchResultCache.for_directory(state_dir)
+        # Yield history is shared by every keyword of the dataset so each one learns from it
+        if yield_history:
+            yield_stats = YieldStats.for_directory(yield_dir)
+        download_manifest, resumed = _open_download_manifest(output_dir, url_index)
+        yield _JobStores(url_index, search_cache, yield_stats, download_manifest, resumed)
+    finally:
+        for store in (yield_stats, search_cache, url_index):
+            if store is not None:
+                store.close()
+
+
+def _publish_chunk(output_dir: str, keyword: str, engine: str) -> Optional[int]:
+    """
+    Publishes a finished workspace chunk into the job's sharded dataset.
+
+    Args:
+        output_dir: Output directory of the task
+        keyword: Search keyword of the chunk
+        engine: Search engine of the chunk
+
+    Returns:
+        Number of published images, or None if the output directory is not a workspace chunk
+    """
+    workspace = CrawlWorkspace.containing(output_dir)
+    if workspace is None:
+        return None
+    return workspace.publish_chunk(output_dir, {'keyword': keyword, 'engine': engine})
+
+
 def task_download_google_impl(
     keyword: str,
     output_dir: str,
@@ -114,35 +233,52 @@ def task_download_google_impl(
             variations = [template.format(keyword=keyword) for template in
                           variation_templates[:5]]
 
-        # Create downloader
-        downloader = ImageDownloader()
-
-        # Download using real builder function
-        result = download_google_images(
-            keyword=keyword,
-            variations=variations,
-            out_dir=output_dir,
-            max_num=max_images,
-            config=config,
-            image_downloader=downloader
-        )
-
-        log_context.info(
-            f"Google download completed: {result.total_downloaded} images",
-            downloaded=result.total_downloaded,
-            variations_processed=result.variations_processed,
-            success_rate=result.success_rate
-        )
+        # Create downloader with a persistent URL index and search cache shared by every engine task
+        # of the job
+        with _job_stores(output_dir) as stores:
+            variations = YieldScheduler(stores.yield_stats).order_variations(variations, keyword)
+            downloader = ImageDownloader(url_index=stores.url_index,
+                                         content_digests=stores.download_manifest.digests,
+                                         search_cache=stores.search_cache,
+                                         yield_stats=stores.yield_stats,
+                                         download_manifest=stores.download_manifest)
+            # File numbering continues after the images kept by an earlier run
+            downloader.total_downloaded = stores.resumed
+
+            # Download using real builder function
+            result = download_google_images(
+                keyword=keyword,
+                variations=variations,
+                out_dir=output_dir,
+                max_num=max(0, max_images - stores.resumed),
+                config=config,
+                image_downloader=downloader
+            )
+            downloaded = stores.resumed + result.total_downloaded
+
+            published = _publish_chunk(output_dir, keyword, 'google')
+
+            log_context.info(
+                f"Google download completed: {downloaded} images",
+                downloaded=downloaded,
+                resumed=stores.resumed,
+                variations_processed=result.variations_processed,
+                success_rate=result.success_rate
+            )
 
-        return {
-            'success': result.total_downloaded > 0,
-            'engine': 'google',
-            'keyword': keyword,
-            'downloaded': result.total_downloaded,
-            'variations_processed': result.variations_processed,
-            'success_rate': result.success_rate,
-            'processing_time': result.processing_time
-        }
+            return {
+                'success': downloaded > 0,
+                'engine': 'google',
+                'keyword': keyword,
+                'downloaded': downloaded,
+                'resumed': stores.resumed,
+                'published': published,
+                'duplicate_urls_skipped': stores.url_index.skipped,
+                'search_cache_hit_rate': stores.search_cache.hit_rate,
+                'variations_processed': result.variations_processed,
+                'success_rate': result.success_rate,
+                'processing_time': result.processing_time
+            }
 
     except Exception as e:
         log_context.error(
@@ -267,33 +403,50 @@ def task_download_bing_impl(
             variations = [template.format(keyword=keyword) for template in
                           variation_templates[:5]]
 
-        downloader = ImageDownloader()
-
-        result = download_bing_images(
-            keyword=keyword,
-            variations=variations,
-            out_dir=output_dir,
-            max_num=max_images,
-            config=config,
-            image_downloader=downloader
-        )
+        # Persistent URL index shared by every engine task of the job
+        with _job_stores(output_dir) as stores:
+            variations = YieldScheduler(stores.yield_stats).order_variations(variations, keyword)
+            downloader = ImageDownloader(url_index=stores.url_index,
+                                         content_digests=stores.download_manifest.digests,
+                                         search_cache=stores.search_cache,
+                                         yield_stats=stores.yield_stats,
+                                         download_manifest=stores.download_manifest)
+            # File numbering continues after the images kept by an earlier run
+            downloader.total_downloaded = stores.resumed
+
+            result = download_bing_images(
+                keyword=keyword,
+                variations=variations,
+                out_dir=output_dir,
+                max_num=max(0, max_images - stores.resumed),
+                config=config,
+                image_downloader=downloader
+            )
+            downloaded = stores.resumed + result.total_downloaded
+
+            published = _publish_chunk(output_dir, keyword, 'bing')
+
+            log_context.info(
+                f"Bing download completed: {downloaded} images",
+                downloaded=downloaded,
+                resumed=stores.resumed,
+                variations_processed=result.variations_processed,
+                success_rate=result.success_rate
+            )
 
-        log_context.info(
-            f"Bing download completed: {result.total_downloaded} images",
-            downloaded=result.total_downloaded,
-            variations_processed=result.variations_processed,
-            success_rate=result.success_rate
-        )
-
-        return {
-            'success': result.total_downloaded > 0,
-            'engine': 'bing',
-            'keyword': keyword,
-            'downloaded': result.total_downloaded,
-            'variations_processed': result.variations_processed,
-            'success_rate': result.success_rate,
-            'processing_time': result.processing_time
-        }
+            return {
+                'success': downloaded > 0,
+                'engine': 'bing',
+                'keyword': keyword,
+                'downloaded': downloaded,
+                'resumed': stores.resumed,
+                'published': published,
+                'duplicate_urls_skipped': stores.url_index.skipped,
+                'search_cache_hit_rate': stores.search_cache.hit_rate,
+                'variations_processed': result.variations_processed,
+                'success_rate': result.success_rate,
+                'processing_time': result.processing_time
+            }
 
     except Exception as e:
         log_context.error(
@@ -418,33 +571,50 @@ def task_download_baidu_impl(
             variations = [template.format(keyword=keyword) for template in
                           variation_templates[:5]]
 
-        downloader = ImageDownloader()
+        # Persistent URL index shared by every engine task of the job
+        with _job_stores(output_dir) as stores:
+            variations = YieldScheduler(stores.yield_stats).order_variations(variations, keyword)
+            downloader = ImageDownloader(url_index=stores.url_index,
+                                         content_digests=stores.download_manifest.digests,
+                                         search_cache=stores.search_cache,
+                                         yield_stats=stores.yield_stats,
+                                         download_manifest=stores.download_manifest)
+            # File numbering continues after the images kept by an earlier run
+            downloader.total_downloaded = stores.resumed
+
+            result = download_baidu_images(
+                keyword=keyword,
+                variations=variations,
+                out_dir=output_dir,
+                max_num=max(0, max_images - stores.resumed),
+                config=config,
+                image_downloader=downloader
+            )
+            downloaded = stores.resumed + result.total_downloaded
+
+            published = _publish_chunk(output_dir, keyword, 'baidu')
+
+            log_context.info(
+                f"Baidu download completed: {downloaded} images",
+                downloaded=downloaded,
+                resumed=stores.resumed,
+                variations_processed=result.variations_processed,
+                success_rate=result.success_rate
+            )
 
-        result = download_baidu_images(
-            keyword=keyword,
-            variations=variations,
-            out_dir=output_dir,
-            max_num=max_images,
-            config=config,
-            image_downloader=downloader
-        )
-
-        log_context.info(
-            f"Baidu download completed: {result.total_downloaded} images",
-            downloaded=result.total_downloaded,
-            variations_processed=result.variations_processed,
-            success_rate=result.success_rate
-        )
-
-        return {
-            'success': result.total_downloaded > 0,
-            'engine': 'baidu',
-            'keyword': keyword,
-            'downloaded': result.total_downloaded,
-            'variations_processed': result.variations_processed,
-            'success_rate': result.success_rate,
-            'processing_time': result.processing_time
-        }
+            return {
+                'success': downloaded > 0,
+                'engine': 'baidu',
+                'keyword': keyword,
+                'downloaded': downloaded,
+                'resumed': stores.resumed,
+                'published': published,
+                'duplicate_urls_skipped': stores.url_index.skipped,
+                'search_cache_hit_rate': stores.search_cache.hit_rate,
+                'variations_processed': result.variations_processed,
+                'success_rate': result.success_rate,
+                'processing_time': result.processing_time
+            }
 
     except Exception as e:
         log_context.error(
@@ -546,20 +716,35 @@ def task_download_duckduckgo_impl(
         Path(output_dir).mkdir(parents=True, exist_ok=True)
 
         # Use real builder function
-        success, downloaded = download_images_ddgs(keyword, output_dir, max_images)
+        with _job_stores(output_dir, yield_history=False) as stores:
+            _, new_downloads = download_images_ddgs(keyword, output_dir,
+                                                    max(0, max_images - stores.resumed),
+                                                    url_index=stores.url_index,
+                                                    content_digests=stores.download_manifest.digests,
+                                                    search_cache=stores.search_cache,
+                                                    download_manifest=stores.download_manifest)
+            downloaded = stores.resumed + new_downloads
+            success = downloaded > 0
+
+            published = _publish_chunk(output_dir, keyword, 'duckduckgo')
+
+            log_context.info(
+                f"DuckDuckGo download completed: {downloaded} images",
+                downloaded=downloaded,
+                resumed=stores.resumed,
+                success=success
+            )
 
-        log_context.info(
-            f"DuckDuckGo download completed: {downloaded} images",
-            downloaded=downloaded,
-            success=success
-        )
-
-        return {
-            'success': success,
-            'engine': 'duckduckgo',
-            'keyword': keyword,
-            'downloaded': downloaded
-        }
+            return {
+                'success': success,
+                'engine': 'duckduckgo',
+                'keyword': keyword,
+                'downloaded': downloaded,
+                'resumed': stores.resumed,
+                'published': published,
+                'duplicate_urls_skipped': stores.url_index.skipped,
+                'search_cache_hit_rate': stores.search_cache.hit_rate
+            }
 
     except Exception as e:
         log_context.error(
@@ -287,6 +287,79 @@ def test_label_generation_formats(temp_dir, fmt):
         pytest.fail(f"Label generation test failed: {e}")
 
 
+def test_label_generation_manifest(temp_dir):
+    """Manifest mode writes one JSONL record per image, and per-image labels on request."""
+    try:
+        from builder._generator import LabelGenerator
+    except ImportError:
+        pytest.skip("LabelGenerator not available - missing dependencies")
+
+    dataset_dir = temp_dir / "dataset"
+    for name in ("img1.png", "img2.png"):
+        _write_png_image(dataset_dir / "cats" / "cute_cat" / name)
+    _write_png_image(dataset_dir / "dogs" / "puppy" / "imgA.png")
+
+    lg = LabelGenerator(format_type="json", manifest_format="jsonl", max_workers=2)
+    generated = lg.generate_dataset_labels(str(dataset_dir))
+
+    labels_root = dataset_dir / "labels"
+    manifest = labels_root / "manifest.jsonl"
+    assert generated == [str(manifest)]
+    records = [json.loads(line) for line in manifest.read_text().splitlines()]
+    assert [r["image_path"] for r in records] == [
+        "cats/cute_cat/img1.png", "cats/cute_cat/img2.png", "dogs/puppy/imgA.png"]
+    assert all(r["width"] and r["height"] and r["size"] for r in records)
+    assert records[2]["category"] == "dogs" and records[2]["keyword"] == "puppy"
+    assert not (labels_root / "cats").exists()
+
+    lg = LabelGenerator(format_type="json", manifest_format="jsonl", per_image_labels=True)
+    generated = lg.generate_dataset_labels(str(dataset_dir))
+    assert len(generated) == 4
+    assert (labels_root / "dogs" / "puppy" / "imgA.json").exists()
+    assert len(manifest.read_text().splitlines()) == 3
+
+
+def test_dataset_manifest_records_every_image(temp_dir):
+    """The dataset manifest holds one row per image with header metadata and content hash."""
+    import hashlib
+    from builder._dataset_manifest import build_dataset_manifest, DATASET_MANIFEST_FIELDS
+
+    dataset_dir = temp_dir / "dataset"
+    _write_png_image(dataset_dir / "cats" / "cute_cat" / "img1.png")
+    _write_png_image(dataset_dir / "dogs" / "puppy" / "imgA.png")
+    _write_png_image(dataset_dir / "labels" / "cats" / "ignored.png")
+
+    path = build_dataset_manifest(dataset_dir, "jsonl", validate=lambda p: True)
+
+    assert path == dataset_dir / "dataset_manifest.jsonl"
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["path"] for r in records] == ["cats/cute_cat/img1.png", "dogs/puppy/imgA.png"]
+    assert all(tuple(r) == DATASET_MANIFEST_FIELDS for r in records)
+    image = dataset_dir / "cats" / "cute_cat" / "img1.png"
+    assert records[0]["content_hash"] == hashlib.md5(image.read_bytes()).hexdigest()
+    assert records[0]["format"] == "PNG" and records[0]["width"] > 0
+    assert records[0]["valid"] is True and records[0]["perceptual_hash"] is None
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_dataset_manifest_columnar_round_trip(temp_dir, fmt):
+    """Columnar manifests load back as Arrow tables, optionally filtered to valid images."""
+    pytest.importorskip("pyarrow")
+    from builder._dataset_manifest import build_dataset_manifest, read_dataset_manifest
+
+    dataset_dir = temp_dir / "dataset"
+    _write_png_image(dataset_dir / "cats" / "cute_cat" / "img1.png")
+    _write_png_image(dataset_dir / "cats" / "cute_cat" / "img2.png")
+
+    path = build_dataset_manifest(dataset_dir, fmt, validate=lambda p: p.endswith("img1.png"))
+
+    assert path.suffix == f".{fmt}"
+    assert read_dataset_manifest(path).num_rows == 2
+    valid = read_dataset_manifest(path, columns=["path"], valid_only=True)
+    assert valid.column_names == ["path"]
+    assert valid.column("path").to_pylist() == ["cats/cute_cat/img1.png"]
+
+
 @patch('builder._generator.ImageDownloader')
 @patch('builder._generator.download_images_ddgs')
 def test_retry_download_success(mock_ddgs, mock_downloader, temp_dir):
@@ -298,7 +371,7 @@ def test_retry_download_success(mock_ddgs, mock_downloader, temp_dir):
         mock_downloader.return_value.download.return_value = (False, 0)
 
         # Mock DDGS to succeed on retry
-        def fake_ddgs(keyword, out_dir, max_num):
+        def fake_ddgs(keyword, out_dir, max_num, **kwargs):
             Path(out_dir).mkdir(parents=True, exist_ok=True)
             for i in range(max_num):
                 _write_png_image(Path(out_dir) / f"ddgs_{i+1:03d}.png")
@@ -354,6 +427,60 @@ def test_retry_download_failure(mock_ddgs, mock_downloader, temp_dir):
         pytest.fail(f"Retry download failure test failed: {e}")
 
 
+@patch('builder._generator.download_images_ddgs', return_value=(False, 0))
+def test_retry_download_counts_resumed_images_once(mock_ddgs, temp_dir):
+    """Images resumed from the manifest are counted once and retries still run."""
+    from builder._downloader import EngineProcessor, ImageDownloader
+    from builder._download_manifest import DownloadManifest
+    from builder._generator import Retry, RetryConfig, RetryStrategy
+
+    out_dir = temp_dir / "out"
+    for i in range(2):
+        _write_png_image(out_dir / f"kept_{i}.png", color=(i, 0, 0))
+    added = []
+
+    def fake_engines(processor, keyword, variations, engine_dir, max_num):
+        added.append(max_num)
+        _write_png_image(Path(engine_dir) / f"new_{len(added)}.png", color=(0, len(added), 0))
+        processor.image_downloader.total_downloaded += 1
+        return []
+
+    retry = Retry(RetryConfig(max_retries=3, backoff_delay=0,
+                              strategy=RetryStrategy.ENGINE_ONLY))
+    with patch.object(DownloadManifest, "resume", return_value=2), \
+            patch.object(EngineProcessor, "download_with_sequential_engines",
+                         autospec=True, side_effect=fake_engines), \
+            patch.object(ImageDownloader, "_try_duckduckgo_fallback",
+                         side_effect=lambda **kwargs: kwargs["total_downloaded"]):
+        success, count = retry.retry_download("cat", str(out_dir), max_num=5)
+
+    assert success is True
+    assert count == 5
+    # The first attempt added one image to the two already there
+    assert retry.stats.retry_history[0]["images_needed"] == 2
+    assert retry.stats.total_attempts == 3
+    assert added == [5, 5, 5]
+    assert len(list(out_dir.glob("*.png"))) == 5
+
+
+def test_retry_waits_for_throttled_engines():
+    """Retries wait as long as the engine's rate control asks, and at least the backoff."""
+    from builder._generator import Retry, RetryConfig
+    from builder._search_engines import DDGS_ENGINE_NAME
+
+    retry = Retry(RetryConfig(backoff_delay=0.1))
+    assert retry._retry_delay(use_ddgs=True) == 0.1
+    assert retry._retry_delay(use_ddgs=False) == 0.1
+
+    retry.rate_controller.record_throttle(DDGS_ENGINE_NAME, retry_after=30)
+    retry.rate_controller.record_throttle("bing", retry_after=20)
+    assert 29 < retry._retry_delay(use_ddgs=True) <= 30
+    assert 19 < retry._retry_delay(use_ddgs=False) <= 20
+
+    retry.rate_controller.record_success("google")
+    assert retry._retry_delay(use_ddgs=False) == 0.1
+
+
 def test_keyword_management_basic():
     """Test basic keyword management functionality."""
     try:
@@ -371,6 +498,53 @@ def test_keyword_management_basic():
         pytest.fail(f"Keyword management test failed: {e}")
 
 
+def test_keyword_expansion_is_batched_and_cached(temp_dir):
+    """Uncached categories share one prompt; later managers read the persisted cache."""
+    from builder._keyword_cache import KeywordCache
+    from builder._keywords import KeywordManagement
+
+    response = '{"cats": ["kitten", "cat photo"], "dogs": ["puppy"]}'
+    with patch.object(KeywordManagement, "_complete", return_value=response) as complete:
+        km = KeywordManagement(keyword_cache=KeywordCache.for_directory(temp_dir))
+        results = km.generate_keywords_batch(["cats", "dogs"])
+        assert complete.call_count == 1
+        assert results == {"cats": ["cats", "kitten", "cat photo"], "dogs": ["dogs", "puppy"]}
+
+        fresh = KeywordManagement(keyword_cache=KeywordCache.for_directory(temp_dir))
+        assert fresh.generate_keywords("Cats") == ["cats", "kitten", "cat photo"]
+        assert complete.call_count == 1
+
+        other_model = KeywordManagement(ai_model="gpt4",
+                                        keyword_cache=KeywordCache.for_directory(temp_dir))
+        other_model.generate_keywords_batch(["cats"])
+        assert complete.call_count == 2
+
+
+def test_keyword_expansion_async_falls_back_on_timeout():
+    """A slow model does not hold up the caller past the timeout."""
+    import asyncio
+    import time
+    from builder._keywords import KeywordManagement
+
+    km = KeywordManagement()
+    km.keyword_cache.put("cats", km.ai_model, km.generation_strategy, ["cats", "kitten"])
+
+    def slow_complete(prompt):
+        time.sleep(1.0)
+        return '{"dogs": ["puppy"]}'
+
+    async def expand():
+        started = time.monotonic()
+        results = await km.generate_keywords_async(["cats", "dogs"], timeout=0.2)
+        return results, time.monotonic() - started
+
+    with patch.object(KeywordManagement, "_complete", side_effect=slow_complete):
+        results, elapsed = asyncio.run(expand())
+
+    assert elapsed < 1.0
+    assert results == {"cats": ["cats", "kitten"], "dogs": ["dogs"]}
+
+
 def test_builder_configuration_methods(temp_dir):
     """Test Builder configuration methods."""
     try:
@@ -401,6 +575,120 @@ def test_builder_configuration_methods(temp_dir):
         pytest.fail(f"Builder configuration test failed: {e}")
 
 
+def _fake_retry_download(keyword, out_dir, max_num, max_retries):
+    """Write three small images into the keyword directory, like a successful download."""
+    for i in range(3):
+        _write_png_image(Path(out_dir) / f"{i + 1:04d}.png", size=(8 + i, 8))
+    return True, 3
+
+
+def _streaming_builder(temp_dir, sample_config, **kwargs):
+    from builder import Builder
+
+    config_path = temp_dir / "test_config.json"
+    with open(config_path, 'w') as f:
+        json.dump(sample_config, f)
+    return Builder(config_path=str(config_path), output_dir=str(temp_dir / "output"),
+                   keyword_generation="disabled", generate_labels=False, **kwargs)
+
+
+@patch('builder._generator.retry_download')
+def test_generate_async_batches_streams_image_records(mock_retry, temp_dir, sample_config):
+    """Every keyword's images arrive as metadata records in fixed-size batches."""
+    import asyncio
+
+    mock_retry.side_effect = _fake_retry_download
+    builder = _streaming_builder(temp_dir, sample_config)
+
+    async def consume():
+        return [batch async for batch in
+                builder.generate_async_batches(batch_size=5, max_pending_batches=1)]
+
+    batches = asyncio.run(consume())
+    builder.cleanup(timeout=5)
+
+    assert [len(batch) for batch in batches] == [5, 5, 2]
+    records = [record for batch in batches for record in batch]
+    assert {record["metadata_"]["keyword"] for record in records} == {
+        "cat", "kitten", "dog", "puppy"}
+    first = records[0]
+    assert (first["filename"], first["width"], first["format_"]) == ("0001.png", 8, "png")
+    assert first["is_valid"] is True
+
+
+@patch('builder._generator.retry_download')
+def test_generate_async_batches_includes_skipped_keywords(mock_retry, temp_dir, sample_config):
+    """Keywords finished by an earlier run are streamed without being downloaded again."""
+    import asyncio
+
+    mock_retry.side_effect = _fake_retry_download
+    options = {"continue_from_last": True, "cache_file": str(temp_dir / "progress.json")}
+
+    async def consume(builder):
+        records = [record async for batch in builder.generate_async_batches(batch_size=5)
+                   for record in batch]
+        builder.cleanup(timeout=5)
+        return records
+
+    first = asyncio.run(consume(_streaming_builder(temp_dir, sample_config, **options)))
+    again = asyncio.run(consume(_streaming_builder(temp_dir, sample_config, **options)))
+
+    assert mock_retry.call_count == 4
+    assert len(again) == len(first) == 12
+    assert {record["metadata_"]["keyword"] for record in again} == {
+        "cat", "kitten", "dog", "puppy"}
+
+
+@patch('builder._generator.retry_download')
+def test_generate_async_batches_stops_when_consumer_leaves(mock_retry, temp_dir, sample_config):
+    """Leaving the stream early stops generation instead of downloading every keyword."""
+    import asyncio
+
+    mock_retry.side_effect = _fake_retry_download
+    builder = _streaming_builder(temp_dir, sample_config)
+
+    async def consume_one():
+        async for batch in builder.generate_async_batches(batch_size=3, max_pending_batches=1):
+            return batch
+
+    assert len(asyncio.run(consume_one())) == 3
+    builder.cleanup(timeout=10)
+
+    assert mock_retry.call_count < 4
+
+
+def test_progress_cache_journals_and_compacts(temp_dir):
+    """Completions are appended to a journal, survive a torn line and compact into the snapshot."""
+    from builder.progress import ProgressCache
+
+    cache_file = str(temp_dir / "progress_cache.json")
+    cache = ProgressCache(cache_file, sync_every=4, compact_min_entries=10)
+    for i in range(8):
+        cache.mark_completed("animals", f"kw{i}", {"downloaded": i})
+    cache.remove_completed("animals", "kw0")
+    assert not (temp_dir / "progress_cache.json").exists()
+
+    # Simulate a crash in the middle of a journal write
+    with open(cache_file + ".journal", "a", encoding="utf-8") as f:
+        f.write('{"op": "done", "key": "animals/kw')
+
+    resumed = ProgressCache(cache_file, compact_min_entries=10)
+    assert resumed.is_completed("animals", "kw7")
+    assert not resumed.is_completed("animals", "kw0")
+    assert resumed.completed_paths["animals/kw3"]["metadata"] == {"downloaded": 3}
+
+    for i in range(8, 12):
+        resumed.mark_completed("plants", f"kw{i}")
+    # The second write outgrows the snapshot and compacts; the last two stay in the journal
+    assert json.loads((temp_dir / "progress_cache.json").read_text())["plants/kw9"]["keyword"] == "kw9"
+    assert len((temp_dir / "progress_cache.json.journal").read_text().splitlines()) == 2
+
+    resumed.mark_completed("plants", "kw12")
+    resumed.close()
+    assert ProgressCache(cache_file).get_completion_stats() == {"total_completed": 12,
+                                                                "categories": 2}
+
+
 if __name__ == "__main__":
     """Run tests with pytest if available, otherwise with unittest."""
     if HAS_PYTEST:
@@ -103,7 +103,7 @@ def test_retry_download_success(mock_ddgs, mock_downloader, temp_dir):
         mock_downloader.return_value.download.return_value = (False, 0)
 
         # Mock DDGS to succeed on retry
-        def fake_ddgs(keyword, out_dir, max_num):
+        def fake_ddgs(keyword, out_dir, max_num, **kwargs):
             Path(out_dir).mkdir(parents=True, exist_ok=True)
             for i in range(max_num):
                 _write_png_image(Path(out_dir) / f"ddgs_{i+1:03d}.png")
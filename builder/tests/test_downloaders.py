@@ -0,0 +1,816 @@
+"""
+Tests for the builder download paths.
+
+These tests run against a local HTTP server so they never touch live search
+engines or image hosts.
+"""
+
+import io
+import os
+import random
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+
+def _png_bytes(size=(64, 64), seed: int = 0) -> bytes:
+    """Create PNG bytes with noisy content so they exceed the minimum file size."""
+    rng = random.Random(seed)
+    img = Image.new("RGB", size)
+    img.putdata([(rng.randrange(256), rng.randrange(256), rng.randrange(256))
+                 for _ in range(size[0] * size[1])])
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    """Serves synthetic images and error responses for download tests."""
+
+    def do_GET(self):
+        if self.path.startswith("/img/"):
+            seed = int(self.path.rsplit("/", 1)[-1].split(".")[0])
+            self._send(200, "image/png", _png_bytes(seed=seed))
+        elif self.path == "/html":
+            self._send(200, "text/html", b"<html>" + b"x" * 4096 + b"</html>")
+        elif self.path == "/disguised":
+            self._send(200, "image/png", b"<html>" + b"x" * 4096 + b"</html>")
+        elif self.path == "/tiny":
+            self._send(200, "image/png", _png_bytes(size=(1, 1)))
+        elif self.path == "/throttled":
+            self._send(429, "text/plain", b"slow down", {"Retry-After": "30"})
+        else:
+            self._send(404, "text/plain", b"not found")
+
+    def _send(self, status: int, content_type: str, body: bytes, headers=None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def builder_state_home(tmp_path, monkeypatch):
+    """Keep the persistent job stores in a temporary user cache directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def image_server():
+    """Run a local HTTP server for the duration of a test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_path = Path(tempfile.mkdtemp())
+    yield temp_path
+    import shutil
+    if temp_path.exists():
+        shutil.rmtree(temp_path)
+
+
+def test_aiohttp_downloader_stops_at_max_num(image_server, temp_dir):
+    """AioHttpDownloader saves exactly max_num images and skips bad responses."""
+    pytest.importorskip("aiohttp")
+    from builder._downloader import AioHttpDownloader
+
+    urls = [f"{image_server}/html", f"{image_server}/tiny", f"{image_server}/missing"]
+    urls += [f"{image_server}/img/{i}.png" for i in range(10)]
+
+    downloader = AioHttpDownloader(max_concurrent=4, per_host_limit=2)
+    saved = downloader.download_urls(urls, str(temp_dir), max_num=5)
+
+    files = sorted(p.name for p in temp_dir.iterdir() if not p.name.startswith("."))
+    assert saved == 5
+    assert len(files) == 5
+    assert all(name.endswith(".png") for name in files)
+    # Bodies stream through partial files, none of which is left behind
+    assert list(temp_dir.glob("*.part")) == []
+
+
+def test_aiohttp_downloader_continues_file_numbering(image_server, temp_dir):
+    """A second call into the same directory does not overwrite the first call's images."""
+    pytest.importorskip("aiohttp")
+    from builder._downloader import AioHttpDownloader
+
+    downloader = AioHttpDownloader(max_concurrent=2, per_host_limit=2)
+    assert downloader.download_urls([f"{image_server}/img/{i}.png" for i in range(2)],
+                                    str(temp_dir), max_num=2) == 2
+    assert downloader.download_urls([f"{image_server}/img/{i}.png" for i in range(2, 4)],
+                                    str(temp_dir), max_num=2) == 2
+
+    files = sorted(p.name for p in temp_dir.iterdir() if not p.name.startswith("."))
+    assert files == [f"aio_{i:04d}.png" for i in range(1, 5)]
+
+
+def test_aiohttp_downloader_rejects_everything_invalid(image_server, temp_dir):
+    """AioHttpDownloader returns zero when no URL yields a valid image."""
+    pytest.importorskip("aiohttp")
+    from builder._downloader import AioHttpDownloader
+
+    urls = [f"{image_server}/html", f"{image_server}/tiny", f"{image_server}/missing"]
+    saved = AioHttpDownloader().download_urls(urls, str(temp_dir), max_num=3)
+
+    assert saved == 0
+    assert [p for p in temp_dir.iterdir() if not p.name.startswith(".")] == []
+    assert list(temp_dir.glob("*.part")) == []
+
+
+def test_ddgs_concurrent_downloads_stop_at_max_count(image_server, temp_dir):
+    """The concurrent DDGS path never writes more than max_count images."""
+    from builder._search_engines import DDGSImageDownloader
+
+    results = [{"image": f"{image_server}/html"}, {"image": f"{image_server}/missing"}]
+    results += [{"image": f"{image_server}/img/{i}.png"} for i in range(12)]
+
+    downloader = DDGSImageDownloader(max_workers=4, per_host_interval=0)
+    saved = downloader._execute_concurrent_downloads(results, str(temp_dir), max_count=4)
+
+    assert saved == 4
+    assert len(list(temp_dir.iterdir())) == 4
+
+
+def test_ddgs_session_is_closed_after_download(temp_dir, monkeypatch):
+    """download_images_ddgs releases the HTTP session of the downloader it creates."""
+    from builder._search_engines import DDGSImageDownloader, download_images_ddgs
+
+    closed = []
+    close = DDGSImageDownloader.close
+    monkeypatch.setattr(DDGSImageDownloader, "download", lambda self, *args: (True, 2))
+    monkeypatch.setattr(DDGSImageDownloader, "close",
+                        lambda self: (closed.append(self), close(self)))
+
+    assert download_images_ddgs("cat", str(temp_dir), 2) == (True, 2)
+    assert len(closed) == 1
+
+
+class _FakeCrawler:
+    """Minimal stand-in for an iCrawler crawler that writes through its storage."""
+
+    def __init__(self, storage, **kwargs):
+        from icrawler.utils import Signal
+        self.storage = storage
+        self.signal = Signal()
+        self.signal.set(reach_max_num=False)
+        self.parser = type("Parser", (), {"parse": lambda *args, **kwargs: []})()
+
+    def crawl(self, keyword, max_num, min_size=None, offset=0, file_idx_offset=0):
+        self.signal.set(reach_max_num=False)
+        for i in range(max_num):
+            if self.signal.get("reach_max_num"):
+                break
+            self.storage.write(f"{file_idx_offset + i + 1:06d}.jpg", b"x" * 2048)
+
+
+def _fake_engine_processor():
+    """Create an EngineProcessor whose engines all use _FakeCrawler."""
+    from builder._engine import EngineProcessor
+
+    class Processor(EngineProcessor):
+        @staticmethod
+        def get_crawler_class(engine_name):
+            return _FakeCrawler
+
+    downloader = type("Downloader", (), {})()
+    downloader.total_downloaded = 0
+    downloader.stop_workers = False
+    downloader.lock = threading.RLock()
+    downloader.min_image_size = (100, 100)
+    downloader.delay_between_searches = 0
+    downloader.log_level = 30
+    downloader.feeder_threads = downloader.parser_threads = 1
+    downloader.downloader_threads = 1
+    return Processor(downloader)
+
+
+def test_parallel_engines_share_target(temp_dir):
+    """Parallel engines never exceed the shared target and clean up their staging dirs."""
+    processor = _fake_engine_processor()
+    variations = [f"cat variation {i}" for i in range(6)]
+
+    results = processor.download_with_parallel_engines("cat", variations, str(temp_dir), 25)
+
+    files = list(temp_dir.iterdir())
+    assert len(files) == 25
+    assert all(path.is_file() for path in files)
+    assert sum(result.total_downloaded for result in results) == 25
+    assert processor.image_downloader.total_downloaded == 25
+
+
+def test_streaming_fetch_saves_with_detected_extension(image_server, temp_dir):
+    """Accepted bodies are streamed to disk under the extension of the sniffed format."""
+    from builder._search_engines import DDGSImageDownloader
+
+    downloader = DDGSImageDownloader(per_host_interval=0)
+    assert downloader._get_image(f"{image_server}/img/1.png", str(temp_dir / "ddgs_001.jpg"))
+
+    assert [p.name for p in temp_dir.iterdir()] == ["ddgs_001.png"]
+
+
+def test_stopped_stream_is_abandoned(temp_dir):
+    """A stream stops at the next chunk once its stop event is set and leaves no file."""
+    from builder._streaming import stream_response_to_file
+
+    body = _png_bytes()
+    stop_event = threading.Event()
+
+    class _StreamedResponse:
+        headers = {"Content-Type": "image/png", "Content-Length": str(len(body))}
+
+        def iter_content(self, chunk_size):
+            yield body[:1024]
+            stop_event.set()
+            yield body[1024:]
+
+    path = stream_response_to_file(_StreamedResponse(), str(temp_dir / "ddgs_001.jpg"),
+                                   stop_event=stop_event)
+
+    assert path is None
+    assert list(temp_dir.iterdir()) == []
+
+
+@pytest.mark.parametrize("path, limits", [
+    ("/disguised", {}),
+    ("/tiny", {}),
+    ("/img/1.png", {"max_pixels": 1000}),
+    ("/img/1.png", {"max_bytes": 2048}),
+])
+def test_streaming_fetch_rejects_early(image_server, temp_dir, path, limits):
+    """Disguised, tiny and oversized bodies are rejected without leaving files behind."""
+    from builder._exceptions import DownloadError
+    from builder._search_engines import DDGSImageDownloader
+    from builder._streaming import StreamLimits
+
+    downloader = DDGSImageDownloader(per_host_interval=0, stream_limits=StreamLimits(**limits))
+    with pytest.raises(DownloadError):
+        downloader._get_image(f"{image_server}{path}", str(temp_dir / "ddgs_001.jpg"))
+
+    assert list(temp_dir.iterdir()) == []
+
+
+def test_streaming_fetch_releases_quota_when_move_fails(image_server, temp_dir, monkeypatch):
+    """A body whose final move fails gives back its quota slot and its digest."""
+    import hashlib
+    from builder._concurrency import DownloadQuota
+    from builder._content_digest import ContentDigestIndex
+    from builder._exceptions import DownloadError
+    from builder._search_engines import DDGSImageDownloader
+    import builder._streaming as streaming
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    digests = ContentDigestIndex(temp_dir)
+    downloader = DDGSImageDownloader(per_host_interval=0, content_digests=digests)
+    quota = DownloadQuota(1)
+    monkeypatch.setattr(streaming.os, "replace", failing_replace)
+    with pytest.raises(DownloadError):
+        downloader._get_image(f"{image_server}/img/1.png", str(temp_dir / "ddgs_001.jpg"), quota)
+
+    assert quota.count == 0
+    assert digests.claim(hashlib.md5(_png_bytes(seed=1)).hexdigest())
+    assert list(temp_dir.iterdir()) == []
+
+
+def test_url_index_skips_repeats_and_persists(temp_dir):
+    """Normalized repeats are skipped, and a persistent store is shared between indexes."""
+    from builder._url_index import URLIndex
+
+    first = URLIndex.for_directory(temp_dir)
+    assert first.check_and_add("HTTPS://Example.com:443/a.jpg#frag")
+    assert not first.check_and_add("https://example.com/a.jpg")
+    assert first.check_and_add("https://example.com/b.jpg")
+    assert first.skipped == 1
+
+    second = URLIndex.for_directory(temp_dir)
+    assert not second.check_and_add("https://example.com/b.jpg")
+    assert second.check_and_add("https://example.com/c.jpg")
+    first.close()
+    second.close()
+
+
+def test_job_stores_are_kept_outside_the_dataset(temp_dir, builder_state_home):
+    """Persistent stores of a dataset directory live in the state directory, keyed by its path."""
+    from builder._scheduler import YieldStats
+    from builder._search_cache import SearchResultCache
+    from builder._state_dir import state_store_path
+    from builder._url_index import URLIndex
+
+    stores = [URLIndex.for_directory(temp_dir), SearchResultCache.for_directory(temp_dir),
+              YieldStats.for_directory(temp_dir)]
+    for store in stores:
+        assert store.store_path.is_relative_to(builder_state_home)
+        store.close()
+    assert list(temp_dir.iterdir()) == []
+    assert len({store.store_path.parent for store in stores}) == 1
+    assert state_store_path(temp_dir / "other", "x").parent != stores[0].store_path.parent
+
+
+def test_ddgs_skips_urls_already_fetched(image_server, temp_dir):
+    """A URL returned twice is requested and written only once."""
+    from builder._search_engines import DDGSImageDownloader
+    from builder._url_index import URLIndex
+
+    url_index = URLIndex()
+    downloader = DDGSImageDownloader(max_workers=2, per_host_interval=0, url_index=url_index)
+    results = [{"image": f"{image_server}/img/{i % 3}.png"} for i in range(9)]
+
+    saved = downloader._execute_concurrent_downloads(results, str(temp_dir), max_count=9)
+
+    assert saved == 3
+    assert url_index.skipped == 6
+
+
+def test_failed_urls_are_not_recorded_as_fetched(image_server, temp_dir):
+    """A URL whose download fails can be retried, in this job and by later ones."""
+    from builder._search_engines import DDGSImageDownloader
+    from builder._url_index import URLIndex
+
+    url_index = URLIndex.for_directory(temp_dir)
+    downloader = DDGSImageDownloader(max_workers=1, per_host_interval=0, url_index=url_index)
+    results = [{"image": f"{image_server}/missing"}, {"image": f"{image_server}/img/0.png"}]
+
+    assert downloader._execute_sequential_downloads(results, str(temp_dir), 2) == 1
+    assert url_index.check_and_add(f"{image_server}/missing")
+    url_index.forget(f"{image_server}/missing")
+    url_index.close()
+
+    later = URLIndex.for_directory(temp_dir)
+    assert later.check_and_add(f"{image_server}/missing")
+    assert not later.check_and_add(f"{image_server}/img/0.png")
+    later.close()
+
+
+def test_duplicate_content_is_not_written(image_server, temp_dir):
+    """Identical bodies behind different URLs are written once and their digest recorded."""
+    from builder._content_digest import ContentDigestIndex
+    from builder._search_engines import DDGSImageDownloader
+
+    digests = ContentDigestIndex.for_directory(temp_dir)
+    downloader = DDGSImageDownloader(max_workers=2, per_host_interval=0, content_digests=digests)
+    results = [{"image": f"{image_server}/img/7.png?copy={i}"} for i in range(4)]
+
+    saved = downloader._execute_concurrent_downloads(results, str(temp_dir), max_count=4)
+
+    images = [p for p in temp_dir.iterdir() if p.suffix == ".png"]
+    assert saved == 1
+    assert len(images) == 1
+    assert digests.duplicates_skipped == 3
+    assert ContentDigestIndex(temp_dir).digest_of(images[0].name) is not None
+
+
+def test_content_digests_follow_sequential_rename(temp_dir):
+    """Renaming images keeps their recorded digests attached to the new names."""
+    from builder._content_digest import ContentDigestIndex
+    from builder._helpers import rename_images_sequentially
+
+    digests = ContentDigestIndex.for_directory(temp_dir)
+    for name, digest in [("b_img.png", "bbb"), ("a_img.png", "aaa")]:
+        (temp_dir / name).write_bytes(b"x" * 10)
+        digests.record(name, digest, 10)
+
+    rename_images_sequentially(str(temp_dir))
+
+    reloaded = ContentDigestIndex(temp_dir)
+    assert reloaded.digest_of("0001.png") == "aaa"
+    assert reloaded.digest_of("0002.png") == "bbb"
+    assert len(reloaded) == 2
+    assert reloaded.current_digest("0001.png") == "aaa"
+
+    # Rewritten at the same size: the recorded digest no longer describes the file
+    stat = os.stat(temp_dir / "0001.png")
+    os.utime(temp_dir / "0001.png", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert reloaded.current_digest("0001.png") is None
+
+
+def test_sequential_rename_moves_files_without_copying(temp_dir):
+    """Renaming relinks the existing files instead of rewriting their data."""
+    from builder._helpers import rename_images_sequentially
+
+    for name in ("b_img.png", "a_img.jpg"):
+        (temp_dir / name).write_bytes(name.encode())
+    inodes = {name: (temp_dir / name).stat().st_ino for name in ("a_img.jpg", "b_img.png")}
+
+    assert rename_images_sequentially(str(temp_dir)) == 2
+
+    assert sorted(p.name for p in temp_dir.iterdir()) == ["0001.jpg", "0002.png"]
+    assert (temp_dir / "0001.jpg").stat().st_ino == inodes["a_img.jpg"]
+    assert (temp_dir / "0002.png").stat().st_ino == inodes["b_img.png"]
+
+
+def test_incremental_rename_only_names_new_images(temp_dir):
+    """Incremental renaming leaves numbered images alone and continues after the highest number."""
+    from builder._helpers import rename_images_sequentially
+
+    for name in ("001.png", "003.png", "ddgs_000.png", "ddgs_001.jpg"):
+        (temp_dir / name).write_bytes(name.encode())
+    existing_mtime = (temp_dir / "003.png").stat().st_mtime_ns
+
+    assert rename_images_sequentially(str(temp_dir), incremental=True) == 2
+
+    assert sorted(p.name for p in temp_dir.iterdir()) == ["001.png", "003.png", "004.png", "005.jpg"]
+    assert (temp_dir / "004.png").read_bytes() == b"ddgs_000.png"
+    assert (temp_dir / "003.png").stat().st_mtime_ns == existing_mtime
+    assert rename_images_sequentially(str(temp_dir), incremental=True) == 0
+
+
+def test_incremental_rename_normalizes_foreign_numeric_names(temp_dir):
+    """Numeric names of another width, like iCrawler's six-digit ones, are renumbered."""
+    from builder._helpers import rename_images_sequentially
+
+    for name in ("001.png", "000481.jpg", "000482.jpg"):
+        (temp_dir / name).write_bytes(name.encode())
+
+    assert rename_images_sequentially(str(temp_dir), incremental=True) == 2
+
+    assert sorted(p.name for p in temp_dir.iterdir()) == ["001.png", "002.jpg", "003.jpg"]
+    assert (temp_dir / "002.jpg").read_bytes() == b"000481.jpg"
+
+
+def test_rate_controller_adapts_to_responses():
+    """Healthy responses speed a key up, throttles and empty pages slow it down."""
+    from builder._rate_control import AdaptiveRateController
+
+    controller = AdaptiveRateController(initial_rate=2.0, increase_step=0.5)
+    controller.record_success("google")
+    assert controller.rate_of("google") == pytest.approx(2.5)
+
+    controller.record_throttle("google")
+    assert controller.rate_of("google") == pytest.approx(1.25)
+    controller.record_empty("google")
+    assert controller.rate_of("google") == pytest.approx(1.0)
+
+    assert controller.rate_of("bing") == pytest.approx(2.0)
+    assert controller.acquire("bing") == 0.0
+    assert controller.snapshot()["google"]["throttles"] == 1
+
+
+def test_rate_controller_reports_delay_without_reserving():
+    """The pending wait of a key reflects throttling, and reading it takes no slot."""
+    from builder._rate_control import AdaptiveRateController
+
+    controller = AdaptiveRateController(initial_rate=2.0)
+    assert controller.delay_of("bing") == 0.0
+    assert controller.acquire("bing") == 0.0
+    assert controller.delay_of("bing") == pytest.approx(0.5, abs=0.05)
+    assert controller.delay_of("bing") == pytest.approx(0.5, abs=0.05)
+
+    controller.record_throttle("google", retry_after=30)
+    assert 29 < controller.delay_of("google") <= 30
+
+
+def test_throttled_host_is_blocked_without_stalling_worker(image_server, temp_dir):
+    """A 429 raises at once and the host's Retry-After delays the next request to it."""
+    import time
+    from builder._exceptions import RateLimitError
+    from builder._rate_control import host_of
+    from builder._search_engines import DDGSImageDownloader
+
+    downloader = DDGSImageDownloader(per_host_interval=0)
+    start = time.monotonic()
+    with pytest.raises(RateLimitError):
+        downloader._get_image(f"{image_server}/throttled", str(temp_dir / "ddgs_001.jpg"))
+    assert time.monotonic() - start < 5
+
+    state = downloader.host_rates.snapshot()[host_of(image_server)]
+    assert state["throttles"] == 1
+    assert state["blocked_until"] - time.monotonic() > 20
+
+
+def test_search_cache_persists_and_expires(temp_dir):
+    """Cached result pages survive a new cache on the same store until their TTL ends."""
+    from builder._search_cache import SearchResultCache
+
+    cache = SearchResultCache.for_directory(temp_dir)
+    cache.put("bing", "cat photo", 35, ["http://a/1.jpg", "http://a/2.jpg"])
+    cache.put("bing", "cat photo", 70, [])
+    cache.close()
+
+    reopened = SearchResultCache.for_directory(temp_dir)
+    assert reopened.get("bing", "cat photo", 35) == ["http://a/1.jpg", "http://a/2.jpg"]
+    assert reopened.get("bing", "cat photo", 35, min_results=3) is None
+    assert reopened.get("bing", "cat photo", 70) is None
+    assert reopened.hit_rate == pytest.approx(1 / 3)
+
+    expired = SearchResultCache(ttl=-1)
+    expired.put("google", "cat", 0, ["http://a/1.jpg"])
+    assert expired.get("google", "cat", 0) is None
+
+
+def test_search_cache_serves_crawler_pages_without_requests():
+    """A crawler page parsed once is served from the cache on the next crawl."""
+    from builder._search_cache import SearchResultCache
+
+    class Session:
+        requests = 0
+
+        def get(self, url, **kwargs):
+            Session.requests += 1
+            return type("Response", (), {"status_code": 200, "url": url})()
+
+    class Parser:
+        session = Session()
+
+        def parse(self, response):
+            yield {"file_url": "http://img/1.jpg"}
+            yield {"file_url": "http://img/2.jpg"}
+
+    crawler = type("Crawler", (), {})()
+    crawler.parser = Parser()
+    cache = SearchResultCache()
+    cache.attach(crawler, "bing")
+
+    page = "https://www.bing.com/images/async?q=cat&first=0"
+    for _ in range(2):
+        tasks = list(crawler.parser.parse(crawler.parser.session.get(page, timeout=5)))
+        assert [task["file_url"] for task in tasks] == ["http://img/1.jpg", "http://img/2.jpg"]
+
+    assert Session.requests == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_yield_stats_persist_per_engine_and_template(temp_dir):
+    """Yields are kept per engine and per template and survive a reopen."""
+    from builder._scheduler import YieldStats, template_of
+
+    assert template_of("cat photo", "cat") == "{keyword} photo"
+
+    store = Path(temp_dir) / ".yield_stats.sqlite"
+    stats = YieldStats(store_path=store)
+    stats.record("bing", "{keyword} photo", images=8, attempts=10)
+    stats.record("bing", "{keyword} drawing", images=0, attempts=4)
+    stats.close()
+
+    reopened = YieldStats(store_path=store)
+    assert reopened.engine("bing").searches == 2
+    assert reopened.engine("bing").images_per_search == 4.0
+    assert reopened.template("{keyword} photo").pass_rate == 0.8
+    assert reopened.template("{keyword} sketch").searches == 0
+    reopened.close()
+
+
+def test_validation_rejections_are_charged_to_their_search(temp_dir):
+    """Images rejected by validation lower the yield of the engine and template that saved them."""
+    from builder._content_digest import ContentDigestIndex
+    from builder._download_manifest import DownloadManifest, STATUS_SAVED
+    from builder._scheduler import YieldStats, record_validation_outcome
+
+    digests = ContentDigestIndex(temp_dir)
+    manifest = DownloadManifest(temp_dir, digests)
+    sources = [("bing", "{keyword} photo"), ("bing", "{keyword} photo"),
+               ("bing", "{keyword} pixelated")]
+    for i, source in enumerate(sources):
+        name = f"{i:04d}.png"
+        (temp_dir / name).write_bytes(b"x" * (i + 1))
+        digests.record(name, f"md5-{i}", i + 1)
+        manifest.finish(f"https://a.test/{i}.png", STATUS_SAVED, temp_dir / name, source)
+
+    stats = YieldStats()
+    stats.record("bing", "{keyword} photo", images=2, attempts=2)
+    stats.record("bing", "{keyword} pixelated", images=1, attempts=1)
+    assert record_validation_outcome(temp_dir, ["md5-2", "not-downloaded"], stats) == 1
+
+    assert stats.template("{keyword} pixelated").images_per_search == 0.0
+    assert stats.template("{keyword} pixelated").pass_rate == 0.0
+    assert stats.template("{keyword} photo").pass_rate == 1.0
+    assert stats.engine("bing").valid_images == 2
+
+
+def test_duplicate_results_count_as_results_not_attempts():
+    """URLs skipped as already fetched are search results but not download attempts."""
+    from builder._scheduler import (track_download_attempts, download_attempts_of,
+                                    track_search_results, search_results_of)
+    from builder._url_index import URLIndex
+
+    downloader = type("Downloader", (), {})()
+    downloader.download = lambda task, *args, **kwargs: task.update(success=True, filename="a.jpg")
+    crawler = type("Crawler", (), {"downloader": downloader})()
+    track_download_attempts(crawler)
+    URLIndex().attach(crawler)
+    track_search_results(crawler)
+
+    for _ in range(3):
+        crawler.downloader.download({"file_url": "https://example.com/a.jpg"})
+
+    assert search_results_of(crawler) == 3
+    assert download_attempts_of(crawler) == 1
+
+
+def test_yield_scheduler_prefers_productive_templates_but_explores():
+    """High-yield templates come first, untried ones still outrank proven duds."""
+    from builder._scheduler import YieldStats, YieldScheduler
+
+    stats = YieldStats()
+    for _ in range(5):
+        stats.record("google", "{keyword} photo", images=20)
+        stats.record("google", "{keyword} clipart", images=0)
+
+    variations = ["cat clipart", "cat sketch", "cat photo"]
+    exploring = YieldScheduler(stats).order_variations(variations, "cat")
+    assert exploring.index("cat sketch") < exploring.index("cat clipart")
+    assert exploring.index("cat photo") < exploring.index("cat clipart")
+
+    greedy = YieldScheduler(stats, exploration=0.0).order_variations(variations, "cat")
+    assert greedy == ["cat photo", "cat sketch", "cat clipart"]
+
+
+def test_download_counter_follows_storage_writes(temp_dir):
+    """Existing images are counted once; new ones are counted as the storage writes them."""
+    from builder._concurrency import DownloadCounter
+    from builder._content_digest import ContentDigestIndex, DigestStorage
+
+    for name in ("0001.png", "0002.jpg", "notes.txt"):
+        (temp_dir / name).write_bytes(name.encode())
+
+    counter = DownloadCounter()
+    assert counter.seed(temp_dir) == 2
+
+    storage = DigestStorage(str(temp_dir), ContentDigestIndex(temp_dir), counter)
+    for i, data in enumerate([b"a" * 2048, b"b" * 2048, b"a" * 2048]):
+        storage.write(f"{i:06d}.jpg", data)
+
+    assert counter.count(temp_dir) == 4
+    assert counter.seed(str(temp_dir) + "/") == 4
+
+
+def test_variation_counts_ignore_images_already_present(temp_dir):
+    """Per-variation counts come from save events, not from the directory size."""
+    from builder._engine import SingleEngineProcessor
+
+    for i in range(5):
+        (temp_dir / f"{i + 1:04d}.png").write_bytes(b"old")
+
+    processor = _fake_engine_processor()
+    config = processor.engine_configs[0]
+    result = SingleEngineProcessor(processor.image_downloader, processor).process_engine(
+        config, ["cat photo", "cat picture"], str(temp_dir), 8, 8)
+
+    assert [v.downloaded_count for v in result.variations] == [4, 4]
+    assert result.total_downloaded == 8
+    assert processor.image_downloader.total_downloaded == 8
+
+
+def test_workspace_chunks_publish_into_shards_and_manifest(temp_dir):
+    """Chunks write privately; publishing links them into shards and the manifest lists them all."""
+    from builder._content_digest import ContentDigestIndex, DigestStorage
+    from builder._workspace import CrawlWorkspace
+
+    workspace = CrawlWorkspace.for_job(7, base_dir=temp_dir)
+    google = workspace.chunk_dir("red cat", "google")
+    bing = workspace.chunk_dir("red cat", "bing")
+    assert google != bing
+    assert CrawlWorkspace.containing(google).root == workspace.root
+    assert CrawlWorkspace.containing(temp_dir) is None
+
+    for index, chunk in enumerate((google, bing)):
+        chunk.mkdir(parents=True)
+        storage = DigestStorage(str(chunk), ContentDigestIndex(chunk))
+        for i in range(3):
+            storage.write(f"{i:06d}.png", _png_bytes(seed=10 * index + i))
+
+    assert workspace.publish_chunk(google, {"engine": "google"}) == 3
+    assert workspace.publish_chunk(bing, {"engine": "bing"}) == 3
+    # Republishing is idempotent
+    assert workspace.publish_chunk(google, {"engine": "google"}) == 3
+
+    entries = list(CrawlWorkspace.for_job(7, base_dir=temp_dir).iter_entries())
+    assert len(entries) == 6
+    assert len({entry["path"] for entry in entries}) == 6
+    for entry in entries:
+        published = workspace.root / entry["path"]
+        assert published.parent.parent == workspace.dataset_dir
+        assert published.read_bytes() == (workspace.chunks_dir / entry["chunk"] / entry["source"]).read_bytes()
+        assert entry["hash"] is not None
+
+    manifest = workspace.write_manifest()
+    assert len(manifest.read_text().splitlines()) == 6
+    assert not list(workspace.root.glob("*.tmp"))
+
+
+def test_content_store_keeps_one_blob_across_jobs(temp_dir):
+    """Jobs that crawl the same image share one blob; their dataset views link to it."""
+    from builder._content_store import ContentStore
+    from builder._workspace import CrawlWorkspace
+
+    data = _png_bytes(seed=42)
+    views = []
+    for job_id in (1, 2):
+        workspace = CrawlWorkspace.for_job(job_id, base_dir=temp_dir)
+        chunk = workspace.chunk_dir("dog", "google")
+        chunk.mkdir(parents=True)
+        (chunk / "0001.png").write_bytes(data)
+        assert workspace.publish_chunk(chunk) == 1
+        views.append(next(workspace.iter_entries()))
+
+    store = ContentStore.beside(temp_dir)
+    blobs = [p for p in store.root.rglob("*") if p.is_file()]
+    assert len(blobs) == 1
+    assert views[0]["blob"] == views[1]["blob"] == blobs[0].relative_to(store.root).as_posix()
+    assert views[0]["hash"] == ContentStore.digest_file(blobs[0])
+    for job_id, entry in zip((1, 2), views):
+        published = temp_dir / f"crawl_{job_id}" / entry["path"]
+        assert os.path.samefile(published, blobs[0])
+
+
+def test_download_manifest_resumes_interrupted_run(image_server, temp_dir):
+    """A re-run counts images kept across renames and refetches only unfinished URLs."""
+    from builder._download_manifest import DownloadManifest, STATUS_SAVED
+    from builder._helpers import rename_images_sequentially
+    from builder._search_engines import DDGSImageDownloader
+    from builder._url_index import URLIndex
+
+    urls = [f"{image_server}/img/{i}.png" for i in range(3)]
+    url_index = URLIndex.for_directory(temp_dir)
+    manifest = DownloadManifest(temp_dir)
+    first = DDGSImageDownloader(max_workers=1, per_host_interval=0, url_index=url_index,
+                                content_digests=manifest.digests, download_manifest=manifest)
+    assert first._execute_sequential_downloads([{"image": urls[0]}], str(temp_dir), 1) == 1
+    # The worker died while fetching the second URL
+    assert url_index.check_and_add(urls[1])
+    first.download_manifest.start(urls[1])
+    url_index.close()
+    rename_images_sequentially(str(temp_dir), incremental=True)
+
+    url_index = URLIndex.for_directory(temp_dir)
+    manifest = DownloadManifest(temp_dir)
+    assert manifest.status_of(urls[0]) == STATUS_SAVED
+    assert manifest.interrupted() == [urls[1]]
+    assert manifest.resume(url_index) == 1
+
+    second = DDGSImageDownloader(max_workers=1, per_host_interval=0, url_index=url_index,
+                                 content_digests=manifest.digests, download_manifest=manifest)
+    saved = second._execute_sequential_downloads([{"image": url} for url in urls],
+                                                 str(temp_dir), 3)
+
+    assert saved == 2
+    assert url_index.skipped == 0
+    assert manifest.interrupted() == []
+    assert manifest.saved_count() == 3
+    url_index.close()
+
+
+def test_download_manifest_retries_failed_urls(temp_dir):
+    """Failed requests are retried on resume; rejected images are not."""
+    from builder._download_manifest import DownloadManifest, STATUS_FAILED, STATUS_REJECTED
+    from builder._url_index import URLIndex
+
+    url_index = URLIndex.for_directory(temp_dir)
+    manifest = DownloadManifest(temp_dir)
+    for url, status in (("https://a.test/1.jpg", STATUS_FAILED),
+                        ("https://a.test/2.jpg", STATUS_REJECTED)):
+        assert url_index.check_and_add(url)
+        manifest.start(url)
+        manifest.finish(url, status)
+
+    manifest = DownloadManifest(temp_dir)
+    assert not manifest.is_done("https://a.test/1.jpg")
+    assert manifest.is_done("https://a.test/2.jpg")
+    assert manifest.retryable() == ["https://a.test/1.jpg"]
+    manifest.resume(url_index)
+    assert url_index.check_and_add("https://a.test/1.jpg")
+    assert not url_index.check_and_add("https://a.test/2.jpg")
+    url_index.close()
+
+
+def test_replay_server_answers_from_cassette_under_profile(temp_dir):
+    """Routed requests get the captured body; misses and rate limits are counted."""
+    import requests
+    from builder.benchmarks.replay import Cassette, ReplayProfile, ReplayServer, replaying
+
+    url = "https://img.replay.invalid/a.png"
+    cassette = Cassette(temp_dir / "cassette")
+    cassette.add_response("GET", url, 200, {"Content-Type": "image/png"}, _png_bytes())
+    # A reloaded cassette serves the same response
+    cassette = Cassette(temp_dir / "cassette")
+
+    profile = ReplayProfile(rate_limit=2, retry_after=7)
+    with ReplayServer(cassette, profile) as server, replaying(server.url):
+        session = requests.Session()
+        first = session.get(url, timeout=5)
+        missing = session.get("https://img.replay.invalid/missing.png", timeout=5)
+        throttled = session.get(url, timeout=5)
+
+    assert first.status_code == 200 and first.content == _png_bytes()
+    assert first.url == url
+    assert missing.status_code == 404
+    assert throttled.status_code == 429 and throttled.headers["Retry-After"] == "7"
+    assert (server.stats.hits, server.stats.misses, server.stats.throttled) == (1, 1, 1)
+    assert server.stats.bytes_sent >= len(_png_bytes())
@@ -4,6 +4,7 @@ from .core import (
     # Functions
     auth,
     load_dataset,
+    load_manifest,
     list_datasets,
     get_dataset_info,
     download_dataset,
@@ -22,6 +23,7 @@ __all__ = [
     # Functions
     "auth",
     "load_dataset",
+    "load_manifest",
     "list_datasets",
     "get_dataset_info",
     "download_dataset",
@@ -1,7 +1,7 @@
 import os
 import time
 from pathlib import Path
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, List, Sequence, Union
 
 import requests
 from dotenv import load_dotenv
@@ -186,6 +186,38 @@ def load_dataset(dataset_id: str, config: Optional[Dict[str, Any]] = None) -> Da
     raise ConnectionError(f"Dataset download failed after {max_retries} retry attempts")
 
 
+def load_manifest(
+    path: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    valid_only: bool = False,
+) -> Any:
+    """
+    Load a dataset manifest as an Arrow table.
+
+    Manifests are written with every dataset build and export. Arrow files are
+    memory-mapped; Parquet files only read the requested columns.
+
+    Args:
+        path: Path of a ``.parquet``, ``.arrow`` or ``.jsonl`` manifest.
+        columns: Columns to load, e.g. ``["path", "category"]``. All if None.
+        valid_only: Keep only images that passed validation.
+
+    Returns:
+        A ``pyarrow.Table`` with one row per image.
+
+    Raises:
+        ImportError: If pyarrow is not installed (``pip install pixcrawler-sdk[manifest]``).
+
+    Example:
+        >>> import pixcrawler as pix
+        >>> table = pix.load_manifest("dataset_manifest.parquet", columns=["path", "category"])
+        >>> table.num_rows
+    """
+    from utility.dataset_manifest import read_dataset_manifest
+
+    return read_dataset_manifest(path, columns=columns, valid_only=valid_only)
+
+
 # ============================================================================
 # Global Authentication Function
 # ============================================================================
@@ -7,6 +7,8 @@ components for compression, archiving, and logging.
 Modules:
     config: Unified configuration system for all utility sub-packages
     compress: Image compression and archiving utilities
+    content_digests: Content digest manifest shared by the builder and the validator
+    dataset_manifest: Dataset manifest columns and reader shared by the builder and the SDK
     logging_config: Centralized Loguru-based logging configuration
 
 Features:
@@ -23,4 +25,4 @@ Features:
 __version__ = "0.1.0"
 __author__ = "PixCrawler Team"
 
-__all__ = ["config", "compress", "logging_config"]
+__all__ = ["config", "compress", "content_digests", "dataset_manifest", "logging_config"]
@@ -0,0 +1,102 @@
+"""
+Content digest manifest shared by the builder and the validator.
+
+The builder records the MD5 digest of every image it writes in a JSON-lines manifest kept
+next to the images. The validator and the dataset manifest read it instead of hashing the
+images a second time. Both sides use the name and entry format defined here.
+
+Functions:
+    digest_entry: Builds one manifest entry for a file.
+    load_content_digests: Loads the recorded digests of a directory.
+    matches_file: Checks that a recorded entry still describes a file.
+
+Features:
+    - One entry per line: file name, MD5 digest, size in bytes and modification time.
+    - A digest is reused only while both the size and the modification time (in ns) of
+      the file still match, so a file rewritten at the same size is hashed again.
+    - Torn lines from an interrupted write are skipped.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Final, Optional, Tuple, Union
+
+__all__ = [
+    'CONTENT_DIGEST_MANIFEST',
+    'RecordedDigest',
+    'digest_entry',
+    'load_content_digests',
+    'matches_file'
+]
+
+CONTENT_DIGEST_MANIFEST: Final[str] = ".content_digests.jsonl"
+
+# MD5 digest, size in bytes and modification time in ns (None for entries without one)
+RecordedDigest = Tuple[str, int, Optional[int]]
+
+
+def digest_entry(file_name: str, recorded: RecordedDigest) -> Dict[str, Any]:
+    """
+    Builds the manifest entry of a file.
+
+    Args:
+        file_name (str): The file path relative to the directory.
+        recorded (RecordedDigest): The digest, size and modification time of the file.
+
+    Returns:
+        Dict[str, Any]: The entry, ready to be written as one JSON line.
+    """
+    digest, size, mtime_ns = recorded
+    entry: Dict[str, Any] = {"file": file_name, "md5": digest, "size": size}
+    if mtime_ns is not None:
+        entry["mtime_ns"] = mtime_ns
+    return entry
+
+
+def load_content_digests(directory: Union[str, Path]) -> Dict[str, RecordedDigest]:
+    """
+    Loads the content digests recorded for a directory, keeping the latest entry per file.
+
+    Args:
+        directory (Union[str, Path]): The image directory.
+
+    Returns:
+        Dict[str, RecordedDigest]: Maps file names to (MD5 digest, size, modification time).
+                                   Empty if the directory has no manifest.
+    """
+    digests: Dict[str, RecordedDigest] = {}
+    try:
+        with open(Path(directory) / CONTENT_DIGEST_MANIFEST, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    mtime_ns = entry.get("mtime_ns")
+                    digests[entry["file"]] = (entry["md5"], int(entry["size"]),
+                                              int(mtime_ns) if mtime_ns is not None else None)
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+    except OSError:
+        pass
+    return digests
+
+
+def matches_file(path: Union[str, Path], recorded: RecordedDigest) -> bool:
+    """
+    Checks that a recorded digest still describes a file.
+
+    Args:
+        path (Union[str, Path]): The file.
+        recorded (RecordedDigest): The recorded digest, size and modification time.
+
+    Returns:
+        bool: True if the file exists with the recorded size and modification time.
+    """
+    _, size, mtime_ns = recorded
+    if mtime_ns is None:
+        return False
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return stat.st_size == size and stat.st_mtime_ns == mtime_ns
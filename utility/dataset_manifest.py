@@ -0,0 +1,116 @@
+"""
+Dataset manifest layout shared by the builder, the backend and the SDK.
+
+The builder and the backend write one manifest row per image of a dataset; the SDK and
+training loaders read them back. The columns, the file formats and the reader live here,
+so readers do not depend on the builder.
+
+Functions:
+    manifest_schema: Returns the Arrow schema of the dataset manifest.
+    read_dataset_manifest: Loads a manifest as an Arrow table, memory-mapped where possible.
+
+Features:
+    - One row per image with path, category, keyword, width, height, format, size, content
+      hash, perceptual hash and validity.
+    - Parquet, Arrow IPC or JSONL files; Arrow files are memory-mapped when loaded.
+    - pyarrow is only imported when a manifest is read or a columnar one written.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Final, Optional, Sequence, Union
+
+__all__ = [
+    'DATASET_MANIFEST_FIELDS',
+    'DATASET_MANIFEST_NAME',
+    'MANIFEST_FORMATS',
+    'manifest_schema',
+    'read_dataset_manifest'
+]
+
+DATASET_MANIFEST_NAME: Final[str] = "dataset_manifest"
+
+DATASET_MANIFEST_FIELDS: Final[tuple] = (
+    "path", "category", "keyword", "width", "height", "format", "size",
+    "content_hash", "perceptual_hash", "valid")
+
+# Manifest format -> file suffix
+MANIFEST_FORMATS: Final[Dict[str, str]] = {
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+    "jsonl": ".jsonl",
+}
+
+
+def manifest_schema() -> Any:
+    """
+    Returns the Arrow schema of the dataset manifest.
+
+    Returns:
+        Any: A pyarrow.Schema.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    import pyarrow as pa
+    return pa.schema([
+        ("path", pa.string()),
+        ("category", pa.string()),
+        ("keyword", pa.string()),
+        ("width", pa.int32()),
+        ("height", pa.int32()),
+        ("format", pa.string()),
+        ("size", pa.int64()),
+        ("content_hash", pa.string()),
+        ("perceptual_hash", pa.string()),
+        ("valid", pa.bool_()),
+    ])
+
+
+def read_dataset_manifest(path: Union[str, Path], columns: Optional[Sequence[str]] = None,
+                          valid_only: bool = False) -> Any:
+    """
+    Loads a dataset manifest as an Arrow table.
+
+    Arrow files are memory-mapped, so loading does not copy the columns. Parquet files
+    only read the requested columns.
+
+    Args:
+        path (Union[str, Path]): The manifest file.
+        columns (Optional[Sequence[str]]): Columns to load; all if None.
+        valid_only (bool): Keep only rows whose ``valid`` column is true.
+
+    Returns:
+        Any: A pyarrow.Table.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    import pyarrow as pa
+
+    path = Path(path)
+    wanted = list(columns) if columns is not None else None
+    if wanted is not None and valid_only and "valid" not in wanted:
+        wanted.append("valid")
+
+    if path.suffix == MANIFEST_FORMATS["parquet"]:
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=wanted)
+    elif path.suffix == MANIFEST_FORMATS["arrow"]:
+        with pa.memory_map(str(path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        if wanted is not None:
+            table = table.select(wanted)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        table = pa.Table.from_pylist(rows, schema=manifest_schema())
+        if wanted is not None:
+            table = table.select(wanted)
+
+    if valid_only:
+        import pyarrow.compute as pc
+        table = table.filter(pc.fill_null(table["valid"], False))
+        if columns is not None and "valid" not in columns:
+            table = table.drop(["valid"])
+    return table
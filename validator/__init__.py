@@ -7,6 +7,8 @@ clean separation of concerns.
 
 Classes:
     ImageHasher: Computes image hashes for duplicate detection
+    PerceptualHashEngine: Computes batches of perceptual hashes on NumPy arrays
+    ImageAnalyzer: Validates, hashes and measures an image from one read and decode
     DuplicationManager: Detects and manages duplicate images
     ImageValidator: Validates image integrity and quality
     IntegrityProcessor: Main processor for integrity workflows
@@ -55,6 +57,16 @@ from validator.integrity import (
     process_integrity
 )
 
+from validator.hashing import (
+    PerceptualHashEngine,
+    HashBatch
+)
+
+from validator.analysis import (
+    ImageAnalyzer,
+    ImageAnalysis
+)
+
 from validator.validation import (
     CheckManager,
     DuplicateResult,
@@ -81,6 +93,10 @@ __all__ = [
     "DuplicationManager",
     "ImageValidator",
     "IntegrityProcessor",
+    "PerceptualHashEngine",
+    "HashBatch",
+    "ImageAnalyzer",
+    "ImageAnalysis",
 
     # Validation management
     "CheckManager",
@@ -0,0 +1,318 @@
+"""
+Single-pass image analysis for PixCrawler.
+
+Validating, hashing and describing an image used to open it several times: once to
+verify it, once more for its metadata, once for the perceptual hash and once to read the
+file for its MD5. This module reads each file once and decodes it once, and derives
+everything the validator, the builder labels and the backend need from that single
+decode into one compact record.
+
+Classes:
+    ImageAnalysis: Everything known about one image after a single read and decode
+    ImageAnalyzer: Produces ImageAnalysis records, for one image or many
+
+Features:
+    - One file read: the content hash is computed from the bytes that are decoded, unless
+      a digest recorded when the file was written is passed in
+    - One decode, at reduced scale for JPEG, serving validity, hashes and quality metrics
+    - Dimensions, format and mode come from the header, before the reduced decode
+    - A full decode catches truncated and corrupted pixel data that `verify()` misses
+    - Records are plain dataclasses, cheap to return from worker processes and to cache
+"""
+
+import hashlib
+import io
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from utility.logging_config import get_logger
+from validator.cache import ValidationCache
+from validator.hashing import HASH_ALGORITHMS, PerceptualHashEngine, hash_to_hex, words_to_int
+from validator.parallel import DEFAULT_MIN_PARALLEL_ITEMS, map_chunks
+
+logger = get_logger(__name__)
+
+__all__ = [
+    'DECODE_VERDICT',
+    'ImageAnalysis',
+    'ImageAnalyzer'
+]
+
+# Cache verdict of whether a file decodes as an image, independent of any size limits
+DECODE_VERDICT = "decode"
+
+# Quality metrics are measured on a thumbnail of this side, so they compare across sizes
+QUALITY_SIDE = 64
+
+
+@dataclass
+class ImageAnalysis:
+    """
+    Everything known about one image after a single read and decode.
+
+    Attributes:
+        path (str): Path of the image file.
+        size_bytes (int): File size in bytes; zero if the file could not be read.
+        valid (bool): Whether the file decoded as an image with non-zero dimensions.
+        error (Optional[str]): Why the image is not valid.
+        width (Optional[int]): Image width in pixels, from the header.
+        height (Optional[int]): Image height in pixels, from the header.
+        format (Optional[str]): Image format reported by Pillow; None if not identified.
+        mode (Optional[str]): Pillow mode of the stored image, e.g. 'RGB'.
+        has_transparency (bool): Whether the image has an alpha channel or transparent color.
+        content_hash (Optional[str]): MD5 digest of the file.
+        perceptual (Dict[str, int]): Packed perceptual hashes keyed by algorithm.
+        hash_size (int): Side of the perceptual hash grid.
+        quality (Dict[str, float]): Brightness and contrast in [0, 1], and sharpness as the
+                                    variance of the Laplacian of a grayscale thumbnail.
+    """
+    path: str
+    size_bytes: int = 0
+    valid: bool = False
+    error: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None
+    mode: Optional[str] = None
+    has_transparency: bool = False
+    content_hash: Optional[str] = None
+    perceptual: Dict[str, int] = field(default_factory=dict)
+    hash_size: int = 8
+    quality: Dict[str, float] = field(default_factory=dict)
+
+    def meets(self, min_width: int, min_height: int) -> bool:
+        """
+        Checks that the image is valid and at least a given size.
+
+        Args:
+            min_width (int): Minimum width in pixels.
+            min_height (int): Minimum height in pixels.
+
+        Returns:
+            bool: True if the image is valid and large enough.
+        """
+        return self.valid and self.width >= min_width and self.height >= min_height
+
+    def perceptual_hex(self, algorithm: str = "ahash") -> Optional[str]:
+        """
+        Returns one perceptual hash as a hex string.
+
+        Args:
+            algorithm (str): The hash algorithm.
+
+        Returns:
+            Optional[str]: The hash, or None if it was not computed.
+        """
+        value = self.perceptual.get(algorithm)
+        return None if value is None else hash_to_hex(value, self.hash_size * self.hash_size)
+
+    def metadata(self) -> Dict[str, Union[int, float, str, None]]:
+        """
+        Returns the image metadata in the layout of validation results and label files.
+
+        Returns:
+            Dict[str, Union[int, float, str, None]]: width, height, format_, mode,
+                                                     size_bytes and aspect_ratio.
+        """
+        return {
+            "width": self.width,
+            "height": self.height,
+            "format_": self.format or "Unknown",
+            "mode": self.mode,
+            "size_bytes": self.size_bytes,
+            "aspect_ratio": round(self.width / self.height, 2) if self.height else 0
+        }
+
+    def record(self, cache: ValidationCache, verdicts: Optional[Dict[str, bool]] = None) -> None:
+        """
+        Records the results in a validation cache, so no later step opens the file again.
+
+        Args:
+            cache (ValidationCache): The cache.
+            verdicts (Optional[Dict[str, bool]]): Further verdicts derived from this analysis,
+                                                  keyed by validation level.
+        """
+        cache.update(self.path, content_hash=self.content_hash,
+                     perceptual={f"{algorithm}:{self.hash_size}": value
+                                 for algorithm, value in self.perceptual.items()},
+                     width=self.width, height=self.height, format=self.format,
+                     verdicts={DECODE_VERDICT: self.valid, **(verdicts or {})})
+
+
+class ImageAnalyzer:
+    """
+    Analyzes images with one file read and one decode each.
+
+    The file is read into memory and hashed with MD5, then opened from those bytes. Header
+    fields are taken before decoding; the decode itself is a grayscale draft at the size the
+    perceptual hashes need, so JPEGs are decoded at reduced scale. Hashes of a chunk of images
+    are computed together on stacked thumbnails.
+    """
+
+    def __init__(self, hash_size: int = 8, algorithms: Sequence[str] = HASH_ALGORITHMS,
+                 batch_size: int = 256):
+        """
+        Initialize the ImageAnalyzer.
+
+        Args:
+            hash_size (int): Side of the perceptual hash grid.
+            algorithms (Sequence[str]): The perceptual hash algorithms to compute.
+            batch_size (int): Number of images hashed together; also the chunk of work
+                              handed to a worker process by `analyze_many`.
+        """
+        unknown = set(algorithms) - set(HASH_ALGORITHMS)
+        if unknown:
+            raise ValueError(f"Unknown hash algorithms: {sorted(unknown)}")
+        self.algorithms = tuple(algorithms)
+        self.engine = PerceptualHashEngine(hash_size=hash_size, batch_size=batch_size)
+
+    @property
+    def hash_size(self) -> int:
+        """Side of the perceptual hash grid."""
+        return self.engine.hash_size
+
+    def analyze(self, image_path: str) -> ImageAnalysis:
+        """
+        Analyzes one image.
+
+        Args:
+            image_path (str): Path to the image file.
+
+        Returns:
+            ImageAnalysis: The analysis; invalid if the file cannot be read or decoded.
+        """
+        return self.analyze_chunk([image_path])[0]
+
+    def analyze_chunk(self, image_paths: List[str]) -> List[ImageAnalysis]:
+        """
+        Analyzes a chunk of images, hashing them together; runs in worker processes.
+
+        Args:
+            image_paths (List[str]): Paths to the image files.
+
+        Returns:
+            List[ImageAnalysis]: One analysis per image, in input order.
+        """
+        return self._analyze_items([(str(path), None) for path in image_paths])
+
+    def _analyze_items(self, items: List[Tuple[str, Optional[str]]]) -> List[ImageAnalysis]:
+        """
+        Analyzes a chunk of images, each with the content hash already known for it, if any.
+
+        Args:
+            items (List[Tuple[str, Optional[str]]]): (path, known MD5 digest or None) pairs.
+
+        Returns:
+            List[ImageAnalysis]: One analysis per image, in input order.
+        """
+        analyses = []
+        for start in range(0, len(items), self.engine.batch_size):
+            decoded = [self._decode(path, content_hash)
+                       for path, content_hash in items[start:start + self.engine.batch_size]]
+            hashed = [(analysis, thumbnails) for analysis, thumbnails in decoded
+                      if thumbnails is not None]
+            if hashed:
+                hashes = self.engine.hash_thumbnails(
+                    {algorithm: np.stack([thumbnails[algorithm] for _, thumbnails in hashed])
+                     for algorithm in self.algorithms})
+                for index, (analysis, _) in enumerate(hashed):
+                    analysis.perceptual = {algorithm: words_to_int(packed[index])
+                                           for algorithm, packed in hashes.items()}
+            analyses.extend(analysis for analysis, _ in decoded)
+        return analyses
+
+    def analyze_many(self, image_paths: Sequence[str], workers: int = 1,
+                     min_parallel_images: int = DEFAULT_MIN_PARALLEL_ITEMS,
+                     on_chunk: Optional[Callable[[int], object]] = None,
+                     content_hashes: Optional[Mapping[str, str]] = None) -> List[ImageAnalysis]:
+        """
+        Analyzes many images, in worker processes if worthwhile.
+
+        Args:
+            image_paths (Sequence[str]): Paths to the image files.
+            workers (int): Number of worker processes; one analyzes serially.
+            min_parallel_images (int): Fewest images for which worker processes are started.
+            on_chunk (Optional[Callable[[int], object]]): Called with the size of every
+                                                          finished chunk.
+            content_hashes (Optional[Mapping[str, str]]): MD5 digests already known for some
+                                                          of the paths, e.g. recorded by the
+                                                          builder; those files are not hashed.
+
+        Returns:
+            List[ImageAnalysis]: One analysis per image, in input order.
+        """
+        content_hashes = content_hashes or {}
+        items = [(str(path), content_hashes.get(str(path))) for path in image_paths]
+        return map_chunks(self._analyze_items, items,
+                          workers=workers, chunk_size=self.engine.batch_size,
+                          min_parallel_items=min_parallel_images, on_chunk=on_chunk)
+
+    def _decode(self, image_path: str, content_hash: Optional[str] = None
+                ) -> Tuple[ImageAnalysis, Optional[Dict[str, np.ndarray]]]:
+        """
+        Reads and decodes one image.
+
+        Args:
+            image_path (str): Path to the image file.
+            content_hash (Optional[str]): The file's MD5 digest, if already known.
+
+        Returns:
+            Tuple[ImageAnalysis, Optional[Dict[str, np.ndarray]]]: The analysis without
+                perceptual hashes, and the hash thumbnails, or None if the image is invalid.
+        """
+        analysis = ImageAnalysis(path=image_path, hash_size=self.hash_size)
+        try:
+            with open(image_path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            analysis.error = f"Cannot read file: {e}"
+            return analysis, None
+        analysis.size_bytes = len(data)
+        analysis.content_hash = content_hash or hashlib.md5(data).hexdigest()
+
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                analysis.width, analysis.height = img.size
+                analysis.format = img.format
+                analysis.mode = img.mode
+                analysis.has_transparency = (img.mode in ("RGBA", "LA", "PA")
+                                             or "transparency" in img.info)
+                if not analysis.width or not analysis.height:
+                    analysis.error = "Image has zero dimensions"
+                    return analysis, None
+                side = self.engine.draft_side
+                img.draft("L", (side, side))
+                # Decodes all pixel data, so truncated or corrupted files fail here
+                gray = img.convert("L")
+        except Exception as e:
+            analysis.error = f"{type(e).__name__}: {e}"
+            logger.debug(f"Image {image_path} failed analysis: {analysis.error}")
+            return analysis, None
+
+        analysis.valid = True
+        analysis.quality = self._quality_metrics(gray)
+        return analysis, self.engine.gray_thumbnails(gray, self.algorithms)
+
+    @staticmethod
+    def _quality_metrics(gray: Image.Image) -> Dict[str, float]:
+        """
+        Measures brightness, contrast and sharpness on a grayscale thumbnail.
+
+        Args:
+            gray (Image.Image): The decoded grayscale image.
+
+        Returns:
+            Dict[str, float]: brightness, contrast and sharpness.
+        """
+        pixels = np.asarray(gray.resize((QUALITY_SIDE, QUALITY_SIDE), Image.Resampling.BILINEAR),
+                            dtype=np.float32) / 255.0
+        laplacian = (pixels[:-2, 1:-1] + pixels[2:, 1:-1] + pixels[1:-1, :-2]
+                     + pixels[1:-1, 2:] - 4 * pixels[1:-1, 1:-1])
+        return {
+            "brightness": round(float(pixels.mean()), 4),
+            "contrast": round(float(pixels.std()), 4),
+            "sharpness": round(float(laplacian.var()), 6)
+        }
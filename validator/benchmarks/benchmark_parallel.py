@@ -0,0 +1,106 @@
+"""
+Benchmark of serial versus process-pool validation and hashing.
+
+Generates a directory of synthetic JPEGs and times `ImageValidator.count_valid`,
+`ImageHasher.build_hashmp` and `CheckManager.check_integrity` for a range of worker
+counts, reporting throughput and speedup over one worker, so the scaling across cores
+and any regression of the parallel mode are easy to spot.
+
+Usage:
+    python -m validator.benchmarks.benchmark_parallel --images 2000 --workers 1 2 4 8 --rounds 2
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+import numpy as np
+from PIL import Image
+
+from validator.config import CheckMode, DuplicateAction, ValidatorConfig
+from validator.integrity import ImageHasher, ImageValidator
+from validator.validation import CheckManager
+
+
+@dataclass
+class CaseResult:
+    """Timings collected for one entry point and worker count."""
+    entry_point: str
+    workers: int
+    durations: List[float] = field(default_factory=list)
+
+    @property
+    def median_duration(self) -> float:
+        return statistics.median(self.durations) if self.durations else 0.0
+
+
+def create_images(directory: str, count: int, size: int) -> None:
+    """Write `count` distinct noisy JPEGs of `size` x `size` pixels into a directory."""
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        pixels = rng.integers(0, 255, (size, size, 3), dtype=np.uint8)
+        Image.fromarray(pixels, mode="RGB").save(os.path.join(directory, f"image_{i:06d}.jpg"),
+                                                 "JPEG", quality=85)
+
+
+def entry_points(directory: str, workers: int) -> Dict[str, Callable[[], object]]:
+    """The benchmarked calls, configured for a worker count."""
+    image_files = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+    config = ValidatorConfig(mode=CheckMode.REPORT_ONLY,
+                             duplicate_action=DuplicateAction.REPORT_ONLY,
+                             max_concurrent_validations=workers, parallel_min_images=1)
+    return {
+        "count_valid": lambda: ImageValidator(workers=workers,
+                                              min_parallel_images=1).count_valid(directory),
+        "build_hashmp": lambda: ImageHasher(workers=workers,
+                                            min_parallel_images=1).build_hashmp(image_files),
+        "check_integrity": lambda: CheckManager(config).check_integrity(directory),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark serial vs process-pool validation")
+    parser.add_argument("--images", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=640, help="Side of the generated images in pixels")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--rounds", type=int, default=1)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="pixcrawler_validator_bench_")
+    try:
+        print(f"Generating {args.images} images of {args.size}x{args.size} pixels...")
+        create_images(directory, args.images, args.size)
+
+        results: Dict[tuple, CaseResult] = {}
+        for round_index in range(args.rounds):
+            # Alternate the order so no worker count always runs against a cold page cache
+            order = args.workers if round_index % 2 == 0 else list(reversed(args.workers))
+            for workers in order:
+                for name, call in entry_points(directory, workers).items():
+                    start = time.perf_counter()
+                    call()
+                    elapsed = time.perf_counter() - start
+                    results.setdefault((name, workers), CaseResult(name, workers)).durations.append(elapsed)
+                    print(f"[round {round_index + 1}] {name:<16} workers={workers:<3} {elapsed:.2f}s")
+
+        print()
+        print(f"{'entry point':<18}{'workers':>8}{'median s':>10}{'img/s':>10}{'speedup':>9}")
+        for (name, workers), result in sorted(results.items()):
+            serial = results.get((name, min(args.workers)))
+            speedup = (serial.median_duration / result.median_duration
+                       if serial and result.median_duration > 0 else 0.0)
+            throughput = args.images / result.median_duration if result.median_duration > 0 else 0.0
+            print(f"{name:<18}{workers:>8}{result.median_duration:>10.2f}"
+                  f"{throughput:>10.1f}{speedup:>8.2f}x")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Persistent cache of per-image hashing and validation results.
+
+Re-validating a dataset re-opens, decodes and hashes every image even when nothing
+changed since the last run. This cache remembers, per file, the content hash, perceptual
+hashes, dimensions, format and validation verdicts, keyed by the file's identity (path,
+size and modification time), so repeat runs only process new or changed files.
+
+Classes:
+    CachedImage: Cached results of one file
+    ValidationCache: SQLite-backed cache keyed by file identity
+
+Features:
+    - Entries are only served while the file's size and modification time still match
+    - Perceptual hashes are kept per algorithm and hash size, verdicts per validation level
+    - Writes are buffered and committed in batches
+    - One store per dataset directory, or one shared store for several directories
+    - Stores live in a cache directory outside the datasets, so they are never packed,
+      uploaded or exported with the images
+    - A memory-only cache shares the results of one run between its steps
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from utility.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+__all__ = [
+    'CachedImage',
+    'ValidationCache',
+    'default_cache_dir'
+]
+
+# Buffered updates are committed once this many are pending
+FLUSH_THRESHOLD = 500
+
+
+def default_cache_dir() -> Path:
+    """
+    Returns the directory holding the per-directory stores: ``pixcrawler/validation`` in the
+    user cache directory ($XDG_CACHE_HOME, or ~/.cache).
+
+    Returns:
+        Path: The cache directory.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pixcrawler" / "validation"
+
+
+@dataclass
+class CachedImage:
+    """
+    Cached results of one file.
+
+    Attributes:
+        size (int): File size in bytes when the results were computed.
+        mtime_ns (int): File modification time in nanoseconds when the results were computed.
+        content_hash (Optional[str]): MD5 digest of the file.
+        perceptual (Dict[str, int]): Packed perceptual hashes keyed by 'algorithm:hash_size'.
+        width (Optional[int]): Image width in pixels.
+        height (Optional[int]): Image height in pixels.
+        format (Optional[str]): Image format reported by Pillow.
+        verdicts (Dict[str, bool]): Validation verdicts keyed by validation level.
+    """
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str] = None
+    perceptual: Dict[str, int] = field(default_factory=dict)
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None
+    verdicts: Dict[str, bool] = field(default_factory=dict)
+
+
+class ValidationCache:
+    """
+    Caches hashing and validation results per file in SQLite.
+
+    Entries are keyed by absolute path and only served while the file's size and
+    modification time match the ones recorded, so a replaced or edited file is processed
+    again. Updates are buffered in memory and committed in batches; call `flush` or `close`
+    when done. A cache is used from the process that created it only; worker processes
+    compute results and the parent records them.
+    """
+
+    def __init__(self, store_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the ValidationCache.
+
+        Args:
+            store_path (Optional[Union[str, Path]]): The SQLite file. It is created if needed.
+                                                     None keeps results in memory only.
+        """
+        self.store_path = Path(store_path) if store_path is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, CachedImage] = {}
+        self._dirty: Dict[str, CachedImage] = {}
+        self._lock = threading.Lock()
+        self._conn = self._open_store(self.store_path) if self.store_path is not None else None
+
+    @classmethod
+    def for_directory(cls, directory: Union[str, Path],
+                      cache_dir: Optional[Union[str, Path]] = None) -> 'ValidationCache':
+        """
+        Creates the cache of a dataset directory, stored outside that directory.
+
+        Args:
+            directory (Union[str, Path]): The dataset directory.
+            cache_dir (Optional[Union[str, Path]]): Directory holding the stores; defaults
+                                                    to `default_cache_dir()`.
+
+        Returns:
+            ValidationCache: The cache.
+        """
+        key = hashlib.sha1(os.path.abspath(directory).encode("utf-8")).hexdigest()[:16]
+        root = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        return cls(root / f"{key}.sqlite")
+
+    @staticmethod
+    def _open_store(path: Path) -> Optional[sqlite3.Connection]:
+        """
+        Opens the SQLite store, creating it if needed.
+
+        Args:
+            path (Path): The SQLite file.
+
+        Returns:
+            Optional[sqlite3.Connection]: The connection, or None if the store cannot be opened.
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS images ("
+                         "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+                         "content_hash TEXT, perceptual TEXT, width INTEGER, height INTEGER, "
+                         "format TEXT, verdicts TEXT)")
+            conn.commit()
+            return conn
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Validation cache unavailable at {path}, using memory only: {e}")
+            return None
+
+    @staticmethod
+    def _identity(path: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Reads the identity of a file.
+
+        Args:
+            path (str): The file path.
+
+        Returns:
+            Optional[Tuple[str, int, int]]: (absolute path, size, mtime_ns), or None if the
+                                            file cannot be read.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+    def lookup(self, path: Union[str, Path]) -> Optional[CachedImage]:
+        """
+        Looks up the cached results of a file.
+
+        Args:
+            path (Union[str, Path]): The file path.
+
+        Returns:
+            Optional[CachedImage]: The results, or None if the file is not cached or changed
+                                   since its results were recorded.
+        """
+        identity = self._identity(str(path))
+        if identity is None:
+            return None
+        key, size, mtime_ns = identity
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._load(key)
+            if entry is None or entry.size != size or entry.mtime_ns != mtime_ns:
+                return None
+            return entry
+
+    def update(self, path: Union[str, Path], content_hash: Optional[str] = None,
+               perceptual: Optional[Dict[str, int]] = None, width: Optional[int] = None,
+               height: Optional[int] = None, format: Optional[str] = None,
+               verdicts: Optional[Dict[str, bool]] = None) -> None:
+        """
+        Records results of a file, merged into any still valid results of it.
+
+        Args:
+            path (Union[str, Path]): The file path.
+            content_hash (Optional[str]): MD5 digest of the file.
+            perceptual (Optional[Dict[str, int]]): Perceptual hashes keyed by 'algorithm:hash_size'.
+            width (Optional[int]): Image width in pixels.
+            height (Optional[int]): Image height in pixels.
+            format (Optional[str]): Image format.
+            verdicts (Optional[Dict[str, bool]]): Verdicts keyed by validation level.
+        """
+        identity = self._identity(str(path))
+        if identity is None:
+            return
+        key, size, mtime_ns = identity
+        with self._lock:
+            entry = self._entries.get(key) or self._load(key)
+            if entry is None or entry.size != size or entry.mtime_ns != mtime_ns:
+                entry = CachedImage(size=size, mtime_ns=mtime_ns)
+            if content_hash is not None:
+                entry.content_hash = content_hash
+            if perceptual:
+                entry.perceptual.update(perceptual)
+            if width is not None:
+                entry.width, entry.height = width, height
+            if format is not None:
+                entry.format = format
+            if verdicts:
+                entry.verdicts.update(verdicts)
+            self._entries[key] = entry
+            self._dirty[key] = entry
+            pending = len(self._dirty)
+        if pending >= FLUSH_THRESHOLD:
+            self.flush()
+
+    def content_hash(self, path: Union[str, Path]) -> Optional[str]:
+        """Returns the cached content hash of an unchanged file, counting a hit or miss."""
+        entry = self.lookup(path)
+        return self._count(entry.content_hash if entry else None)
+
+    def perceptual_hash(self, path: Union[str, Path], key: str) -> Optional[int]:
+        """Returns a cached perceptual hash of an unchanged file, counting a hit or miss."""
+        entry = self.lookup(path)
+        return self._count(entry.perceptual.get(key) if entry else None)
+
+    def verdict(self, path: Union[str, Path], level: str) -> Optional[bool]:
+        """Returns the cached verdict of an unchanged file at a level, counting a hit or miss."""
+        entry = self.lookup(path)
+        return self._count(entry.verdicts.get(level) if entry else None)
+
+    def flush(self) -> None:
+        """
+        Commits buffered updates to the store.
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            if not dirty or self._conn is None:
+                return
+            rows = [(key, entry.size, entry.mtime_ns, entry.content_hash,
+                     json.dumps(entry.perceptual), entry.width, entry.height, entry.format,
+                     json.dumps(entry.verdicts)) for key, entry in dirty.items()]
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO images (path, size, mtime_ns, content_hash, "
+                        "perceptual, width, height, format, verdicts) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to write validation cache {self.store_path}: {e}")
+
+    def close(self) -> None:
+        """
+        Commits buffered updates and closes the store.
+        """
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _load(self, key: str) -> Optional[CachedImage]:
+        """
+        Loads one entry from the store into memory. Must be called with the lock held.
+
+        Args:
+            key (str): The absolute file path.
+
+        Returns:
+            Optional[CachedImage]: The entry, or None if it is not stored.
+        """
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, content_hash, perceptual, width, height, format, verdicts "
+                "FROM images WHERE path = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read validation cache {self.store_path}: {e}")
+            return None
+        if row is None:
+            return None
+        size, mtime_ns, content_hash, perceptual, width, height, format_name, verdicts = row
+        entry = CachedImage(size=size, mtime_ns=mtime_ns, content_hash=content_hash,
+                            perceptual=json.loads(perceptual or "{}"), width=width,
+                            height=height, format=format_name,
+                            verdicts=json.loads(verdicts or "{}"))
+        self._entries[key] = entry
+        return entry
+
+    def _count(self, value: Any) -> Any:
+        """Counts a lookup as a hit or a miss and passes its value through."""
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def __enter__(self) -> 'ValidationCache':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __getstate__(self):
+        raise TypeError("ValidationCache cannot be sent to other processes")
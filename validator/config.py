@@ -139,13 +139,26 @@ class ValidatorConfig(BaseSettings):
         description="Perceptual hash size (between 4 and 32)",
         examples=[4, 8, 16, 32]
     )
+    near_duplicate_threshold: conint(ge=0, le=1024) = Field(
+        default=4,
+        description="Maximum Hamming distance in bits between perceptual hashes of near-duplicates "
+                    "(0 matches identical hashes only)",
+        examples=[0, 4, 8, 12]
+    )
     max_concurrent_validations: PositiveInt = Field(
         default=4,
         ge=1,
         le=32,
-        description="Maximum number of concurrent validation operations",
+        description="Maximum number of concurrent validation operations; the number of worker "
+                    "processes used for validation and hashing (1 runs serially)",
         examples=[1, 4, 8, 16]
     )
+    parallel_min_images: PositiveInt = Field(
+        default=200,
+        le=1000000,
+        description="Fewest images in a directory for which worker processes are started",
+        examples=[50, 200, 1000]
+    )
 
     # Quarantine and logging
     quarantine_dir: Optional[Path] = Field(
@@ -159,6 +172,24 @@ class ValidatorConfig(BaseSettings):
         examples=[True, False]
     )
 
+    # Result cache
+    validation_cache: bool = Field(
+        default=True,
+        description="Cache hashes and verdicts per file so unchanged images are not processed again",
+        examples=[True, False]
+    )
+    validation_cache_path: Optional[Path] = Field(
+        default=None,
+        description="SQLite file shared by all checked directories (None stores one per directory)",
+        examples=[None, Path("validation_cache.sqlite")]
+    )
+    validation_cache_dir: Optional[Path] = Field(
+        default=None,
+        description="Directory of the per-directory caches, kept outside the datasets "
+                    "(None uses the user cache directory)",
+        examples=[None, Path("/var/cache/pixcrawler/validation")]
+    )
+
     @field_validator('quarantine_dir')
     @classmethod
     def validate_quarantine_path(cls, v: Optional[Path]) -> Optional[Path]:
@@ -223,9 +254,14 @@ class ValidatorConfig(BaseSettings):
             'min_image_height': self.min_image_height,
             'batch_size': self.batch_size,
             'hash_size': self.hash_size,
+            'near_duplicate_threshold': self.near_duplicate_threshold,
             'max_concurrent_validations': self.max_concurrent_validations,
+            'parallel_min_images': self.parallel_min_images,
             'quarantine_dir': str(self.quarantine_dir) if self.quarantine_dir else None,
             'detailed_logging': self.detailed_logging,
+            'validation_cache': self.validation_cache,
+            'validation_cache_path': str(self.validation_cache_path) if self.validation_cache_path else None,
+            'validation_cache_dir': str(self.validation_cache_dir) if self.validation_cache_dir else None,
         }
 
     @classmethod
@@ -267,6 +303,11 @@ class ValidatorConfig(BaseSettings):
         ):
             config_copy['quarantine_dir'] = Path(config_copy['quarantine_dir'])
 
+        if isinstance(config_copy.get('validation_cache_path'), str):
+            config_copy['validation_cache_path'] = Path(config_copy['validation_cache_path'])
+        if isinstance(config_copy.get('validation_cache_dir'), str):
+            config_copy['validation_cache_dir'] = Path(config_copy['validation_cache_dir'])
+
         return cls(**config_copy)
 
 
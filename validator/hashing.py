@@ -0,0 +1,464 @@
+"""
+Batch perceptual hashing engine for PixCrawler.
+
+This module computes average (aHash), difference (dHash) and DCT (pHash) perceptual
+hashes for batches of images with NumPy. Each image is decoded once, at reduced
+resolution where the format allows it, and the thresholding, DCT and bit packing run
+on stacked arrays for the whole batch. Hashes are kept as packed unsigned 64-bit words
+instead of hex strings, so they can be compared and indexed directly.
+
+Classes:
+    PerceptualHashEngine: Computes perceptual hashes for batches of images
+    HashBatch: Packed perceptual hashes of a batch of images
+    NearDuplicateIndex: BK-tree answering Hamming-distance queries over packed hashes
+
+Functions:
+    pack_bits: Packs rows of hash bits into unsigned 64-bit words
+    words_to_int: Converts the packed words of one hash to an integer
+    hash_to_hex: Formats a packed hash integer as a zero-padded hex string
+    hamming_distance: Number of differing bits between two packed hashes
+
+Features:
+    - aHash, dHash and pHash from a single decode per image
+    - JPEG images are decoded at reduced scale through the decoder's draft mode
+    - Hashes of any size, stored as (images, words) arrays of uint64
+    - Near-duplicate lookups within a Hamming distance without pairwise comparison
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from utility.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+__all__ = [
+    'HASH_ALGORITHMS',
+    'DEFAULT_NEAR_DUPLICATE_DISTANCE',
+    'PerceptualHashEngine',
+    'HashBatch',
+    'NearDuplicateIndex',
+    'pack_bits',
+    'words_to_int',
+    'hash_to_hex',
+    'hamming_distance'
+]
+
+# Supported perceptual hash algorithms
+HASH_ALGORITHMS: Tuple[str, ...] = ("ahash", "dhash", "phash")
+
+# Hamming distance in bits up to which two 64-bit hashes count as near-duplicates
+DEFAULT_NEAR_DUPLICATE_DISTANCE = 4
+
+# pHash takes its low frequencies from an image this many times the hash size
+PHASH_FACTOR = 4
+
+
+def pack_bits(bits: np.ndarray) -> np.ndarray:
+    """
+    Packs rows of hash bits into unsigned 64-bit words, most significant bit first.
+
+    Args:
+        bits (np.ndarray): Boolean array of shape (images, bits).
+
+    Returns:
+        np.ndarray: Array of shape (images, words) and dtype uint64. Rows shorter than a
+                    multiple of 64 bits are zero-padded at the front, so the words read
+                    as one big-endian integer equal the bit string.
+    """
+    count, nbits = bits.shape
+    padding = (-nbits) % 64
+    if padding:
+        bits = np.concatenate([np.zeros((count, padding), dtype=bool), bits], axis=1)
+    packed = np.packbits(bits, axis=1)
+    return packed.view(">u8").astype(np.uint64).reshape(count, -1)
+
+
+def words_to_int(words: np.ndarray) -> int:
+    """
+    Converts the packed words of one hash to an integer.
+
+    Args:
+        words (np.ndarray): The uint64 words of the hash, most significant first.
+
+    Returns:
+        int: The hash as an integer.
+    """
+    value = 0
+    for word in words:
+        value = (value << 64) | int(word)
+    return value
+
+
+def hash_to_hex(value: int, nbits: int) -> str:
+    """
+    Formats a packed hash integer as a zero-padded hex string.
+
+    Args:
+        value (int): The hash as an integer.
+        nbits (int): Number of bits in the hash.
+
+    Returns:
+        str: The hexadecimal hash string.
+    """
+    return format(value, f"0{nbits // 4}x")
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """
+    Counts the bits in which two packed hashes differ.
+
+    Args:
+        first (int): A hash as an integer.
+        second (int): Another hash as an integer.
+
+    Returns:
+        int: The Hamming distance.
+    """
+    return (first ^ second).bit_count()
+
+
+@dataclass
+class HashBatch:
+    """
+    Packed perceptual hashes of a batch of images.
+
+    Attributes:
+        paths (List[str]): The image paths, in input order.
+        valid (np.ndarray): Boolean mask of the images that could be hashed.
+        hashes (Dict[str, np.ndarray]): (images, words) uint64 arrays per algorithm. Rows of
+                                        images that could not be hashed are zero.
+        nbits (int): Number of bits in each hash.
+    """
+    paths: List[str]
+    valid: np.ndarray
+    hashes: Dict[str, np.ndarray] = field(default_factory=dict)
+    nbits: int = 64
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def as_int(self, algorithm: str, index: int) -> Optional[int]:
+        """
+        Returns one hash as an integer.
+
+        Args:
+            algorithm (str): The hash algorithm.
+            index (int): Position of the image in the batch.
+
+        Returns:
+            Optional[int]: The hash, or None if the image could not be hashed.
+        """
+        if not self.valid[index]:
+            return None
+        return words_to_int(self.hashes[algorithm][index])
+
+    def as_hex(self, algorithm: str, index: int) -> Optional[str]:
+        """
+        Returns one hash as a hex string.
+
+        Args:
+            algorithm (str): The hash algorithm.
+            index (int): Position of the image in the batch.
+
+        Returns:
+            Optional[str]: The hash, or None if the image could not be hashed.
+        """
+        value = self.as_int(algorithm, index)
+        return None if value is None else hash_to_hex(value, self.nbits)
+
+
+class PerceptualHashEngine:
+    """
+    Computes perceptual hashes for batches of images on NumPy arrays.
+
+    aHash sets a bit for every pixel of a hash_size x hash_size grayscale thumbnail at or
+    above its mean. dHash compares horizontally adjacent pixels of a (hash_size + 1) x
+    hash_size thumbnail. pHash thresholds the lowest hash_size x hash_size DCT
+    coefficients of a larger thumbnail at their median.
+    """
+
+    def __init__(self, hash_size: int = 8, batch_size: int = 256):
+        """
+        Initialize the PerceptualHashEngine.
+
+        Args:
+            hash_size (int): Side of the hash grid; hashes have hash_size ** 2 bits.
+            batch_size (int): Number of images decoded before their hashes are computed.
+        """
+        if hash_size < 2:
+            raise ValueError("hash_size must be at least 2")
+        self.hash_size = hash_size
+        self.batch_size = max(1, batch_size)
+        self.nbits = hash_size * hash_size
+        self._dct_matrix = self._build_dct_matrix(hash_size * PHASH_FACTOR)
+
+    @staticmethod
+    def _build_dct_matrix(size: int) -> np.ndarray:
+        """Builds the orthonormal DCT-II matrix of a size, so a 2D DCT is two matmuls."""
+        n = np.arange(size)
+        matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+        matrix[0] *= np.sqrt(1 / size)
+        matrix[1:] *= np.sqrt(2 / size)
+        return matrix.astype(np.float32)
+
+    def thumbnails(self, img: Image.Image,
+                   algorithms: Sequence[str] = HASH_ALGORITHMS) -> Dict[str, np.ndarray]:
+        """
+        Decodes an image once and creates the grayscale thumbnails the algorithms need.
+
+        Args:
+            img (Image.Image): An opened, not yet loaded image.
+            algorithms (Sequence[str]): The hash algorithms.
+
+        Returns:
+            Dict[str, np.ndarray]: One float32 thumbnail array per algorithm.
+        """
+        # Lets the JPEG decoder skip detail no thumbnail needs
+        img.draft("L", (self.draft_side, self.draft_side))
+        return self.gray_thumbnails(img.convert("L"), algorithms)
+
+    @property
+    def draft_side(self) -> int:
+        """
+        Side of the largest thumbnail. Images are always decoded at least this large, whichever
+        algorithms are requested, so a hash does not depend on what was computed with it.
+        """
+        return self.hash_size * PHASH_FACTOR
+
+    def gray_thumbnails(self, gray: Image.Image,
+                        algorithms: Sequence[str] = HASH_ALGORITHMS) -> Dict[str, np.ndarray]:
+        """
+        Creates the thumbnails the algorithms need from an already decoded grayscale image.
+
+        Args:
+            gray (Image.Image): A decoded image in mode 'L'.
+            algorithms (Sequence[str]): The hash algorithms.
+
+        Returns:
+            Dict[str, np.ndarray]: One float32 thumbnail array per algorithm.
+        """
+        size = self.hash_size
+        thumbnails = {}
+        if "ahash" in algorithms:
+            thumbnails["ahash"] = np.asarray(
+                gray.resize((size, size), Image.Resampling.LANCZOS), dtype=np.float32)
+        if "dhash" in algorithms:
+            thumbnails["dhash"] = np.asarray(
+                gray.resize((size + 1, size), Image.Resampling.LANCZOS), dtype=np.float32)
+        if "phash" in algorithms:
+            side = size * PHASH_FACTOR
+            thumbnails["phash"] = np.asarray(
+                gray.resize((side, side), Image.Resampling.LANCZOS), dtype=np.float32)
+        return thumbnails
+
+    def hash_thumbnails(self, thumbnails: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Computes packed hashes from stacked thumbnails.
+
+        Args:
+            thumbnails (Dict[str, np.ndarray]): (images, height, width) arrays per algorithm.
+
+        Returns:
+            Dict[str, np.ndarray]: (images, words) uint64 arrays per algorithm.
+        """
+        hashes = {}
+        size = self.hash_size
+        for algorithm, stack in thumbnails.items():
+            count = stack.shape[0]
+            if algorithm == "ahash":
+                bits = stack >= stack.mean(axis=(1, 2), keepdims=True)
+            elif algorithm == "dhash":
+                bits = stack[:, :, 1:] > stack[:, :, :-1]
+            elif algorithm == "phash":
+                dct = self._dct_matrix @ stack @ self._dct_matrix.T
+                low = dct[:, :size, :size]
+                bits = low > np.median(low.reshape(count, -1), axis=1)[:, None, None]
+            else:
+                raise ValueError(f"Unknown hash algorithm: {algorithm}")
+            hashes[algorithm] = pack_bits(bits.reshape(count, -1))
+        return hashes
+
+    def hash_paths(self, image_paths: Iterable[str],
+                   algorithms: Sequence[str] = ("ahash",)) -> HashBatch:
+        """
+        Computes perceptual hashes for image files.
+
+        Args:
+            image_paths (Iterable[str]): Paths to the image files.
+            algorithms (Sequence[str]): The hash algorithms to compute.
+
+        Returns:
+            HashBatch: The hashes, in input order. Images that cannot be opened are
+                       marked invalid.
+        """
+        unknown = set(algorithms) - set(HASH_ALGORITHMS)
+        if unknown:
+            raise ValueError(f"Unknown hash algorithms: {sorted(unknown)}")
+
+        paths = [str(path) for path in image_paths]
+        words = (self.nbits + 63) // 64
+        result = HashBatch(paths=paths, valid=np.zeros(len(paths), dtype=bool),
+                           hashes={a: np.zeros((len(paths), words), dtype=np.uint64)
+                                   for a in algorithms},
+                           nbits=self.nbits)
+
+        for start in range(0, len(paths), self.batch_size):
+            indices, stacks = [], {a: [] for a in algorithms}
+            for index in range(start, min(start + self.batch_size, len(paths))):
+                thumbnails = self._load_thumbnails(paths[index], algorithms)
+                if thumbnails is None:
+                    continue
+                indices.append(index)
+                for algorithm, thumbnail in thumbnails.items():
+                    stacks[algorithm].append(thumbnail)
+            if not indices:
+                continue
+            hashes = self.hash_thumbnails({a: np.stack(s) for a, s in stacks.items()})
+            result.valid[indices] = True
+            for algorithm, packed in hashes.items():
+                result.hashes[algorithm][indices] = packed
+        return result
+
+    def hash_image(self, img: Image.Image, algorithm: str = "ahash") -> int:
+        """
+        Computes one perceptual hash of an opened image.
+
+        Args:
+            img (Image.Image): An opened image.
+            algorithm (str): The hash algorithm.
+
+        Returns:
+            int: The hash as an integer.
+        """
+        thumbnails = self.thumbnails(img, (algorithm,))
+        packed = self.hash_thumbnails({algorithm: thumbnails[algorithm][None]})[algorithm]
+        return words_to_int(packed[0])
+
+    def _load_thumbnails(self, image_path: str,
+                         algorithms: Sequence[str]) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Opens one image and creates its thumbnails.
+
+        Args:
+            image_path (str): Path to the image file.
+            algorithms (Sequence[str]): The hash algorithms.
+
+        Returns:
+            Optional[Dict[str, np.ndarray]]: The thumbnails, or None if the image cannot
+                                             be processed.
+        """
+        try:
+            with Image.open(image_path) as img:
+                return self.thumbnails(img, algorithms)
+        except Exception as e:
+            logger.warning(f"Failed to compute perceptual hash for {image_path}: {e}")
+            return None
+
+
+class _BKNode:
+    """One distinct hash in a NearDuplicateIndex with the items that have it."""
+
+    __slots__ = ("value", "items", "children")
+
+    def __init__(self, value: int, item: Any):
+        self.value = value
+        self.items: List[Any] = [item]
+        self.children: Dict[int, "_BKNode"] = {}
+
+
+class NearDuplicateIndex:
+    """
+    BK-tree over packed perceptual hashes.
+
+    Every child of a node sits at a distinct Hamming distance from it, so by the triangle
+    inequality a query within distance k only descends into children whose distance lies
+    in [d - k, d + k]. For small k that visits a small fraction of the tree. Items are
+    added one at a time, so the index can grow while images arrive.
+    """
+
+    def __init__(self):
+        """Initialize an empty NearDuplicateIndex."""
+        self._root: Optional[_BKNode] = None
+        self._size = 0
+
+    def add(self, value: int, item: Any) -> None:
+        """
+        Adds an item under its hash.
+
+        Args:
+            value (int): The packed hash.
+            item (Any): The item stored with it, e.g. an image path.
+        """
+        self._size += 1
+        if self._root is None:
+            self._root = _BKNode(value, item)
+            return
+
+        node = self._root
+        while True:
+            distance = hamming_distance(value, node.value)
+            if distance == 0:
+                node.items.append(item)
+                return
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _BKNode(value, item)
+                return
+            node = child
+
+    def query(self, value: int, max_distance: int) -> List[Tuple[Any, int]]:
+        """
+        Finds all items whose hash is within a Hamming distance.
+
+        Args:
+            value (int): The packed hash to search for.
+            max_distance (int): The largest distance to include.
+
+        Returns:
+            List[Tuple[Any, int]]: (item, distance) pairs, nearest first; items at the
+                                   same distance are in insertion order.
+        """
+        matches: List[Tuple[int, int, Any]] = []
+        stack = [self._root] if self._root is not None else []
+        order = 0
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(value, node.value)
+            if distance <= max_distance:
+                for item in node.items:
+                    matches.append((distance, order, item))
+                    order += 1
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for edge, child in node.children.items() if low <= edge <= high)
+        matches.sort(key=lambda match: (match[0], match[1]))
+        return [(item, distance) for distance, _, item in matches]
+
+    def nearest(self, value: int, max_distance: int) -> Optional[Tuple[Any, int]]:
+        """
+        Finds the closest item within a Hamming distance.
+
+        Args:
+            value (int): The packed hash to search for.
+            max_distance (int): The largest distance to accept.
+
+        Returns:
+            Optional[Tuple[Any, int]]: The (item, distance) pair, or None if no item is
+                                       close enough.
+        """
+        matches = self.query(value, max_distance)
+        return matches[0] if matches else None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Tuple[int, Any]]:
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            for item in node.items:
+                yield node.value, item
+            stack.extend(node.children.values())
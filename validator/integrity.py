@@ -30,7 +30,13 @@ from typing import Dict, Optional, List, Tuple, TypedDict, Union
 from PIL import Image
 from tqdm.auto import tqdm
 
+from utility.content_digests import RecordedDigest, load_content_digests, matches_file
 from utility.logging_config import get_logger
+from validator.analysis import DECODE_VERDICT, ImageAnalysis, ImageAnalyzer
+from validator.hashing import (DEFAULT_NEAR_DUPLICATE_DISTANCE, HASH_ALGORITHMS, HashBatch,
+                               NearDuplicateIndex, hash_to_hex)
+from validator.cache import ValidationCache
+from validator.parallel import DEFAULT_MIN_PARALLEL_ITEMS
 
 logger = get_logger(__name__)
 
@@ -47,7 +53,8 @@ __all__ = [
     'ProcessingResults',
     'validate_dataset',
     'remove_duplicates',
-    'process_integrity'
+    'process_integrity',
+    'load_content_digests'
 ]
 
 
@@ -57,6 +64,7 @@ def valid_image_ext(file_path) -> bool:
         file_path = Path(file_path)
     return file_path.suffix.lower() in IMAGE_EXTENSIONS
 
+
 # TypedDict definitions for enhanced type safety
 class ValidationResults(TypedDict):
     """Type definition for validation results."""
@@ -96,14 +104,43 @@ class ImageHasher:
     and perceptual hashes (for visually similar images).
     """
 
-    def __init__(self, hash_size: int = 8):
+    def __init__(self, hash_size: int = 8, algorithm: str = "ahash", batch_size: int = 256,
+                 workers: int = 1, min_parallel_images: int = DEFAULT_MIN_PARALLEL_ITEMS,
+                 cache: Optional[ValidationCache] = None):
         """
         Initialize the ImageHasher with a specified hash size.
 
         Args:
             hash_size (int): The size of the perceptual hash. Larger sizes provide more sensitivity.
-        """
+            algorithm (str): The perceptual hash algorithm ('ahash', 'dhash' or 'phash').
+            batch_size (int): Number of images hashed together by `build_hashmp`; also the
+                              chunk of work handed to a worker process.
+            workers (int): Number of processes `build_hashmp` hashes with; one hashes serially.
+            min_parallel_images (int): Fewest images for which worker processes are started.
+            cache (Optional[ValidationCache]): Cache of earlier results; unchanged files found
+                                               there are not read or decoded again.
+        """
+        if algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"Unknown perceptual hash algorithm: {algorithm}")
         self.hash_size = hash_size
+        self.algorithm = algorithm
+        self.workers = max(1, workers)
+        self.min_parallel_images = min_parallel_images
+        self.analyzer = ImageAnalyzer(hash_size=hash_size, batch_size=batch_size)
+        self.engine = self.analyzer.engine
+        self.cache = cache
+        self._recorded_digests: Dict[Path, Dict[str, RecordedDigest]] = {}
+
+    def __getstate__(self):
+        # The cache stays with the parent process, which records what workers compute
+        state = self.__dict__.copy()
+        state["cache"] = None
+        return state
+
+    @property
+    def perceptual_key(self) -> str:
+        """Key of this hasher's perceptual hashes in a ValidationCache."""
+        return f"{self.algorithm}:{self.hash_size}"
 
     def compute_perceptual_hash(self, image_path: str) -> Optional[str]:
         """
@@ -116,20 +153,51 @@ class ImageHasher:
             Optional[str]: The hexadecimal string representation of the perceptual hash,
                           or None if the image cannot be processed.
         """
+        value = self.compute_perceptual_hash_int(image_path)
+        return None if value is None else hash_to_hex(value, self.engine.nbits)
+
+    def compute_perceptual_hash_int(self, image_path: str) -> Optional[int]:
+        """
+        Computes a perceptual hash for an image as a packed integer.
+
+        Args:
+            image_path (str): The path to the image file.
+
+        Returns:
+            Optional[int]: The perceptual hash, or None if the image cannot be processed.
+        """
+        if self.cache is not None:
+            cached = self.cache.perceptual_hash(image_path, self.perceptual_key)
+            if cached is not None:
+                return cached
+
         try:
             with Image.open(image_path) as img:
-                processed_image = self._prepare_image_for_hashing(img)
-                pixels = list(processed_image.getdata())
-                avg_pixel_value = self._calculate_average_pixel_value(pixels)
-                binary_hash = self._create_binary_hash(pixels, avg_pixel_value)
-                return self._convert_to_hex_hash(binary_hash)
+                value = self.engine.hash_image(img, self.algorithm)
         except Exception as e:
             logger.warning(f"Failed to compute perceptual hash for {image_path}: {e}")
             return None
+        if self.cache is not None:
+            self.cache.update(image_path, perceptual={self.perceptual_key: value})
+        return value
+
+    def compute_perceptual_hashes(self, image_files: List[str]) -> HashBatch:
+        """
+        Computes perceptual hashes for a list of images in batches.
+
+        Args:
+            image_files (List[str]): Paths to the image files.
+
+        Returns:
+            HashBatch: The packed hashes of the hasher's algorithm, in input order.
+        """
+        return self.engine.hash_paths(image_files, (self.algorithm,))
 
     def compute_content_hash(self, file_path: str) -> Optional[str]:
         """
         Computes the MD5 hash of a file's contents for exact duplicate detection.
+        Digests recorded by the builder while the file was downloaded are reused while the
+        file size and modification time still match, so the file is not read again.
 
         Args:
             file_path (str): The path to the file.
@@ -138,6 +206,30 @@ class ImageHasher:
             Optional[str]: The hexadecimal string representation of the MD5 hash,
                           or None if the file cannot be read.
         """
+        if self.cache is not None:
+            cached = self.cache.content_hash(file_path)
+            if cached is not None:
+                return cached
+
+        content_hash = self._hash_file_content(file_path)
+        if content_hash is not None and self.cache is not None:
+            self.cache.update(file_path, content_hash=content_hash)
+        return content_hash
+
+    def _hash_file_content(self, file_path: str) -> Optional[str]:
+        """
+        Computes the MD5 hash of a file, or takes the one the builder recorded for it.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            Optional[str]: The MD5 digest, or None if the file cannot be read.
+        """
+        recorded = self._recorded_content_hash(file_path)
+        if recorded is not None:
+            return recorded
+
         try:
             file_hash = hashlib.md5()
             with open(file_path, "rb") as f:
@@ -147,72 +239,95 @@ class ImageHasher:
             logger.warning(f"Failed to compute content hash for {file_path}: {e}")
             return None
 
-    def build_hashmp(self, image_files: List[str]) -> Tuple[
-        Dict[str, List[str]], Dict[str, List[str]]]:
+    def _recorded_content_hash(self, file_path: str) -> Optional[str]:
         """
-        Builds content hash and perceptual hash maps for a list of image files.
+        Looks up the digest the builder recorded for a file.
 
         Args:
-            image_files (List[str]): A list of absolute paths to image files.
+            file_path (str): The path to the file.
 
         Returns:
-            Tuple[Dict[str, List[str]], Dict[str, List[str]]]: A tuple containing:
-                - Content hash map: maps content hashes to file paths with that hash
-                - Perceptual hash map: maps perceptual hashes to file paths with that hash
+            Optional[str]: The recorded MD5 digest, or None if there is none or the file
+                          size or modification time no longer match it.
         """
-        content_hash_map: Dict[str, List[str]] = {}
-        perceptual_hash_map: Dict[str, List[str]] = {}
+        path = Path(file_path)
+        recorded = self._recorded_digests.get(path.parent)
+        if recorded is None:
+            recorded = load_content_digests(path.parent)
+            self._recorded_digests[path.parent] = recorded
 
-        for img_path in image_files:
-            self._process_image_for_maps(img_path, content_hash_map,
-                                         perceptual_hash_map)
-
-        return content_hash_map, perceptual_hash_map
+        entry = recorded.get(path.name)
+        return entry[0] if entry is not None and matches_file(path, entry) else None
 
-    def _prepare_image_for_hashing(self, img: Image.Image) -> Image:
+    def build_hashmp(self, image_files: List[str]) -> Tuple[
+        Dict[str, List[str]], Dict[int, List[str]]]:
         """
-        Prepares an image for perceptual hashing by converting to grayscale and resizing.
+        Builds content hash and perceptual hash maps for a list of image files.
 
         Args:
-            img (Image.Image): The input image.
+            image_files (List[str]): A list of absolute paths to image files.
 
         Returns:
-            Image.Image: The processed image ready for hashing.
-        """
-        return img.convert("L").resize((self.hash_size, self.hash_size),
-                                       Image.Resampling.LANCZOS)
-
-    @staticmethod
-    def _calculate_average_pixel_value(pixels: List[int]) -> float:
-        """Calculates the average pixel value from a list of pixel values."""
-        return sum(pixels) / len(pixels)
-
-    @staticmethod
-    def _create_binary_hash(pixels: List[int], avg_pixel_value: float) -> str:
+            Tuple[Dict[str, List[str]], Dict[int, List[str]]]: A tuple containing:
+                - Content hash map: maps content hashes to file paths with that hash
+                - Perceptual hash map: maps packed perceptual hashes to file paths with that hash
         """
-        Creates a binary hash string by comparing each pixel to the average.
+        content_hash_map: Dict[str, List[str]] = {}
+        perceptual_hash_map: Dict[int, List[str]] = {}
+
+        hashes = self._cached_hashes(image_files)
+        missing = [img_path for img_path in image_files if img_path not in hashes]
+        # Digests the builder recorded while writing the files are not computed again
+        recorded = {img_path: digest for img_path in missing
+                    if (digest := self._recorded_content_hash(img_path)) is not None}
+        # One read and decode per image yields both hashes, plus what the validator needs
+        analyses = self.analyzer.analyze_many(missing, workers=self.workers,
+                                              min_parallel_images=self.min_parallel_images,
+                                              content_hashes=recorded)
+        for img_path, analysis in zip(missing, analyses):
+            hashes[img_path] = (analysis.content_hash, analysis.perceptual.get(self.algorithm))
+            if self.cache is not None and analysis.content_hash is not None:
+                analysis.record(self.cache)
+        if self.cache is not None:
+            self.cache.flush()
 
-        Args:
-            pixels (List[int]): List of pixel values.
-            avg_pixel_value (float): The average pixel value.
+        for img_path in image_files:
+            content_hash, perceptual_hash = hashes[img_path]
+            # Content hash (exact match)
+            if content_hash:
+                content_hash_map.setdefault(content_hash, []).append(img_path)
+            # Perceptual hash (similar images)
+            if perceptual_hash is not None:
+                perceptual_hash_map.setdefault(perceptual_hash, []).append(img_path)
 
-        Returns:
-            str: Binary hash string.
-        """
-        return ''.join('1' if px >= avg_pixel_value else '0' for px in pixels)
+        return content_hash_map, perceptual_hash_map
 
-    def _convert_to_hex_hash(self, binary_hash: str) -> str:
+    def _cached_hashes(self, image_files: List[str]) -> Dict[str, Tuple[str, int]]:
         """
-        Converts a binary hash string to a hexadecimal representation.
+        Looks up the images whose content and perceptual hashes are both cached.
 
         Args:
-            binary_hash (str): The binary hash string.
+            image_files (List[str]): Paths to the image files.
 
         Returns:
-            str: The hexadecimal hash string, zero-padded to the expected length.
+            Dict[str, Tuple[str, int]]: Maps the paths found to (content hash, perceptual hash).
         """
-        hex_hash = hex(int(binary_hash, 2))[2:]
-        return hex_hash.zfill(self.hash_size ** 2 // 4)
+        if self.cache is None:
+            return {}
+        found = {}
+        for img_path in image_files:
+            entry = self.cache.lookup(img_path)
+            if entry is None:
+                continue
+            perceptual_hash = entry.perceptual.get(self.perceptual_key)
+            if perceptual_hash is None:
+                continue
+            content_hash = entry.content_hash or self._recorded_content_hash(img_path)
+            if content_hash is not None:
+                found[img_path] = (content_hash, perceptual_hash)
+        self.cache.hits += len(found)
+        self.cache.misses += len(image_files) - len(found)
+        return found
 
     @staticmethod
     def _update_hash_with_file_chunks(file_handle, file_hash) -> None:
@@ -226,27 +341,6 @@ class ImageHasher:
         for chunk in iter(lambda: file_handle.read(4096), b""):
             file_hash.update(chunk)
 
-    def _process_image_for_maps(self, img_path: str,
-                                content_hash_map: Dict[str, List[str]],
-                                perceptual_hash_map: Dict[str, List[str]]) -> None:
-        """
-        Processes a single image file and updates both hash maps.
-
-        Args:
-            img_path (str): Path to the image file.
-            content_hash_map (Dict[str, List[str]]): Content hash map to update.
-            perceptual_hash_map (Dict[str, List[str]]): Perceptual hash map to update.
-        """
-        # Get content hash (exact match)
-        content_hash = self.compute_content_hash(img_path)
-        if content_hash:
-            content_hash_map.setdefault(content_hash, []).append(img_path)
-
-        # Get perceptual hash (similar images)
-        perceptual_hash = self.compute_perceptual_hash(img_path)
-        if perceptual_hash:
-            perceptual_hash_map.setdefault(perceptual_hash, []).append(img_path)
-
 
 class DuplicationManager:
     """
@@ -257,14 +351,18 @@ class DuplicationManager:
     keeping original copies.
     """
 
-    def __init__(self, hasher: Optional['ImageHasher'] = None):
+    def __init__(self, hasher: Optional['ImageHasher'] = None,
+                 max_distance: int = DEFAULT_NEAR_DUPLICATE_DISTANCE):
         """
         Initialize the DuplicationManager with an ImageHasher instance.
 
         Args:
             hasher (ImageHasher): An instance of ImageHasher for computing hashes.
+            max_distance (int): Largest Hamming distance between perceptual hashes at which
+                                two images count as duplicates. Zero only matches equal hashes.
         """
         self.hasher = hasher or ImageHasher()
+        self.max_distance = max(0, max_distance)
 
     def detect_duplicates(self, directory: str) -> Dict[str, List[str]]:
         """
@@ -388,43 +486,40 @@ class DuplicationManager:
 
     def _process_perceptual_duplicates(
         self,
-        perceptual_hash_map: Dict[str, List[str]],
+        perceptual_hash_map: Dict[int, List[str]],
         existing_duplicates: Dict[str, List[str]]
     ) -> Dict[str, List[str]]:
         """
         Processes perceptual duplicates and merges them with a dictionary of existing exact duplicates.
-        It identifies visually similar images and adds them to the duplicates list, ensuring that
-        already marked exact duplicates are not re-processed.
+        Images are visited in order and looked up in a near-duplicate index of the images kept
+        so far; an image within `max_distance` of a kept image becomes a duplicate of the
+        nearest one, otherwise it is kept and added to the index. Already marked exact
+        duplicates are not re-processed.
 
         Args:
-            perceptual_hash_map (Dict[str, List[str]]): A dictionary mapping perceptual hashes to lists of file paths.
+            perceptual_hash_map (Dict[int, List[str]]): A dictionary mapping packed perceptual hashes to lists of file paths.
             existing_duplicates (Dict[str, List[str]]): A dictionary of already identified exact duplicates.
 
         Returns:
             Dict[str, List[str]]: An updated dictionary of duplicates, including both exact and perceptual duplicates.
         """
-        duplicates = existing_duplicates.copy()
-
-        for file_list in perceptual_hash_map.values():
-            if len(file_list) > 1:
-                kept_file = None
-
-                # Find an image not already marked as duplicate
-                self._find_unmarked_duplicate(file_list, duplicates, kept_file)
+        duplicates = {original: list(dups) for original, dups in existing_duplicates.items()}
+        marked = {dup for dups in duplicates.values() for dup in dups}
+        kept_index = NearDuplicateIndex()
+
+        for perceptual_hash, file_list in perceptual_hash_map.items():
+            for img in file_list:
+                if img in marked:
+                    continue
+                nearest = kept_index.nearest(perceptual_hash, self.max_distance)
+                if nearest is None:
+                    kept_index.add(perceptual_hash, img)
+                    continue
+                kept_file, _ = nearest
+                duplicates.setdefault(kept_file, []).append(img)
+                marked.add(img)
         return duplicates
 
-    def _find_unmarked_duplicate(self, file_list, duplicates, kept_file):
-        for img in file_list:
-            if not self.is_duplicate(img, duplicates):
-                if kept_file is None:
-                    kept_file = img
-                else:
-                    # Add to duplicates of kept_file
-                    if kept_file in duplicates:
-                        duplicates[kept_file].append(img)
-                    else:
-                        duplicates[kept_file] = [img]
-
     @staticmethod
     def remove_duplicate(duplicate_path: str, original_path: str) -> bool:
         """
@@ -456,19 +551,49 @@ class ImageValidator:
     A class responsible for validating image files and counting valid/invalid images.
 
     This class provides functionality to validate image integrity, count valid images
-    in directories, and handle corrupted image files.
+    in directories, and handle corrupted image files. Every image is read and decoded once
+    by an ImageAnalyzer; with a cache, its hashes are kept for the duplicate checks as well.
     """
 
-    def __init__(self, min_width: int = 50, min_height: int = 50):
+    def __init__(self, min_width: int = 50, min_height: int = 50, workers: int = 1,
+                 chunk_size: int = 100, min_parallel_images: int = DEFAULT_MIN_PARALLEL_ITEMS,
+                 cache: Optional[ValidationCache] = None, hash_size: int = 8):
         """
         Initialize the ImageValidator with minimum image dimensions.
 
         Args:
             min_width (int): Minimum width for valid images.
             min_height (int): Minimum height for valid images.
+            workers (int): Number of processes `count_valid` validates with; one validates serially.
+            chunk_size (int): Number of images handed to a worker process at a time.
+            min_parallel_images (int): Fewest images for which worker processes are started.
+            cache (Optional[ValidationCache]): Cache of earlier verdicts; unchanged files found
+                                               there are not opened again.
+            hash_size (int): Size of the perceptual hashes computed from the same decode and
+                             recorded in the cache for duplicate detection.
         """
         self.min_width = min_width
         self.min_height = min_height
+        self.workers = max(1, workers)
+        self.min_parallel_images = min_parallel_images
+        self.analyzer = ImageAnalyzer(hash_size=hash_size, batch_size=chunk_size)
+        self.cache = cache
+
+    def __getstate__(self):
+        # The cache stays with the parent process, which records what workers compute
+        state = self.__dict__.copy()
+        state["cache"] = None
+        return state
+
+    @property
+    def chunk_size(self) -> int:
+        """Number of images handed to a worker process at a time."""
+        return self.analyzer.engine.batch_size
+
+    @property
+    def verdict_key(self) -> str:
+        """Key of this validator's verdicts in a ValidationCache; verdicts depend on the limits."""
+        return f"integrity:{self.min_width}x{self.min_height}"
 
     def validate(self, image_path: str) -> bool:
         """
@@ -480,22 +605,67 @@ class ImageValidator:
         Returns:
             bool: True if image is valid, False otherwise
         """
-        try:
-            with Image.open(image_path) as img:
-                img.verify()  # Verify image integrity
+        cached = self._cached_verdict(image_path)
+        if cached is not None:
+            return cached
 
-                # Additional check for very small or empty images
-                if not self._is_image_size_valid(img, image_path):
-                    return False
+        analysis = self.analyzer.analyze(image_path)
+        is_valid = self.accepts(analysis)
+        self._record(analysis, is_valid)
+        return is_valid
 
-            return True
-        except (Image.UnidentifiedImageError, IOError) as e:
-            logger.error(f"Corrupted image detected: {image_path} - {str(e)}")
+    def accepts(self, analysis: ImageAnalysis) -> bool:
+        """
+        Decides the verdict of an analyzed image.
+
+        Args:
+            analysis: The analysis of the image
+
+        Returns:
+            bool: True if the image decoded and meets the minimum dimensions
+        """
+        if not analysis.valid:
+            logger.error(f"Corrupted image detected: {analysis.path} - {analysis.error}")
             return False
-        except Exception as e:
-            logger.error(
-                f"An unexpected error occurred during image validation: {image_path} - {str(e)}")
+        if not analysis.meets(self.min_width, self.min_height):
+            logger.warning(f"Image too small: {analysis.path} ({analysis.width}x{analysis.height})")
             return False
+        return True
+
+    def _cached_verdict(self, image_path: str) -> Optional[bool]:
+        """
+        Looks up the verdict of an unchanged image, counting a cache hit or miss.
+
+        A verdict at these limits is served as recorded. An image only analyzed so far, e.g.
+        while hashing, gets its verdict from the recorded decode result and dimensions.
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            Optional[bool]: The verdict, or None if it is not cached
+        """
+        if self.cache is None:
+            return None
+        entry = self.cache.lookup(image_path)
+        verdict = None
+        if entry is not None:
+            verdict = entry.verdicts.get(self.verdict_key)
+            decoded = entry.verdicts.get(DECODE_VERDICT)
+            if verdict is None and decoded is not None:
+                verdict = (decoded and entry.width >= self.min_width
+                           and entry.height >= self.min_height)
+        if verdict is None:
+            self.cache.misses += 1
+        else:
+            self.cache.hits += 1
+        return verdict
+
+    def _record(self, analysis: ImageAnalysis, is_valid: bool) -> None:
+        """Records an analysis and its verdict in the cache, if there is one."""
+        if self.cache is None:
+            return
+        analysis.record(self.cache, {self.verdict_key: is_valid})
 
     def count_valid(self, directory: str) -> Tuple[int, int, List[str]]:
         """
@@ -507,49 +677,57 @@ class ImageValidator:
         Returns:
             Tuple of (valid_count, total_count, corrupted_files)
         """
-        valid_count = 0
-        total_count = 0
-        corrupted_files = []
-
         directory_path = Path(directory)
         if not directory_path.exists():
             return 0, 0, []
 
-        for file_path in tqdm(directory_path.iterdir(), desc="Validating", leave=False,
-                              unit="file"):
-            if file_path.is_file() and valid_image_ext(file_path):
-                total_count += 1
-                if self.validate(str(file_path)):
-                    valid_count += 1
-                else:
-                    corrupted_files.append(str(file_path))
+        image_files = [str(file_path) for file_path in directory_path.iterdir()
+                       if file_path.is_file() and valid_image_ext(file_path)]
+
+        verdicts: Dict[str, bool] = {}
+        for image_path in image_files:
+            cached = self._cached_verdict(image_path)
+            if cached is not None:
+                verdicts[image_path] = cached
+        missing = [image_path for image_path in image_files if image_path not in verdicts]
+
+        with tqdm(total=len(image_files), initial=len(verdicts), desc="Validating", leave=False,
+                  unit="file") as progress:
+            analyses = self.analyzer.analyze_many(missing, workers=self.workers,
+                                                  min_parallel_images=self.min_parallel_images,
+                                                  on_chunk=progress.update)
+        for image_path, analysis in zip(missing, analyses):
+            verdicts[image_path] = self.accepts(analysis)
+            self._record(analysis, verdicts[image_path])
+        if self.cache is not None:
+            self.cache.flush()
+
+        corrupted_files = [path for path in image_files if not verdicts[path]]
+        total_count = len(image_files)
+        valid_count = total_count - len(corrupted_files)
 
         return valid_count, total_count, corrupted_files
-    def _is_image_size_valid(self, img: Image.Image, image_path: str) -> bool:
-        """
-        Check if image dimensions meet minimum requirements.
-
-        Args:
-            img (Image.Image): The image to check.
-            image_path (str): Path to the image file (for logging).
 
-        Returns:
-            bool: True if image size is valid, False otherwise.
-        """
-        if img.width < self.min_width or img.height < self.min_height:
-            logger.warning(f"Image too small: {image_path} ({img.width}x{img.height})")
-            return False
-        return True
 
 class IntegrityProcessor:
     """
     Main processor for integrity workflows combining validation and duplicate detection.
     """
 
-    def __init__(self):
-        """Initialize the integrity processor with validator and duplication manager."""
-        self.validator = ImageValidator()
-        self.duplication_manager = DuplicationManager()
+    def __init__(self, workers: int = 1, use_cache: bool = True):
+        """
+        Initialize the integrity processor with validator and duplication manager.
+
+        Args:
+            workers (int): Number of processes used for validation and hashing.
+            use_cache (bool): Whether to keep verdicts and hashes in a cache stored in the
+                              processed directory, so unchanged images are skipped next time.
+                              Without it they are kept in memory for the run, so duplicate
+                              detection reuses the decode done for validation.
+        """
+        self.validator = ImageValidator(workers=workers)
+        self.duplication_manager = DuplicationManager(ImageHasher(workers=workers))
+        self.use_cache = use_cache
 
     def process_dataset(self, directory: str, remove_duplicates: bool = True,
                         remove_corrupted: bool = True) -> ProcessingResults:
@@ -566,6 +744,21 @@ class IntegrityProcessor:
         """
         logger.info(f"Starting integrity processing for {directory}")
 
+        if not Path(directory).is_dir():
+            return self._process(directory, remove_duplicates, remove_corrupted)
+
+        hasher = self.duplication_manager.hasher
+        cache = ValidationCache.for_directory(directory) if self.use_cache else ValidationCache()
+        with cache:
+            self.validator.cache = hasher.cache = cache
+            try:
+                return self._process(directory, remove_duplicates, remove_corrupted)
+            finally:
+                self.validator.cache = hasher.cache = None
+
+    def _process(self, directory: str, remove_duplicates: bool,
+                 remove_corrupted: bool) -> ProcessingResults:
+        """Validates and deduplicates a directory; see `process_dataset`."""
         # Validate images
         valid_count, total_count, corrupted_files = self.validator.count_valid(
             directory)
@@ -645,7 +838,7 @@ def remove_duplicates(directory: str) -> Tuple[int, List[str]]:
 
 
 def process_integrity(directory: str, remove_duplicates: bool = True,
-                      remove_corrupted: bool = True) -> ProcessingResults:
+                      remove_corrupted: bool = True, use_cache: bool = True) -> ProcessingResults:
     """
     Process a dataset for all integrity issues.
 
@@ -653,9 +846,10 @@ def process_integrity(directory: str, remove_duplicates: bool = True,
         directory: Directory containing the dataset
         remove_duplicates: Whether to remove duplicate images
         remove_corrupted: Whether to remove corrupted images
+        use_cache: Whether to skip images unchanged since an earlier run
 
     Returns:
         ProcessingResults containing processing results
     """
-    processor = IntegrityProcessor()
+    processor = IntegrityProcessor(use_cache=use_cache)
     return processor.process_dataset(directory, remove_duplicates, remove_corrupted)
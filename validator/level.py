@@ -22,7 +22,8 @@ from pydantic import (
     PositiveFloat,
     NonNegativeInt
 )
-from PIL import Image
+
+from validator.analysis import ImageAnalysis, ImageAnalyzer
 
 try:
     from utility.logging_config import get_logger
@@ -270,9 +271,9 @@ def get_validation_strategy(level: ValidationLevel, config: Optional[ValidationC
 class FastValidation(ImageValidationStrategy):
     """Fast validation strategy.
 
-    Validates that the file exists and can be opened as an image.
-    Extracts basic metadata (format_ and size) with minimal processing time.
-    Uses existing validation logic from the integrity module.
+    Validates that the file exists and decodes as an image.
+    Extracts basic metadata (format_ and size) from a single read and decode of the file,
+    the same analysis the integrity module and the hashing use.
     """
 
     def validate(self, image_path: str) -> ValidationResult:
@@ -284,11 +285,24 @@ class FastValidation(ImageValidationStrategy):
         Returns:
             ValidationResult with basic image metadata.
         """
+        return self.validate_with_analysis(image_path)[0]
+
+    def validate_with_analysis(self, image_path: str) -> Tuple[ValidationResult, Optional[ImageAnalysis]]:
+        """Perform fast validation and keep the analysis for further checks.
+
+        Args:
+            image_path: Path to the image file.
+
+        Returns:
+            The ValidationResult and the image analysis, which is None if the file
+            checks failed before the image was read.
+        """
         start_time = time.time()
         issues = []
         metadata = {}
         is_valid = True
         file_size = 0
+        analysis = None
 
         try:
             # Basic file checks
@@ -297,61 +311,32 @@ class FastValidation(ImageValidationStrategy):
                 issues.extend(file_issues)
                 is_valid = False
             else:
-                # Try to open and verify the image
-                try:
-                    with Image.open(image_path) as img:
-                        # Verify image integrity
-                        img.verify()
-
-                        # Re-open for metadata extraction (verify() closes the image)
-                        with Image.open(image_path) as img_meta:
-                            width, height = img_meta.size
-                            format_name = img_meta.format or "Unknown"
-                            mode = img_meta.mode
-
-                            # Store metadata
-                            metadata.update({
-                                "width": width,
-                                "height": height,
-                                "format_": format_name,
-                                "mode": mode,
-                                "size_bytes": file_size,
-                                "aspect_ratio": round(width / height, 2) if height > 0 else 0
-                            })
-
-                            # Check minimum dimensions
-                            if width < self.config.min_width:
-                                issues.append(f"Width {width} < minimum {self.config.min_width}")
-                                if self.config.strict_mode:
-                                    is_valid = False
-
-                            if height < self.config.min_height:
-                                issues.append(f"Height {height} < minimum {self.config.min_height}")
-                                if self.config.strict_mode:
-                                    is_valid = False
-
-                            # Check for transparency if requested
-                            if self.config.check_transparency:
-                                has_transparency = (
-                                    mode in ('RGBA', 'LA') or
-                                    'transparency' in img_meta.info
-                                )
-                                metadata["has_transparency"] = has_transparency
-
-                            # Additional fast checks
-                            if width == 0 or height == 0:
-                                issues.append("Image has zero dimensions")
-                                is_valid = False
-
-                except Image.UnidentifiedImageError as e:
-                    issues.append(f"Cannot identify image format_: {str(e)}")
-                    is_valid = False
-                except IOError as e:
-                    issues.append(f"Cannot open image file: {str(e)}")
-                    is_valid = False
-                except Exception as e:
-                    issues.append(f"Image validation error: {str(e)}")
+                # One read and decode yields integrity, metadata, hashes and quality
+                analysis = _analyzer.analyze(image_path)
+                if not analysis.valid:
+                    if analysis.format is None:
+                        issues.append(f"Cannot identify image format_: {analysis.error}")
+                    else:
+                        issues.append(f"Image validation error: {analysis.error}")
                     is_valid = False
+                else:
+                    metadata.update(analysis.metadata())
+                    width, height = analysis.width, analysis.height
+
+                    # Check minimum dimensions
+                    if width < self.config.min_width:
+                        issues.append(f"Width {width} < minimum {self.config.min_width}")
+                        if self.config.strict_mode:
+                            is_valid = False
+
+                    if height < self.config.min_height:
+                        issues.append(f"Height {height} < minimum {self.config.min_height}")
+                        if self.config.strict_mode:
+                            is_valid = False
+
+                    # Check for transparency if requested
+                    if self.config.check_transparency:
+                        metadata["has_transparency"] = analysis.has_transparency
 
         except Exception as e:
             issues.append(f"Unexpected validation error: {str(e)}")
@@ -359,7 +344,7 @@ class FastValidation(ImageValidationStrategy):
 
         processing_time = time.time() - start_time
 
-        return ValidationResult(
+        result = ValidationResult(
             is_valid=is_valid,
             issues_found=issues,
             metadata=metadata,
@@ -368,17 +353,18 @@ class FastValidation(ImageValidationStrategy):
             file_path=image_path,
             file_size_bytes=file_size
         )
+        return result, analysis
 
 
 class MediumValidation(ImageValidationStrategy):
     """Medium validation strategy.
 
-    Extends fast validation with additional quality checks.
-    Currently includes a placeholder for content/quality metrics.
+    Extends fast validation with basic quality metrics measured on the decode fast
+    validation already did: brightness, contrast and sharpness.
 
     Future enhancements will include:
     - Color histogram analysis
-    - Basic quality metrics (blur detection, noise analysis)
+    - Noise analysis
     - Content-based validation
     """
 
@@ -391,34 +377,40 @@ class MediumValidation(ImageValidationStrategy):
         Returns:
             ValidationResult with image metadata and quality indicators.
         """
-        # For now, delegate to fast validation and add placeholder metadata
+        return self.validate_with_analysis(image_path)[0]
+
+    def validate_with_analysis(self, image_path: str) -> Tuple[ValidationResult, Optional[ImageAnalysis]]:
+        """Perform medium validation and keep the analysis for further checks.
+
+        Args:
+            image_path: Path to the image file.
+
+        Returns:
+            The ValidationResult and the image analysis, or None if the image was not read.
+        """
         fast_validator = FastValidation(self.config)
-        result = fast_validator.validate(image_path)
+        result, analysis = fast_validator.validate_with_analysis(image_path)
 
         # Update validation level and add placeholder for future enhancements
         result.validation_level = ValidationLevel.MEDIUM
         result.metadata.update({
-            "quality_score": None,  # Placeholder for future quality analysis
+            "quality_metrics": analysis.quality if analysis and analysis.valid else None,
             "color_analysis": None,  # Placeholder for color histogram
             "content_features": None  # Placeholder for content analysis
         })
 
-        # Add note about current implementation
-        if result.is_valid:
-            result.issues_found.append("Medium validation not fully implemented - using fast validation")
-
-        return result
+        return result, analysis
 
 
 class SlowValidation(ImageValidationStrategy):
     """Slow validation strategy.
 
     Extends medium validation with comprehensive deep analysis.
-    Currently includes placeholders for quality and deep content checks.
+    Currently adds the perceptual hashes from the shared decode and placeholders for
+    deep content checks.
 
     Future enhancements will include:
-    - Deep quality analysis (sharpness, exposure, composition)
-    - Advanced duplicate detection using perceptual hashing
+    - Deep quality analysis (exposure, composition)
     - Content classification and tagging
     - Metadata extraction and validation
     """
@@ -432,15 +424,17 @@ class SlowValidation(ImageValidationStrategy):
         Returns:
             ValidationResult with comprehensive metadata and analysis results.
         """
-        # For now, delegate to medium validation and add placeholder metadata
+        # Delegate to medium validation, which reads and decodes the image once
         medium_validator = MediumValidation(self.config)
-        result = medium_validator.validate(image_path)
+        result, analysis = medium_validator.validate_with_analysis(image_path)
 
         # Update validation level and add placeholder for future enhancements
         result.validation_level = ValidationLevel.SLOW
         result.metadata.update({
             "deep_quality_analysis": None,  # Placeholder for advanced quality metrics
-            "perceptual_hash": None,  # Placeholder for perceptual hashing
+            "perceptual_hash": (dict(analysis.perceptual)
+                                if result.is_valid and analysis and analysis.valid else None),
+            "content_hash": analysis.content_hash if analysis else None,
             "content_classification": None,  # Placeholder for AI-based classification
             "exif_data": None,  # Placeholder for EXIF metadata
             "technical_analysis": None  # Placeholder for technical image analysis
@@ -451,3 +445,7 @@ class SlowValidation(ImageValidationStrategy):
             result.issues_found.append("Slow validation not fully implemented - using medium validation")
 
         return result
+
+
+# Shared by all strategies; holds only the precomputed DCT matrix
+_analyzer = ImageAnalyzer()
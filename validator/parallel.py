@@ -0,0 +1,106 @@
+"""
+Process-pool execution for the CPU-bound validator entry points.
+
+Image decoding, resizing and hashing hold the GIL, so threads do not help; this module
+spreads them over worker processes instead. Work is split into fixed-size chunks in
+input order and the chunk results come back in the same order, so merged results are
+identical to a serial run.
+
+Functions:
+    map_chunks: Applies a function to consecutive chunks of items, in processes if worthwhile
+    resolve_workers: Turns a configured worker count into an effective one
+
+Features:
+    - Serial fallback below a minimum item count, for one worker, and inside daemonic
+      processes such as Celery prefork workers, which cannot start children
+    - A pool that fails to start or breaks falls back to serial execution
+    - Deterministic result order independent of completion order
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, List, Optional, Sequence, TypeVar
+
+from utility.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+__all__ = [
+    'DEFAULT_MIN_PARALLEL_ITEMS',
+    'map_chunks',
+    'resolve_workers'
+]
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Below this many items the cost of starting workers outweighs the gain
+DEFAULT_MIN_PARALLEL_ITEMS = 200
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """
+    Turns a configured worker count into an effective one.
+
+    Args:
+        workers (Optional[int]): The configured count. None or zero means one per CPU core.
+
+    Returns:
+        int: The number of worker processes to use, at least one.
+    """
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def map_chunks(func: Callable[[List[T]], List[R]], items: Sequence[T], workers: int = 1,
+               chunk_size: int = 100,
+               min_parallel_items: int = DEFAULT_MIN_PARALLEL_ITEMS,
+               on_chunk: Optional[Callable[[int], object]] = None) -> List[R]:
+    """
+    Applies a function to consecutive chunks of items and concatenates the results.
+
+    Args:
+        func (Callable[[List[T]], List[R]]): Picklable function mapping a chunk of items to
+                                             one result per item.
+        items (Sequence[T]): The items to process.
+        workers (int): Number of worker processes; one runs serially.
+        chunk_size (int): Number of items sent to a worker at a time.
+        min_parallel_items (int): Fewest items worth starting worker processes for.
+        on_chunk (Optional[Callable[[int], object]]): Called in this process with the size of
+                                                      every finished chunk, e.g. to advance
+                                                      a progress bar.
+
+    Returns:
+        List[R]: The results in item order.
+    """
+    chunk_size = max(1, chunk_size)
+    chunks = [list(items[i:i + chunk_size]) for i in range(0, len(items), chunk_size)]
+    workers = min(workers, len(chunks))
+
+    if workers > 1 and len(items) >= min_parallel_items and not _in_daemon_process():
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map yields in submission order, whatever order the chunks finish in
+                return _collect(executor.map(func, chunks), on_chunk)
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"Process pool failed, processing {len(items)} items serially: {e}")
+
+    return _collect(map(func, chunks), on_chunk)
+
+
+def _collect(chunk_results: Iterable[List[R]], on_chunk: Optional[Callable[[int], object]]) -> List[R]:
+    """Concatenates chunk results in order, reporting each finished chunk."""
+    results: List[R] = []
+    for chunk_result in chunk_results:
+        results.extend(chunk_result)
+        if on_chunk is not None:
+            on_chunk(len(chunk_result))
+    return results
+
+
+def _in_daemon_process() -> bool:
+    """Daemonic processes are not allowed to have children."""
+    return multiprocessing.current_process().daemon
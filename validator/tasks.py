@@ -65,8 +65,8 @@ def check_duplicates_impl(
             return {"error": f"Directory does not exist: {directory}"}
 
         # Use real CheckManager
-        check_manager = CheckManager(config=config)
-        result = check_manager.check_duplicates(directory, category_name, keyword)
+        with CheckManager(config=config) as check_manager:
+            result = check_manager.check_duplicates(directory, category_name, keyword)
 
         log_context.info(
             "Duplicate check completed",
@@ -128,8 +128,9 @@ def check_integrity_impl(
             return {"error": f"Directory does not exist: {directory}"}
 
         # Use real CheckManager
-        check_manager = CheckManager(config=config)
-        result = check_manager.check_integrity(directory, expected_count, category_name, keyword)
+        with CheckManager(config=config) as check_manager:
+            result = check_manager.check_integrity(directory, expected_count, category_name,
+                                                   keyword)
 
         log_context.info(
             "Integrity check completed",
@@ -191,10 +192,10 @@ def check_all_impl(
             return {"error": f"Directory does not exist: {directory}"}
 
         # Use real CheckManager
-        check_manager = CheckManager(config=config)
-        duplicate_result, integrity_result = check_manager.check_all(
-            directory, expected_count, category_name, keyword
-        )
+        with CheckManager(config=config) as check_manager:
+            duplicate_result, integrity_result = check_manager.check_all(
+                directory, expected_count, category_name, keyword
+            )
 
         log_context.info(
             "Comprehensive validation completed",
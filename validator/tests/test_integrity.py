@@ -32,6 +32,13 @@ from validator import (
 # Fixtures
 # ============================================================================
 
+@pytest.fixture(autouse=True)
+def validation_cache_home(tmp_path, monkeypatch):
+    """Keep the per-directory validation caches in a temporary user cache directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
 @pytest.fixture
 def temp_dataset_dir():
     """Create a temporary directory for test datasets."""
@@ -209,6 +216,42 @@ class TestIntegrityWorkflows:
         # One file should remain, one should be removed (order is non-deterministic)
         assert os.path.exists(original) != os.path.exists(duplicate)
     
+    def test_content_hash_reuses_recorded_digest(self, sample_images, temp_dataset_dir):
+        """Digests recorded by the builder are reused only while size and mtime match."""
+        import hashlib
+        import json
+
+        first, second, third = sample_images[0], sample_images[1], sample_images[2]
+        manifest = Path(temp_dataset_dir) / ".content_digests.jsonl"
+        with open(manifest, "w", encoding="utf-8") as f:
+            for path, digest, size_delta, mtime_delta in ((first, "recorded", 0, 0),
+                                                          (second, "stale", 1, 0),
+                                                          (third, "rewritten", 0, 1)):
+                stat = os.stat(path)
+                f.write(json.dumps({"file": Path(path).name, "md5": digest,
+                                    "size": stat.st_size + size_delta,
+                                    "mtime_ns": stat.st_mtime_ns + mtime_delta}) + "\n")
+
+        hasher = ImageHasher()
+        assert hasher.compute_content_hash(first) == "recorded"
+        for path in (second, third):
+            with open(path, "rb") as f:
+                assert hasher.compute_content_hash(path) == hashlib.md5(f.read()).hexdigest()
+
+    def test_hash_maps_reuse_recorded_digests(self, sample_images, temp_dataset_dir):
+        """Building the duplicate maps takes recorded digests instead of hashing the files."""
+        import json
+
+        first, second = sample_images[0], sample_images[1]
+        stat = os.stat(first)
+        with open(Path(temp_dataset_dir) / ".content_digests.jsonl", "w", encoding="utf-8") as f:
+            f.write(json.dumps({"file": Path(first).name, "md5": "recorded",
+                                "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}) + "\n")
+
+        content_hash_map, _ = ImageHasher().build_hashmp([first, second])
+        assert content_hash_map["recorded"] == [first]
+        assert [second] in content_hash_map.values()
+
     def test_invalid_paths(self):
         """Test handling of invalid paths."""
         validator = ImageValidator()
@@ -220,6 +263,144 @@ class TestIntegrityWorkflows:
         assert hasher.compute_content_hash('/nonexistent/file.jpg') is None
         assert hasher.compute_perceptual_hash('/nonexistent/file.jpg') is None
 
+    def test_batch_hashes_match_single_image_hashes(self, sample_images, temp_dataset_dir):
+        """Batched aHash, dHash and pHash equal the per-image hashes and pack to uint64."""
+        from validator.hashing import HASH_ALGORITHMS, PerceptualHashEngine, pack_bits
+
+        bits = np.zeros((1, 64), dtype=bool)
+        bits[0, 0] = bits[0, 63] = True
+        assert int(pack_bits(bits)[0, 0]) == (1 << 63) | 1
+
+        corrupted = os.path.join(temp_dataset_dir, 'corrupted.jpg')
+        with open(corrupted, 'wb') as f:
+            f.write(b'invalid image data')
+
+        engine = PerceptualHashEngine(batch_size=2)
+        batch = engine.hash_paths(sample_images + [corrupted], HASH_ALGORITHMS)
+
+        assert batch.valid.tolist() == [True] * len(sample_images) + [False]
+        assert batch.hashes["phash"].dtype == np.uint64
+        assert batch.as_int("dhash", len(sample_images)) is None
+        for algorithm in HASH_ALGORITHMS:
+            with Image.open(sample_images[0]) as img:
+                assert batch.as_int(algorithm, 0) == engine.hash_image(img, algorithm)
+
+        hasher = ImageHasher()
+        assert hasher.compute_perceptual_hash(sample_images[0]) == batch.as_hex("ahash", 0)
+
+    def test_near_duplicate_index_matches_brute_force(self):
+        """BK-tree queries return exactly the hashes within the distance, nearest first."""
+        import random
+        from validator.hashing import NearDuplicateIndex, hamming_distance
+
+        rng = random.Random(7)
+        values = [rng.getrandbits(64) for _ in range(300)]
+        # Near copies with a few flipped bits
+        values += [values[i] ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for i in range(30)]
+        index = NearDuplicateIndex()
+        for i, value in enumerate(values):
+            index.add(value, i)
+
+        assert len(index) == len(values)
+        for probe in values[:40]:
+            matches = index.query(probe, 4)
+            expected = sorted(i for i, value in enumerate(values) if hamming_distance(probe, value) <= 4)
+            assert sorted(i for i, _ in matches) == expected
+            assert [d for _, d in matches] == sorted(d for _, d in matches)
+
+    def test_resized_copy_is_a_near_duplicate(self, temp_dataset_dir):
+        """A re-encoded, resized copy is grouped with its original only within the threshold."""
+        from validator.integrity import DuplicationManager
+
+        gradient = np.tile(np.linspace(0, 255, 200, dtype=np.uint8), (200, 1))
+        img = Image.fromarray(np.stack([gradient, gradient.T, gradient], axis=2), mode='RGB')
+        original = os.path.join(temp_dataset_dir, 'original.png')
+        img.save(original, 'PNG')
+        img.resize((120, 120)).save(os.path.join(temp_dataset_dir, 'resized.jpg'), 'JPEG', quality=70)
+
+        duplicates = DuplicationManager(ImageHasher(), max_distance=6).detect_duplicates(temp_dataset_dir)
+        assert sum(len(dups) for dups in duplicates.values()) == 1
+
+        manager = CheckManager(ValidatorConfig(near_duplicate_threshold=0,
+                                               duplicate_action=DuplicateAction.REPORT_ONLY))
+        assert manager.duplication_manager.max_distance == 0
+
+    def test_process_pool_matches_serial_results(self, sample_images, temp_dataset_dir):
+        """Worker processes produce the same verdicts and hash maps, in the same order."""
+        with open(os.path.join(temp_dataset_dir, 'corrupted.jpg'), 'wb') as f:
+            f.write(b'invalid image data')
+        shutil.copy(sample_images[0], os.path.join(temp_dataset_dir, 'copy.jpg'))
+        image_files = sorted(str(p) for p in Path(temp_dataset_dir).iterdir())
+
+        serial = ImageValidator(workers=1).count_valid(temp_dataset_dir)
+        parallel = ImageValidator(workers=2, chunk_size=2, min_parallel_images=1).count_valid(temp_dataset_dir)
+        assert parallel == serial
+        assert (parallel[0], parallel[1]) == (6, 7)
+
+        serial_maps = ImageHasher(workers=1).build_hashmp(image_files)
+        parallel_maps = ImageHasher(workers=2, batch_size=2, min_parallel_images=1).build_hashmp(image_files)
+        assert parallel_maps == serial_maps
+        assert [list(m) for m in parallel_maps] == [list(m) for m in serial_maps]
+
+    def test_validation_cache_skips_unchanged_files(self, sample_images, temp_dataset_dir):
+        """A second run is served from the cache; a rewritten file is processed again."""
+        from unittest.mock import patch
+        from validator.analysis import ImageAnalyzer
+        from validator.cache import ValidationCache, default_cache_dir
+
+        with patch.object(ImageAnalyzer, 'analyze_chunk', autospec=True,
+                          side_effect=ImageAnalyzer.analyze_chunk) as analyze:
+            IntegrityProcessor().process_dataset(temp_dataset_dir, remove_duplicates=False,
+                                                 remove_corrupted=False)
+            # Validation and duplicate detection share one read and decode per image
+            assert sorted(p for call in analyze.call_args_list for p in call.args[1]) == sample_images
+            # The store is kept outside the dataset, so it is never packed with the images
+            assert len(list(default_cache_dir().glob("*.sqlite"))) == 1
+            assert not list(Path(temp_dataset_dir).glob("*.sqlite*"))
+
+            analyze.reset_mock()
+            Image.new('RGB', (10, 10)).save(sample_images[0], 'JPEG')
+            results = IntegrityProcessor().process_dataset(temp_dataset_dir, remove_duplicates=False,
+                                                           remove_corrupted=False)
+
+        assert [call.args[1] for call in analyze.call_args_list] == [[sample_images[0]]]
+        assert results['validation']['corrupted_files'] == [sample_images[0]]
+
+        with ValidationCache.for_directory(temp_dataset_dir) as cache:
+            entry = cache.lookup(sample_images[1])
+            assert (entry.width, entry.height, entry.format) == (100, 100, 'JPEG')
+            assert entry.verdicts == {'decode': True, 'integrity:50x50': True}
+            assert set(entry.perceptual) == {'ahash:8', 'dhash:8', 'phash:8'}
+
+    def test_single_pass_analysis_matches_separate_passes(self, sample_images, temp_dataset_dir):
+        """One read and decode gives the same hashes and metadata, and catches truncation."""
+        import hashlib
+        from validator.analysis import ImageAnalyzer
+        from validator.hashing import HASH_ALGORITHMS, PerceptualHashEngine
+        from validator.level import MediumValidation
+
+        truncated = os.path.join(temp_dataset_dir, 'truncated.jpg')
+        with open(sample_images[0], 'rb') as f:
+            data = f.read()
+        with open(truncated, 'wb') as f:
+            f.write(data[:len(data) // 2])
+
+        analyses = ImageAnalyzer(batch_size=2).analyze_chunk(sample_images + [truncated])
+        batch = PerceptualHashEngine().hash_paths(sample_images, HASH_ALGORITHMS)
+        for index, analysis in enumerate(analyses[:-1]):
+            assert analysis.valid and analysis.meets(100, 100)
+            assert (analysis.width, analysis.height, analysis.format, analysis.mode) == (100, 100, 'JPEG', 'RGB')
+            assert analysis.perceptual == {a: batch.as_int(a, index) for a in HASH_ALGORITHMS}
+            with open(sample_images[index], 'rb') as f:
+                assert analysis.content_hash == hashlib.md5(f.read()).hexdigest()
+            assert set(analysis.quality) == {'brightness', 'contrast', 'sharpness'}
+
+        assert not analyses[-1].valid and analyses[-1].format == 'JPEG'
+        assert not ImageValidator().validate(truncated)
+
+        result = MediumValidation().validate(sample_images[0])
+        assert result.is_valid and result.metadata['quality_metrics'] == analyses[0].quality
+
 
 # ============================================================================
 # Integration Tests: CheckManager and Validation Modes
@@ -249,7 +430,21 @@ class TestCheckManager:
         result = manager.check_duplicates(temp_dataset_dir)
         assert result.duplicates_found == 1
         assert result.duplicates_removed == 1
-    
+
+    def test_shared_cache_is_closed(self, sample_images, temp_dataset_dir, validation_cache_home):
+        """A shared cache is committed and closed when the manager is closed."""
+        from validator.cache import ValidationCache
+
+        cache_path = validation_cache_home / "shared.sqlite"
+        with CheckManager(ValidatorConfig(validation_cache_path=cache_path)) as manager:
+            manager.check_integrity(temp_dataset_dir)
+            shared = manager.shared_cache
+        assert manager.shared_cache is None and shared._conn is None
+        assert manager.image_validator.cache is None
+
+        with ValidationCache(cache_path) as cache:
+            assert cache.lookup(sample_images[0]) is not None
+
     @pytest.mark.parametrize("mode,has_error,expected_valid", [
         ("strict", True, None),
         ("lenient", False, 1),
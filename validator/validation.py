@@ -29,13 +29,16 @@ Features:
 """
 
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple, Set, TypedDict
+from typing import Optional, List, Dict, Any, Tuple, Set, TypedDict, Iterator
 
 from utility.logging_config import get_logger
+from validator.analysis import ImageAnalysis
+from validator.cache import ValidationCache
 from validator.config import CheckMode, DuplicateAction, ValidatorConfig
-from validator.integrity import DuplicationManager, ImageValidator
+from validator.integrity import DuplicationManager, ImageHasher, ImageValidator
 
 logger = get_logger(__name__)
 
@@ -137,17 +140,78 @@ class CheckManager:
         self.stats = CheckStats()
 
         # Initialize validation components
-        self.duplication_manager = DuplicationManager()
+        self.duplication_manager = DuplicationManager(
+            ImageHasher(hash_size=self.config.hash_size, batch_size=self.config.batch_size,
+                        workers=self.config.max_concurrent_validations,
+                        min_parallel_images=self.config.parallel_min_images),
+            max_distance=self.config.near_duplicate_threshold)
         self.image_validator = ImageValidator(
             min_width=self.config.min_image_width,
-            min_height=self.config.min_image_height
+            min_height=self.config.min_image_height,
+            workers=self.config.max_concurrent_validations,
+            chunk_size=self.config.batch_size,
+            min_parallel_images=self.config.parallel_min_images,
+            hash_size=self.config.hash_size
         )
 
+        # A configured cache path is shared by every directory and by single-image calls
+        self.shared_cache: Optional[ValidationCache] = None
+        if self.config.validation_cache and self.config.validation_cache_path:
+            self.shared_cache = ValidationCache(self.config.validation_cache_path)
+            self.duplication_manager.hasher.cache = self.shared_cache
+            self.image_validator.cache = self.shared_cache
+
         # Setup quarantine directory if specified
         if (self.config.duplicate_action == DuplicateAction.QUARANTINE and
             self.config.quarantine_dir):
             Path(self.config.quarantine_dir).mkdir(parents=True, exist_ok=True)
 
+    def close(self) -> None:
+        """
+        Commits and closes the shared result cache, if any.
+        """
+        if self.shared_cache is not None:
+            self.duplication_manager.hasher.cache = self.image_validator.cache = None
+            self.shared_cache.close()
+            self.shared_cache = None
+
+    def __enter__(self) -> 'CheckManager':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @contextmanager
+    def _directory_cache(self, directory: str) -> Iterator[Optional[ValidationCache]]:
+        """
+        Provides the hasher and validator with the result cache of a directory.
+
+        A cache already in place, shared or opened by an enclosing check, is kept. With
+        caching disabled the results are kept in memory for the duration of the check.
+
+        Args:
+            directory: The directory being checked
+
+        Yields:
+            The cache in use, or None if the directory does not exist
+        """
+        active = self.image_validator.cache
+        if active is not None or not Path(directory).is_dir():
+            yield active
+            if active is not None:
+                active.flush()
+            return
+
+        hasher = self.duplication_manager.hasher
+        cache = (ValidationCache.for_directory(directory, self.config.validation_cache_dir)
+                 if self.config.validation_cache else ValidationCache())
+        with cache:
+            hasher.cache = self.image_validator.cache = cache
+            try:
+                yield cache
+            finally:
+                hasher.cache = self.image_validator.cache = None
+
     def _is_valid_image_file(self, file_path: Path) -> bool:
         """Check if a file is a valid image file"""
         try:
@@ -270,7 +334,8 @@ class CheckManager:
                 logger.info(f"Processing {category_name}/{keyword}")
 
             # Detect duplicates
-            duplicates = self.duplication_manager.detect_duplicates(directory)
+            with self._directory_cache(directory):
+                duplicates = self.duplication_manager.detect_duplicates(directory)
 
             result.duplicate_groups = duplicates
             result.duplicates_found = sum(len(dups) for dups in duplicates.values())
@@ -370,8 +435,9 @@ class CheckManager:
             context: Context information for the integrity check
             result: Result object to populate
         """
-        valid_count, total_count, corrupted_files = self.image_validator.count_valid(
-            context['directory'])
+        with self._directory_cache(context['directory']):
+            valid_count, total_count, corrupted_files = self.image_validator.count_valid(
+                context['directory'])
 
         result.total_images = total_count
         result.valid_images = valid_count
@@ -564,15 +630,50 @@ class CheckManager:
         if category_name and keyword:
             logger.info(f"Processing {category_name}/{keyword}")
 
-        # Check duplicates first
-        duplicate_result = self.check_duplicates(directory, category_name, keyword)
+        # Both checks share one cache, so every image is read and decoded once
+        with self._directory_cache(directory):
+            # Check duplicates first
+            duplicate_result = self.check_duplicates(directory, category_name, keyword)
 
-        # Then check integrity
-        integrity_result = self.check_integrity(directory, expected_count,
-                                                category_name, keyword)
+            # Then check integrity
+            integrity_result = self.check_integrity(directory, expected_count,
+                                                    category_name, keyword)
 
         return duplicate_result, integrity_result
 
+    def analyze_images(self, image_files: List[str]) -> List[ImageAnalysis]:
+        """
+        Reads and decodes each image once for its verdict, hashes, metadata and quality.
+
+        Args:
+            image_files: Paths of the images to analyze
+
+        Returns:
+            List[ImageAnalysis]: One analysis per image, in input order; pass one to
+                                 `image_validator.accepts` for its verdict
+        """
+        return self.image_validator.analyzer.analyze_many(
+            image_files, workers=self.config.max_concurrent_validations,
+            min_parallel_images=self.config.parallel_min_images)
+
+    def record_analyses(self, directory: str, analyses: List[ImageAnalysis]) -> None:
+        """
+        Records analyses of images in a directory, so the checks of that directory reuse
+        them instead of opening the images again.
+
+        Args:
+            directory: The directory holding the analyzed images, at the analyzed paths
+            analyses: The analyses, e.g. from `analyze_images`
+        """
+        if not self.config.validation_cache:
+            return
+        with self._directory_cache(directory) as cache:
+            if cache is None:
+                return
+            for analysis in analyses:
+                analysis.record(cache, {self.image_validator.verdict_key:
+                                        self.image_validator.accepts(analysis)})
+
     def _update_duplicate_statistics(self, result: DuplicateResult, category_name: str,
                                      keyword: str):
         """Update statistics after duplicate check"""